@@ -0,0 +1,346 @@
+// Contact form validation, bot checks and submission. script.js imports this
+// module when the form comes within 200px of the viewport, when the form is
+// submitted before that, or at load when an earlier visit left a message in
+// the outbox.
+//
+// A valid form is posted with fetch (Formspree's JSON API) instead of a page
+// navigation. Each attempt times out after SUBMIT_TIMEOUT_MS; network errors,
+// timeouts, 429 and 5xx responses are retried with exponential backoff. When
+// every attempt fails, or the browser is offline, the message is saved to the
+// outbox in localStorage. It is sent on the next `online` event or visit, and
+// while the browser is online, on a timer that backs off from OUTBOX_RETRY_BASE_MS.
+const SUBMIT_TIMEOUT_MS = 10000;
+const SUBMIT_ATTEMPTS = 3;
+const RETRY_BASE_MS = 1000;
+const OUTBOX_RETRY_BASE_MS = 30000;
+const OUTBOX_RETRY_MAX_MS = 10 * 60 * 1000;
+// The fields a rejected saved message is put back into, so it can be corrected.
+const MESSAGE_FIELDS = ['name', 'email', 'message'];
+
+// The outbox lives under the localStorage key script.js passes in, which it
+// also checks at load to decide whether to import this module straight away.
+const createOutbox = (key) => ({
+    read() {
+        try {
+            const entries = JSON.parse(localStorage.getItem(key) || '[]');
+            // Security: Ignore anything that is not a list of saved messages, in
+            // case localStorage was tampered with or corrupted.
+            if (!Array.isArray(entries)) return [];
+            return entries.filter(entry => entry && typeof entry.id === 'string'
+                && entry.fields && typeof entry.fields === 'object');
+        } catch (_) {
+            return [];
+        }
+    },
+    // Returns false when storage is unavailable, so the caller keeps the message in the form.
+    write(entries) {
+        try {
+            if (entries.length) {
+                localStorage.setItem(key, JSON.stringify(entries));
+            } else {
+                localStorage.removeItem(key);
+            }
+            return true;
+        } catch (_) {
+            return false;
+        }
+    }
+});
+
+const wait = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+// One attempt. Resolves with 'sent', 'retry' (worth another attempt) or
+// 'rejected' (any other 4xx: Formspree refused the message itself).
+const postForm = (endpoint, fields) => {
+    const controller = new AbortController();
+    const timer = setTimeout(() => controller.abort(), SUBMIT_TIMEOUT_MS);
+    return fetch(endpoint, {
+        method: 'POST',
+        body: new URLSearchParams(fields),
+        headers: { Accept: 'application/json' },
+        signal: controller.signal,
+        keepalive: true,
+    }).then((response) => {
+        if (response.ok) return 'sent';
+        return response.status === 429 || response.status >= 500 ? 'retry' : 'rejected';
+    }, () => 'retry').finally(() => clearTimeout(timer));
+};
+
+// Retries with backoff (RETRY_BASE_MS, then doubling) and resolves with the
+// last result. onRetry gets the number of the attempt the backoff leads to.
+const sendWithRetry = (endpoint, fields, onRetry = () => {}) => {
+    const attempt = (number) => postForm(endpoint, fields).then((result) => {
+        if (result !== 'retry' || number >= SUBMIT_ATTEMPTS || !navigator.onLine) return result;
+        onRetry(number + 1);
+        return wait(RETRY_BASE_MS * 2 ** (number - 1)).then(() => attempt(number + 1));
+    });
+    return attempt(1);
+};
+
+export const initContactForm = (contactForm, { contactOutboxKey }) => {
+    const outbox = createOutbox(contactOutboxKey);
+    const submitButton = contactForm.querySelector('.contact-submit-btn');
+    const submitText = submitButton ? submitButton.querySelector('.submit-text') : null;
+    const submitSpinner = submitButton ? submitButton.querySelector('.submit-spinner') : null;
+    const idleSubmitText = submitText ? submitText.textContent : '';
+
+    // Time-based bot detection: script.js records the page load time here
+    const formLoadTimeInput = document.getElementById('formLoadTime');
+
+    // Rate limiting via localStorage: max 5 submissions per 15 minutes
+    const RATE_LIMIT_MAX = 5;
+    const RATE_LIMIT_WINDOW_MS = 15 * 60 * 1000;
+    function isRateLimited() {
+        const now = Date.now();
+        let timestamps;
+        try {
+            timestamps = JSON.parse(localStorage.getItem('_formSubmits') || '[]');
+            // Security Enhancement: Validate that parsed JSON is actually an array
+            // before calling array methods, preventing unhandled exceptions if
+            // localStorage was tampered with or corrupted.
+            if (!Array.isArray(timestamps)) timestamps = [];
+        } catch (_) {
+            timestamps = [];
+        }
+        timestamps = timestamps.filter(t => typeof t === 'number' && now - t < RATE_LIMIT_WINDOW_MS);
+        // Saved messages were counted when they were submitted; the outbox is
+        // capped at the same limit however long the visitor stays offline.
+        if (timestamps.length >= RATE_LIMIT_MAX || outbox.read().length >= RATE_LIMIT_MAX) return true;
+        timestamps.push(now);
+        try {
+            localStorage.setItem('_formSubmits', JSON.stringify(timestamps));
+        } catch (_) { /* storage unavailable */ }
+        return false;
+    }
+
+    // UX Improvement: Clear inline validation errors instantly when the user starts typing to correct them
+    contactForm.querySelectorAll('input, textarea').forEach(input => {
+        input.addEventListener('input', () => {
+            if (input.getAttribute('aria-invalid') === 'true') {
+                input.removeAttribute('aria-invalid');
+                input.removeAttribute('aria-describedby');
+                const errorMsg = document.getElementById(`${input.id}-error`);
+                if (errorMsg) errorMsg.remove();
+            }
+        });
+    });
+
+    const setSubmitting = (submitting) => {
+        if (submitButton) {
+            if (submitText) submitText.textContent = submitting ? 'Sending...' : idleSubmitText;
+            if (submitSpinner) submitSpinner.toggleAttribute('hidden', !submitting);
+            submitButton.disabled = submitting;
+            if (submitting) {
+                submitButton.setAttribute('aria-disabled', 'true');
+            } else {
+                submitButton.removeAttribute('aria-disabled');
+            }
+        }
+        contactForm.classList.toggle('is-submitting', submitting);
+    };
+
+    // The submission state is kept in data-submit-state (sending, retrying,
+    // sent, queued or failed) and the current attempt in data-submit-attempt.
+    const showStatus = (state, message) => {
+        contactForm.dataset.submitState = state;
+        let statusMsg = contactForm.querySelector('.form-success-msg');
+        if (!statusMsg) {
+            statusMsg = document.createElement('p');
+            statusMsg.className = 'form-success-msg';
+            statusMsg.setAttribute('role', 'status');
+            contactForm.insertBefore(statusMsg, submitButton);
+        }
+        statusMsg.textContent = message;
+    };
+
+    const showSendError = () => {
+        contactForm.dataset.submitState = 'failed';
+        contactForm.querySelectorAll('.form-success-msg, .error-msg-send').forEach(msg => msg.remove());
+        const sendError = document.createElement('p');
+        sendError.className = 'error-msg error-msg-send';
+        sendError.textContent = 'Your message could not be sent. Please check it and try again in a few minutes.';
+        sendError.setAttribute('role', 'status');
+        contactForm.insertBefore(sendError, submitButton);
+    };
+
+    // A rejected saved message would be refused again, so it leaves the
+    // outbox; it goes back into the form, unless the visitor has started a new one.
+    const restoreMessage = (fields) => {
+        const messageInput = contactForm.elements.namedItem('message');
+        if (messageInput && messageInput.value.trim()) return;
+        MESSAGE_FIELDS.forEach((name) => {
+            const input = contactForm.elements.namedItem(name);
+            if (input && typeof fields[name] === 'string') input.value = fields[name];
+        });
+    };
+
+    // Sends saved messages one at a time, oldest first, and stops at the
+    // first one that still cannot get through. While the browser stays online
+    // that one is tried again on a backoff timer; offline, the `online` event does it.
+    let flushing = null;
+    let flushTimer = 0;
+    let flushDelay = OUTBOX_RETRY_BASE_MS;
+    const scheduleFlush = () => {
+        clearTimeout(flushTimer);
+        flushTimer = setTimeout(flushOutbox, flushDelay);
+        flushDelay = Math.min(flushDelay * 2, OUTBOX_RETRY_MAX_MS);
+    };
+    const flushOutbox = () => {
+        if (flushing || !navigator.onLine) return flushing;
+        clearTimeout(flushTimer);
+        const outcomes = [];
+        flushing = outbox.read().reduce((chain, entry) => chain.then((blocked) => {
+            if (blocked) return true;
+            return sendWithRetry(contactForm.action, entry.fields).then((result) => {
+                if (result === 'retry') return true;
+                outcomes.push({ entry, result });
+                outbox.write(outbox.read().filter(queued => queued.id !== entry.id));
+                return false;
+            });
+        }), Promise.resolve(false)).then((blocked) => {
+            flushing = null;
+            if (blocked) {
+                if (navigator.onLine) scheduleFlush();
+                return;
+            }
+            flushDelay = OUTBOX_RETRY_BASE_MS;
+            const rejected = outcomes.find(({ result }) => result === 'rejected');
+            if (rejected) {
+                restoreMessage(rejected.entry.fields);
+                showSendError();
+            } else if (outcomes.length && contactForm.dataset.submitState === 'queued') {
+                showStatus('sent', 'Your saved message has been sent.');
+            }
+        });
+        return flushing;
+    };
+    window.addEventListener('online', flushOutbox);
+    flushOutbox();
+
+    contactForm.addEventListener('submit', (e) => {
+        // A message is already on its way
+        if (contactForm.classList.contains('is-submitting')) {
+            e.preventDefault();
+            return;
+        }
+
+        // Bot protection 1: Honeypot — reject if hidden field is filled
+        const gotchaInput = contactForm.querySelector('input[name="_gotcha"]');
+        if (gotchaInput && gotchaInput.value) {
+            e.preventDefault();
+            return;
+        }
+
+        // Bot protection 2: Time-based — reject if form was submitted in under 2 seconds
+        const loadTime = parseInt(formLoadTimeInput ? formLoadTimeInput.value : '0', 10);
+        if (!loadTime || Date.now() - loadTime < 2000) {
+            e.preventDefault();
+            return;
+        }
+
+        // Bot protection 3: Rate limiting — max 5 submissions per 15-minute window
+        if (isRateLimited()) {
+            e.preventDefault();
+            const existingRateError = contactForm.querySelector('.error-msg-rate');
+            if (!existingRateError) {
+                const rateError = document.createElement('p');
+                rateError.className = 'error-msg error-msg-rate';
+                rateError.textContent = 'Too many submissions. Please wait a few minutes before trying again.';
+                rateError.setAttribute('role', 'status');
+                contactForm.insertBefore(rateError, submitButton);
+            }
+            return;
+        }
+
+        let isValid = true;
+
+        // Remove existing messages
+        const existingErrors = contactForm.querySelectorAll('.error-msg, .form-success-msg');
+        existingErrors.forEach(error => {
+            // Remove ARIA attributes from the associated input
+            const input = error.previousSibling;
+            if (input && input.removeAttribute) {
+                input.removeAttribute('aria-invalid');
+                input.removeAttribute('aria-describedby');
+            }
+            error.remove();
+        });
+
+        // Helper to add error message
+        const showError = (input, message) => {
+            const errorSpan = document.createElement('span');
+            errorSpan.className = 'error-msg';
+            errorSpan.id = `${input.id}-error`;
+            errorSpan.textContent = message;
+            errorSpan.setAttribute('role', 'status');
+            input.parentNode.insertBefore(errorSpan, input.nextSibling);
+            input.setAttribute('aria-invalid', 'true');
+            input.setAttribute('aria-describedby', errorSpan.id);
+            isValid = false;
+        };
+
+        // Validate Name
+        const nameInput = document.getElementById('name');
+        if (!nameInput.value.trim()) {
+            showError(nameInput, 'Name is required.');
+        }
+
+        // Validate Email
+        const emailInput = document.getElementById('email');
+        const emailRegex = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
+        if (!emailInput.value.trim()) {
+            showError(emailInput, 'Email is required.');
+        } else if (!emailRegex.test(emailInput.value.trim())) {
+            showError(emailInput, 'Please enter a valid email address.');
+        }
+
+        // Validate Message
+        const messageInput = document.getElementById('message');
+        if (!messageInput.value.trim()) {
+            showError(messageInput, 'Message is required.');
+        }
+
+        if (!isValid) {
+            e.preventDefault();
+            // Accessibility: Shift focus to the first invalid input for immediate error recovery
+            const firstInvalidInput = contactForm.querySelector('[aria-invalid="true"]');
+            if (firstInvalidInput) {
+                firstInvalidInput.focus();
+            }
+            return;
+        }
+
+        // Send in the background instead of navigating to Formspree
+        e.preventDefault();
+        const fields = Object.fromEntries(new FormData(contactForm));
+        setSubmitting(true);
+        contactForm.dataset.submitAttempt = '1';
+        showStatus('sending', 'Looks great — sending your message now.');
+
+        const retry = (attempt) => {
+            contactForm.dataset.submitAttempt = String(attempt);
+            showStatus('retrying', `The connection is slow. Trying again (${attempt} of ${SUBMIT_ATTEMPTS})...`);
+        };
+        const result = navigator.onLine ? sendWithRetry(contactForm.action, fields, retry) : Promise.resolve('retry');
+        result.then((outcome) => {
+            setSubmitting(false);
+            if (outcome === 'sent') {
+                contactForm.reset();
+                showStatus('sent', 'Thanks! Your message was sent. I will get back to you soon.');
+                return;
+            }
+            const id = `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+            if (outcome === 'retry' && outbox.write([...outbox.read(), { id, fields, queuedAt: Date.now() }])) {
+                contactForm.reset();
+                if (!navigator.onLine) {
+                    showStatus('queued', 'You seem to be offline. Your message is saved on this device and will be sent when you are back online.');
+                    return;
+                }
+                showStatus('queued', 'The form service is not responding. Your message is saved on this device and will be sent automatically in a few minutes.');
+                scheduleFlush();
+                return;
+            }
+            showSendError();
+        });
+    });
+};
@@ -0,0 +1,167 @@
+// Hero neural-network canvas. script.js imports this module two frames after
+// DOMContentLoaded, once the typed heading has painted, and calls
+// initHeroNeuralNetwork(). The engine itself (createHeroEngine, HERO_MESSAGE)
+// lives in hero-engine.js, which is only fetched once the canvas is going to
+// animate and then starts under the 'hero-canvas' telemetry name.
+const HERO_WORKER_URL = 'hero-worker.js';
+
+// Worker rendering: the canvas is transferred to hero-worker.js, which runs the
+// same engine (hero-engine.js) off the main thread. Returns a controller with
+// the engine's interface that forwards every call as a message, or null when the
+// browser cannot transfer canvases or the worker cannot be created, in which case
+// the caller falls back to rendering on the main thread.
+const createHeroWorkerRenderer = (canvas, options, { HERO_MESSAGE }) => {
+    if (typeof canvas.transferControlToOffscreen !== 'function' || typeof OffscreenCanvas === 'undefined' ||
+        !('Worker' in window)) {
+        return null;
+    }
+
+    let worker;
+    try {
+        let scriptURL = HERO_WORKER_URL;
+        if (window.trustedTypes && window.trustedTypes.createPolicy) {
+            // Security: Trusted Types are enforced for script URLs; this policy can only
+            // ever produce the hero worker URL.
+            const policy = window.trustedTypes.createPolicy('hero-worker', {
+                createScriptURL: (url) => {
+                    if (url !== HERO_WORKER_URL) throw new TypeError(`Refusing worker URL: ${url}`);
+                    return url;
+                }
+            });
+            scriptURL = policy.createScriptURL(HERO_WORKER_URL);
+        }
+        worker = new Worker(scriptURL);
+    } catch (error) {
+        return null;
+    }
+
+    const probe = options.probe;
+    worker.addEventListener('message', (event) => {
+        const [type, ...data] = event.data;
+        if (type === HERO_MESSAGE.QUALITY) {
+            options.onQualityChange(data[0]);
+        } else if (probe && type === HERO_MESSAGE.PROBE_NODES) {
+            probe.nodes = data[0];
+        } else if (probe && type === HERO_MESSAGE.PROBE_MARKS) {
+            // The worker batches one frame's probe marks per message; replay them here.
+            for (let i = 0; i < data.length; i += 2) {
+                probe.mark(data[i], data[i + 1]);
+            }
+        }
+    });
+
+    const post = (...message) => worker.postMessage(message);
+
+    return {
+        start: (width, height) => {
+            const offscreen = canvas.transferControlToOffscreen();
+            const probeConfig = probe ? {
+                nodeCount: probe.nodeCount || null,
+                qualityTier: typeof probe.qualityTier === 'number' ? probe.qualityTier : null,
+                frameBudgetMs: probe.frameBudgetMs || null
+            } : null;
+            worker.postMessage([
+                HERO_MESSAGE.START, offscreen, width, height,
+                options.lowPowerDevice, options.isDarkTheme, options.devicePixelRatio, probeConfig
+            ], [offscreen]);
+        },
+        resize: (width, height) => post(HERO_MESSAGE.RESIZE, width, height),
+        setMouse: (x, y) => post(HERO_MESSAGE.MOUSE, x, y),
+        resetMouse: () => post(HERO_MESSAGE.LEAVE),
+        click: (x, y) => post(HERO_MESSAGE.CLICK, x, y),
+        setTheme: (dark) => post(HERO_MESSAGE.THEME, dark),
+        setVisible: (visible) => post(HERO_MESSAGE.VISIBILITY, visible)
+    };
+};
+
+const startHeroNeuralNetwork = (heroSection, canvas, engine, scrollScheduler) => {
+    // Benchmarks (tests/bench/hero_frames.py) install window.__heroFrameProbe
+    // before the page loads to time each phase of a frame and to pin the node
+    // count / power mode. It is never present in production.
+    const frameProbe = window.__heroFrameProbe || null;
+
+    // Performance: Scale animation complexity on lower-power devices while
+    // preserving visual behavior on typical desktops.
+    const lowPowerDevice = frameProbe && typeof frameProbe.lowPowerDevice === 'boolean'
+        ? frameProbe.lowPowerDevice
+        : Boolean((navigator.hardwareConcurrency && navigator.hardwareConcurrency <= 4) ||
+            (navigator.deviceMemory && navigator.deviceMemory <= 4) ||
+            (navigator.connection && navigator.connection.saveData));
+
+    const readDarkTheme = () => document.body.getAttribute('data-theme') === 'dark';
+    const engineOptions = {
+        lowPowerDevice,
+        isDarkTheme: readDarkTheme(),
+        devicePixelRatio: window.devicePixelRatio || 1,
+        probe: frameProbe,
+        // The adaptive quality governor reports its tier (0-4) here for tests and benchmarks.
+        onQualityChange: (tier) => {
+            canvas.dataset.heroQuality = String(tier);
+        }
+    };
+
+    // Opt-in: render in a worker with ?hero=worker or data-hero-renderer="worker".
+    const wantsWorker = canvas.dataset.heroRenderer === 'worker' ||
+        new URLSearchParams(window.location.search).get('hero') === 'worker';
+    let renderer = wantsWorker ? createHeroWorkerRenderer(canvas, engineOptions, engine) : null;
+    canvas.dataset.heroActiveRenderer = renderer ? 'worker' : 'main';
+
+    if (!renderer) {
+        const ctx = canvas.getContext('2d', { desynchronized: true });
+        if (!ctx) return;
+        renderer = engine.createHeroEngine(canvas, ctx, engineOptions);
+    }
+
+    const rect = heroSection.getBoundingClientRect();
+    renderer.start(rect.width, rect.height);
+
+    let isHeroVisible = true;
+    let isDocumentVisible = !document.hidden;
+    const updateVisibility = () => renderer.setVisible(isHeroVisible && isDocumentVisible);
+
+    // Performance: Use offsetX/Y instead of getBoundingClientRect() to avoid synchronous main-thread layout thrashing
+    heroSection.addEventListener('mousemove', (event) => renderer.setMouse(event.offsetX, event.offsetY), { passive: true });
+    heroSection.addEventListener('mouseleave', () => renderer.resetMouse(), { passive: true });
+    heroSection.addEventListener('click', (event) => renderer.click(event.offsetX, event.offsetY), { passive: true });
+    window.addEventListener('themechange', () => renderer.setTheme(readDarkTheme()));
+    document.addEventListener('visibilitychange', () => {
+        isDocumentVisible = !document.hidden;
+        updateVisibility();
+    });
+
+    if ('IntersectionObserver' in window) {
+        scrollScheduler.observe(heroSection, (entry) => {
+            isHeroVisible = entry.isIntersecting;
+            updateVisibility();
+        });
+    }
+
+    // The hero keeps its own ResizeObserver: its height follows the typed
+    // heading and the fonts, not just the viewport.
+    const handleCanvasResize = () => {
+        const nextRect = heroSection.getBoundingClientRect();
+        renderer.resize(nextRect.width, nextRect.height);
+    };
+
+    if ('ResizeObserver' in window) {
+        const observer = new ResizeObserver(handleCanvasResize);
+        observer.observe(heroSection);
+    } else {
+        window.addEventListener('resize', handleCanvasResize);
+    }
+};
+
+// Resolves once the canvas is running, or straight away when there is nothing
+// to animate, so reduced-motion visitors never download the engine.
+export const initHeroNeuralNetwork = ({ perfTelemetry, scrollScheduler }) => {
+    const heroSection = document.getElementById('hero');
+    const canvas = document.getElementById('hero-neural-canvas');
+    if (!heroSection || !canvas) return Promise.resolve();
+
+    const prefersReducedMotion = window.matchMedia('(prefers-reduced-motion: reduce)').matches;
+    if (prefersReducedMotion) return Promise.resolve();
+
+    return import('./hero-engine.js').then(() => {
+        perfTelemetry.wrap('hero-canvas', startHeroNeuralNetwork)(heroSection, canvas, self.heroEngine, scrollScheduler);
+    });
+};
@@ -0,0 +1,676 @@
+// Hero neural-network simulation and renderer.
+//
+// Shared by the main-thread renderer in hero-canvas.js and by hero-worker.js,
+// which runs the same engine on an OffscreenCanvas. The engine never touches the DOM:
+// the host pushes size, pointer, theme and visibility changes in through the
+// returned controller, so it behaves identically in a window or a worker.
+// Messages between hero-canvas.js and hero-worker.js are small arrays, [type, ...args],
+// so forwarding pointer moves stays cheap.
+const HERO_MESSAGE = Object.freeze({
+    START: 0,
+    RESIZE: 1,
+    MOUSE: 2,
+    LEAVE: 3,
+    CLICK: 4,
+    THEME: 5,
+    VISIBILITY: 6,
+    PROBE_MARKS: 7,
+    PROBE_NODES: 8,
+    QUALITY: 9
+});
+
+// Quality tiers for the adaptive governor, lowest first. Tier 2 is the original
+// fixed configuration; the governor starts there and moves one tier at a time.
+// pixelRatio is capped by the display's devicePixelRatio. The top tier only adds
+// resolution, which on a HiDPI display quadruples the pixels to raster: it is
+// used only on such displays, and only reached from tier 3 once frame intervals
+// there have stayed within budget.
+const HERO_QUALITY_TIERS = Object.freeze([
+    Object.freeze({ nodeScale: 0.5, connectionDistance: 120, connectionBins: 4, pixelRatio: 0.75 }),
+    Object.freeze({ nodeScale: 0.75, connectionDistance: 140, connectionBins: 6, pixelRatio: 1 }),
+    Object.freeze({ nodeScale: 1, connectionDistance: 160, connectionBins: 8, pixelRatio: 1 }),
+    Object.freeze({ nodeScale: 1.5, connectionDistance: 160, connectionBins: 12, pixelRatio: 1 }),
+    Object.freeze({ nodeScale: 1.5, connectionDistance: 160, connectionBins: 12, pixelRatio: 2 })
+]);
+const HERO_DEFAULT_QUALITY = 2;
+
+const createHeroEngine = (canvas, ctx, options = {}) => {
+    // `self` is the window on the main thread and the global scope in a worker.
+    const requestFrame = typeof self.requestAnimationFrame === 'function'
+        ? self.requestAnimationFrame.bind(self)
+        : (callback) => self.setTimeout(() => callback(performance.now()), 16);
+    // Performance: Scale animation complexity on lower-power devices while
+    // preserving visual behavior on typical desktops.
+    const lowPowerDevice = Boolean(options.lowPowerDevice);
+    // Benchmarks (tests/bench/hero_frames.py) pass a probe to time each phase of a
+    // frame and to pin the node count. It is never present in production.
+    const frameProbe = options.probe || null;
+    const probeMark = frameProbe ? (phase) => frameProbe.mark(phase, performance.now()) : () => {};
+    const onQualityChange = options.onQualityChange || (() => {});
+    const devicePixelRatio = options.devicePixelRatio || 1;
+
+    let width = 0;
+    let height = 0;
+    const mouse = { x: -9999, y: -9999, active: false };
+    // Connection distance (and the grid cell size that follows it) is set by the quality tier.
+    let connectionDistance = 160;
+    let connectionDistanceSq = connectionDistance * connectionDistance;
+    let gridCellSize = connectionDistance;
+    let pixelRatio = 1;
+    const MOUSE_RADIUS = 200;
+    const BASE_SPEED = lowPowerDevice ? 0.32 : 0.35;
+    const MAX_SPEED = lowPowerDevice ? 0.68 : 0.75;
+    const REPULSION_DIST = 80;
+    const CLICK_RADIUS = 200;
+    const REPULSION_DIST_SQ = REPULSION_DIST * REPULSION_DIST;
+    const MOUSE_RADIUS_SQ = MOUSE_RADIUS * MOUSE_RADIUS;
+    const CLICK_RADIUS_SQ = CLICK_RADIUS * CLICK_RADIUS;
+    // Performance: Nodes are stored as a structure of typed arrays indexed by node id, so
+    // the per-frame loops read contiguous memory and allocate nothing. The buffers are
+    // (re)allocated only when createNodes needs more room than they have.
+    let nodeCapacity = 0;
+    let nodeTotal = 0;
+    let posX = new Float32Array(0);
+    let posY = new Float32Array(0);
+    let velX = new Float32Array(0);
+    let velY = new Float32Array(0);
+    let radii = new Float32Array(0);
+    let pulses = new Float32Array(0);
+    let pulseSpeeds = new Float32Array(0);
+    let hues = new Float32Array(0);
+    // Pre-computed per-node fill strings and glow sprites; rebuilt only on createNodes/theme change.
+    const fillColors = [];
+    const glowSprites = [];
+    // Spatial grid (counting sort) and packed per-node neighbor lists.
+    let gridCols = 1;
+    let gridRows = 1;
+    let cellStart = new Int32Array(2);
+    let cellNodes = new Int32Array(0);
+    let nodeCells = new Int32Array(0);
+    let neighborStart = new Int32Array(1);
+    let neighborList = new Int32Array(0);
+    let animationFrameId = null;
+    let isVisible = true;
+    let frameCounter = 0;
+    let lastFrameTime = 0;
+
+    // Performance: Pre-allocated shared buffers to avoid per-frame array/object allocation
+    // binCoords holds x1, y1, x2, y2 per connection and only grows (doubling) when a bin fills up.
+    const MAX_CONNECTION_BINS = 12;
+    let connectionBins = 8;
+    const binCoords = Array.from({ length: MAX_CONNECTION_BINS }, () => new Float32Array(256));
+    const binAlphaSum = new Float64Array(MAX_CONNECTION_BINS);
+    const binCount = new Int32Array(MAX_CONNECTION_BINS);
+
+    // Performance: Pre-render each node's glow to an offscreen canvas once at creation time.
+    // Eliminates createRadialGradient() — the largest per-frame allocation bottleneck (~N objects/frame).
+    // drawImage() from a cached texture is significantly cheaper than re-building gradients each frame.
+    const createGlowSprite = (hue, maxGlowRadius, spriteSize) => {
+        const sprite = typeof OffscreenCanvas !== 'undefined'
+            ? new OffscreenCanvas(spriteSize, spriteSize)
+            : (() => { const c = document.createElement('canvas'); c.width = spriteSize; c.height = spriteSize; return c; })();
+        const sCtx = sprite.getContext('2d');
+        const cx = spriteSize / 2;
+        const gradient = sCtx.createRadialGradient(cx, cx, 0, cx, cx, maxGlowRadius);
+        gradient.addColorStop(0, `hsla(${hue}, 70%, 75%, 1)`);
+        gradient.addColorStop(1, `hsla(${hue}, 70%, 60%, 0)`);
+        sCtx.beginPath();
+        sCtx.arc(cx, cx, maxGlowRadius, 0, Math.PI * 2);
+        sCtx.fillStyle = gradient;
+        sCtx.fill();
+        return sprite;
+    };
+
+    // Theme state is pushed in by the host (setTheme), so the animation loop never reads the DOM.
+    let isDarkTheme = Boolean(options.isDarkTheme);
+
+    const getConnectionStrength = () => {
+        return {
+            alphaBoost: isDarkTheme ? 0.2 : 0.29,
+            lineWidth: isDarkTheme ? 1.05 : 1.25
+        };
+    };
+
+    const getThemeAwareHue = () => {
+        return isDarkTheme ? 190 : 200;
+    };
+
+    const growFloat32 = (array, minLength) => {
+        const grown = new Float32Array(Math.max(minLength, array.length * 2));
+        grown.set(array);
+        return grown;
+    };
+
+    const growInt32 = (array, minLength) => {
+        const grown = new Int32Array(Math.max(minLength, array.length * 2));
+        grown.set(array);
+        return grown;
+    };
+
+    // Existing nodes are kept, so the governor can add nodes without reseeding the scene.
+    const ensureNodeCapacity = (count) => {
+        if (count <= nodeCapacity) return;
+        nodeCapacity = count;
+        posX = growFloat32(posX, count);
+        posY = growFloat32(posY, count);
+        velX = growFloat32(velX, count);
+        velY = growFloat32(velY, count);
+        radii = growFloat32(radii, count);
+        pulses = growFloat32(pulses, count);
+        pulseSpeeds = growFloat32(pulseSpeeds, count);
+        hues = growFloat32(hues, count);
+        cellNodes = new Int32Array(count);
+        nodeCells = new Int32Array(count);
+        neighborStart = new Int32Array(count + 1);
+        // Typical density is well under 16 candidates per node; grows on demand otherwise.
+        neighborList = new Int32Array(Math.max(neighborList.length, count * 16));
+    };
+
+    const setNodeHue = (i, hue) => {
+        hues[i] = hue;
+        const maxGlowRadius = (radii[i] + 0.6) * 2.5;
+        const spriteSize = Math.ceil(maxGlowRadius) * 2 + 2;
+        // Performance: Pre-computed to avoid per-frame string allocation
+        fillColors[i] = `hsla(${hue}, 60%, 80%, 0.55)`;
+        // Performance: Pre-rendered glow texture; avoids createRadialGradient each frame
+        glowSprites[i] = createGlowSprite(hue, maxGlowRadius, spriteSize);
+    };
+
+    // The backing store follows the tier's pixel ratio while drawing stays in CSS pixels.
+    const applyPixelRatio = () => {
+        canvas.width = Math.max(1, Math.round(width * pixelRatio));
+        canvas.height = Math.max(1, Math.round(height * pixelRatio));
+        // Resizing the canvas resets the context transform.
+        ctx.setTransform(pixelRatio, 0, 0, pixelRatio, 0, 0);
+    };
+
+    const resize = (nextWidth, nextHeight) => {
+        width = Math.max(1, Math.floor(nextWidth));
+        height = Math.max(1, Math.floor(nextHeight));
+        applyPixelRatio();
+        resizeGrid();
+    };
+
+    const getTargetNodeCount = () => {
+        if (frameProbe && frameProbe.nodeCount) return frameProbe.nodeCount;
+        const area = width * height;
+        const minNodes = lowPowerDevice ? 50 : 70;
+        const maxNodes = lowPowerDevice ? 96 : 130;
+        const baseCount = Math.max(minNodes, Math.min(maxNodes, Math.round(area / 16500)));
+        return Math.max(1, Math.round(baseCount * HERO_QUALITY_TIERS[qualityTier].nodeScale));
+    };
+
+    const spawnNode = (i, x, y) => {
+        const angle = Math.random() * Math.PI * 2;
+        const speed = BASE_SPEED * (0.6 + Math.random() * 0.8);
+        posX[i] = x;
+        posY[i] = y;
+        velX[i] = Math.cos(angle) * speed;
+        velY[i] = Math.sin(angle) * speed;
+        radii[i] = 1.2 + Math.random() * 1.2;
+        pulses[i] = Math.random() * Math.PI * 2;
+        pulseSpeeds[i] = 0.008 + Math.random() * 0.01;
+        setNodeHue(i, getThemeAwareHue() + Math.random() * 40);
+    };
+
+    const finishNodeChange = () => {
+        fillColors.length = nodeTotal;
+        glowSprites.length = nodeTotal;
+        // Empty neighbor lists until the next grid rebuild (low-power frames may update first).
+        neighborStart.fill(0);
+        if (frameProbe) frameProbe.nodes = nodeTotal;
+    };
+
+    const createNodes = () => {
+        const nodeCount = getTargetNodeCount();
+        const cols = Math.ceil(Math.sqrt(nodeCount * (width / height)));
+        const rows = Math.ceil(nodeCount / cols);
+        const cellW = width / cols;
+        const cellH = height / rows;
+        ensureNodeCapacity(nodeCount);
+        nodeTotal = 0;
+
+        for (let row = 0; row < rows; row++) {
+            for (let col = 0; col < cols; col++) {
+                if (nodeTotal >= nodeCount) break;
+                spawnNode(nodeTotal++, col * cellW + Math.random() * cellW, row * cellH + Math.random() * cellH);
+            }
+        }
+        finishNodeChange();
+    };
+
+    // Grow or shrink the scene in place: surviving nodes keep their positions, new ones
+    // appear at random points, so a tier change does not visibly reset the animation.
+    const setNodeCount = (nodeCount) => {
+        if (nodeCount === nodeTotal) return;
+        if (nodeCount > nodeTotal) {
+            ensureNodeCapacity(nodeCount);
+            while (nodeTotal < nodeCount) {
+                spawnNode(nodeTotal++, Math.random() * width, Math.random() * height);
+            }
+        } else {
+            nodeTotal = nodeCount;
+        }
+        finishNodeChange();
+    };
+
+    let qualityTier = HERO_DEFAULT_QUALITY;
+    const applyQualityTier = (tier, { rebuildNodes = true } = {}) => {
+        const settings = HERO_QUALITY_TIERS[tier];
+        qualityTier = tier;
+        connectionDistance = settings.connectionDistance;
+        connectionDistanceSq = connectionDistance * connectionDistance;
+        gridCellSize = connectionDistance;
+        connectionBins = settings.connectionBins;
+        const nextPixelRatio = Math.min(settings.pixelRatio, Math.max(1, devicePixelRatio));
+        if (nextPixelRatio !== pixelRatio) {
+            pixelRatio = nextPixelRatio;
+            if (width) applyPixelRatio();
+        }
+        resizeGrid();
+        if (rebuildNodes) setNodeCount(getTargetNodeCount());
+        onQualityChange(tier);
+    };
+
+    // Adaptive quality: full frames are sampled in windows of GOVERNOR_WINDOW frames,
+    // both for the engine's own script cost and for the interval since the previous
+    // animation frame. Intervals also show raster and compositing cost and jank from
+    // other main-thread work, none of which the script cost sees. The interval budget
+    // is 1.5 display frames, where a display frame is the shortest interval seen, at
+    // most 60Hz. One window whose cost p90 exceeds the frame budget or whose interval
+    // p90 exceeds the interval budget drops a tier; climbing back needs several
+    // consecutive windows with cost under half the budget and intervals within theirs,
+    // and that requirement doubles every time a tier is dropped, so quality settles
+    // instead of oscillating. The window after any change is discarded while the
+    // scene settles. Benchmarks can pin a tier (probe.qualityTier) to measure a fixed
+    // workload.
+    const GOVERNOR_WINDOW = 30;
+    const GOVERNOR_MAX_UPGRADE_WINDOWS = 48;
+    const pinnedTier = frameProbe && typeof frameProbe.qualityTier === 'number' ? frameProbe.qualityTier : null;
+    const frameBudgetMs = (frameProbe && frameProbe.frameBudgetMs) || options.frameBudgetMs || 6;
+    const topTier = HERO_QUALITY_TIERS.length - (devicePixelRatio > 1 ? 1 : 2);
+    const frameSamples = new Float32Array(GOVERNOR_WINDOW);
+    const intervalSamples = new Float32Array(GOVERNOR_WINDOW);
+    let displayFrameMs = 1000 / 60;
+    let sampleCount = 0;
+    // The first window overlaps page load and JIT warm-up, so it is discarded too.
+    let skipWindow = true;
+    let goodWindows = 0;
+    let upgradeWindows = 3;
+
+    const changeQualityTier = (tier) => {
+        applyQualityTier(tier);
+        goodWindows = 0;
+        skipWindow = true;
+    };
+
+    // interval is 0 for the first frame after the animation (re)starts.
+    const recordFrame = (cost, interval) => {
+        if (pinnedTier !== null) return;
+        if (interval > 0) displayFrameMs = Math.max(1000 / 240, Math.min(displayFrameMs, interval));
+        frameSamples[sampleCount] = cost;
+        intervalSamples[sampleCount++] = interval;
+        if (sampleCount < GOVERNOR_WINDOW) return;
+        sampleCount = 0;
+        if (skipWindow) {
+            skipWindow = false;
+            return;
+        }
+
+        frameSamples.sort();
+        intervalSamples.sort();
+        const p90 = frameSamples[Math.floor(GOVERNOR_WINDOW * 0.9)];
+        const intervalP90 = intervalSamples[Math.floor(GOVERNOR_WINDOW * 0.9)];
+        if (p90 > frameBudgetMs || intervalP90 > displayFrameMs * 1.5) {
+            if (qualityTier > 0) {
+                upgradeWindows = Math.min(GOVERNOR_MAX_UPGRADE_WINDOWS, upgradeWindows * 2);
+                changeQualityTier(qualityTier - 1);
+            }
+        } else if (p90 < frameBudgetMs * 0.5) {
+            goodWindows++;
+            if (goodWindows >= upgradeWindows && qualityTier < topTier) {
+                changeQualityTier(qualityTier + 1);
+            }
+        } else {
+            goodWindows = 0;
+        }
+    };
+
+    // Performance: The grid is a counting sort over cells. cellStart[c]..cellStart[c + 1]
+    // indexes the slice of cellNodes holding cell c's nodes, so rebuilding it each frame is
+    // two passes over the nodes and touches no Map, bucket array or key hashing.
+    const resizeGrid = () => {
+        gridCols = Math.floor(width / gridCellSize) + 1;
+        gridRows = Math.floor(height / gridCellSize) + 1;
+        const cellCount = gridCols * gridRows;
+        if (cellStart.length < cellCount + 1) {
+            cellStart = new Int32Array(cellCount + 1);
+        }
+    };
+
+    const getCellIndex = (i) => {
+        // Clamped: after a resize nodes can sit outside the new bounds until createNodes runs.
+        const cellX = Math.min(gridCols - 1, Math.max(0, Math.floor(posX[i] / gridCellSize)));
+        const cellY = Math.min(gridRows - 1, Math.max(0, Math.floor(posY[i] / gridCellSize)));
+        return cellY * gridCols + cellX;
+    };
+
+    const rebuildSpatialGrid = () => {
+        const cellCount = gridCols * gridRows;
+        cellStart.fill(0, 0, cellCount + 1);
+        for (let i = 0; i < nodeTotal; i++) {
+            const cell = getCellIndex(i);
+            nodeCells[i] = cell;
+            cellStart[cell + 1]++;
+        }
+        for (let c = 0; c < cellCount; c++) {
+            cellStart[c + 1] += cellStart[c];
+        }
+        // Fill each cell's slice front to back; cellStart is restored afterwards.
+        for (let i = 0; i < nodeTotal; i++) {
+            cellNodes[cellStart[nodeCells[i]]++] = i;
+        }
+        for (let c = cellCount; c > 0; c--) {
+            cellStart[c] = cellStart[c - 1];
+        }
+        cellStart[0] = 0;
+    };
+
+    // Performance: Build every node's neighbor list once per frame after the grid rebuild,
+    // packed into one Int32Array (neighborStart[i]..neighborStart[i + 1]). drawConnections
+    // and updateNodes both read it, so the 3x3 cell scan runs N times per frame, not 2N.
+    const cacheAllNeighbors = () => {
+        let count = 0;
+        for (let i = 0; i < nodeTotal; i++) {
+            neighborStart[i] = count;
+            const cell = nodeCells[i];
+            const cellX = cell % gridCols;
+            const cellY = (cell - cellX) / gridCols;
+            const minX = cellX > 0 ? cellX - 1 : 0;
+            const maxX = cellX < gridCols - 1 ? cellX + 1 : cellX;
+            const minY = cellY > 0 ? cellY - 1 : 0;
+            const maxY = cellY < gridRows - 1 ? cellY + 1 : cellY;
+
+            for (let y = minY; y <= maxY; y++) {
+                const rowStart = y * gridCols;
+                const from = cellStart[rowStart + minX];
+                const to = cellStart[rowStart + maxX + 1];
+                // Adjacent cells in a row are contiguous in cellNodes, so copy the run in one loop.
+                if (count + (to - from) > neighborList.length) {
+                    neighborList = growInt32(neighborList, count + (to - from));
+                }
+                for (let k = from; k < to; k++) {
+                    neighborList[count++] = cellNodes[k];
+                }
+            }
+        }
+        neighborStart[nodeTotal] = count;
+    };
+
+    const setMouse = (x, y) => {
+        mouse.x = x;
+        mouse.y = y;
+        mouse.active = true;
+    };
+
+    const drawNode = (i) => {
+        const x = posX[i];
+        const y = posY[i];
+        const glow = Math.sin(pulses[i]) * 0.5 + 0.5;
+        const radius = radii[i] + glow * 0.6;
+        const glowRadius = radius * 2.5;
+
+        // Performance: drawImage from pre-rendered texture avoids per-frame createRadialGradient.
+        // globalAlpha varies the intensity (0.28–0.43) exactly as the original gradient alpha did.
+        // Scaling drawImage to the live glowRadius preserves the pulsing size animation.
+        ctx.globalAlpha = 0.28 + glow * 0.15;
+        const drawSize = glowRadius * 2;
+        ctx.drawImage(glowSprites[i], x - glowRadius, y - glowRadius, drawSize, drawSize);
+        ctx.globalAlpha = 1;
+
+        ctx.beginPath();
+        ctx.arc(x, y, radius, 0, Math.PI * 2);
+        ctx.fillStyle = fillColors[i];
+        ctx.fill();
+    };
+
+    const drawConnections = () => {
+        // Performance: Cache connection strength outside the loops to avoid severe DOM read overhead and layout thrashing
+        // from repeated calls to getAttribute('data-theme') on every frame.
+        const { alphaBoost, lineWidth } = getConnectionStrength();
+
+        // Performance: Reset the preallocated bins instead of creating new arrays each frame.
+        // Batching connections into alpha bins reduces GPU draw calls from ~300 to connectionBins,
+        // and eliminates createLinearGradient() — the biggest per-frame allocation bottleneck.
+        binAlphaSum.fill(0);
+        binCount.fill(0);
+
+        // Representative hue for connections: midpoint of each node's hue range per theme
+        const baseHue = isDarkTheme ? 210 : 220;
+
+        for (let i = 0; i < nodeTotal; i++) {
+            const ax = posX[i];
+            const ay = posY[i];
+            const end = neighborStart[i + 1];
+
+            for (let n = neighborStart[i]; n < end; n++) {
+                const j = neighborList[n];
+                if (j <= i) continue;
+                const bx = posX[j];
+                const by = posY[j];
+                const dx = bx - ax;
+                const dy = by - ay;
+                const distSq = dx * dx + dy * dy;
+
+                if (distSq < connectionDistanceSq) {
+                    const dist = Math.sqrt(distSq);
+                    const ratio = 1 - dist / connectionDistance;
+                    const binIdx = Math.min(connectionBins - 1, (ratio * connectionBins) | 0);
+                    const offset = binCount[binIdx] * 4;
+                    if (offset + 4 > binCoords[binIdx].length) {
+                        binCoords[binIdx] = growFloat32(binCoords[binIdx], offset + 4);
+                    }
+                    const coords = binCoords[binIdx];
+                    coords[offset] = ax;
+                    coords[offset + 1] = ay;
+                    coords[offset + 2] = bx;
+                    coords[offset + 3] = by;
+                    binAlphaSum[binIdx] += ratio * alphaBoost;
+                    binCount[binIdx]++;
+                }
+            }
+        }
+
+        ctx.lineWidth = lineWidth;
+        for (let b = 0; b < connectionBins; b++) {
+            const count = binCount[b];
+            if (!count) continue;
+            const avgAlpha = binAlphaSum[b] / count;
+            ctx.strokeStyle = `hsla(${baseHue}, 70%, 65%, ${avgAlpha})`;
+            ctx.beginPath();
+            const coords = binCoords[b];
+            const length = count * 4;
+            for (let p = 0; p < length; p += 4) {
+                ctx.moveTo(coords[p], coords[p + 1]);
+                ctx.lineTo(coords[p + 2], coords[p + 3]);
+            }
+            ctx.stroke();
+        }
+    };
+
+    const updateNodes = () => {
+        const closeZone = MOUSE_RADIUS * 0.3;
+
+        for (let i = 0; i < nodeTotal; i++) {
+            pulses[i] += pulseSpeeds[i];
+            const x = posX[i];
+            const y = posY[i];
+            let vx = velX[i];
+            let vy = velY[i];
+
+            const mdx = mouse.x - x;
+            const mdy = mouse.y - y;
+            const mdistSq = mdx * mdx + mdy * mdy;
+
+            if (mouse.active && mdistSq < MOUSE_RADIUS_SQ && mdistSq > 0) {
+                const mdist = Math.sqrt(mdistSq);
+                if (mdist < closeZone) {
+                    const force = (1 - mdist / closeZone) * 0.025;
+                    vx -= (mdx / mdist) * force;
+                    vy -= (mdy / mdist) * force;
+                } else {
+                    const force = (1 - mdist / MOUSE_RADIUS) * 0.004;
+                    vx += (mdx / mdist) * force;
+                    vy += (mdy / mdist) * force;
+                }
+            }
+
+            const end = neighborStart[i + 1];
+            for (let n = neighborStart[i]; n < end; n++) {
+                const j = neighborList[n];
+                if (i === j) continue;
+                const dx = x - posX[j];
+                const dy = y - posY[j];
+                const distSq = dx * dx + dy * dy;
+                if (distSq < REPULSION_DIST_SQ && distSq > 0) {
+                    const dist = Math.sqrt(distSq);
+                    const force = (1 - dist / REPULSION_DIST) * 0.012;
+                    vx += (dx / dist) * force;
+                    vy += (dy / dist) * force;
+                }
+            }
+
+            const speed = Math.sqrt(vx * vx + vy * vy);
+            if (speed > MAX_SPEED) {
+                vx = (vx / speed) * MAX_SPEED;
+                vy = (vy / speed) * MAX_SPEED;
+            }
+
+            if (speed < 0.05) {
+                const angle = Math.random() * Math.PI * 2;
+                vx += Math.cos(angle) * 0.05;
+                vy += Math.sin(angle) * 0.05;
+            }
+
+            vx *= 0.998;
+            vy *= 0.998;
+            velX[i] = vx;
+            velY[i] = vy;
+
+            let nextX = x + vx;
+            let nextY = y + vy;
+            if (nextX < 0) nextX = width;
+            if (nextX > width) nextX = 0;
+            if (nextY < 0) nextY = height;
+            if (nextY > height) nextY = 0;
+            posX[i] = nextX;
+            posY[i] = nextY;
+        }
+    };
+
+    const animate = (timestamp) => {
+        if (!isVisible) {
+            animationFrameId = null;
+            lastFrameTime = 0;
+            return;
+        }
+
+        const frameStart = performance.now();
+        const frameInterval = lastFrameTime ? timestamp - lastFrameTime : 0;
+        lastFrameTime = timestamp;
+        probeMark('frame');
+        if (lowPowerDevice) {
+            frameCounter = (frameCounter + 1) % 2;
+            if (frameCounter !== 0) {
+                updateNodes();
+                probeMark('updateNodes');
+                animationFrameId = requestFrame(animate);
+                return;
+            }
+        }
+
+        rebuildSpatialGrid();
+        probeMark('rebuildSpatialGrid');
+        cacheAllNeighbors();
+        probeMark('cacheAllNeighbors');
+        ctx.clearRect(0, 0, width, height);
+        probeMark('clearRect');
+        drawConnections();
+        probeMark('drawConnections');
+        for (let i = 0; i < nodeTotal; i++) {
+            drawNode(i);
+        }
+        probeMark('drawNode');
+        updateNodes();
+        probeMark('updateNodes');
+        recordFrame(performance.now() - frameStart, frameInterval);
+        animationFrameId = requestFrame(animate);
+    };
+
+    const ensureAnimation = () => {
+        if (!animationFrameId && isVisible) {
+            animationFrameId = requestFrame(animate);
+        }
+    };
+
+    const click = (clickX, clickY) => {
+        for (let i = 0; i < nodeTotal; i++) {
+            const dx = posX[i] - clickX;
+            const dy = posY[i] - clickY;
+            const distSq = dx * dx + dy * dy;
+            if (distSq < CLICK_RADIUS_SQ && distSq > 0) {
+                const dist = Math.sqrt(distSq);
+                const force = (1 - dist / CLICK_RADIUS) * 1.8;
+                velX[i] += (dx / dist) * force;
+                velY[i] += (dy / dist) * force;
+            }
+        }
+    };
+
+    const resetMouse = () => {
+        mouse.active = false;
+        mouse.x = -9999;
+        mouse.y = -9999;
+    };
+
+    const setTheme = (dark) => {
+        isDarkTheme = Boolean(dark);
+        const baseHue = getThemeAwareHue();
+        for (let i = 0; i < nodeTotal; i++) {
+            setNodeHue(i, baseHue + Math.random() * 40);
+        }
+    };
+
+    const setVisible = (visible) => {
+        isVisible = Boolean(visible);
+        ensureAnimation();
+    };
+
+    let resizeTimeout;
+    const handleResize = (nextWidth, nextHeight) => {
+        // Performance: Resize canvas immediately for visual continuity, but debounce
+        // the heavy createNodes() call (which allocates 100+ OffscreenCanvas glow sprites)
+        // to prevent severe lag and GC pressure during window resize.
+        resize(nextWidth, nextHeight);
+        if (resizeTimeout) self.clearTimeout(resizeTimeout);
+        resizeTimeout = self.setTimeout(() => {
+            createNodes();
+        }, 150);
+    };
+
+    const start = (initialWidth, initialHeight) => {
+        applyQualityTier(pinnedTier !== null ? pinnedTier : HERO_DEFAULT_QUALITY, { rebuildNodes: false });
+        resize(initialWidth, initialHeight);
+        createNodes();
+        rebuildSpatialGrid();
+        cacheAllNeighbors();
+        ensureAnimation();
+    };
+
+    return { start, resize: handleResize, setMouse, resetMouse, click, setTheme, setVisible };
+};
+
+// hero-canvas.js import()s this file when the canvas starts, so there the
+// declarations above are module-scoped; the worker loads it with importScripts
+// and reads them as globals. Both can reach the engine through self.heroEngine.
+self.heroEngine = Object.freeze({ createHeroEngine, HERO_MESSAGE });
@@ -0,0 +1,72 @@
+// Runs the hero animation off the main thread on a transferred OffscreenCanvas.
+// hero-canvas.js starts this worker only when worker rendering is requested
+// (?hero=worker or data-hero-renderer="worker") and the browser supports it,
+// then forwards pointer, theme, resize and visibility changes as messages.
+importScripts('hero-engine.js');
+
+let engine = null;
+
+// Benchmarks only: collect a frame's probe marks and post them as one message.
+const createProbeRelay = (config) => {
+    let batch = [];
+    const flush = () => {
+        if (!batch.length) return;
+        self.postMessage([HERO_MESSAGE.PROBE_MARKS, ...batch]);
+        batch = [];
+    };
+    return {
+        nodeCount: config.nodeCount,
+        qualityTier: config.qualityTier,
+        frameBudgetMs: config.frameBudgetMs,
+        set nodes(count) {
+            self.postMessage([HERO_MESSAGE.PROBE_NODES, count]);
+        },
+        mark(phase, now) {
+            if (phase === 'frame') flush();
+            batch.push(phase, now);
+        }
+    };
+};
+
+self.addEventListener('message', (event) => {
+    const [type, ...data] = event.data;
+
+    if (type === HERO_MESSAGE.START) {
+        const [canvas, width, height, lowPowerDevice, isDarkTheme, devicePixelRatio, probeConfig] = data;
+        const ctx = canvas.getContext('2d', { desynchronized: true });
+        if (!ctx) return;
+        engine = createHeroEngine(canvas, ctx, {
+            lowPowerDevice,
+            isDarkTheme,
+            devicePixelRatio,
+            onQualityChange: (tier) => self.postMessage([HERO_MESSAGE.QUALITY, tier]),
+            probe: probeConfig ? createProbeRelay(probeConfig) : null
+        });
+        engine.start(width, height);
+        return;
+    }
+    if (!engine) return;
+
+    switch (type) {
+        case HERO_MESSAGE.RESIZE:
+            engine.resize(data[0], data[1]);
+            break;
+        case HERO_MESSAGE.MOUSE:
+            engine.setMouse(data[0], data[1]);
+            break;
+        case HERO_MESSAGE.LEAVE:
+            engine.resetMouse();
+            break;
+        case HERO_MESSAGE.CLICK:
+            engine.click(data[0], data[1]);
+            break;
+        case HERO_MESSAGE.THEME:
+            engine.setTheme(data[0]);
+            break;
+        case HERO_MESSAGE.VISIBILITY:
+            engine.setVisible(data[0]);
+            break;
+        default:
+            break;
+    }
+});
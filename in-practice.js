@@ -0,0 +1,194 @@
+// In Practice scenes: the act reveals, the before/after crossfade and the
+// sticky-layout guard. script.js imports this module when the section comes
+// within 200px of the viewport (right away without IntersectionObserver).
+export const initInPractice = ({ perfTelemetry, scrollScheduler }) => {
+    const supportsIO = 'IntersectionObserver' in window;
+
+    // In Practice — guard against desktop browsers that fail to size the sticky scene
+    // correctly, which otherwise leaves a tall blank area while scrolling.
+    const ipSceneWraps = document.querySelectorAll('.ip-scene-panel-wrap');
+    const ipScrollScenes = document.querySelectorAll('.ip-scroll-scene');
+    const supportsSticky = typeof CSS !== 'undefined' && CSS.supports && CSS.supports('position', 'sticky');
+
+    // Declared here so setInPracticeFallbackLayout can access it
+    let stopSceneReveal = null;
+    let refreshSceneObserver = null;
+
+    // Tracks scenes already animated so scroll-lock only fires on first reveal
+    const ipAnimatedScenes = new WeakSet();
+    let ipScrollLockTimer = null;
+
+    const ipLockScroll = () => {
+        if (ipScrollLockTimer) clearTimeout(ipScrollLockTimer);
+        const scrollbarWidth = window.innerWidth - document.documentElement.clientWidth;
+        document.documentElement.style.overflow = 'hidden';
+        if (scrollbarWidth > 0) document.documentElement.style.paddingRight = scrollbarWidth + 'px';
+        // Hold for animation (0.82s) + buffer to appreciate the after state
+        ipScrollLockTimer = setTimeout(() => {
+            document.documentElement.style.overflow = '';
+            document.documentElement.style.paddingRight = '';
+            ipScrollLockTimer = null;
+        }, 1400);
+    };
+
+    const setInPracticeFallbackLayout = (shouldEnable) => {
+        const wasEnabled = document.documentElement.classList.contains('ip-no-sticky');
+        document.documentElement.classList.toggle('ip-no-sticky', shouldEnable);
+        if (shouldEnable) {
+            // Stop observing the triggers — CSS already makes both panels visible
+            if (stopSceneReveal) {
+                stopSceneReveal();
+                stopSceneReveal = null;
+            }
+            ipScrollScenes.forEach(scene => scene.classList.add('scene-revealed'));
+        } else if (wasEnabled && refreshSceneObserver) {
+            // Sticky support restored after a resize — rebuild the observer
+            refreshSceneObserver();
+        }
+    };
+
+    const evaluateInPracticeLayout = perfTelemetry.wrap('in-practice-layout', () => {
+        if (!ipSceneWraps.length) return;
+
+        if (!supportsSticky) {
+            setInPracticeFallbackLayout(true);
+            return;
+        }
+
+        const hasCollapsedScene = Array.from(ipSceneWraps).some((wrap) => {
+            const rect = wrap.getBoundingClientRect();
+            return rect.height < 24 || rect.width < 24;
+        });
+
+        scrollScheduler.write(perfTelemetry.wrap('in-practice-layout', () => setInPracticeFallbackLayout(hasCollapsedScene)));
+    });
+
+    if (ipSceneWraps.length) {
+        scrollScheduler.read(evaluateInPracticeLayout);
+    }
+
+    // In Practice — add ip-visible to each act as soon as it enters the viewport
+    // (threshold: 0 because acts now contain tall scroll scenes; we only need the top edge)
+    const ipActs = document.querySelectorAll('.ip-act');
+    if (ipActs.length) {
+        const revealVisibleIpActs = () => {
+            const viewportHeight = window.innerHeight || document.documentElement.clientHeight;
+
+            // Performance: Batch DOM reads to prevent layout thrashing
+            const actsToReveal = [];
+            ipActs.forEach((act) => {
+                const rect = act.getBoundingClientRect();
+                if (rect.bottom > 0 && rect.top < viewportHeight) {
+                    actsToReveal.push(act);
+                }
+            });
+
+            // Performance: Batch DOM writes
+            scrollScheduler.write(() => actsToReveal.forEach(act => act.classList.add('ip-visible')));
+        };
+
+        if (supportsIO) {
+            ipActs.forEach((act) => {
+                const stopWatchingAct = scrollScheduler.observe(act, (entry) => {
+                    if (entry.isIntersecting) {
+                        entry.target.classList.add('ip-visible');
+                        stopWatchingAct();
+                    }
+                }, { rootMargin: '-80px 0px 0px 0px' });
+            });
+            scrollScheduler.read(revealVisibleIpActs);
+            scrollScheduler.onResize(revealVisibleIpActs);
+            // Queued from a read so it runs after revealVisibleIpActs' writes.
+            scrollScheduler.read(() => scrollScheduler.write(() => {
+                if (!document.querySelector('.ip-act.ip-visible')) {
+                    ipActs[0].classList.add('ip-visible');
+                }
+            }));
+        } else {
+            ipActs.forEach(act => act.classList.add('ip-visible'));
+        }
+    }
+
+    // In Practice — crossfade from "before" to "after" when the sentinel
+    // element (positioned mid-scene) scrolls into view.
+    // Uses IntersectionObserver for zero main-thread scroll cost: no scroll
+    // listener, no rAF, no getBoundingClientRect on every frame.
+    if (ipScrollScenes.length) {
+        if (!supportsIO) {
+            ipScrollScenes.forEach(scene => scene.classList.add('scene-revealed'));
+        } else {
+        // Performance: Pre-cache trigger elements and their parent scenes once,
+        // avoiding repeated querySelector calls inside any hot path.
+        const triggerToScene = new Map();
+        const cachedTriggers = [];
+        ipScrollScenes.forEach(scene => {
+            const trigger = scene.querySelector('.ip-scene-trigger');
+            if (trigger) {
+                cachedTriggers.push(trigger);
+                triggerToScene.set(trigger, scene);
+            }
+        });
+
+        // Performance: Create the MediaQueryList once; check .matches (a cheap
+        // property read) instead of calling matchMedia() on every frame.
+        const mobileQuery = window.matchMedia('(max-width: 720px)');
+
+        const setupSceneRevealObserver = () => {
+            if (!supportsIO) {
+                ipScrollScenes.forEach(scene => scene.classList.add('scene-revealed'));
+                return;
+            }
+
+            if (stopSceneReveal) {
+                stopSceneReveal();
+                stopSceneReveal = null;
+            }
+
+            // In no-sticky mode both panels are already visible via CSS; nothing to observe.
+            if (document.documentElement.classList.contains('ip-no-sticky') || !cachedTriggers.length) return;
+
+            if (supportsIO) {
+                // Shrink the bottom of the viewport detection zone so the observer fires at
+                // the same visual threshold as the previous getBoundingClientRect logic:
+                //   desktop → 58 % from top  →  bottom margin = -(100 - 58) % = -42 %
+                //   mobile  → 78 % from top  →  bottom margin = -(100 - 78) % = -22 %
+                const rootMarginBottom = mobileQuery.matches ? '-22%' : '-42%';
+
+                const handleSceneTrigger = (entry) => {
+                    const scene = triggerToScene.get(entry.target);
+                    if (!scene) return;
+                    // Reveal when the trigger is inside the detection zone OR has
+                    // already scrolled above it (top < 0 means above the viewport).
+                    const shouldReveal = entry.isIntersecting || entry.boundingClientRect.top < 0;
+                    scene.classList.toggle('scene-revealed', shouldReveal);
+                    // On first reveal (not on scroll-back), briefly lock scroll so the
+                    // swipe animation can complete before the page moves on. Skip on
+                    // mobile where touch physics behave differently.
+                    if (entry.isIntersecting && !ipAnimatedScenes.has(scene) && !mobileQuery.matches) {
+                        ipAnimatedScenes.add(scene);
+                        ipLockScroll();
+                    }
+                };
+
+                const stops = cachedTriggers.map(trigger => scrollScheduler.observe(trigger, handleSceneTrigger, {
+                    rootMargin: `0px 0px ${rootMarginBottom} 0px`
+                }));
+                stopSceneReveal = () => stops.forEach(stop => stop());
+            } else {
+                // Fallback: Reveal all scenes immediately if IntersectionObserver is unavailable
+                ipScrollScenes.forEach(scene => scene.classList.add('scene-revealed'));
+            }
+        };
+
+        // Store reference so setInPracticeFallbackLayout can rebuild the observer
+        // if sticky support is restored after a resize.
+        refreshSceneObserver = setupSceneRevealObserver;
+
+        // Recreate with the correct rootMargin when the mobile breakpoint changes.
+        mobileQuery.addEventListener('change', setupSceneRevealObserver);
+        setupSceneRevealObserver();
+        }
+    }
+
+    scrollScheduler.onResize(() => evaluateInPracticeLayout());
+};
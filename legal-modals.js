@@ -0,0 +1,169 @@
+// Legal modals (privacy, terms, accessibility) and the terms email reveal.
+// script.js imports this module when a [data-legal-modal-target] trigger is
+// hovered, focused or clicked, and opens modals through the functions
+// initLegalModals() returns.
+//
+// The modal bodies are not in index.html. Each .legal-modal-body names an
+// HTML fragment in data-legal-src (fragments/, served with a long cache
+// lifetime) that is fetched when its trigger is warmed and inserted on the
+// first open.
+
+// Elements and attributes a fragment may contain. Everything else is dropped
+// when the fragment is copied into the page.
+const FRAGMENT_ELEMENTS = new Set(['P', 'H3', 'H4', 'UL', 'OL', 'LI', 'A', 'STRONG', 'EM', 'BR', 'SPAN', 'BUTTON']);
+const FRAGMENT_ATTRIBUTES = new Set(['class', 'type', 'href', 'aria-label', 'aria-live', 'data-email-user', 'data-email-domain']);
+const SAFE_HREF = /^(?:https:|mailto:|#)/i;
+
+// XHR parses the response into an inert document, so no Trusted Types policy
+// is needed (the CSP's require-trusted-types-for covers innerHTML and
+// DOMParser). Scripts in that document never run.
+const fetchFragment = (url) => new Promise((resolve, reject) => {
+    const request = new XMLHttpRequest();
+    request.open('GET', url);
+    request.responseType = 'document';
+    request.addEventListener('load', () => {
+        if (request.status === 200 && request.response && request.response.body) {
+            resolve(request.response.body);
+        } else {
+            reject(new Error(`${url}: HTTP ${request.status}`));
+        }
+    });
+    request.addEventListener('error', () => reject(new Error(`${url}: network error`)));
+    request.send();
+});
+
+// Security: Rebuild the fragment node by node with createElement so only
+// allowlisted elements and attributes (and no event handlers) reach the page.
+const copyAllowed = (source, target) => {
+    source.childNodes.forEach((node) => {
+        if (node.nodeType === Node.TEXT_NODE) {
+            target.appendChild(document.createTextNode(node.textContent));
+            return;
+        }
+        if (node.nodeType !== Node.ELEMENT_NODE || !FRAGMENT_ELEMENTS.has(node.tagName)) return;
+
+        const element = document.createElement(node.tagName.toLowerCase());
+        Array.from(node.attributes).forEach(({ name, value }) => {
+            if (!FRAGMENT_ATTRIBUTES.has(name)) return;
+            if (name === 'href' && !SAFE_HREF.test(value.trim())) return;
+            element.setAttribute(name, value);
+        });
+        copyAllowed(node, element);
+        target.appendChild(element);
+    });
+};
+
+const wireEmailReveal = (button) => {
+    button.addEventListener('click', () => {
+        const user = button.dataset.emailUser;
+        const domain = button.dataset.emailDomain;
+        if (!user || !domain) return;
+
+        const email = `${user}@${domain}`;
+        const output = button.nextElementSibling;
+        if (!output) return;
+
+        output.textContent = ` ${email}`;
+        button.hidden = true;
+    });
+};
+
+const showFallback = (body, url) => {
+    const message = document.createElement('p');
+    const link = document.createElement('a');
+    link.href = url;
+    link.textContent = 'Open it in its own page';
+    message.append('This section could not be loaded. ', link, '.');
+    body.replaceChildren(message);
+};
+
+export const initLegalModals = () => {
+    const legalModalCloseButtons = document.querySelectorAll('[data-legal-modal-close]');
+
+    // Performance: Cache legal modal overlays to prevent repeated DOM queries on every keydown event
+    const legalModalOverlays = document.querySelectorAll('.legal-modal-overlay');
+
+    // One request per fragment, shared by warm-ups and opens. A failed
+    // request is forgotten so the next open tries again.
+    const fragmentRequests = new Map();
+    const requestFragment = (url) => {
+        if (!fragmentRequests.has(url)) {
+            fragmentRequests.set(url, fetchFragment(url).catch((error) => {
+                fragmentRequests.delete(url);
+                throw error;
+            }));
+        }
+        return fragmentRequests.get(url);
+    };
+
+    const warmLegalModal = (modal) => {
+        const body = modal && modal.querySelector('.legal-modal-body[data-legal-src]');
+        if (body) {
+            requestFragment(body.dataset.legalSrc).catch(() => {});
+        }
+    };
+
+    // Resolves once the modal's body is in the page (or the fallback is).
+    const hydrateLegalModal = (modal) => {
+        const body = modal.querySelector('.legal-modal-body[data-legal-src]');
+        if (!body || body.dataset.legalState === 'ready') return Promise.resolve();
+
+        const url = body.dataset.legalSrc;
+        return requestFragment(url).then((fragment) => {
+            if (body.dataset.legalState === 'ready') return;
+            const content = document.createDocumentFragment();
+            copyAllowed(fragment, content);
+            body.replaceChildren(content);
+            body.querySelectorAll('.terms-email-reveal').forEach(wireEmailReveal);
+            body.dataset.legalState = 'ready';
+        }, () => showFallback(body, url));
+    };
+
+    const openLegalModal = (modal) => {
+        if (!modal) return Promise.resolve();
+        return hydrateLegalModal(modal).then(() => {
+            modal.hidden = false;
+            document.body.style.overflow = 'hidden';
+            const closeButton = modal.querySelector('[data-legal-modal-close]');
+            if (closeButton) {
+                closeButton.focus();
+            }
+        });
+    };
+
+    const closeLegalModal = (modal) => {
+        if (!modal) return;
+        modal.hidden = true;
+        const hasOpenModal = Array.from(legalModalOverlays).some(overlay => !overlay.hidden);
+        if (!hasOpenModal) {
+            document.body.style.overflow = '';
+        }
+    };
+
+    legalModalCloseButtons.forEach(button => {
+        button.addEventListener('click', () => {
+            const modal = button.closest('.legal-modal-overlay');
+            closeLegalModal(modal);
+        });
+    });
+
+    legalModalOverlays.forEach((overlay) => {
+        overlay.addEventListener('click', (event) => {
+            if (event.target === overlay) {
+                closeLegalModal(overlay);
+            }
+        });
+    });
+
+    document.addEventListener('keydown', (event) => {
+        if (event.key === 'Escape') {
+            legalModalOverlays.forEach((overlay) => {
+                if (!overlay.hidden) {
+                    closeLegalModal(overlay);
+                }
+            });
+        }
+    });
+
+    return { openLegalModal, warmLegalModal };
+};
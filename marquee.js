@@ -0,0 +1,146 @@
+// Virtualized skills marquee. Each track renders only the items needed to span
+// the marquee plus the one entering on the left, in an aria-hidden "window"
+// list. The full source list stays in the DOM, visually hidden, for assistive
+// tech and print.
+//
+// The window is moved by a linear Web Animations `transform` animation, which
+// runs on the compositor: each step slides the window right by the width of the
+// leading (still hidden) item. When a step finishes, the node that left on the
+// right is recycled as the next leading item and the next step starts, so the
+// main thread only does work once per item, never per frame. The animations are
+// paused on hover and focus, while the marquee is offscreen, and are not created
+// at all under reduced motion. Row speeds come from `--marquee-cycle` in
+// styles.css: the time one full pass of the list takes.
+//
+// script.js imports this module when the skills section comes within 200px
+// of the viewport and starts the marquee from an idle callback.
+export const createSkillsMarquee = (marquee, { scrollScheduler }) => {
+    const sourceList = marquee.querySelector('.skills-list');
+    const tracks = Array.from(marquee.querySelectorAll('.skills-track'));
+    if (!sourceList || !tracks.length || marquee.classList.contains('is-virtual')) return;
+
+    const sourceItems = Array.from(sourceList.children);
+    const labels = sourceItems.map((item) => item.textContent);
+    const itemCount = labels.length;
+    if (!itemCount) return;
+
+    sourceList.classList.add('skills-list--source');
+    marquee.classList.add('is-virtual');
+
+    // Rows after the first start part-way through the list so they don't line up.
+    const rowShift = Math.floor(itemCount / 3);
+    const rows = tracks.map((track, index) => {
+        const list = document.createElement('ul');
+        list.className = 'skills-list skills-window';
+        list.setAttribute('aria-hidden', 'true');
+        track.appendChild(list);
+        return { track, list, offset: (rowShift * index) % itemCount, widths: [], speed: 0, first: 0, animation: null };
+    });
+
+    const reducedMotion = window.matchMedia('(prefers-reduced-motion: reduce)');
+    let viewportWidth = 0;
+    let isVisible = true;
+    let isHeld = false;
+
+    const measure = () => {
+        const gap = parseFloat(window.getComputedStyle(sourceList).columnGap) || 0;
+        const widths = sourceItems.map((item) => item.getBoundingClientRect().width + gap);
+        const cycle = widths.reduce((total, width) => total + width, 0);
+        viewportWidth = marquee.clientWidth;
+        rows.forEach((row) => {
+            row.widths = widths.map((_, k) => widths[(k + row.offset) % itemCount]);
+            const seconds = parseFloat(window.getComputedStyle(row.track).getPropertyValue('--marquee-cycle'));
+            row.speed = seconds > 0 ? cycle / (seconds * 1000) : 0;
+        });
+    };
+
+    // Lays out the window for the current leading item: that item sits just past
+    // the left edge and the ones after it cover the marquee.
+    const fill = (row) => {
+        const { list, widths, first } = row;
+        let count = 1;
+        let edge = 0;
+        while (edge < viewportWidth && count < itemCount * 2) {
+            edge += widths[(first + count) % itemCount];
+            count++;
+        }
+        while (list.children.length < count) list.appendChild(document.createElement('li'));
+        while (list.children.length > count) list.lastElementChild.remove();
+        for (let k = 0; k < count; k++) {
+            const label = labels[(first + k + row.offset) % itemCount];
+            const node = list.children[k];
+            if (node.textContent !== label) node.textContent = label;
+        }
+        list.style.transform = `translate3d(${-widths[first]}px, 0, 0)`;
+    };
+
+    const isPlaying = () => isVisible && !isHeld;
+
+    const step = (row, progress = 0) => {
+        if (row.animation) row.animation.cancel();
+        row.animation = null;
+        fill(row);
+        if (reducedMotion.matches || !row.speed) return;
+        const width = row.widths[row.first];
+        const animation = row.list.animate(
+            [{ transform: `translate3d(${-width}px, 0, 0)` }, { transform: 'translate3d(0, 0, 0)' }],
+            { duration: width / row.speed, easing: 'linear', fill: 'forwards' }
+        );
+        animation.currentTime = progress * width / row.speed;
+        if (!isPlaying()) animation.pause();
+        animation.onfinish = () => {
+            if (row.animation !== animation) return;
+            // The item that left on the right is reused for the one entering on the left.
+            const list = row.list;
+            list.insertBefore(list.lastElementChild, list.firstElementChild);
+            row.first = (row.first - 1 + itemCount) % itemCount;
+            step(row);
+        };
+        row.animation = animation;
+    };
+
+    const restart = () => rows.forEach((row) => {
+        const timing = row.animation && row.animation.effect.getComputedTiming();
+        step(row, timing ? timing.progress || 0 : 0);
+    });
+
+    const syncPlayState = () => rows.forEach((row) => {
+        // A finished step is left alone: its finish handler starts the next one.
+        const state = row.animation ? row.animation.playState : 'idle';
+        if (isPlaying() && state === 'paused') row.animation.play();
+        else if (!isPlaying() && state === 'running') row.animation.pause();
+    });
+
+    // Pause while the pointer is over the marquee or focus is inside it.
+    const syncHold = () => {
+        isHeld = marquee.matches(':hover, :focus-within');
+        syncPlayState();
+    };
+    ['mouseenter', 'mouseleave', 'focusin', 'focusout'].forEach((type) => marquee.addEventListener(type, syncHold));
+    reducedMotion.addEventListener('change', restart);
+
+    const remeasure = () => {
+        measure();
+        scrollScheduler.write(restart);
+    };
+
+    measure();
+    rows.forEach((row) => step(row));
+    syncHold();
+    marquee.dataset.marquee = 'ready';
+
+    if ('IntersectionObserver' in window) {
+        scrollScheduler.observe(marquee, (entry) => {
+            isVisible = entry.isIntersecting;
+            syncPlayState();
+        });
+    }
+
+    scrollScheduler.onResize(remeasure);
+
+    // Item widths change once the web font replaces the fallback.
+    if (document.fonts) {
+        document.fonts.ready.then(() => scrollScheduler.read(remeasure));
+        document.fonts.addEventListener('loadingdone', () => scrollScheduler.read(remeasure));
+    }
+};
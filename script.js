@@ -1,446 +1,353 @@
-const initHeroNeuralNetwork = () => {
-    const heroSection = document.getElementById('hero');
-    const canvas = document.getElementById('hero-neural-canvas');
-    if (!heroSection || !canvas) return;
+// Opt-in performance telemetry: add ?perf to the URL or data-perf to <html>.
+// Components run their hot paths through perfTelemetry.wrap(name, fn), which
+// brackets each call with performance.mark/measure when enabled and returns fn
+// untouched otherwise. Measures, long tasks and layout shifts go into a ring
+// buffer, each attributed to a component: long tasks to the measure they
+// overlap, layout shifts to the component region containing the shifted node.
+// Tests and benchmarks read it through window.__perf. With data-perf-beacon
+// (or ?perf-beacon=) set to a same-origin path, the summary is also sent with
+// navigator.sendBeacon when the page is hidden.
+const PERF_BUFFER_SIZE = 300;
+const PERF_MARK_PREFIX = 'hire:';
+// Layout shifts are attributed to the component whose region contains the shifted node.
+const PERF_COMPONENT_REGIONS = {
+    'hero-intro': '#hero',
+    marquee: '.skills-marquee',
+    'nav-indicator': '.nav-links',
+    'in-practice-layout': '.ip-section'
+};
 
-    const ctx = canvas.getContext('2d', { desynchronized: true });
-    if (!ctx) return;
+const createPerfTelemetry = () => {
+    const params = new URLSearchParams(window.location.search);
+    const root = document.documentElement;
+    const enabled = params.has('perf') || root.hasAttribute('data-perf');
+    if (!enabled || !window.performance || typeof performance.mark !== 'function') {
+        return { enabled: false, wrap: (name, fn) => fn };
+    }
 
-    const prefersReducedMotion = window.matchMedia('(prefers-reduced-motion: reduce)').matches;
-    if (prefersReducedMotion) return;
-
-    // Performance: Scale animation complexity on lower-power devices while
-    // preserving visual behavior on typical desktops.
-    const lowPowerDevice =
-        (navigator.hardwareConcurrency && navigator.hardwareConcurrency <= 4) ||
-        (navigator.deviceMemory && navigator.deviceMemory <= 4) ||
-        (navigator.connection && navigator.connection.saveData);
-
-    let width = 0;
-    let height = 0;
-    const mouse = { x: -9999, y: -9999, active: false };
-    const CONNECTION_DISTANCE = 160;
-    const MOUSE_RADIUS = 200;
-    const BASE_SPEED = lowPowerDevice ? 0.32 : 0.35;
-    const MAX_SPEED = lowPowerDevice ? 0.68 : 0.75;
-    const REPULSION_DIST = 80;
-    const CLICK_RADIUS = 200;
-    const CONNECTION_DISTANCE_SQ = CONNECTION_DISTANCE * CONNECTION_DISTANCE;
-    const REPULSION_DIST_SQ = REPULSION_DIST * REPULSION_DIST;
-    const MOUSE_RADIUS_SQ = MOUSE_RADIUS * MOUSE_RADIUS;
-    const CLICK_RADIUS_SQ = CLICK_RADIUS * CLICK_RADIUS;
-    const GRID_CELL_SIZE = CONNECTION_DISTANCE;
-    const nodes = [];
-    const spatialGrid = new Map();
-    let animationFrameId = null;
-    let isHeroVisible = true;
-    let isDocumentVisible = !document.hidden;
-    let frameCounter = 0;
-
-    // Performance: Pre-allocated shared buffers to avoid per-frame array/object allocation
-    const CONNECTION_BINS = 8;
-    const binCoords = Array.from({ length: CONNECTION_BINS }, () => []);
-    const binAlphaSum = new Float64Array(CONNECTION_BINS);
-    const binCount = new Int32Array(CONNECTION_BINS);
-
-    // Performance: Pre-render each node's glow to an offscreen canvas once at creation time.
-    // Eliminates createRadialGradient() — the largest per-frame allocation bottleneck (~N objects/frame).
-    // drawImage() from a cached texture is significantly cheaper than re-building gradients each frame.
-    const createGlowSprite = (hue, maxGlowRadius, spriteSize) => {
-        const sprite = typeof OffscreenCanvas !== 'undefined'
-            ? new OffscreenCanvas(spriteSize, spriteSize)
-            : (() => { const c = document.createElement('canvas'); c.width = spriteSize; c.height = spriteSize; return c; })();
-        const sCtx = sprite.getContext('2d');
-        const cx = spriteSize / 2;
-        const gradient = sCtx.createRadialGradient(cx, cx, 0, cx, cx, maxGlowRadius);
-        gradient.addColorStop(0, `hsla(${hue}, 70%, 75%, 1)`);
-        gradient.addColorStop(1, `hsla(${hue}, 70%, 60%, 0)`);
-        sCtx.beginPath();
-        sCtx.arc(cx, cx, maxGlowRadius, 0, Math.PI * 2);
-        sCtx.fillStyle = gradient;
-        sCtx.fill();
-        return sprite;
+    const buffer = [];
+    let next = 0;
+    let dropped = 0;
+    const record = (entry) => {
+        if (buffer.length < PERF_BUFFER_SIZE) {
+            buffer.push(entry);
+        } else {
+            buffer[next] = entry;
+            next = (next + 1) % PERF_BUFFER_SIZE;
+            dropped += 1;
+        }
+    };
+    const entries = () => buffer.slice(next).concat(buffer.slice(0, next));
+
+    // Marks and measures are cleared once recorded: observers and DevTools have
+    // already seen them, and the browser's User Timing buffer is unbounded.
+    const wrap = (name, fn) => {
+        const measureName = `${PERF_MARK_PREFIX}${name}`;
+        const startMark = `${measureName}:start`;
+        const endMark = `${measureName}:end`;
+        return function (...args) {
+            const start = performance.now();
+            performance.mark(startMark);
+            try {
+                return fn.apply(this, args);
+            } finally {
+                performance.mark(endMark);
+                const measure = performance.measure(measureName, startMark, endMark);
+                record({
+                    type: 'measure',
+                    component: name,
+                    startTime: start,
+                    duration: measure ? measure.duration : performance.now() - start
+                });
+                performance.clearMarks(startMark);
+                performance.clearMarks(endMark);
+                performance.clearMeasures(measureName);
+            }
+        };
     };
 
-    // Performance: Cache theme state outside the animation loop to prevent layout thrashing
-    // from repeated synchronous DOM reads.
-    let isDarkTheme = document.body.getAttribute('data-theme') === 'dark';
+    const componentForTask = (task) => {
+        let best = null;
+        let bestOverlap = 0;
+        buffer.forEach((entry) => {
+            if (entry.type !== 'measure') return;
+            const overlap = Math.min(task.startTime + task.duration, entry.startTime + entry.duration) -
+                Math.max(task.startTime, entry.startTime);
+            if (overlap > bestOverlap) {
+                best = entry.component;
+                bestOverlap = overlap;
+            }
+        });
+        return best;
+    };
+
+    const componentForNode = (node) => {
+        const element = node && node.nodeType === Node.ELEMENT_NODE ? node : node && node.parentElement;
+        if (!element) return null;
+        const names = Object.keys(PERF_COMPONENT_REGIONS);
+        return names.find((name) => element.closest(PERF_COMPONENT_REGIONS[name])) || null;
+    };
+
+    const observe = (type, handle) => {
+        const supported = window.PerformanceObserver && PerformanceObserver.supportedEntryTypes;
+        if (!supported || !supported.includes(type)) return;
+        new PerformanceObserver((list) => list.getEntries().forEach(handle)).observe({ type, buffered: true });
+    };
+
+    observe('longtask', (task) => record({
+        type: 'longtask',
+        component: componentForTask(task),
+        startTime: task.startTime,
+        duration: task.duration
+    }));
+    observe('layout-shift', (shift) => {
+        if (shift.hadRecentInput) return;
+        const source = shift.sources && shift.sources[0];
+        record({
+            type: 'layout-shift',
+            component: componentForNode(source && source.node),
+            startTime: shift.startTime,
+            value: shift.value
+        });
+    });
 
-    const getConnectionStrength = () => {
-        return {
-            alphaBoost: isDarkTheme ? 0.2 : 0.29,
-            lineWidth: isDarkTheme ? 1.05 : 1.25
+    const summary = () => {
+        const components = {};
+        const slot = (name) => {
+            const key = name || 'unattributed';
+            if (!components[key]) {
+                components[key] = { calls: 0, totalMs: 0, maxMs: 0, longTasks: 0, longTaskMs: 0, layoutShift: 0 };
+            }
+            return components[key];
         };
+        entries().forEach((entry) => {
+            const totals = slot(entry.component);
+            if (entry.type === 'measure') {
+                totals.calls += 1;
+                totals.totalMs += entry.duration;
+                totals.maxMs = Math.max(totals.maxMs, entry.duration);
+            } else if (entry.type === 'longtask') {
+                totals.longTasks += 1;
+                totals.longTaskMs += entry.duration;
+            } else if (entry.type === 'layout-shift') {
+                totals.layoutShift += entry.value;
+            }
+        });
+        return { url: window.location.pathname, dropped, components };
     };
 
-    const getThemeAwareHue = () => {
-        return isDarkTheme ? 190 : 200;
-    };
-
-    const resize = () => {
-        const rect = heroSection.getBoundingClientRect();
-        width = Math.max(1, Math.floor(rect.width));
-        height = Math.max(1, Math.floor(rect.height));
-        canvas.width = width;
-        canvas.height = height;
+    // Only same-origin paths: the CSP's connect-src would block anything else anyway.
+    const beaconPath = root.getAttribute('data-perf-beacon') || params.get('perf-beacon');
+    const beaconUrl = beaconPath && beaconPath.startsWith('/') && !beaconPath.startsWith('//') ? beaconPath : null;
+    const send = () => {
+        if (!beaconUrl || !navigator.sendBeacon) return false;
+        const body = new Blob([JSON.stringify(summary())], { type: 'application/json' });
+        return navigator.sendBeacon(beaconUrl, body);
     };
+    if (beaconUrl) {
+        document.addEventListener('visibilitychange', () => {
+            if (document.visibilityState === 'hidden') send();
+        });
+    }
 
-    const createNodes = () => {
-        const area = width * height;
-        const minNodes = lowPowerDevice ? 50 : 70;
-        const maxNodes = lowPowerDevice ? 96 : 130;
-        const nodeCount = Math.max(minNodes, Math.min(maxNodes, Math.round(area / 16500)));
-        const cols = Math.ceil(Math.sqrt(nodeCount * (width / height)));
-        const rows = Math.ceil(nodeCount / cols);
-        const cellW = width / cols;
-        const cellH = height / rows;
-        nodes.length = 0;
-
-        for (let row = 0; row < rows; row++) {
-            for (let col = 0; col < cols; col++) {
-                if (nodes.length >= nodeCount) break;
-                const x = col * cellW + Math.random() * cellW;
-                const y = row * cellH + Math.random() * cellH;
-                const angle = Math.random() * Math.PI * 2;
-                const speed = BASE_SPEED * (0.6 + Math.random() * 0.8);
-                const radius = 1.2 + Math.random() * 1.2;
-                const hue = getThemeAwareHue() + Math.random() * 40;
-                const maxGlowRadius = (radius + 0.6) * 2.5;
-                const spriteSize = Math.ceil(maxGlowRadius) * 2 + 2;
-                nodes.push({
-                    x,
-                    y,
-                    vx: Math.cos(angle) * speed,
-                    vy: Math.sin(angle) * speed,
-                    radius,
-                    pulse: Math.random() * Math.PI * 2,
-                    pulseSpeed: 0.008 + Math.random() * 0.01,
-                    hue,
-                    // Performance: Pre-computed to avoid per-frame string allocation
-                    fillColor: `hsla(${hue}, 60%, 80%, 0.55)`,
-                    // Performance: Pre-rendered glow texture; avoids createRadialGradient each frame
-                    glowSprite: createGlowSprite(hue, maxGlowRadius, spriteSize),
-                    glowSpriteSize: spriteSize,
-                    // Performance: Per-node neighbor cache; populated once per frame after grid rebuild
-                    cachedNeighbors: []
-                });
-            }
+    window.__perf = Object.freeze({
+        entries,
+        summary,
+        send,
+        clear: () => {
+            buffer.length = 0;
+            next = 0;
+            dropped = 0;
         }
-    };
+    });
 
-    // Performance: Integer key avoids string allocation on every grid lookup
-    const getCellKey = (x, y) => {
-        return Math.floor(x / GRID_CELL_SIZE) * 1000 + Math.floor(y / GRID_CELL_SIZE);
-    };
+    return { enabled: true, wrap };
+};
 
-    const rebuildSpatialGrid = () => {
-        spatialGrid.clear();
-        for (let i = 0; i < nodes.length; i++) {
-            const node = nodes[i];
-            const key = getCellKey(node.x, node.y);
-            let bucket = spatialGrid.get(key);
-            if (!bucket) {
-                bucket = [];
-                spatialGrid.set(key, bucket);
+const perfTelemetry = createPerfTelemetry();
+
+// Scroll-state scheduler shared by every component on the page.
+//
+// - observe(): IntersectionObservers are pooled by rootMargin and threshold, so
+//   components watching with the same options share one observer. The callback
+//   gets one entry at a time; observe() returns a function that stops it.
+// - read() / write(): layout work is batched into one animation frame, with all
+//   queued reads running before all queued writes. Writes queued by a read run
+//   in the same frame; anything queued by a write waits for the next one.
+// - onResize(): one debounced resize/orientationchange listener for the page.
+//   Subscribers run in the read phase and queue their DOM changes with write().
+const RESIZE_DEBOUNCE_MS = 150;
+
+const createScrollScheduler = () => {
+    const pool = new Map();
+    const reads = [];
+    const writes = [];
+    const resizeSubscribers = new Set();
+    const counters = { frames: 0, reads: 0, writes: 0, resizes: 0 };
+    let frame = 0;
+    let resizeTimer = 0;
+
+    const run = (tasks) => {
+        tasks.forEach((task) => {
+            try {
+                task();
+            } catch (error) {
+                console.error(error);
             }
-            bucket.push(i);
-        }
+        });
     };
 
-    const getNeighborIndices = (node, neighbors) => {
-        neighbors.length = 0;
-        const baseCellX = Math.floor(node.x / GRID_CELL_SIZE);
-        const baseCellY = Math.floor(node.y / GRID_CELL_SIZE);
-
-        for (let offsetY = -1; offsetY <= 1; offsetY++) {
-            for (let offsetX = -1; offsetX <= 1; offsetX++) {
-                // Performance: Integer key avoids string allocation on every cell lookup
-                const key = (baseCellX + offsetX) * 1000 + (baseCellY + offsetY);
-                const bucket = spatialGrid.get(key);
-                if (bucket) {
-                    for (let i = 0; i < bucket.length; i++) {
-                        neighbors.push(bucket[i]);
-                    }
-                }
-            }
-        }
-
-        return neighbors;
+    const flush = () => {
+        frame = 0;
+        counters.frames += 1;
+        const frameReads = reads.splice(0);
+        counters.reads += frameReads.length;
+        run(frameReads);
+        const frameWrites = writes.splice(0);
+        counters.writes += frameWrites.length;
+        run(frameWrites);
+        if (reads.length || writes.length) requestFlush();
     };
 
-    // Performance: Build per-node neighbor caches once per frame after grid rebuild.
-    // Both drawConnections and updateNodes can then read node.cachedNeighbors,
-    // halving the total getNeighborIndices calls from 2N to N per frame.
-    const cacheAllNeighbors = () => {
-        for (let i = 0; i < nodes.length; i++) {
-            getNeighborIndices(nodes[i], nodes[i].cachedNeighbors);
-        }
+    const requestFlush = () => {
+        if (!frame) frame = window.requestAnimationFrame(flush);
     };
 
-    const setMouseFromEvent = (event) => {
-        // Performance: Use offsetX/Y instead of getBoundingClientRect() to avoid synchronous main-thread layout thrashing
-        mouse.x = event.offsetX;
-        mouse.y = event.offsetY;
-        mouse.active = true;
+    const read = (task) => {
+        reads.push(task);
+        requestFlush();
     };
 
-    const drawNode = (node) => {
-        const glow = Math.sin(node.pulse) * 0.5 + 0.5;
-        const radius = node.radius + glow * 0.6;
-        const glowRadius = radius * 2.5;
-
-        // Performance: drawImage from pre-rendered texture avoids per-frame createRadialGradient.
-        // globalAlpha varies the intensity (0.28–0.43) exactly as the original gradient alpha did.
-        // Scaling drawImage to the live glowRadius preserves the pulsing size animation.
-        ctx.globalAlpha = 0.28 + glow * 0.15;
-        const drawSize = glowRadius * 2;
-        ctx.drawImage(node.glowSprite, node.x - glowRadius, node.y - glowRadius, drawSize, drawSize);
-        ctx.globalAlpha = 1;
-
-        ctx.beginPath();
-        ctx.arc(node.x, node.y, radius, 0, Math.PI * 2);
-        ctx.fillStyle = node.fillColor;
-        ctx.fill();
+    const write = (task) => {
+        writes.push(task);
+        requestFlush();
     };
 
-    const drawConnections = () => {
-        // Performance: Cache connection strength outside the loops to avoid severe DOM read overhead and layout thrashing
-        // from repeated calls to getAttribute('data-theme') on every frame.
-        const { alphaBoost, lineWidth } = getConnectionStrength();
-
-        // Performance: Reset pre-allocated bins instead of creating new arrays each frame.
-        // Batching connections into alpha bins reduces GPU draw calls from ~300 to CONNECTION_BINS,
-        // and eliminates createLinearGradient() — the biggest per-frame allocation bottleneck.
-        for (let b = 0; b < CONNECTION_BINS; b++) {
-            binCoords[b].length = 0;
-            binAlphaSum[b] = 0;
-            binCount[b] = 0;
-        }
+    const poolKey = ({ rootMargin = '0px', threshold = 0 } = {}) => `${rootMargin}|${[].concat(threshold).join(',')}`;
 
-        // Representative hue for connections: midpoint of each node's hue range per theme
-        const baseHue = isDarkTheme ? 210 : 220;
-
-        for (let i = 0; i < nodes.length; i++) {
-            const a = nodes[i];
-            const neighbors = a.cachedNeighbors;
-
-            for (let n = 0; n < neighbors.length; n++) {
-                const j = neighbors[n];
-                if (j <= i) continue;
-                const b = nodes[j];
-                const dx = b.x - a.x;
-                const dy = b.y - a.y;
-                const distSq = dx * dx + dy * dy;
-
-                if (distSq < CONNECTION_DISTANCE_SQ) {
-                    const dist = Math.sqrt(distSq);
-                    const ratio = 1 - dist / CONNECTION_DISTANCE;
-                    const alpha = ratio * alphaBoost;
-                    const binIdx = Math.min(CONNECTION_BINS - 1, (ratio * CONNECTION_BINS) | 0);
-                    const coords = binCoords[binIdx];
-                    coords.push(a.x, a.y, b.x, b.y);
-                    binAlphaSum[binIdx] += alpha;
-                    binCount[binIdx]++;
-                }
-            }
+    const observe = (element, callback, options = {}) => {
+        const key = poolKey(options);
+        let slot = pool.get(key);
+        if (!slot) {
+            const targets = new Map();
+            const observer = new IntersectionObserver((entries) => {
+                entries.forEach((entry) => {
+                    const target = targets.get(entry.target);
+                    if (!target) return;
+                    target.entry = entry;
+                    Array.from(target.callbacks).forEach((fn) => fn(entry));
+                });
+            }, { rootMargin: options.rootMargin || '0px', threshold: options.threshold || 0 });
+            slot = { observer, targets };
+            pool.set(key, slot);
+        }
+
+        let target = slot.targets.get(element);
+        if (!target) {
+            target = { callbacks: new Set(), entry: null };
+            slot.targets.set(element, target);
+            slot.observer.observe(element);
+        } else if (target.entry) {
+            // The element is already observed, so no initial entry is coming: replay the last one.
+            const lastEntry = target.entry;
+            Promise.resolve().then(() => {
+                if (target.callbacks.has(callback)) callback(lastEntry);
+            });
         }
+        target.callbacks.add(callback);
 
-        ctx.lineWidth = lineWidth;
-        for (let b = 0; b < CONNECTION_BINS; b++) {
-            const count = binCount[b];
-            if (!count) continue;
-            const avgAlpha = binAlphaSum[b] / count;
-            ctx.strokeStyle = `hsla(${baseHue}, 70%, 65%, ${avgAlpha})`;
-            ctx.beginPath();
-            const coords = binCoords[b];
-            for (let p = 0; p < coords.length; p += 4) {
-                ctx.moveTo(coords[p], coords[p + 1]);
-                ctx.lineTo(coords[p + 2], coords[p + 3]);
+        return () => {
+            if (!target.callbacks.delete(callback) || target.callbacks.size) return;
+            slot.targets.delete(element);
+            slot.observer.unobserve(element);
+            if (!slot.targets.size && pool.get(key) === slot) {
+                slot.observer.disconnect();
+                pool.delete(key);
             }
-            ctx.stroke();
-        }
+        };
     };
 
-    const updateNodes = () => {
-        const closeZone = MOUSE_RADIUS * 0.3;
-
-        for (let i = 0; i < nodes.length; i++) {
-            const node = nodes[i];
-            node.pulse += node.pulseSpeed;
-
-            const mdx = mouse.x - node.x;
-            const mdy = mouse.y - node.y;
-            const mdistSq = mdx * mdx + mdy * mdy;
-
-            if (mouse.active && mdistSq < MOUSE_RADIUS_SQ && mdistSq > 0) {
-                const mdist = Math.sqrt(mdistSq);
-                if (mdist < closeZone) {
-                    const force = (1 - mdist / closeZone) * 0.025;
-                    node.vx -= (mdx / mdist) * force;
-                    node.vy -= (mdy / mdist) * force;
-                } else {
-                    const force = (1 - mdist / MOUSE_RADIUS) * 0.004;
-                    node.vx += (mdx / mdist) * force;
-                    node.vy += (mdy / mdist) * force;
-                }
-            }
-
-            const neighbors = node.cachedNeighbors;
-            for (let n = 0; n < neighbors.length; n++) {
-                const j = neighbors[n];
-                if (i === j) continue;
-                const other = nodes[j];
-                const dx = node.x - other.x;
-                const dy = node.y - other.y;
-                const distSq = dx * dx + dy * dy;
-                if (distSq < REPULSION_DIST_SQ && distSq > 0) {
-                    const dist = Math.sqrt(distSq);
-                    const force = (1 - dist / REPULSION_DIST) * 0.012;
-                    node.vx += (dx / dist) * force;
-                    node.vy += (dy / dist) * force;
-                }
-            }
-
-            const speed = Math.sqrt(node.vx * node.vx + node.vy * node.vy);
-            if (speed > MAX_SPEED) {
-                node.vx = (node.vx / speed) * MAX_SPEED;
-                node.vy = (node.vy / speed) * MAX_SPEED;
-            }
-
-            if (speed < 0.05) {
-                const angle = Math.random() * Math.PI * 2;
-                node.vx += Math.cos(angle) * 0.05;
-                node.vy += Math.sin(angle) * 0.05;
-            }
-
-            node.vx *= 0.998;
-            node.vy *= 0.998;
-            node.x += node.vx;
-            node.y += node.vy;
-
-            if (node.x < 0) node.x = width;
-            if (node.x > width) node.x = 0;
-            if (node.y < 0) node.y = height;
-            if (node.y > height) node.y = 0;
-        }
+    const notifyResize = () => {
+        resizeTimer = 0;
+        counters.resizes += 1;
+        resizeSubscribers.forEach((callback) => read(callback));
     };
 
-    const animate = () => {
-        if (!isHeroVisible || !isDocumentVisible) {
-            animationFrameId = null;
-            return;
-        }
-
-        if (lowPowerDevice) {
-            frameCounter = (frameCounter + 1) % 2;
-            if (frameCounter !== 0) {
-                updateNodes();
-                animationFrameId = window.requestAnimationFrame(animate);
-                return;
-            }
-        }
-
-        rebuildSpatialGrid();
-        cacheAllNeighbors();
-        ctx.clearRect(0, 0, width, height);
-        drawConnections();
-        for (let i = 0; i < nodes.length; i++) {
-            drawNode(nodes[i]);
-        }
-        updateNodes();
-        animationFrameId = window.requestAnimationFrame(animate);
+    const handleResize = () => {
+        if (resizeTimer) clearTimeout(resizeTimer);
+        resizeTimer = setTimeout(notifyResize, RESIZE_DEBOUNCE_MS);
     };
 
-    const ensureAnimation = () => {
-        if (!animationFrameId && isHeroVisible && isDocumentVisible) {
-            animationFrameId = window.requestAnimationFrame(animate);
+    const onResize = (callback) => {
+        if (!resizeSubscribers.size) {
+            window.addEventListener('resize', handleResize, { passive: true });
+            window.addEventListener('orientationchange', handleResize, { passive: true });
         }
-    };
-
-    const onClick = (event) => {
-        // Performance: Use offsetX/Y instead of getBoundingClientRect() to avoid synchronous main-thread layout thrashing
-        const clickX = event.offsetX;
-        const clickY = event.offsetY;
-
-        for (let i = 0; i < nodes.length; i++) {
-            const node = nodes[i];
-            const dx = node.x - clickX;
-            const dy = node.y - clickY;
-            const distSq = dx * dx + dy * dy;
-            if (distSq < CLICK_RADIUS_SQ && distSq > 0) {
-                const dist = Math.sqrt(distSq);
-                const force = (1 - dist / CLICK_RADIUS) * 1.8;
-                node.vx += (dx / dist) * force;
-                node.vy += (dy / dist) * force;
+        resizeSubscribers.add(callback);
+        return () => {
+            resizeSubscribers.delete(callback);
+            if (!resizeSubscribers.size) {
+                window.removeEventListener('resize', handleResize);
+                window.removeEventListener('orientationchange', handleResize);
             }
-        }
-    };
-
-    const resetMouse = () => {
-        mouse.active = false;
-        mouse.x = -9999;
-        mouse.y = -9999;
-    };
-
-    const onThemeChange = () => {
-        isDarkTheme = document.body.getAttribute('data-theme') === 'dark';
-        const baseHue = getThemeAwareHue();
-        for (let i = 0; i < nodes.length; i++) {
-            const node = nodes[i];
-            node.hue = baseHue + Math.random() * 40;
-            node.fillColor = `hsla(${node.hue}, 60%, 80%, 0.55)`;
-            const maxGlowRadius = (node.radius + 0.6) * 2.5;
-            const spriteSize = Math.ceil(maxGlowRadius) * 2 + 2;
-            node.glowSprite = createGlowSprite(node.hue, maxGlowRadius, spriteSize);
-        }
+        };
     };
 
-    resize();
-    createNodes();
-    rebuildSpatialGrid();
-    cacheAllNeighbors();
-    ensureAnimation();
-
-    heroSection.addEventListener('mousemove', setMouseFromEvent, { passive: true });
-    heroSection.addEventListener('mouseleave', resetMouse, { passive: true });
-    heroSection.addEventListener('click', onClick, { passive: true });
-    window.addEventListener('themechange', onThemeChange);
-    document.addEventListener('visibilitychange', () => {
-        isDocumentVisible = !document.hidden;
-        ensureAnimation();
+    // One place to inspect the page's observer and layout-batching load.
+    const stats = () => ({
+        observers: pool.size,
+        observedElements: Array.from(pool.values()).reduce((count, slot) => count + slot.targets.size, 0),
+        resizeSubscribers: resizeSubscribers.size,
+        ...counters
     });
 
-    if ('IntersectionObserver' in window) {
-        const heroVisibilityObserver = new IntersectionObserver((entries) => {
-            entries.forEach(entry => {
-                isHeroVisible = entry.isIntersecting;
-                ensureAnimation();
-            });
-        }, { threshold: 0 });
-        heroVisibilityObserver.observe(heroSection);
-    }
+    return { observe, read, write, onResize, stats };
+};
 
-    let canvasResizeTimeout;
-    const handleCanvasResize = () => {
-        // Performance: Resize canvas immediately for visual continuity, but debounce
-        // the heavy createNodes() call (which allocates 100+ OffscreenCanvas glow sprites)
-        // to prevent severe main-thread lag and GC pressure during window resize.
-        resize();
-        if (canvasResizeTimeout) window.clearTimeout(canvasResizeTimeout);
-        canvasResizeTimeout = window.setTimeout(() => {
-            createNodes();
-        }, 150);
+const scrollScheduler = createScrollScheduler();
+
+// On-demand modules. Everything below the hero lives in an ES module that is
+// imported the first time it is needed: hero-canvas.js after first paint,
+// marquee.js, in-practice.js and contact-form.js as their section nears the
+// viewport, legal-modals.js when a trigger is hovered, focused or clicked,
+// and back-to-top.js once the page scrolls. Modules get the shared scheduler and telemetry from
+// moduleServices instead of importing them, so each one stays a leaf.
+// contactOutboxKey is the localStorage key of contact-form.js's outbox of unsent
+// messages; script.js checks it at load to import the module straight away.
+const moduleServices = { perfTelemetry, scrollScheduler, contactOutboxKey: '_formOutbox' };
+
+// A failed import is logged and left for the next trigger to retry.
+const reportLoadError = (error) => console.error(error);
+
+// Wraps load (an import() plus its setup) so it runs once and every caller
+// shares the promise. A failed import is retried on the next call.
+const loadOnce = (load) => {
+    let pending = null;
+    return () => {
+        if (!pending) {
+            pending = load().catch((error) => {
+                pending = null;
+                throw error;
+            });
+        }
+        return pending;
     };
+};
 
-    if ('ResizeObserver' in window) {
-        const observer = new ResizeObserver(handleCanvasResize);
-        observer.observe(heroSection);
-    } else {
-        window.addEventListener('resize', handleCanvasResize);
+// Calls load() once element comes within rootMargin of the viewport, or right
+// away without IntersectionObserver. Watching stops once load() succeeds, so a
+// failed import is tried again the next time the element comes into range.
+const loadWhenNear = (element, load, rootMargin = '200px') => {
+    if (!('IntersectionObserver' in window)) {
+        load().catch(reportLoadError);
+        return;
     }
+    const stopWatching = scrollScheduler.observe(element, (entry) => {
+        if (entry.isIntersecting) load().then(stopWatching, reportLoadError);
+    }, { rootMargin });
 };
 
-const initHeroIntro = () => {
+const initHeroIntro = perfTelemetry.wrap('hero-intro', () => {
     const heroSection = document.getElementById('hero');
     const heroHeading = document.getElementById('hero-heading');
     if (!heroSection || !heroHeading) return;
@@ -493,13 +400,19 @@ const initHeroIntro = () => {
     };
 
     typeNextCharacter();
-};
+});
 
 document.addEventListener('DOMContentLoaded', () => {
+    // fonts:begin -- removed by `python -m tools.fonts` along with the Google Fonts link.
     // Performance: Activate preloaded font CSS now that the DOM is ready,
     // keeping the initial render unblocked by the external font request.
     const fontLink = document.getElementById('google-fonts-link');
     if (fontLink) fontLink.rel = 'stylesheet';
+    // fonts:end
+    // The critical-CSS build inlines the above-the-fold rules and preloads the
+    // rest of styles.css under this id; the source page links it directly.
+    const siteStylesLink = document.getElementById('site-styles-link');
+    if (siteStylesLink) siteStylesLink.rel = 'stylesheet';
 
     const runWhenIdle = (callback) => {
         if ('requestIdleCallback' in window) {
@@ -515,56 +428,34 @@ document.addEventListener('DOMContentLoaded', () => {
     // Defer canvas init past first paint so it doesn't compete with critical
     // hero text rendering. Double-rAF ensures at least one frame has been painted.
     window.requestAnimationFrame(() => {
-        window.requestAnimationFrame(initHeroNeuralNetwork);
+        window.requestAnimationFrame(() => import('./hero-canvas.js')
+            .then(({ initHeroNeuralNetwork }) => initHeroNeuralNetwork(moduleServices))
+            .catch(reportLoadError));
     });
 
     const inPracticeSection = document.querySelector('.ip-section');
     if (inPracticeSection) {
         document.documentElement.classList.add('ip-enhanced');
+        loadWhenNear(inPracticeSection, loadOnce(() => import('./in-practice.js').then(({ initInPractice }) => {
+            initInPractice(moduleServices);
+        })));
     }
 
-    // Performance: Lazily clone skills lists for the marquee to unblock the main thread
-    const initMarquee = () => {
-        const skillsTracks = document.querySelectorAll('.skills-track');
-        const sourceList = document.querySelector('.skills-track--slow .skills-list');
-
-        skillsTracks.forEach((track, index) => {
-            let listToClone = track.querySelector('.skills-list');
-
-            // If track is empty, populate it with the source list (shifted for visual variety)
-            if (!listToClone && sourceList) {
-                listToClone = sourceList.cloneNode(true);
-                const items = Array.from(listToClone.children);
-                // Shift elements based on track index to prevent identical alignment
-                const shiftAmount = Math.floor(items.length / 3) * index;
-                for (let i = 0; i < shiftAmount; i++) {
-                    listToClone.appendChild(items[i]);
-                }
-                track.appendChild(listToClone);
-            }
-
-            // Clone for infinite scroll effect
-            if (listToClone) {
-                const clone = listToClone.cloneNode(true);
-                clone.setAttribute('aria-hidden', 'true');
-                track.appendChild(clone);
-            }
-        });
-    };
+    // Performance: Lazily start the skills marquee renderer to unblock the main thread
+    const initMarquee = loadOnce(() => import('./marquee.js').then(({ createSkillsMarquee }) => {
+        const marquee = document.querySelector('.skills-marquee');
+        if (marquee) perfTelemetry.wrap('marquee', createSkillsMarquee)(marquee, moduleServices);
+    }));
 
     const marqueeSection = document.getElementById('skills');
     if (marqueeSection && 'IntersectionObserver' in window) {
-        const marqueeObserver = new IntersectionObserver((entries, observer) => {
-            entries.forEach(entry => {
-                if (entry.isIntersecting) {
-                    runWhenIdle(initMarquee);
-                    observer.disconnect();
-                }
-            });
+        const stopWatchingMarquee = scrollScheduler.observe(marqueeSection, (entry) => {
+            if (entry.isIntersecting) {
+                runWhenIdle(() => initMarquee().then(stopWatchingMarquee, reportLoadError));
+            }
         }, { rootMargin: '200px' });
-        marqueeObserver.observe(marqueeSection);
     } else {
-        runWhenIdle(initMarquee);
+        runWhenIdle(() => initMarquee().catch(reportLoadError));
     }
 
     // Dynamic copyright year
@@ -617,7 +508,7 @@ document.addEventListener('DOMContentLoaded', () => {
         };
     };
 
-    const updateNavLinkMetrics = () => {
+    const updateNavLinkMetrics = perfTelemetry.wrap('nav-indicator', () => {
         if (!navList) return;
 
         // Only calculate on desktop where indicator is visible
@@ -631,15 +522,17 @@ document.addEventListener('DOMContentLoaded', () => {
         });
 
         // Also update the current indicator if active, to ensure it snaps to correct position
-        if (activeNavLink && !isInteractingWithNav) {
-            setNavIndicator(activeNavLink);
-        }
-    };
+        scrollScheduler.write(perfTelemetry.wrap('nav-indicator', () => {
+            if (activeNavLink && !isInteractingWithNav) {
+                setNavIndicator(activeNavLink);
+            }
+        }));
+    });
 
     // Initialize metrics after first paint to avoid forcing synchronous layout on startup
-    requestAnimationFrame(updateNavLinkMetrics);
+    scrollScheduler.read(updateNavLinkMetrics);
     // Update when fonts load (as text width changes)
-    document.fonts.ready.then(updateNavLinkMetrics);
+    document.fonts.ready.then(() => scrollScheduler.read(updateNavLinkMetrics));
 
     const setNavIndicator = (link) => {
         if (!navList) {
@@ -833,421 +726,103 @@ document.addEventListener('DOMContentLoaded', () => {
         setTimeout(() => { isInitialCheck = false; }, 1000);
 
         // Observer for scroll animations
-        const animationObserver = new IntersectionObserver((entries) => {
-            // Performance: Avoid accessing window.scrollY/innerHeight to prevent main thread layout thrashing.
-            // Using entry properties is more efficient as they are already calculated.
-
-            entries.forEach(entry => {
-                const rect = entry.boundingClientRect;
-                const isBelowViewport = rect.top > 0;
-
-                // Element is entering from bottom if its top edge is visible (rect.top >= 0)
-                // This covers both scrolling down and elements at the very top (formerly scrollY === 0)
-                const isEnteringFromBottom = rect.top >= 0;
-
-                if (entry.isIntersecting) {
-                    // Show if:
-                    // 1. Initial load (show everything visible)
-                    // 2. Element is entering from bottom (scrolling down or at top)
-                    if (isInitialCheck || isEnteringFromBottom) {
-                        entry.target.classList.add('is-visible');
-                    }
-                } else {
-                    // Hide if:
-                    // 1. It is below viewport (scrolling up past it)
-                    if (isBelowViewport) {
-                        entry.target.classList.remove('is-visible');
-                    }
+        // Performance: Avoid accessing window.scrollY/innerHeight to prevent main thread layout thrashing.
+        // Using entry properties is more efficient as they are already calculated.
+        const handleScrollFade = (entry) => {
+            const rect = entry.boundingClientRect;
+            const isBelowViewport = rect.top > 0;
+
+            // Element is entering from bottom if its top edge is visible (rect.top >= 0)
+            // This covers both scrolling down and elements at the very top (formerly scrollY === 0)
+            const isEnteringFromBottom = rect.top >= 0;
+
+            if (entry.isIntersecting) {
+                // Show if:
+                // 1. Initial load (show everything visible)
+                // 2. Element is entering from bottom (scrolling down or at top)
+                if (isInitialCheck || isEnteringFromBottom) {
+                    entry.target.classList.add('is-visible');
                 }
-            });
-        }, {
-            threshold: 0.15,
-            rootMargin: '0px 0px -6% 0px',
-        });
+            } else {
+                // Hide if:
+                // 1. It is below viewport (scrolling up past it)
+                if (isBelowViewport) {
+                    entry.target.classList.remove('is-visible');
+                }
+            }
+        };
 
         animatedItems.forEach(item => {
             if (!item.classList.contains('ip-section')) {
-                animationObserver.observe(item);
+                scrollScheduler.observe(item, handleScrollFade, {
+                    threshold: 0.15,
+                    rootMargin: '0px 0px -6% 0px'
+                });
             }
         });
 
         // Observer for Active Section
         // rootMargin: '-20% 0px -80% 0px' creates a detection line at 20% from top.
-        const activeSectionObserver = new IntersectionObserver((entries) => {
-            entries.forEach(entry => {
-                if (entry.isIntersecting) {
-                    if (pendingSectionId) {
-                        return;
-                    }
-                    setActiveSection(entry.target.id);
+        const handleActiveSection = (entry) => {
+            if (entry.isIntersecting) {
+                if (pendingSectionId) {
+                    return;
                 }
-            });
-        }, {
-            rootMargin: '-20% 0px -80% 0px',
-            threshold: 0
-        });
+                setActiveSection(entry.target.id);
+            }
+        };
 
-        sections.forEach(section => activeSectionObserver.observe(section));
+        sections.forEach(section => scrollScheduler.observe(section, handleActiveSection, {
+            rootMargin: '-20% 0px -80% 0px'
+        }));
 
     } else {
         animatedItems.forEach(item => item.classList.add('is-visible'));
     }
 
-    let resizeTimeout;
-    window.addEventListener('resize', () => {
-        if (resizeTimeout) clearTimeout(resizeTimeout);
-        // Performance: Debounce resize event to prevent excessive main thread layout recalculations
-        resizeTimeout = setTimeout(() => {
-            // Re-calculate all metrics on resize
-            updateNavLinkMetrics();
-            evaluateInPracticeLayout();
-        }, 150);
-    });
-
-    // In Practice — guard against desktop browsers that fail to size the sticky scene
-    // correctly, which otherwise leaves a tall blank area while scrolling.
-    const ipSceneWraps = document.querySelectorAll('.ip-scene-panel-wrap');
-    const ipScrollScenes = document.querySelectorAll('.ip-scroll-scene');
-    const supportsSticky = typeof CSS !== 'undefined' && CSS.supports && CSS.supports('position', 'sticky');
-
-    // Declared here so setInPracticeFallbackLayout can access it
-    let sceneRevealObserver = null;
-    let refreshSceneObserver = null;
-
-    // Tracks scenes already animated so scroll-lock only fires on first reveal
-    const ipAnimatedScenes = new WeakSet();
-    let ipScrollLockTimer = null;
-
-    const ipLockScroll = () => {
-        if (ipScrollLockTimer) clearTimeout(ipScrollLockTimer);
-        const scrollbarWidth = window.innerWidth - document.documentElement.clientWidth;
-        document.documentElement.style.overflow = 'hidden';
-        if (scrollbarWidth > 0) document.documentElement.style.paddingRight = scrollbarWidth + 'px';
-        // Hold for animation (0.82s) + buffer to appreciate the after state
-        ipScrollLockTimer = setTimeout(() => {
-            document.documentElement.style.overflow = '';
-            document.documentElement.style.paddingRight = '';
-            ipScrollLockTimer = null;
-        }, 1400);
-    };
-
-    const setInPracticeFallbackLayout = (shouldEnable) => {
-        const wasEnabled = document.documentElement.classList.contains('ip-no-sticky');
-        document.documentElement.classList.toggle('ip-no-sticky', shouldEnable);
-        if (shouldEnable) {
-            // Disconnect the IntersectionObserver — CSS already makes both panels visible
-            if (sceneRevealObserver) {
-                sceneRevealObserver.disconnect();
-                sceneRevealObserver = null;
-            }
-            ipScrollScenes.forEach(scene => scene.classList.add('scene-revealed'));
-        } else if (wasEnabled && refreshSceneObserver) {
-            // Sticky support restored after a resize — rebuild the observer
-            refreshSceneObserver();
-        }
-    };
-
-    const evaluateInPracticeLayout = () => {
-        if (!ipSceneWraps.length) return;
-
-        if (!supportsSticky) {
-            setInPracticeFallbackLayout(true);
-            return;
-        }
-
-        const hasCollapsedScene = Array.from(ipSceneWraps).some((wrap) => {
-            const rect = wrap.getBoundingClientRect();
-            return rect.height < 24 || rect.width < 24;
-        });
-
-        setInPracticeFallbackLayout(hasCollapsedScene);
-    };
-
-    if (ipSceneWraps.length) {
-        requestAnimationFrame(evaluateInPracticeLayout);
-    }
-
-    // In Practice — add ip-visible to each act as soon as it enters the viewport
-    // (threshold: 0 because acts now contain tall scroll scenes; we only need the top edge)
-    const ipActs = document.querySelectorAll('.ip-act');
-    if (ipActs.length) {
-        const revealVisibleIpActs = () => {
-            const viewportHeight = window.innerHeight || document.documentElement.clientHeight;
-
-            // Performance: Batch DOM reads to prevent layout thrashing
-            const actsToReveal = [];
-            ipActs.forEach((act) => {
-                const rect = act.getBoundingClientRect();
-                if (rect.bottom > 0 && rect.top < viewportHeight) {
-                    actsToReveal.push(act);
-                }
-            });
-
-            // Performance: Batch DOM writes
-            actsToReveal.forEach(act => act.classList.add('ip-visible'));
-        };
+    // Re-calculate all metrics on resize (debounced by the scheduler's resize bus)
+    scrollScheduler.onResize(updateNavLinkMetrics);
 
-        if (supportsIO) {
-            const actObserver = new IntersectionObserver((entries) => {
-                entries.forEach(entry => {
-                    if (entry.isIntersecting) {
-                        entry.target.classList.add('ip-visible');
-                        actObserver.unobserve(entry.target);
-                    }
-                });
-            }, { threshold: 0, rootMargin: '-80px 0px 0px 0px' });
-
-            ipActs.forEach(act => actObserver.observe(act));
-            revealVisibleIpActs();
-            let actResizeTimeout;
-            window.addEventListener('resize', () => {
-                if (actResizeTimeout) clearTimeout(actResizeTimeout);
-                // Performance: Debounce resize event to prevent excessive main thread layout recalculations
-                actResizeTimeout = setTimeout(revealVisibleIpActs, 150);
-            });
-            requestAnimationFrame(() => {
-                if (!document.querySelector('.ip-act.ip-visible')) {
-                    ipActs[0].classList.add('ip-visible');
-                }
-            });
-        } else {
-            ipActs.forEach(act => act.classList.add('ip-visible'));
-        }
-    }
-
-    // In Practice — crossfade from "before" to "after" when the sentinel
-    // element (positioned mid-scene) scrolls into view.
-    // Uses IntersectionObserver for zero main-thread scroll cost: no scroll
-    // listener, no rAF, no getBoundingClientRect on every frame.
-    if (ipScrollScenes.length) {
-        if (!supportsIO) {
-            ipScrollScenes.forEach(scene => scene.classList.add('scene-revealed'));
-        } else {
-        // Performance: Pre-cache trigger elements and their parent scenes once,
-        // avoiding repeated querySelector calls inside any hot path.
-        const triggerToScene = new Map();
-        const cachedTriggers = [];
-        ipScrollScenes.forEach(scene => {
-            const trigger = scene.querySelector('.ip-scene-trigger');
-            if (trigger) {
-                cachedTriggers.push(trigger);
-                triggerToScene.set(trigger, scene);
-            }
-        });
-
-        // Performance: Create the MediaQueryList once; check .matches (a cheap
-        // property read) instead of calling matchMedia() on every frame.
-        const mobileQuery = window.matchMedia('(max-width: 720px)');
-
-        const setupSceneRevealObserver = () => {
-            if (!supportsIO) {
-                ipScrollScenes.forEach(scene => scene.classList.add('scene-revealed'));
-                return;
-            }
-
-            if (sceneRevealObserver) {
-                sceneRevealObserver.disconnect();
-                sceneRevealObserver = null;
-            }
-
-            // In no-sticky mode both panels are already visible via CSS; nothing to observe.
-            if (document.documentElement.classList.contains('ip-no-sticky') || !cachedTriggers.length) return;
-
-            if (supportsIO) {
-                // Shrink the bottom of the viewport detection zone so the observer fires at
-                // the same visual threshold as the previous getBoundingClientRect logic:
-                //   desktop → 58 % from top  →  bottom margin = -(100 - 58) % = -42 %
-                //   mobile  → 78 % from top  →  bottom margin = -(100 - 78) % = -22 %
-                const rootMarginBottom = mobileQuery.matches ? '-22%' : '-42%';
-
-                sceneRevealObserver = new IntersectionObserver((entries) => {
-                    entries.forEach(entry => {
-                        const scene = triggerToScene.get(entry.target);
-                        if (!scene) return;
-                        // Reveal when the trigger is inside the detection zone OR has
-                        // already scrolled above it (top < 0 means above the viewport).
-                        const shouldReveal = entry.isIntersecting || entry.boundingClientRect.top < 0;
-                        scene.classList.toggle('scene-revealed', shouldReveal);
-                        // On first reveal (not on scroll-back), briefly lock scroll so the
-                        // swipe animation can complete before the page moves on. Skip on
-                        // mobile where touch physics behave differently.
-                        if (entry.isIntersecting && !ipAnimatedScenes.has(scene) && !mobileQuery.matches) {
-                            ipAnimatedScenes.add(scene);
-                            ipLockScroll();
-                        }
-                    });
-                }, {
-                    rootMargin: `0px 0px ${rootMarginBottom} 0px`,
-                    threshold: 0,
-                });
-
-                cachedTriggers.forEach(trigger => sceneRevealObserver.observe(trigger));
-            } else {
-                // Fallback: Reveal all scenes immediately if IntersectionObserver is unavailable
-                ipScrollScenes.forEach(scene => scene.classList.add('scene-revealed'));
-            }
-        };
-
-        // Store reference so setInPracticeFallbackLayout can rebuild the observer
-        // if sticky support is restored after a resize.
-        refreshSceneObserver = setupSceneRevealObserver;
-
-        // Recreate with the correct rootMargin when the mobile breakpoint changes.
-        mobileQuery.addEventListener('change', setupSceneRevealObserver);
-        setupSceneRevealObserver();
-        }
-    }
-
-    // Form Validation
+    // Form Validation: contact-form.js loads as the form nears the viewport. A
+    // submit that comes first waits for it, so nothing is sent unvalidated.
     const contactForm = document.querySelector('.contact-form');
     if (contactForm) {
-        const submitButton = contactForm.querySelector('.contact-submit-btn');
-
-        // Time-based bot detection: record when the form section first loads
+        // Time-based bot detection: record when the page loads
         const formLoadTimeInput = document.getElementById('formLoadTime');
         if (formLoadTimeInput) {
             formLoadTimeInput.value = Date.now();
         }
 
-        // Rate limiting via localStorage: max 5 submissions per 15 minutes
-        const RATE_LIMIT_MAX = 5;
-        const RATE_LIMIT_WINDOW_MS = 15 * 60 * 1000;
-        function isRateLimited() {
-            const now = Date.now();
-            let timestamps;
-            try {
-                timestamps = JSON.parse(localStorage.getItem('_formSubmits') || '[]');
-                // Security Enhancement: Validate that parsed JSON is actually an array
-                // before calling array methods, preventing unhandled exceptions if
-                // localStorage was tampered with or corrupted.
-                if (!Array.isArray(timestamps)) timestamps = [];
-            } catch (_) {
-                timestamps = [];
-            }
-            timestamps = timestamps.filter(t => typeof t === 'number' && now - t < RATE_LIMIT_WINDOW_MS);
-            if (timestamps.length >= RATE_LIMIT_MAX) return true;
-            timestamps.push(now);
-            try {
-                localStorage.setItem('_formSubmits', JSON.stringify(timestamps));
-            } catch (_) { /* storage unavailable */ }
-            return false;
-        }
-
-        // UX Improvement: Clear inline validation errors instantly when the user starts typing to correct them
-        contactForm.querySelectorAll('input, textarea').forEach(input => {
-            input.addEventListener('input', () => {
-                if (input.getAttribute('aria-invalid') === 'true') {
-                    input.removeAttribute('aria-invalid');
-                    input.removeAttribute('aria-describedby');
-                    const errorMsg = document.getElementById(`${input.id}-error`);
-                    if (errorMsg) errorMsg.remove();
-                }
+        let contactFormReady = false;
+        const loadContactForm = loadOnce(() => import('./contact-form.js').then(({ initContactForm }) => {
+            initContactForm(contactForm, moduleServices);
+            contactFormReady = true;
+        }));
+
+        contactForm.addEventListener('submit', (event) => {
+            if (contactFormReady) return;
+            event.preventDefault();
+            loadContactForm().then(() => contactForm.requestSubmit(), (error) => {
+                // Nothing is sent unchecked: the message stays and the next submit retries the import.
+                reportLoadError(error);
+                contactForm.dataset.submitState = 'failed';
+                const loadError = contactForm.querySelector('.error-msg-send') || document.createElement('p');
+                loadError.className = 'error-msg error-msg-send';
+                loadError.setAttribute('role', 'status');
+                loadError.textContent = 'The form could not be loaded. Please try again.';
+                contactForm.querySelector('.contact-submit-btn').before(loadError);
             });
         });
+        loadWhenNear(contactForm, loadContactForm);
 
-        contactForm.addEventListener('submit', (e) => {
-            // Bot protection 1: Honeypot — reject if hidden field is filled
-            const gotchaInput = contactForm.querySelector('input[name="_gotcha"]');
-            if (gotchaInput && gotchaInput.value) {
-                e.preventDefault();
-                return;
-            }
-
-            // Bot protection 2: Time-based — reject if form was submitted in under 2 seconds
-            const loadTime = parseInt(formLoadTimeInput ? formLoadTimeInput.value : '0', 10);
-            if (!loadTime || Date.now() - loadTime < 2000) {
-                e.preventDefault();
-                return;
-            }
-
-            // Bot protection 3: Rate limiting — max 5 submissions per 15-minute window
-            if (isRateLimited()) {
-                e.preventDefault();
-                const existingRateError = contactForm.querySelector('.error-msg-rate');
-                if (!existingRateError) {
-                    const rateError = document.createElement('p');
-                    rateError.className = 'error-msg error-msg-rate';
-                    rateError.textContent = 'Too many submissions. Please wait a few minutes before trying again.';
-                    rateError.setAttribute('role', 'status');
-                    contactForm.insertBefore(rateError, submitButton);
-                }
-                return;
-            }
-
-            let isValid = true;
-
-            // Remove existing messages
-            const existingErrors = contactForm.querySelectorAll('.error-msg, .form-success-msg');
-            existingErrors.forEach(error => {
-                // Remove ARIA attributes from the associated input
-                const input = error.previousSibling;
-                if (input && input.removeAttribute) {
-                    input.removeAttribute('aria-invalid');
-                    input.removeAttribute('aria-describedby');
-                }
-                error.remove();
-            });
-
-            // Helper to add error message
-            const showError = (input, message) => {
-                const errorSpan = document.createElement('span');
-                errorSpan.className = 'error-msg';
-                errorSpan.id = `${input.id}-error`;
-                errorSpan.textContent = message;
-                errorSpan.setAttribute('role', 'status');
-                input.parentNode.insertBefore(errorSpan, input.nextSibling);
-                input.setAttribute('aria-invalid', 'true');
-                input.setAttribute('aria-describedby', errorSpan.id);
-                isValid = false;
-            };
-
-            // Validate Name
-            const nameInput = document.getElementById('name');
-            if (!nameInput.value.trim()) {
-                showError(nameInput, 'Name is required.');
-            }
-
-            // Validate Email
-            const emailInput = document.getElementById('email');
-            const emailRegex = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
-            if (!emailInput.value.trim()) {
-                showError(emailInput, 'Email is required.');
-            } else if (!emailRegex.test(emailInput.value.trim())) {
-                showError(emailInput, 'Please enter a valid email address.');
-            }
-
-            // Validate Message
-            const messageInput = document.getElementById('message');
-            if (!messageInput.value.trim()) {
-                showError(messageInput, 'Message is required.');
-            }
-
-            if (!isValid) {
-                e.preventDefault();
-                // Accessibility: Shift focus to the first invalid input for immediate error recovery
-                const firstInvalidInput = contactForm.querySelector('[aria-invalid="true"]');
-                if (firstInvalidInput) {
-                    firstInvalidInput.focus();
-                }
-                return;
-            }
-
-            if (submitButton) {
-                const submitText = submitButton.querySelector('.submit-text');
-                const submitSpinner = submitButton.querySelector('.submit-spinner');
-                if (submitText) submitText.textContent = 'Sending...';
-                if (submitSpinner) submitSpinner.removeAttribute('hidden');
-                submitButton.disabled = true;
-                submitButton.setAttribute('aria-disabled', 'true');
-            }
-            contactForm.classList.add('is-submitting');
-
-            const successMsg = document.createElement('p');
-            successMsg.className = 'form-success-msg';
-            successMsg.setAttribute('role', 'status');
-            successMsg.textContent = 'Looks great — sending your message now.';
-            contactForm.insertBefore(successMsg, submitButton);
-        });
+        // A message saved in the outbox on an earlier visit is sent straight away.
+        let hasSavedMessage = false;
+        try {
+            hasSavedMessage = Boolean(localStorage.getItem(moduleServices.contactOutboxKey));
+        } catch (_) { /* storage unavailable */ }
+        if (hasSavedMessage) {
+            loadContactForm().catch(reportLoadError);
+        }
     }
 
     // Back to Top Button
@@ -1264,131 +839,37 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     });
 
-    const legalModalTriggers = document.querySelectorAll('[data-legal-modal-target]');
-    const legalModalCloseButtons = document.querySelectorAll('[data-legal-modal-close]');
-
-    // Performance: Cache legal modal overlays to prevent repeated DOM queries on every keydown event
-    const legalModalOverlays = document.querySelectorAll('.legal-modal-overlay');
-
-    const openLegalModal = (modal) => {
-        if (!modal) return;
-        modal.hidden = false;
-        document.body.style.overflow = 'hidden';
-        const closeButton = modal.querySelector('[data-legal-modal-close]');
-        if (closeButton) {
-            closeButton.focus();
-        }
-    };
-
-    const closeLegalModal = (modal) => {
-        if (!modal) return;
-        modal.hidden = true;
-        const hasOpenModal = Array.from(legalModalOverlays).some(overlay => !overlay.hidden);
-        if (!hasOpenModal) {
-            document.body.style.overflow = '';
-        }
-    };
-
-    legalModalTriggers.forEach(trigger => {
+    // Legal modals: hovering or focusing a trigger loads legal-modals.js and
+    // starts fetching that modal's body, so a click usually finds both ready.
+    const loadLegalModals = loadOnce(() => import('./legal-modals.js').then(({ initLegalModals }) => initLegalModals()));
+    document.querySelectorAll('[data-legal-modal-target]').forEach((trigger) => {
+        const targetId = trigger.getAttribute('data-legal-modal-target');
+        if (!targetId) return;
+        const warm = () => {
+            loadLegalModals().then(({ warmLegalModal }) => warmLegalModal(document.getElementById(targetId)), () => {});
+        };
+        trigger.addEventListener('pointerenter', warm, { once: true });
+        trigger.addEventListener('focus', warm, { once: true });
         trigger.addEventListener('click', () => {
-            const targetId = trigger.getAttribute('data-legal-modal-target');
-            if (!targetId) return;
-            const modal = document.getElementById(targetId);
-            openLegalModal(modal);
-        });
-    });
-
-    legalModalCloseButtons.forEach(button => {
-        button.addEventListener('click', () => {
-            const modal = button.closest('.legal-modal-overlay');
-            closeLegalModal(modal);
-        });
-    });
-
-    legalModalOverlays.forEach((overlay) => {
-        overlay.addEventListener('click', (event) => {
-            if (event.target === overlay) {
-                closeLegalModal(overlay);
-            }
-        });
-    });
-
-    document.addEventListener('keydown', (event) => {
-        if (event.key === 'Escape') {
-            legalModalOverlays.forEach((overlay) => {
-                if (!overlay.hidden) {
-                    closeLegalModal(overlay);
-                }
-            });
-        }
-    });
-
-    document.querySelectorAll('.terms-email-reveal').forEach((button) => {
-        button.addEventListener('click', () => {
-            const user = button.dataset.emailUser;
-            const domain = button.dataset.emailDomain;
-            if (!user || !domain) return;
-
-            const email = `${user}@${domain}`;
-            const output = button.nextElementSibling;
-            if (!output) return;
-
-            output.textContent = ` ${email}`;
-            button.hidden = true;
+            loadLegalModals().then(({ openLegalModal }) => openLegalModal(document.getElementById(targetId)),
+                reportLoadError);
         });
     });
 
     const backToTopBtn = document.getElementById('back-to-top');
-
     if (backToTopBtn) {
+        const loadBackToTop = loadOnce(() => import('./back-to-top.js').then(({ initBackToTop }) => {
+            initBackToTop(backToTopBtn, moduleServices);
+        }));
         const sentinel = document.getElementById('back-to-top-sentinel');
 
         if (supportsIO && sentinel) {
-            // Performance: Use IntersectionObserver instead of scroll listener to avoid main thread work
-            // The sentinel is 200px tall at the top of the body.
-            // When it stops intersecting, it means the user has scrolled past 200px.
-            const backToTopObserver = new IntersectionObserver((entries) => {
-                entries.forEach(entry => {
-                    if (!entry.isIntersecting) {
-                        backToTopBtn.classList.add('is-visible');
-                    } else {
-                        backToTopBtn.classList.remove('is-visible');
-                    }
-                });
-            }, {
-                threshold: 0,
-                // Optional: ensure it works even if sentinel is slightly off-screen
-                rootMargin: '0px'
+            // The button is only needed once the page has scrolled past the sentinel.
+            const stopWatchingSentinel = scrollScheduler.observe(sentinel, (entry) => {
+                if (!entry.isIntersecting) loadBackToTop().then(stopWatchingSentinel, reportLoadError);
             });
-            backToTopObserver.observe(sentinel);
         } else {
-            // Fallback for older browsers or if sentinel is missing
-            window.addEventListener('scroll', () => {
-                if (window.scrollY > 200) {
-                    backToTopBtn.classList.add('is-visible');
-                } else {
-                    backToTopBtn.classList.remove('is-visible');
-                }
-            }, { passive: true });
+            loadBackToTop().catch(reportLoadError);
         }
-
-        // Performance: Cache skip link to avoid redundant DOM queries on every click
-        // Yields ~13-18x speed improvement for the click operation
-        const skipLink = document.querySelector('.skip-link');
-
-        // Performance: Cache matchMedia query to avoid synchronous style recalculations on every click
-        const prefersReducedMotionQuery = window.matchMedia('(prefers-reduced-motion: reduce)');
-
-        backToTopBtn.addEventListener('click', () => {
-            const prefersReducedMotion = prefersReducedMotionQuery.matches;
-            window.scrollTo({
-                top: 0,
-                behavior: prefersReducedMotion ? 'auto' : 'smooth'
-            });
-            // Accessibility: Move focus to skip link (start of page)
-            if (skipLink) {
-                skipLink.focus({ preventScroll: true });
-            }
-        });
     }
 });
@@ -0,0 +1,5 @@
+"""Performance benchmarks for the site, driven by the shared Playwright harness.
+
+Benchmarks are not collected by pytest; run them as modules from the
+repository root, e.g. ``python -m tests.bench.web_vitals``.
+"""
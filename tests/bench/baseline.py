@@ -0,0 +1,68 @@
+"""Compare a benchmark report against a stored baseline.
+
+A metric regresses when its current median is worse than the baseline median
+by more than ``tolerance`` (relative) *and* by more than the metric's absolute
+slack, so tiny timings near zero do not flap on noise.
+"""
+import json
+from pathlib import Path
+
+# Absolute slack per metric, in the metric's own unit (ms, or unitless for CLS).
+DEFAULT_SLACK = {
+    "cls": 0.01,
+    "long_task_count": 1,
+}
+DEFAULT_TIME_SLACK_MS = 20.0
+
+
+def load_report(path):
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def write_report(report, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def compare(current, baseline, tolerance=0.10, slack=None, statistic="p50"):
+    """Return a list of regression dicts; an empty list means no regressions.
+
+    Both arguments are reports shaped like ``{"profiles": {name: {"summary":
+    {metric: {"p50": ...}}}}}``. Profiles or metrics missing from either side
+    are skipped, so adding a metric does not fail against an older baseline.
+    """
+    slack = {**DEFAULT_SLACK, **(slack or {})}
+    regressions = []
+    for profile, current_profile in sorted(current.get("profiles", {}).items()):
+        baseline_profile = baseline.get("profiles", {}).get(profile)
+        if baseline_profile is None:
+            continue
+        for metric, current_summary in sorted(current_profile.get("summary", {}).items()):
+            baseline_summary = baseline_profile.get("summary", {}).get(metric)
+            if not baseline_summary:
+                continue
+            now = current_summary.get(statistic)
+            before = baseline_summary.get(statistic)
+            if now is None or before is None:
+                continue
+            allowed = max(before * (1 + tolerance), before + slack.get(metric, DEFAULT_TIME_SLACK_MS))
+            if now > allowed:
+                regressions.append({
+                    "profile": profile,
+                    "metric": metric,
+                    "baseline": before,
+                    "current": now,
+                    "allowed": allowed,
+                })
+    return regressions
+
+
+def format_regressions(regressions, statistic="p50"):
+    lines = []
+    for item in regressions:
+        lines.append(
+            f"{item['profile']}: {item['metric']} {statistic} {item['current']:.3f} "
+            f"exceeds baseline {item['baseline']:.3f} (allowed {item['allowed']:.3f})"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,311 @@
+"""Frame-time benchmark for the hero neural-network canvas.
+
+Installs ``window.__heroFrameProbe`` before the page loads. initHeroNeuralNetwork
+picks it up and reports a timestamp after each phase of every animation frame
+(rebuildSpatialGrid, cacheAllNeighbors, clearRect, drawConnections, the drawNode
+loop, updateNodes). The probe also pins the node count, the low-power mode and
+the quality tier (the adaptive governor is switched off; tier 2 by default), so
+every configuration does the same amount of work on any machine.
+
+Each configuration (a viewport, which sets the canvas size, plus a node count)
+runs for a fixed number of frames after a warm-up. The benchmark reports the
+mean/p95/p99 cost of each phase and of the whole frame, plus dropped frames
+(gaps between frames longer than the measured refresh interval).
+
+``--renderer worker`` runs the same matrix with the OffscreenCanvas worker
+renderer (``?hero=worker``). Phase timings then come from the worker, and the
+main-thread long tasks recorded while the pointer moves and clicks over the
+hero show how much work stays on the main thread in each mode.
+
+The process exits non-zero when the p95 of the connection-drawing pass is over
+``--max-connections-ms`` in any configuration, or when ``--baseline`` is given
+and a phase regressed against it, so CI can gate on it.
+
+Usage (from the repository root):
+
+    python -m tests.bench.hero_frames
+    python -m tests.bench.hero_frames --frames 600 --max-connections-ms 6
+    python -m tests.bench.hero_frames --renderer worker
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+from . import baseline as baseline_mod
+from . import stats
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+if str(TESTS_DIR) not in sys.path:
+    sys.path.insert(0, str(TESTS_DIR))
+
+import harness  # noqa: E402
+import waits  # noqa: E402
+
+DEFAULT_OUTPUT = TESTS_DIR / "bench" / "results" / "hero-frames.json"
+
+PHASES = ("rebuildSpatialGrid", "cacheAllNeighbors", "clearRect", "drawConnections", "drawNode", "updateNodes")
+
+# Half of a 60Hz frame: the connection pass must leave room for everything else.
+DEFAULT_MAX_CONNECTIONS_MS = 8.0
+
+# (name, viewport, node count); a node count of None keeps the page's own
+# area-based density (70-130 nodes).
+CONFIGS = (
+    ("1280x800-default", {"width": 1280, "height": 800}, None),
+    ("1280x800-260", {"width": 1280, "height": 800}, 260),
+    ("1920x1080-130", {"width": 1920, "height": 1080}, 130),
+    ("1920x1080-520", {"width": 1920, "height": 1080}, 520),
+    ("2560x1440-1000", {"width": 2560, "height": 1440}, 1000),
+    ("390x844-70", {"width": 390, "height": 844}, 70),
+)
+
+RENDERERS = ("main", "worker")
+
+# Tier 2 of HERO_QUALITY_TIERS in hero-engine.js is the original fixed configuration.
+QUALITY_TIERS = (0, 1, 2, 3, 4)
+DEFAULT_QUALITY_TIER = 2
+
+PROBE_SCRIPT = """
+(() => {
+    const config = __CONFIG__;
+    const longTasks = [];
+    try {
+        new PerformanceObserver((list) => {
+            list.getEntries().forEach((entry) => longTasks.push(entry.duration));
+        }).observe({ type: 'longtask', buffered: true });
+    } catch (error) {
+        // Long Tasks API unavailable; main-thread figures stay empty.
+    }
+    const phases = __PHASES__;
+    const total = config.warmupFrames + config.frames;
+    const starts = new Float64Array(total);
+    const costs = new Float64Array(total);
+    const phaseTimes = phases.map(() => new Float64Array(total));
+    let index = -1;
+    let last = 0;
+    let resolveDone;
+    const done = new Promise((resolve) => { resolveDone = resolve; });
+
+    const finish = () => {
+        const from = config.warmupFrames;
+        const slice = (array) => Array.from(array.subarray(from, total));
+        const byPhase = {};
+        phases.forEach((phase, p) => { byPhase[phase] = slice(phaseTimes[p]); });
+        resolveDone({ starts: slice(starts), costs: slice(costs), phases: byPhase, longTasks: longTasks.slice() });
+    };
+
+    window.__heroFrameProbe = {
+        nodeCount: config.nodeCount,
+        lowPowerDevice: config.lowPowerDevice,
+        qualityTier: config.qualityTier,
+        nodes: null,
+        done,
+        mark(phase, now) {
+            if (index >= total) return;
+            if (phase === 'frame') {
+                index += 1;
+                if (index === total) {
+                    finish();
+                    return;
+                }
+                starts[index] = now;
+                last = now;
+                return;
+            }
+            if (index < 0) return;
+            phaseTimes[phases.indexOf(phase)][index] += now - last;
+            costs[index] = now - starts[index];
+            last = now;
+        },
+    };
+})();
+"""
+
+AWAIT_PROBE = """
+(timeout) => new Promise((resolve, reject) => {
+    const natives = window.__hireWaitNatives || window;
+    const probe = window.__heroFrameProbe;
+    const timer = natives.setTimeout(() => reject(new Error('Hero animation did not produce enough frames')), timeout);
+    probe.done.then((result) => {
+        natives.clearTimeout(timer);
+        const canvas = document.getElementById('hero-neural-canvas');
+        resolve({ ...result, nodes: probe.nodes, canvas: [canvas.width, canvas.height] });
+    });
+})
+"""
+
+
+def probe_script(frames, warmup_frames, node_count=None, low_power=False, quality_tier=DEFAULT_QUALITY_TIER):
+    config = {
+        "frames": frames,
+        "warmupFrames": warmup_frames,
+        "nodeCount": node_count,
+        "lowPowerDevice": low_power,
+        "qualityTier": quality_tier,
+    }
+    return PROBE_SCRIPT.replace("__CONFIG__", json.dumps(config)).replace("__PHASES__", json.dumps(PHASES))
+
+
+def dropped_frames(starts):
+    """Count frames missed between consecutive ``requestAnimationFrame`` callbacks.
+
+    The refresh interval is taken as the median gap, so the count does not
+    assume a 60Hz display.
+    """
+    intervals = [b - a for a, b in zip(starts, starts[1:])]
+    if not intervals:
+        return 0, None
+    expected = stats.median(intervals)
+    if not expected:
+        return 0, expected
+    dropped = sum(max(0, round(interval / expected) - 1) for interval in intervals)
+    return dropped, expected
+
+
+def summarize_run(raw):
+    summary = {"frame": stats.summarize(raw["costs"], percentiles=(50, 95, 99))}
+    for phase, values in raw["phases"].items():
+        summary[phase] = stats.summarize(values, percentiles=(50, 95, 99))
+    dropped, interval = dropped_frames(raw["starts"])
+    long_tasks = raw.get("longTasks", [])
+    return {
+        "nodes": raw["nodes"],
+        "canvas": raw["canvas"],
+        "frames": len(raw["costs"]),
+        "dropped_frames": dropped,
+        "refresh_interval_ms": interval,
+        "main_thread": {
+            "long_tasks": len(long_tasks),
+            "blocking_ms": sum(max(0.0, duration - 50) for duration in long_tasks),
+        },
+        "summary": summary,
+    }
+
+
+def _drive_pointer(page, viewport, steps=120):
+    """Sweep the pointer across the hero and click a few times while frames are recorded."""
+    width, height = viewport["width"], min(viewport["height"], 600)
+    for step in range(steps):
+        x = 20 + (width - 40) * (step % 60) / 59
+        y = 80 + (height - 160) * ((step // 60) % 2)
+        page.mouse.move(x, y)
+        if step % 40 == 39:
+            page.mouse.click(x, y)
+
+
+def run_config(browser, base_url, viewport, node_count, frames, warmup_frames, low_power=False, renderer="main",
+               quality_tier=DEFAULT_QUALITY_TIER):
+    context = browser.new_context(viewport=viewport, reduced_motion="no-preference")
+    try:
+        context.add_init_script(waits.INIT_SCRIPT)
+        context.add_init_script(probe_script(frames, warmup_frames, node_count, low_power, quality_tier))
+        harness.block_external_fonts(context)
+        page = context.new_page()
+        query = "?hero=worker" if renderer == "worker" else ""
+        page.goto(f"{base_url}/{query}", wait_until="load")
+        if not waits.wait_for_attribute(page, "#hero-neural-canvas", "data-hero-active-renderer", renderer):
+            active = page.get_attribute("#hero-neural-canvas", "data-hero-active-renderer")
+            raise RuntimeError(f"Hero started on the {active!r} renderer, not {renderer!r}")
+        _drive_pointer(page, viewport)
+        # Generous: one second per 30 frames, for slow software-rendered CI.
+        timeout = max(10_000, (frames + warmup_frames) * 1000 // 30)
+        raw = page.evaluate(AWAIT_PROBE, timeout)
+        return summarize_run(raw)
+    finally:
+        context.close()
+
+
+def check_threshold(report, max_connections_ms):
+    failures = []
+    for name, result in report["profiles"].items():
+        p95 = result["summary"]["drawConnections"].get("p95")
+        if p95 is not None and p95 > max_connections_ms:
+            failures.append(f"{name}: drawConnections p95 {p95:.3f}ms exceeds {max_connections_ms:.3f}ms")
+    return failures
+
+
+def _fmt(value):
+    return "n/a" if value is None else f"{value:.3f}"
+
+
+def print_summary(report, stream=sys.stdout):
+    header = (f"{'config':<18}{'nodes':>6}{'phase':>20}{'mean':>9}{'p95':>9}{'p99':>9}")
+    stream.write(header + "\n" + "-" * len(header) + "\n")
+    for name, result in report["profiles"].items():
+        for phase in ("frame",) + PHASES:
+            summary = result["summary"][phase]
+            stream.write(f"{name:<18}{result['nodes']:>6}{phase:>20}{_fmt(summary.get('mean')):>9}"
+                         f"{_fmt(summary.get('p95')):>9}{_fmt(summary.get('p99')):>9}\n")
+        stream.write(f"{name:<18}{'':>6}{'dropped frames':>20}{result['dropped_frames']:>9}"
+                     f"  of {result['frames']}\n")
+        main_thread = result["main_thread"]
+        stream.write(f"{name:<18}{'':>6}{'main long tasks':>20}{main_thread['long_tasks']:>9}"
+                     f"  ({main_thread['blocking_ms']:.1f}ms blocking)\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure per-phase frame cost of the hero canvas.")
+    parser.add_argument("--config", action="append", choices=[name for name, _viewport, _nodes in CONFIGS],
+                        help="configuration to run; repeatable (default: all)")
+    parser.add_argument("--frames", type=int, default=300, help="measured frames per configuration (default: 300)")
+    parser.add_argument("--warmup-frames", type=int, default=60, help="unrecorded frames first (default: 60)")
+    parser.add_argument("--renderer", choices=RENDERERS, default="main",
+                        help="render on the main thread or in the OffscreenCanvas worker (default: main)")
+    parser.add_argument("--quality-tier", type=int, choices=QUALITY_TIERS, default=DEFAULT_QUALITY_TIER,
+                        help="quality tier to pin while measuring (default: %(default)s)")
+    parser.add_argument("--low-power", action="store_true",
+                        help="benchmark the low-power path (updates every frame, draws every other frame)")
+    parser.add_argument("--max-connections-ms", type=float, default=DEFAULT_MAX_CONNECTIONS_MS,
+                        help="fail when drawConnections p95 exceeds this (default: %(default)s)")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="where to write the JSON report")
+    parser.add_argument("--baseline", help="also fail if phase medians regress against this report")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="allowed relative regression against the baseline (default: 0.15)")
+    args = parser.parse_args(argv)
+
+    selected = [config for config in CONFIGS if not args.config or config[0] in args.config]
+    session = harness.get_session()
+    report = {
+        "meta": {
+            "benchmark": "hero-frames",
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "browser": session.browser.version,
+            "platform": platform.platform(),
+            "frames": args.frames,
+            "low_power": args.low_power,
+            "renderer": args.renderer,
+            "quality_tier": args.quality_tier,
+        },
+        "profiles": {},
+    }
+    try:
+        for name, viewport, node_count in selected:
+            sys.stderr.write(f"Running {name}...\n")
+            report["profiles"][name] = run_config(session.browser, session.base_url, viewport, node_count,
+                                                  args.frames, args.warmup_frames, args.low_power, args.renderer,
+                                                  args.quality_tier)
+    finally:
+        harness.shutdown()
+
+    baseline_mod.write_report(report, args.output)
+    print_summary(report)
+    print(f"\nWrote {args.output}")
+
+    failures = check_threshold(report, args.max_connections_ms)
+    if args.baseline:
+        # Sub-millisecond phases need a smaller absolute slack than page-level timings.
+        slack = {phase: 0.25 for phase in ("frame",) + PHASES}
+        regressions = baseline_mod.compare(report, baseline_mod.load_report(args.baseline), args.tolerance, slack)
+        if regressions:
+            failures.append(baseline_mod.format_regressions(regressions))
+    if failures:
+        print("\nFAILED:\n" + "\n".join(failures))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
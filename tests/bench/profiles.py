@@ -0,0 +1,44 @@
+"""Viewport and CPU-throttling profiles the benchmarks run under.
+
+``cpu_throttling`` is passed to ``Emulation.setCPUThrottlingRate`` (1 means no
+slowdown); the mobile profile approximates a mid-range phone the same way
+Lighthouse's mobile preset does.
+"""
+
+PROFILES = {
+    "desktop": {
+        "viewport": {"width": 1280, "height": 800},
+        "device_scale_factor": 1,
+        "is_mobile": False,
+        "has_touch": False,
+        "cpu_throttling": 1,
+    },
+    "laptop-throttled": {
+        "viewport": {"width": 1280, "height": 800},
+        "device_scale_factor": 1,
+        "is_mobile": False,
+        "has_touch": False,
+        "cpu_throttling": 4,
+    },
+    "mobile": {
+        "viewport": {"width": 390, "height": 844},
+        "device_scale_factor": 3,
+        "is_mobile": True,
+        "has_touch": True,
+        "cpu_throttling": 4,
+    },
+}
+
+DEFAULT_PROFILES = ("desktop", "mobile")
+
+
+def get_profile(name):
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown profile {name!r}; choose from {', '.join(sorted(PROFILES))}") from None
+
+
+def context_options(profile):
+    """Return the ``browser.new_context`` keyword arguments for ``profile``."""
+    return {key: profile[key] for key in ("viewport", "device_scale_factor", "is_mobile", "has_touch")}
@@ -0,0 +1,48 @@
+"""Small, dependency-free summary statistics for benchmark samples."""
+import math
+
+SUMMARY_PERCENTILES = (50, 75, 95)
+
+
+def percentile(values, pct):
+    """Return the ``pct``-th percentile of ``values`` using linear interpolation.
+
+    Matches the default ("linear") method of ``numpy.percentile``. Returns
+    ``None`` for an empty sample.
+    """
+    if not 0 <= pct <= 100:
+        raise ValueError(f"Percentile must be between 0 and 100, got {pct}")
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = (len(ordered) - 1) * pct / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return float(ordered[lower])
+    fraction = rank - lower
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * fraction
+
+
+def median(values):
+    return percentile(values, 50)
+
+
+def summarize(values, percentiles=SUMMARY_PERCENTILES):
+    """Summarize a sample as ``n``, ``min``, ``max``, ``mean`` and ``p<N>`` keys.
+
+    ``None`` entries (a metric the browser did not report in that run) are
+    dropped before summarizing.
+    """
+    sample = [value for value in values if value is not None]
+    if not sample:
+        return {"n": 0}
+    summary = {
+        "n": len(sample),
+        "min": float(min(sample)),
+        "max": float(max(sample)),
+        "mean": sum(sample) / len(sample),
+    }
+    for pct in percentiles:
+        summary[f"p{pct}"] = percentile(sample, pct)
+    return summary
@@ -0,0 +1,263 @@
+"""Core Web Vitals benchmark for index.html.
+
+Loads the page under each viewport/CPU-throttling profile, scrolls it end to
+end, drives a few real interactions and records what the browser reports via
+PerformanceObserver:
+
+* LCP (and which element/URL won: the brand logo and the hero photo are both
+  preloaded as candidates),
+* FCP,
+* CLS using the session-window definition (gaps of 1s, windows of at most 5s),
+* INP from the scripted interactions (event timing grouped by interactionId),
+* TBT and the long-task count for tasks that start after FCP and before the
+  scripted interactions begin.
+
+Each profile is run ``--runs`` times in fresh contexts; medians and
+percentiles are written to JSON, which can be compared against a stored
+baseline. External font hosts are blocked exactly as in the test suite so the
+numbers do not depend on a third-party network.
+
+Usage (from the repository root):
+
+    python -m tests.bench.web_vitals --runs 7
+    python -m tests.bench.web_vitals --profile mobile --baseline baseline.json
+"""
+import argparse
+import platform
+import sys
+import time
+from pathlib import Path
+
+from . import baseline as baseline_mod
+from . import profiles as profiles_mod
+from . import stats
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+if str(TESTS_DIR) not in sys.path:
+    sys.path.insert(0, str(TESTS_DIR))
+
+import harness  # noqa: E402
+import waits  # noqa: E402
+
+DEFAULT_OUTPUT = TESTS_DIR / "bench" / "results" / "web-vitals.json"
+
+NUMERIC_METRICS = ("fcp", "lcp", "cls", "inp", "tbt", "long_task_count")
+
+# Installed before any page script runs; buffered observers also pick up
+# entries recorded before they were attached.
+VITALS_INIT_SCRIPT = """
+(() => {
+    const state = {
+        fcp: null,
+        lcp: null,
+        lcpElement: null,
+        lcpUrl: null,
+        shifts: [],
+        longTasks: [],
+        interactions: new Map(),
+    };
+    const observe = (type, callback, options = {}) => {
+        try {
+            new PerformanceObserver((list) => list.getEntries().forEach(callback))
+                .observe({ type, buffered: true, ...options });
+        } catch (error) {
+            // Entry type unsupported in this browser; the metric stays null.
+        }
+    };
+
+    observe('paint', (entry) => {
+        if (entry.name === 'first-contentful-paint') state.fcp = entry.startTime;
+    });
+    observe('largest-contentful-paint', (entry) => {
+        state.lcp = entry.startTime;
+        state.lcpUrl = entry.url || null;
+        const el = entry.element;
+        state.lcpElement = el ? el.tagName.toLowerCase() + (el.id ? `#${el.id}` : '') +
+            (el.classList.length ? `.${Array.from(el.classList).join('.')}` : '') : null;
+    });
+    observe('layout-shift', (entry) => {
+        if (!entry.hadRecentInput) state.shifts.push({ time: entry.startTime, value: entry.value });
+    });
+    observe('longtask', (entry) => {
+        state.longTasks.push({ start: entry.startTime, duration: entry.duration });
+    });
+    observe('event', (entry) => {
+        if (!entry.interactionId) return;
+        const previous = state.interactions.get(entry.interactionId) || 0;
+        state.interactions.set(entry.interactionId, Math.max(previous, entry.duration));
+    }, { durationThreshold: 16 });
+
+    Object.defineProperty(window, '__benchVitals', { value: state });
+})();
+"""
+
+COLLECT_VITALS = """
+(interactionsStart) => {
+    const state = window.__benchVitals;
+
+    let cls = 0;
+    let windowValue = 0;
+    let windowStart = 0;
+    let previous = -Infinity;
+    state.shifts.forEach(({ time, value }) => {
+        if (time - previous > 1000 || time - windowStart > 5000) {
+            windowValue = 0;
+            windowStart = time;
+        }
+        windowValue += value;
+        previous = time;
+        cls = Math.max(cls, windowValue);
+    });
+
+    const durations = Array.from(state.interactions.values()).sort((a, b) => b - a);
+    // INP ignores one outlier per 50 interactions, like the web-vitals library.
+    const inp = durations.length ? durations[Math.min(durations.length - 1, Math.floor(durations.length / 50))] : null;
+
+    const start = state.fcp || 0;
+    const blocking = state.longTasks.filter((task) => task.start >= start && task.start < interactionsStart);
+    const tbt = blocking.reduce((total, task) => total + Math.max(0, task.duration - 50), 0);
+
+    return {
+        fcp: state.fcp,
+        lcp: state.lcp,
+        lcp_element: state.lcpElement,
+        lcp_url: state.lcpUrl,
+        cls,
+        inp,
+        interaction_count: durations.length,
+        tbt,
+        long_task_count: blocking.length,
+    };
+}
+"""
+
+
+def _scroll_through(page, step=600):
+    """Wheel-scroll to the bottom and back so lazily rendered sections lay out."""
+    height = page.evaluate("document.documentElement.scrollHeight")
+    position = 0
+    while position < height:
+        page.mouse.wheel(0, step)
+        position += step
+        waits.wait_for_frames(page)
+    if not waits.wait_for_scroll_end(page):
+        raise RuntimeError("Scrolling to the bottom of the page never settled")
+    page.evaluate("window.scrollTo({ top: 0, behavior: 'instant' })")
+    waits.wait_for_frames(page)
+
+
+def _interact(page):
+    """Scripted interactions that exercise the page's main input handlers."""
+    page.click(".theme-toggle")
+    waits.wait_for_frames(page)
+    page.click("#name")
+    page.keyboard.type("Ada Lovelace", delay=20)
+    page.click("#message")
+    page.keyboard.type("Benchmark run", delay=20)
+    page.click(".theme-toggle")
+    waits.wait_for_frames(page, 4)
+
+
+def measure_once(browser, base_url, profile):
+    """Load the page once under ``profile`` and return that run's metrics."""
+    context = browser.new_context(**profiles_mod.context_options(profile))
+    try:
+        context.add_init_script(waits.INIT_SCRIPT)
+        context.add_init_script(VITALS_INIT_SCRIPT)
+        harness.block_external_fonts(context)
+        page = context.new_page()
+        cdp = context.new_cdp_session(page)
+        cdp.send("Emulation.setCPUThrottlingRate", {"rate": profile["cpu_throttling"]})
+
+        page.goto(f"{base_url}/", wait_until="load")
+        if not waits.wait_for_page_ready(page):
+            raise RuntimeError("The page never finished its deferred setup")
+        _scroll_through(page)
+
+        interactions_start = page.evaluate("performance.now()")
+        _interact(page)
+        return page.evaluate(COLLECT_VITALS, interactions_start)
+    finally:
+        context.close()
+
+
+def run_profile(browser, base_url, name, runs, warmup=1, stream=sys.stderr):
+    profile = profiles_mod.get_profile(name)
+    for _ in range(warmup):
+        measure_once(browser, base_url, profile)
+
+    results = []
+    for index in range(runs):
+        result = measure_once(browser, base_url, profile)
+        results.append(result)
+        stream.write(f"  {name} run {index + 1}/{runs}: "
+                     f"LCP {_fmt(result['lcp'])}ms CLS {_fmt(result['cls'], 4)} "
+                     f"INP {_fmt(result['inp'])}ms TBT {_fmt(result['tbt'])}ms\n")
+
+    summary = {metric: stats.summarize([run[metric] for run in results]) for metric in NUMERIC_METRICS}
+    lcp_urls = sorted({run["lcp_url"] or run["lcp_element"] or "unknown" for run in results})
+    return {"settings": profile, "runs": results, "summary": summary, "lcp_candidates": lcp_urls}
+
+
+def _fmt(value, digits=1):
+    return "n/a" if value is None else f"{value:.{digits}f}"
+
+
+def print_summary(report, stream=sys.stdout):
+    header = f"{'profile':<18}{'metric':<17}{'p50':>10}{'p75':>10}{'p95':>10}{'n':>4}"
+    stream.write(header + "\n" + "-" * len(header) + "\n")
+    for name, profile in report["profiles"].items():
+        for metric in NUMERIC_METRICS:
+            summary = profile["summary"][metric]
+            digits = 4 if metric == "cls" else 1
+            stream.write(f"{name:<18}{metric:<17}{_fmt(summary.get('p50'), digits):>10}"
+                         f"{_fmt(summary.get('p75'), digits):>10}{_fmt(summary.get('p95'), digits):>10}"
+                         f"{summary['n']:>4}\n")
+        stream.write(f"{name:<18}{'LCP element':<17}{', '.join(profile['lcp_candidates'])}\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure Core Web Vitals for index.html.")
+    parser.add_argument("--profile", action="append", choices=sorted(profiles_mod.PROFILES),
+                        help=f"profile to run; repeatable (default: {', '.join(profiles_mod.DEFAULT_PROFILES)})")
+    parser.add_argument("--runs", type=int, default=5, help="measured runs per profile (default: 5)")
+    parser.add_argument("--warmup", type=int, default=1, help="unrecorded runs per profile (default: 1)")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="where to write the JSON report")
+    parser.add_argument("--baseline", help="fail if medians regress against this report")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed relative regression against the baseline (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    session = harness.get_session()
+    report = {
+        "meta": {
+            "benchmark": "web-vitals",
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "browser": session.browser.version,
+            "platform": platform.platform(),
+            "runs": args.runs,
+        },
+        "profiles": {},
+    }
+    try:
+        for name in args.profile or profiles_mod.DEFAULT_PROFILES:
+            sys.stderr.write(f"Profiling {name}...\n")
+            report["profiles"][name] = run_profile(session.browser, session.base_url, name, args.runs, args.warmup)
+    finally:
+        harness.shutdown()
+
+    baseline_mod.write_report(report, args.output)
+    print_summary(report)
+    print(f"\nWrote {args.output}")
+
+    if args.baseline:
+        regressions = baseline_mod.compare(report, baseline_mod.load_report(args.baseline), args.tolerance)
+        if regressions:
+            print("\nRegressions against baseline:\n" + baseline_mod.format_regressions(regressions))
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
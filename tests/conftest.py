@@ -0,0 +1,10 @@
+import pytest
+
+import harness
+
+
+@pytest.fixture(scope="session", autouse=True)
+def shared_browser_session():
+    """Tear down the shared server and browser once, after the whole run."""
+    yield
+    harness.shutdown()
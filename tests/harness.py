@@ -0,0 +1,135 @@
+"""Shared server and browser harness for the Playwright test suite.
+
+A single dev server (tools/devserver.py) and a single headless Chromium are
+started lazily the first time a browser test needs them and are reused by
+every test class in the process. Each test still gets a brand-new browser
+context, so cookies, localStorage and routes never leak from one test into the
+next.
+"""
+import atexit
+import sys
+import unittest
+from pathlib import Path
+
+from playwright.sync_api import sync_playwright
+
+import waits
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from tools.budgets import third_party_patterns  # noqa: E402
+from tools.devserver import start_server  # noqa: E402
+
+
+class _Session:
+    """One dev server plus one browser, shared by every test in the process."""
+
+    def __init__(self):
+        self.server = start_server(REPO_ROOT)
+        self.port = self.server.port
+
+        self.playwright = sync_playwright().start()
+        self.browser = self.playwright.chromium.launch(headless=True)
+        self.base_url = f"http://localhost:{self.port}"
+
+    def close(self):
+        self.browser.close()
+        self.playwright.stop()
+        self.server.stop()
+
+
+_session = None
+
+
+def get_session():
+    """Return the process-wide session, starting the server and browser on first use."""
+    global _session
+    if _session is None:
+        _session = _Session()
+        atexit.register(shutdown)
+    return _session
+
+
+def shutdown():
+    """Stop the shared browser and server. Safe to call more than once."""
+    global _session
+    if _session is not None:
+        session, _session = _session, None
+        session.close()
+
+
+def block_external_fonts(context):
+    """Abort requests to the third-party origins in budgets.json for every page in ``context``.
+
+    These are the web font hosts; the page falls back to system fonts, which is
+    all the tests need, instead of waiting on the network.
+    """
+    for pattern in third_party_patterns():
+        context.route(pattern, lambda route: route.abort())
+
+
+# Set by tests/impact.py while it records which files, functions and rules each test exercises.
+coverage_recorder = None
+
+
+# Start of the virtual clock: 2026-01-01T00:00:00Z, so Date-derived output is stable.
+VIRTUAL_EPOCH_MS = 1_767_225_600_000
+
+
+class BrowserTestCase(unittest.TestCase):
+    """Base class for tests that drive index.html in a real browser.
+
+    Subclasses may set ``viewport`` (a Playwright viewport dict) or extend
+    ``context_options`` to customise the fresh context created for each test.
+    Set ``virtual_time = True`` (or call ``use_virtual_time()`` before
+    navigating) to run the page on a paused virtual clock, then move it with
+    ``advance(ms)`` instead of sleeping through script.js timers.
+    """
+
+    viewport = None
+    context_options = {}
+    virtual_time = False
+
+    @classmethod
+    def setUpClass(cls):
+        session = get_session()
+        cls.browser = session.browser
+        cls.base_url = session.base_url
+
+    def setUp(self):
+        options = dict(self.context_options)
+        if self.viewport is not None:
+            options["viewport"] = self.viewport
+        self.context = self.browser.new_context(**options)
+        self.context.add_init_script(waits.INIT_SCRIPT)
+        block_external_fonts(self.context)
+        self.page = self.context.new_page()
+        if coverage_recorder is not None:
+            coverage_recorder.start(self)
+        if self.virtual_time:
+            self.use_virtual_time()
+
+    def tearDown(self):
+        if coverage_recorder is not None:
+            coverage_recorder.stop(self)
+        self.context.close()
+
+    def use_virtual_time(self, start_ms=VIRTUAL_EPOCH_MS):
+        """Replace setTimeout, rAF, requestIdleCallback, Date and performance.now with a paused clock.
+
+        Playwright's clock is installed for the whole context, so reloads keep
+        it. The helpers in ``waits`` keep using the real timers captured by
+        ``waits.INIT_SCRIPT``, which is installed first.
+        """
+        self.context.clock.install(time=start_ms)
+        self.context.clock.pause_at(start_ms)
+
+    def advance(self, ms):
+        """Run the virtual clock forward ``ms`` milliseconds, firing every timer and frame that falls due."""
+        self.page.clock.run_for(ms)
+
+    def navigate(self, path="", wait_until="domcontentloaded"):
+        # Use domcontentloaded to avoid waiting for external assets that might hang
+        return self.page.goto(f"{self.base_url}/{path.lstrip('/')}", wait_until=wait_until)
@@ -0,0 +1,362 @@
+"""Pick the tests a change can affect, from a recorded coverage index.
+
+``record`` runs the suite once with Chromium's coverage turned on and, for
+every browser test, stores the same-origin files the page loaded, the
+script functions it called (V8 precise coverage) and the stylesheet rules
+that matched (CSS rule usage). Offsets are in the files as recorded, and the
+git blob hash of each file is kept with them.
+
+``select`` reads ``git diff`` against a base revision and maps each changed
+line range onto the recorded units. A change inside a function selects the
+tests that called the innermost enclosing function. A change to a rule
+selects the tests that matched it. A change outside any unit selects every
+test that loaded the file. Changed test modules select themselves. Tests
+with no browser coverage (the Python-only ones) and tests added since the
+recording always run. The whole suite runs instead when:
+
+* there is no index;
+* the base revision's copy of any recorded file differs from the recording
+  (the index is stale);
+* the change touches the harness or ``tools/``;
+* the change touches a file the index does not know.
+
+Usage (from the repository root):
+
+    python tests/impact.py record                        # writes tests/impact-index.json
+    python tests/impact.py select --base origin/main     # test ids, one per line
+    python -m pytest $(python tests/impact.py select --base origin/main --format pytest)
+"""
+import argparse
+import fnmatch
+import hashlib
+import json
+import re
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+TESTS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = TESTS_DIR.parent
+INDEX_FILE = TESTS_DIR / "impact-index.json"
+INDEX_VERSION = 1
+
+# Changes here never affect a test.
+IGNORED_PATTERNS = ("*.md", ".jules/*", ".Jules/*", "tests/bench/*", ".gitignore")
+# Changes here can affect any test.
+GLOBAL_PREFIXES = ("tests/", "tools/")
+
+_HUNK = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+\d+(?:,\d+)? @@", re.MULTILINE)
+
+
+class ImpactError(Exception):
+    pass
+
+
+def blob_hash(data):
+    """Return the git blob id of ``data``, so recorded files compare against ``git ls-tree`` directly."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def _utf16_slice(text, start, end):
+    return text.encode("utf-16-le")[start * 2:end * 2].decode("utf-16-le", errors="replace")
+
+
+class CoverageRecorder:
+    """Collects per-test coverage through the ``harness.coverage_recorder`` hook."""
+
+    def __init__(self, root=REPO_ROOT):
+        self.root = Path(root)
+        self.units = {}  # path -> {(start, end): label}
+        self.tests = {}  # test id -> {path: {(start, end), ...}}
+        self._active = {}
+        self._texts = {}
+
+    def _path(self, url, base_url):
+        if not url.startswith(base_url + "/"):
+            return None
+        return unquote(urlsplit(url).path).lstrip("/") or "index.html"
+
+    def _selector(self, path, start, end):
+        if path not in self._texts:
+            self._texts[path] = (self.root / path).read_text(encoding="utf-8")
+        rule = _utf16_slice(self._texts[path], start, end)
+        return " ".join(rule.split("{", 1)[0].split()) or "(rule)"
+
+    def start(self, test):
+        cdp = test.context.new_cdp_session(test.page)
+        sheets = {}
+        loaded = set()
+        cdp.on("CSS.styleSheetAdded", lambda event: sheets.update({
+            event["header"]["styleSheetId"]: event["header"]["sourceURL"]}))
+        test.page.on("requestfinished", lambda request: loaded.add(request.url))
+        cdp.send("Profiler.enable")
+        cdp.send("Profiler.startPreciseCoverage", {"callCount": True, "detailed": False})
+        cdp.send("DOM.enable")
+        cdp.send("CSS.enable")
+        cdp.send("CSS.startRuleUsageTracking")
+        self._active[test.id()] = (cdp, sheets, loaded, test.base_url)
+
+    def stop(self, test):
+        cdp, sheets, loaded, base_url = self._active.pop(test.id())
+        used = {path: set() for path in filter(None, (self._path(url, base_url) for url in loaded))}
+        try:
+            scripts = cdp.send("Profiler.takePreciseCoverage")["result"]
+            rules = cdp.send("CSS.stopRuleUsageTracking")["ruleUsage"]
+        except Exception:
+            # The page went away (a test closed it); leave the test unrecorded so it always runs.
+            return
+        for script in scripts:
+            path = self._path(script["url"], base_url)
+            if path is None:
+                continue
+            units = self.units.setdefault(path, {})
+            for function in script["functions"]:
+                whole = function["ranges"][0]
+                key = (whole["startOffset"], whole["endOffset"])
+                units.setdefault(key, function["functionName"] or "(top level)")
+                if whole["count"]:
+                    used.setdefault(path, set()).add(key)
+        for rule in rules:
+            path = self._path(sheets.get(rule["styleSheetId"], ""), base_url)
+            if path is None:
+                continue
+            key = (rule["startOffset"], rule["endOffset"])
+            self.units.setdefault(path, {}).setdefault(key, self._selector(path, *key))
+            if rule["used"]:
+                used.setdefault(path, set()).add(key)
+        self.tests[test.id()] = used
+
+    def index(self, test_ids):
+        """Return the JSON-ready index; tests without coverage are stored as ``None``."""
+        paths = set(self.units).union(*self.tests.values()) if self.tests else set(self.units)
+        paths.update(str(path.relative_to(self.root)) for folder in ("tests", "tools")
+                     for path in (self.root / folder).glob("*.py"))
+        files = {}
+        for path in sorted(paths):
+            units = sorted(self.units.get(path, {}).items())
+            files[path] = {
+                "hash": blob_hash((self.root / path).read_bytes()) if (self.root / path).is_file() else None,
+                "units": [[start, end, label] for (start, end), label in units],
+            }
+        tests = {}
+        for test_id in sorted(test_ids):
+            used = self.tests.get(test_id)
+            if used is None:
+                tests[test_id] = None
+                continue
+            positions = {path: {tuple(unit[:2]): i for i, unit in enumerate(files[path]["units"])} for path in used}
+            tests[test_id] = {path: sorted(positions[path][key] for key in keys) for path, keys in sorted(used.items())}
+        return {"version": INDEX_VERSION, "commit": _git("rev-parse", "HEAD").strip(), "files": files, "tests": tests}
+
+
+def _git(*args, cwd=REPO_ROOT):
+    completed = subprocess.run(["git", *args], cwd=cwd, capture_output=True, check=False)
+    if completed.returncode != 0:
+        raise ImpactError(f"git {' '.join(args)} failed: {completed.stderr.decode(errors='replace').strip()}")
+    return completed.stdout.decode("utf-8", errors="replace")
+
+
+def _iter_tests(suite):
+    for item in suite:
+        if isinstance(item, unittest.TestSuite):
+            yield from _iter_tests(item)
+        else:
+            yield item
+
+
+def load_suite(modules=None, tests_dir=TESTS_DIR):
+    if str(tests_dir) not in sys.path:
+        sys.path.insert(0, str(tests_dir))
+    names = modules or sorted(path.stem for path in Path(tests_dir).glob("test_*.py"))
+    return unittest.TestLoader().loadTestsFromNames([name[:-3] if name.endswith(".py") else name for name in names])
+
+
+def record(modules=None, output=INDEX_FILE):
+    """Run the tests with coverage recording and write the index; return the unittest result."""
+    suite = load_suite(modules)
+    import harness
+
+    recorder = CoverageRecorder()
+    harness.coverage_recorder = recorder
+    try:
+        result = unittest.TextTestRunner(verbosity=1).run(suite)
+    finally:
+        harness.coverage_recorder = None
+        harness.shutdown()
+    index = recorder.index(test.id() for test in _iter_tests(suite))
+    with open(output, "w", encoding="utf-8") as handle:
+        json.dump(index, handle, separators=(",", ":"))
+        handle.write("\n")
+    return result
+
+
+def load_index(path=INDEX_FILE):
+    """Return the index at ``path``, or ``None`` when it is missing or from another version."""
+    try:
+        with open(path, encoding="utf-8") as handle:
+            index = json.load(handle)
+    except FileNotFoundError:
+        return None
+    return index if index.get("version") == INDEX_VERSION else None
+
+
+def changed_spans(diff_text):
+    """Return ``(first_line, count)`` old-side spans from a ``-U0`` diff; ``count`` 0 is an insertion after the line."""
+    return [(int(start), int(count) if count else 1) for start, count in _HUNK.findall(diff_text)]
+
+
+def spans_to_offsets(text, spans):
+    """Convert old-side line spans to ``(start, end)`` UTF-16 offsets, the unit V8 and CSSOM report."""
+    starts = [0]
+    for line in text.splitlines(keepends=True):
+        starts.append(starts[-1] + len(line.encode("utf-16-le")) // 2)
+
+    def offset(line):
+        return starts[min(line, len(starts)) - 1] if line > 0 else 0
+
+    ranges = []
+    for first, count in spans:
+        if count == 0:
+            point = offset(first + 1)
+            ranges.append((point, point))
+        else:
+            ranges.append((offset(first), offset(first + count)))
+    return ranges
+
+
+def units_hit(units, ranges):
+    """Return indexes of the units ``ranges`` touch, or ``None`` if a change falls outside every unit.
+
+    A change inside nested units (a closure in a function) hits only the innermost one.
+    """
+    hit = set()
+    for start, end in ranges:
+        if start == end:
+            containing = [i for i, (low, high, _label) in enumerate(units) if low <= start < high]
+        else:
+            containing = [i for i, (low, high, _label) in enumerate(units) if low <= start and end <= high]
+        if containing:
+            hit.add(min(containing, key=lambda i: units[i][1] - units[i][0]))
+            continue
+        overlapping = [i for i, (low, high, _label) in enumerate(units) if low < end and start < high]
+        if not overlapping:
+            return None
+        hit.update(overlapping)
+    return hit
+
+
+def stale_files(index, listing):
+    """Return recorded paths whose blob in ``listing`` (``{path: blob}`` at the base) differs from the recording."""
+    return sorted(path for path, entry in index["files"].items() if listing.get(path) != entry["hash"])
+
+
+def select(index, changes, test_ids):
+    """Return ``(selected test ids, notes)`` for ``changes``.
+
+    ``changes`` maps each changed path to its changed ``(start, end)`` offsets
+    in the recorded file, or to ``None`` when the file changed as a whole
+    (added, deleted or binary). ``notes`` explain the choice, one line each.
+    """
+    test_ids = set(test_ids)
+    tests = index["tests"]
+    selected = {test_id for test_id in test_ids if tests.get(test_id, None) is None}
+    notes = [f"{len(selected)} tests without browser coverage or newer than the index"] if selected else []
+    for path, ranges in sorted(changes.items()):
+        if any(fnmatch.fnmatch(path, pattern) for pattern in IGNORED_PATTERNS):
+            continue
+        module = re.fullmatch(r"tests/(test_\w+)\.py", path)
+        if module:
+            own = {test_id for test_id in test_ids if test_id.startswith(module.group(1) + ".")}
+            selected |= own
+            notes.append(f"{path}: {len(own)} tests in the changed module")
+            continue
+        if path.startswith(GLOBAL_PREFIXES) or path not in index["files"]:
+            reason = "shared test or build code" if path.startswith(GLOBAL_PREFIXES) else "not in the index"
+            return test_ids, [f"{path}: {reason}; running the full suite"]
+        users = {test_id for test_id, files in tests.items() if files and path in files and test_id in test_ids}
+        units = index["files"][path]["units"]
+        hit = None if ranges is None or not units else units_hit(units, ranges)
+        if hit is None:
+            selected |= users
+            notes.append(f"{path}: changed outside a recorded unit, {len(users)} tests load it")
+            continue
+        picked = {test_id for test_id in users if hit.intersection(tests[test_id][path])}
+        selected |= picked
+        labels = ", ".join(sorted({units[i][2] for i in hit}))
+        notes.append(f"{path}: {labels} -> {len(picked)} tests")
+    return selected, notes
+
+
+def git_changes(index, base, cwd=REPO_ROOT):
+    """Return the ``select`` changes between ``base`` and the working tree."""
+    changes = {}
+    for line in _git("diff", "--name-status", "--no-renames", base, cwd=cwd).splitlines():
+        status, _, path = line.partition("\t")
+        if status != "M" or path not in index["files"]:
+            changes[path] = None
+            continue
+        old_text = _git("show", f"{base}:{path}", cwd=cwd)
+        spans = changed_spans(_git("diff", "-U0", base, "--", path, cwd=cwd))
+        changes[path] = spans_to_offsets(old_text, spans) if spans else None
+    for path in _git("ls-files", "--others", "--exclude-standard", cwd=cwd).splitlines():
+        changes[path] = None
+    return changes
+
+
+def base_listing(base, cwd=REPO_ROOT):
+    listing = {}
+    for line in _git("ls-tree", "-r", base, cwd=cwd).splitlines():
+        meta, _, path = line.partition("\t")
+        listing[path] = meta.split()[2]
+    return listing
+
+
+def _pytest_id(test_id):
+    module, cls, name = test_id.rsplit(".", 2)
+    return f"tests/{module}.py::{cls}::{name}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    recording = commands.add_parser("record", help="run the tests with coverage and write the index")
+    recording.add_argument("modules", nargs="*", help="test modules to record (default: every tests/test_*.py)")
+    recording.add_argument("--index", default=str(INDEX_FILE), help="index file (default: tests/impact-index.json)")
+    selecting = commands.add_parser("select", help="print the tests affected by the working tree's changes")
+    selecting.add_argument("--base", default="HEAD", help="revision the changes are measured from (default: HEAD)")
+    selecting.add_argument("--index", default=str(INDEX_FILE), help="index file (default: tests/impact-index.json)")
+    selecting.add_argument("--format", choices=("unittest", "pytest"), default="unittest", help="test id style")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        result = record(args.modules, args.index)
+        print(f"impact: wrote {args.index}", file=sys.stderr)
+        return 0 if result.wasSuccessful() else 1
+
+    test_ids = {test.id() for test in _iter_tests(load_suite())}
+    index = load_index(args.index)
+    try:
+        if index is None:
+            selected, notes = test_ids, ["no index; running the full suite (record one with `record`)"]
+        else:
+            stale = stale_files(index, base_listing(args.base))
+            if stale:
+                selected, notes = test_ids, [f"index is stale ({', '.join(stale[:3])}); running the full suite"]
+            else:
+                selected, notes = select(index, git_changes(index, args.base), test_ids)
+    except ImpactError as exc:
+        print(f"impact: {exc}", file=sys.stderr)
+        return 2
+
+    for note in notes:
+        print(f"impact: {note}", file=sys.stderr)
+    print(f"impact: {len(selected)} of {len(test_ids)} tests selected", file=sys.stderr)
+    for test_id in sorted(selected):
+        print(_pytest_id(test_id) if args.format == "pytest" else test_id)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""Run the test classes across several worker processes.
+
+Each worker process owns its own warm Chromium and port-0 static server via
+``harness.get_session()``; test classes are handed out one at a time, so the
+run finishes close to ``total / workers``. Every test still gets a fresh
+browser context, so tests that touch localStorage (the theme toggle, the
+contact-form rate limiter) stay isolated no matter which worker runs them.
+
+Usage:
+
+    python tests/parallel.py -n 16
+    python tests/parallel.py -n 4 test_theme test_scroll_behavior --junit-xml report.xml
+"""
+import argparse
+import multiprocessing
+import multiprocessing.util
+import os
+import sys
+import time
+import unittest
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+TESTS_DIR = Path(__file__).resolve().parent
+
+PASSED = "passed"
+FAILED = "failed"
+ERROR = "error"
+SKIPPED = "skipped"
+
+
+class _RecordingResult(unittest.TestResult):
+    """Collects picklable ``(test_id, outcome, detail, duration)`` records."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self._started = {}
+
+    def startTest(self, test):
+        super().startTest(test)
+        self._started[test.id()] = time.perf_counter()
+
+    def _record(self, test, outcome, detail=""):
+        started = self._started.pop(test.id(), None)
+        duration = time.perf_counter() - started if started is not None else 0.0
+        self.records.append((test.id(), outcome, detail, duration))
+
+    def addSuccess(self, test):
+        super().addSuccess(test)
+        self._record(test, PASSED)
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self._record(test, FAILED, self.failures[-1][1])
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self._record(test, ERROR, self.errors[-1][1])
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self._record(test, SKIPPED, reason)
+
+    def addExpectedFailure(self, test, err):
+        super().addExpectedFailure(test, err)
+        self._record(test, PASSED, "expected failure")
+
+    def addUnexpectedSuccess(self, test):
+        super().addUnexpectedSuccess(test)
+        self._record(test, FAILED, "unexpected success")
+
+
+def discover_units(names=None, tests_dir=TESTS_DIR):
+    """Return ``(module, class, test_count)`` work units, largest classes first."""
+    if str(tests_dir) not in sys.path:
+        sys.path.insert(0, str(tests_dir))
+
+    if names:
+        modules = [name[:-3] if name.endswith(".py") else name for name in names]
+    else:
+        modules = sorted(path.stem for path in Path(tests_dir).glob("test_*.py"))
+
+    counts = {}
+    loader = unittest.TestLoader()
+    for module in modules:
+        for test in _iter_tests(loader.loadTestsFromName(module)):
+            key = (type(test).__module__, type(test).__name__)
+            counts[key] = counts.get(key, 0) + 1
+
+    units = [(module, cls, count) for (module, cls), count in counts.items()]
+    units.sort(key=lambda unit: unit[2], reverse=True)
+    return units
+
+
+def _iter_tests(suite):
+    for item in suite:
+        if isinstance(item, unittest.TestSuite):
+            yield from _iter_tests(item)
+        else:
+            yield item
+
+
+def _init_worker(paths, warm):
+    for path in paths:
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    if warm:
+        import harness
+
+        try:
+            harness.get_session()
+        except Exception:
+            # A failing initializer makes Pool respawn workers forever; let the
+            # first test's setUpClass surface the launch error instead.
+            return
+        # Pool workers skip atexit handlers, so register the shutdown as a
+        # multiprocessing finalizer instead.
+        multiprocessing.util.Finalize(None, harness.shutdown, exitpriority=10)
+
+
+def _run_unit(unit):
+    module, cls, _count = unit
+    suite = unittest.TestLoader().loadTestsFromName(f"{module}.{cls}")
+    result = _RecordingResult()
+    suite.run(result)
+    return result.records
+
+
+def run_parallel(units, workers, tests_dir=TESTS_DIR, warm=True):
+    """Run ``units`` on ``workers`` processes and return the merged records."""
+    records = []
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(workers, initializer=_init_worker, initargs=([str(tests_dir)], warm)) as pool:
+        for unit_records in pool.imap_unordered(_run_unit, units, chunksize=1):
+            records.extend(unit_records)
+        pool.close()
+        pool.join()
+    records.sort(key=lambda record: record[0])
+    return records
+
+
+def summarize(records):
+    summary = {PASSED: 0, FAILED: 0, ERROR: 0, SKIPPED: 0}
+    for _test_id, outcome, _detail, _duration in records:
+        summary[outcome] += 1
+    return summary
+
+
+def print_report(records, elapsed, workers, stream=sys.stderr):
+    for test_id, outcome, detail, _duration in records:
+        if outcome in (FAILED, ERROR):
+            stream.write("=" * 70 + "\n")
+            stream.write(f"{outcome.upper()}: {test_id}\n")
+            stream.write("-" * 70 + "\n")
+            stream.write(f"{detail}\n")
+
+    summary = summarize(records)
+    stream.write("-" * 70 + "\n")
+    stream.write(f"Ran {len(records)} tests in {elapsed:.3f}s across {workers} workers\n\n")
+    problems = [f"{name}={summary[key]}" for key, name in
+                ((FAILED, "failures"), (ERROR, "errors"), (SKIPPED, "skipped")) if summary[key]]
+    status = "FAILED" if summary[FAILED] or summary[ERROR] else "OK"
+    stream.write(f"{status} ({', '.join(problems)})\n" if problems else f"{status}\n")
+
+
+def write_junit_xml(records, elapsed, path):
+    summary = summarize(records)
+    suite = ET.Element("testsuite", {
+        "name": "hire",
+        "tests": str(len(records)),
+        "failures": str(summary[FAILED]),
+        "errors": str(summary[ERROR]),
+        "skipped": str(summary[SKIPPED]),
+        "time": f"{elapsed:.3f}",
+    })
+    for test_id, outcome, detail, duration in records:
+        if test_id.endswith(")") and " (" in test_id:
+            # Class/module fixture errors are reported as "setUpClass (module.Class)"
+            name, _, classname = test_id[:-1].partition(" (")
+        else:
+            classname, _, name = test_id.rpartition(".")
+        case = ET.SubElement(suite, "testcase", {"classname": classname, "name": name, "time": f"{duration:.3f}"})
+        if outcome == FAILED:
+            ET.SubElement(case, "failure").text = detail
+        elif outcome == ERROR:
+            ET.SubElement(case, "error").text = detail
+        elif outcome == SKIPPED:
+            ET.SubElement(case, "skipped", {"message": detail})
+    ET.ElementTree(suite).write(path, encoding="utf-8", xml_declaration=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", help="test modules to run (default: every tests/test_*.py)")
+    parser.add_argument("-n", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument("--junit-xml", help="also write a merged JUnit XML report to this path")
+    args = parser.parse_args(argv)
+
+    units = discover_units(args.modules)
+    workers = max(1, min(args.workers, len(units)))
+
+    start = time.perf_counter()
+    records = run_parallel(units, workers)
+    elapsed = time.perf_counter() - start
+
+    print_report(records, elapsed, workers)
+    if args.junit_xml:
+        write_junit_xml(records, elapsed, args.junit_xml)
+
+    summary = summarize(records)
+    return 1 if summary[FAILED] or summary[ERROR] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,48 +1,15 @@
 import unittest
-import threading
-import http.server
-import socketserver
-import os
-import time
-from playwright.sync_api import sync_playwright
-
-class BackToTopTest(unittest.TestCase):
-    @classmethod
-    def setUpClass(cls):
-        # Start a local server to serve the frontend files
-        # Use 0 to bind to a random free port
-        handler = http.server.SimpleHTTPRequestHandler
-        cls.httpd = socketserver.TCPServer(("", 0), handler)
-        cls.port = cls.httpd.server_address[1]
-        cls.server_thread = threading.Thread(target=cls.httpd.serve_forever)
-        cls.server_thread.daemon = True
-        cls.server_thread.start()
-
-        cls.playwright = sync_playwright().start()
-        cls.browser = cls.playwright.chromium.launch(headless=True)
-        cls.base_url = f"http://localhost:{cls.port}"
-
-    @classmethod
-    def tearDownClass(cls):
-        cls.browser.close()
-        cls.playwright.stop()
-        cls.httpd.shutdown()
-        cls.httpd.server_close()
-
-    def setUp(self):
-        self.context = self.browser.new_context(
-            viewport={'width': 1280, 'height': 800}
-        )
-        self.page = self.context.new_page()
-        # Block external font requests
-        self.page.route("**/*", lambda route: route.abort() if "fonts.googleapis.com" in route.request.url or "fonts.gstatic.com" in route.request.url else route.continue_())
 
-    def tearDown(self):
-        self.context.close()
+import waits
+from harness import BrowserTestCase
+
+
+class BackToTopTest(BrowserTestCase):
+    viewport = {'width': 1280, 'height': 800}
 
     def navigate(self):
-        self.page.goto(self.base_url, wait_until="domcontentloaded")
-        self.page.wait_for_timeout(500)
+        super().navigate()
+        self.assertTrue(waits.wait_for_page_ready(self.page))
 
     def test_back_to_top_button_visibility_and_functionality(self):
         """Test the Back to Top button behavior."""
@@ -66,28 +33,28 @@ class BackToTopTest(unittest.TestCase):
         scroll_target = hero_height + 100 # Scroll past hero
 
         self.page.evaluate(f"window.scrollTo({{ top: {scroll_target}, behavior: 'instant' }})")
-        self.page.wait_for_timeout(500) # Wait for observer
 
-        # 4. Verify button becomes visible
-        is_visible_class = self.page.evaluate(f"document.querySelector('{button_selector}').classList.contains('is-visible')")
-        self.assertTrue(is_visible_class, "Button should be visible after scrolling past hero")
+        # 4. Verify button becomes visible once the observer fires
+        self.assertTrue(
+            waits.wait_for_visible(self.page, button_selector),
+            "Button should be visible after scrolling past hero"
+        )
 
         # 5. Click the button
         button.click()
 
-        # Wait for smooth scroll to finish (might take a moment)
-        # Or check repeatedly
-        self.page.wait_for_timeout(1500)
+        # Wait for smooth scroll to finish
+        self.assertTrue(waits.wait_for_scroll_end(self.page))
 
         # 6. Verify scroll position is back to top (approx 0)
         scroll_y = self.page.evaluate("window.scrollY")
         self.assertLess(scroll_y, 10, "Scroll position should be near 0 after clicking Back to Top")
 
         # 7. Verify button becomes hidden again
-        # Wait for observer to update
-        self.page.wait_for_timeout(500)
-        is_visible_class = self.page.evaluate(f"document.querySelector('{button_selector}').classList.contains('is-visible')")
-        self.assertFalse(is_visible_class, "Button should be hidden again after scrolling to top")
+        self.assertTrue(
+            waits.wait_for_class(self.page, button_selector, 'is-visible', present=False),
+            "Button should be hidden again after scrolling to top"
+        )
 
         # 8. Verify focus moved to skip link
         # The logic: skipLink.focus()
@@ -0,0 +1,86 @@
+import unittest
+
+from bench import baseline, hero_frames, stats
+
+
+class PercentileTest(unittest.TestCase):
+    def test_matches_linear_interpolation(self):
+        values = [15, 20, 35, 40, 50]
+        self.assertEqual(stats.percentile(values, 0), 15)
+        self.assertEqual(stats.percentile(values, 50), 35)
+        self.assertEqual(stats.percentile(values, 100), 50)
+        self.assertAlmostEqual(stats.percentile(values, 40), 29.0)
+        self.assertAlmostEqual(stats.percentile(values, 95), 48.0)
+
+    def test_median_of_even_sample_interpolates(self):
+        self.assertEqual(stats.median([4, 1, 3, 2]), 2.5)
+
+    def test_empty_sample(self):
+        self.assertIsNone(stats.percentile([], 50))
+        self.assertEqual(stats.summarize([None, None]), {"n": 0})
+
+    def test_rejects_out_of_range_percentile(self):
+        with self.assertRaises(ValueError):
+            stats.percentile([1], 101)
+
+    def test_summarize_drops_missing_values(self):
+        summary = stats.summarize([10, None, 30, 20])
+        self.assertEqual(summary["n"], 3)
+        self.assertEqual(summary["p50"], 20)
+        self.assertEqual((summary["min"], summary["max"]), (10, 30))
+        self.assertEqual(summary["mean"], 20)
+
+
+class BaselineCompareTest(unittest.TestCase):
+    @staticmethod
+    def report(lcp, cls):
+        return {"profiles": {"desktop": {"summary": {"lcp": {"p50": lcp}, "cls": {"p50": cls}}}}}
+
+    def test_within_tolerance_is_not_a_regression(self):
+        self.assertEqual(baseline.compare(self.report(1050, 0.05), self.report(1000, 0.05)), [])
+
+    def test_small_absolute_change_is_absorbed_by_slack(self):
+        # 15ms on a 40ms metric is +37%, but below the 20ms timing slack.
+        self.assertEqual(baseline.compare(self.report(55, 0.0), self.report(40, 0.0)), [])
+
+    def test_reports_regressions(self):
+        regressions = baseline.compare(self.report(1400, 0.2), self.report(1000, 0.05))
+        self.assertEqual([item["metric"] for item in regressions], ["cls", "lcp"])
+        self.assertIn("desktop: lcp p50 1400.000", baseline.format_regressions(regressions))
+
+    def test_missing_profiles_and_metrics_are_skipped(self):
+        current = self.report(5000, 1.0)
+        current["profiles"]["mobile"] = current["profiles"]["desktop"]
+        old = {"profiles": {"desktop": {"summary": {"cls": {"p50": 1.0}}}}}
+        self.assertEqual(baseline.compare(current, old), [])
+
+
+class HeroFramesHelpersTest(unittest.TestCase):
+    def test_dropped_frames_uses_median_refresh_interval(self):
+        # 8ms cadence (120Hz) with one 24ms gap = two missed frames.
+        starts = [0, 8, 16, 24, 48, 56, 64]
+        dropped, interval = hero_frames.dropped_frames(starts)
+        self.assertEqual(interval, 8)
+        self.assertEqual(dropped, 2)
+
+    def test_dropped_frames_needs_two_frames(self):
+        self.assertEqual(hero_frames.dropped_frames([5.0]), (0, None))
+
+    def test_connection_threshold(self):
+        report = {"profiles": {
+            "small": {"summary": {"drawConnections": {"p95": 1.5}}},
+            "large": {"summary": {"drawConnections": {"p95": 9.25}}},
+        }}
+        failures = hero_frames.check_threshold(report, 8.0)
+        self.assertEqual(failures, ["large: drawConnections p95 9.250ms exceeds 8.000ms"])
+
+    def test_probe_script_embeds_config(self):
+        script = hero_frames.probe_script(120, 10, node_count=260)
+        self.assertIn('"nodeCount": 260', script)
+        self.assertIn('"qualityTier": 2', script)
+        self.assertIn('"drawConnections"', script)
+        self.assertNotIn("__CONFIG__", script)
+
+
+if __name__ == '__main__':
+    unittest.main()
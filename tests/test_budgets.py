@@ -0,0 +1,102 @@
+import unittest
+
+import waits
+from harness import REPO_ROOT, BrowserTestCase
+from tools import budgets
+
+HEAD = """\
+<html><head>
+<link rel="stylesheet" href="a.css">
+<link rel="stylesheet" href="print.css" media="print">
+<link rel="preload" as="style" href="late.css">
+<script src="a.js"></script>
+<script src="b.js" defer></script>
+<noscript><link rel="stylesheet" href="noscript.css"></noscript>
+<link rel="stylesheet" href="https://cdn.example.com/x.css">
+</head><body>
+<a href="https://elsewhere.example.org/">link</a>
+<img src="me.png" srcset="https://img.example.net/me.png 2x">
+</body></html>
+"""
+
+
+class ScanPageTest(unittest.TestCase):
+    def test_counts_blocking_requests_and_origins(self):
+        elements, blocking, origins = budgets.scan_page(HEAD)
+        self.assertEqual(blocking, ["a.css", "a.js", "https://cdn.example.com/x.css"])
+        self.assertEqual(origins, {"https://cdn.example.com", "https://img.example.net"})
+        self.assertEqual(elements, 13)
+
+
+class CompareTest(unittest.TestCase):
+    BUDGETS = {
+        "assets": {"a.js": {"raw": 10, "gzip": 5}},
+        "static": {"render_blocking_requests": 1, "dom_elements": 100},
+        "third_party_origins": ["https://fonts.example.com"],
+    }
+
+    def report(self, raw=8, blocking=1, origins=()):
+        return {"static": {
+            "assets": {"a.js": {"raw": raw, "gzip": 4, "brotli": None}},
+            "render_blocking_requests": blocking,
+            "dom_elements": 50,
+            "third_party_origins": list(origins),
+        }}
+
+    def test_within_budget(self):
+        rows = budgets.compare(self.report(origins=["https://fonts.example.com"]), self.BUDGETS)
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(budgets.violations(rows), [])
+
+    def test_reports_every_overrun(self):
+        rows = budgets.compare(self.report(raw=11, blocking=2, origins=["https://cdn.example.com"]), self.BUDGETS)
+        over = [row[0] for row in budgets.violations(rows)]
+        self.assertEqual(over, [
+            "a.js (raw)", "render blocking requests [static]", "unexpected third-party origins [static]",
+        ])
+
+    def test_table_shows_change_from_baseline(self):
+        before = budgets.compare(self.report(raw=8), self.BUDGETS)
+        after = budgets.compare(self.report(raw=11), self.BUDGETS)
+        table = budgets.format_table(after, before)
+        row = next(line for line in table.splitlines() if line.startswith("a.js (raw)"))
+        self.assertTrue(row.endswith("OVER"))
+        self.assertIn("+3 B", row)
+
+    def test_dynamic_report_ignores_page_origin(self):
+        section = budgets.dynamic_report(
+            {"domElements": 3, "marqueeLayerArea": 10, "renderBlocking": ["http://localhost:1/a.css"]},
+            ["http://localhost:1/", "https://fonts.example.com/css", "data:image/png;base64,AA"],
+            "http://localhost:1",
+        )
+        self.assertEqual(section["third_party_origins"], ["https://fonts.example.com"])
+        self.assertEqual(section["render_blocking_requests"], 1)
+
+
+class SiteStaticBudgetTest(unittest.TestCase):
+    def test_source_tree_is_within_budget(self):
+        limits = budgets.load_budgets()
+        rows = budgets.compare({"static": budgets.measure_static(REPO_ROOT, limits)}, limits)
+        self.assertEqual(budgets.violations(rows), [], "\n" + budgets.format_table(rows))
+
+
+class SiteDynamicBudgetTest(BrowserTestCase):
+    def test_page_is_within_budget_after_marquee_init(self):
+        requested = []
+        self.page.on("request", lambda request: requested.append(request.url))
+        self.navigate(wait_until="load")
+        self.page.locator(".skills-marquee").scroll_into_view_if_needed()
+        self.assertTrue(waits.wait_for_marquee(self.page))
+
+        limits = budgets.load_budgets()
+        report = {
+            "static": budgets.measure_static(REPO_ROOT, limits),
+            "dynamic": budgets.dynamic_report(
+                self.page.evaluate(budgets.PAGE_METRICS_SCRIPT), requested, self.base_url),
+        }
+        rows = budgets.compare(report, limits)
+        self.assertEqual(budgets.violations(rows), [], "\n" + budgets.format_table(rows))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,232 @@
+import gzip
+import re
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from harness import REPO_ROOT
+from tools import build, minify
+from tools.devserver import headers_for_path, parse_headers_file
+
+SOURCE_HEADERS = """\
+/*
+  X-Frame-Options: DENY
+
+/*.css
+  Cache-Control: public, max-age=1814400
+  Expires: Thu, 16 Apr 2026 00:00:00 GMT
+
+/*.js
+  Cache-Control: public, max-age=1814400
+
+/
+  Cache-Control: public, max-age=300
+  Expires: Thu, 26 Mar 2026 00:05:00 GMT
+"""
+
+
+class MinifyJsTest(unittest.TestCase):
+    def test_strips_comments_and_indentation(self):
+        source = "// header\nfunction add(a, b) {\n    /* sum */\n    return a + b; // done\n}\n"
+        self.assertEqual(minify.minify_js(source), "function add(a,b){\nreturn a+b;\n}\n")
+
+    def test_keeps_line_breaks_for_semicolon_insertion(self):
+        self.assertEqual(minify.minify_js("let a = 1\nlet b = a\n"), "let a=1\nlet b=a\n")
+
+    def test_preserves_strings_templates_and_regexes(self):
+        source = (
+            "const s = 'a // not a comment';\n"
+            "const t = `x ${ {a: 1}.a } /* kept */ y`;\n"
+            "const r = /[/*]+ \\/ x/g;\n"
+            "const d = total / count / 2;\n"
+        )
+        out = minify.minify_js(source)
+        self.assertIn("'a // not a comment'", out)
+        self.assertIn("`x ${{a:1}.a} /* kept */ y`", out)
+        self.assertIn("/[/*]+ \\/ x/g", out)
+        self.assertIn("total/count/2", out)
+
+    def test_does_not_merge_increment_operators(self):
+        self.assertEqual(minify.minify_js("a = b + +c - -d;"), "a=b+ +c- -d;\n")
+
+    def test_division_after_postfix_update_and_object_literal(self):
+        self.assertEqual(minify.minify_js("x = i++ / 2 / 3;\ny = j-- / 2;"), "x=i++/2/3;\ny=j--/2;\n")
+        self.assertEqual(minify.minify_js("z = { a: 1 } / 2;"), "z={a:1}/2;\n")
+        # After a block's closing brace a slash still starts a regex.
+        self.assertEqual(minify.minify_js("if (a) {\n}\n/x y/.test(s);"), "if(a){\n}\n/x y/.test(s);\n")
+
+    def test_rejects_unterminated_literals(self):
+        for source in ("const s = 'oops\n';", "/* never closed", "const t = `open"):
+            with self.assertRaises(ValueError, msg=source):
+                minify.minify_js(source)
+
+
+class MinifyCssAndHtmlTest(unittest.TestCase):
+    def test_css_drops_comments_and_redundant_space(self):
+        source = "/* theme */\n.a > .b ,\n.c {\n  color: red ;\n  margin: 0 auto;\n}\n"
+        self.assertEqual(minify.minify_css(source), ".a>.b,.c{color: red;margin: 0 auto}\n")
+
+    def test_css_keeps_strings(self):
+        source = '.x::before { content: "a  /* b */  c"; }'
+        self.assertIn('"a  /* b */  c"', minify.minify_css(source))
+
+    def test_html_collapses_whitespace_outside_preserved_blocks(self):
+        source = "<!-- note -->\n<p>\n    Hello   world\n</p>\n<pre>  keep\n   this</pre>\n"
+        self.assertEqual(minify.minify_html(source), "<p>\nHello world\n</p>\n<pre>  keep\n   this</pre>\n")
+
+
+class BuildTest(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.out = Path(tempfile.mkdtemp()) / "dist"
+        (self.root / "index.html").write_text(
+            '<!DOCTYPE html>\n<!-- site.css is mentioned here only -->\n'
+            '<link rel="preload" href="site.css" as="style">\n<link rel="stylesheet" href="./site.css">\n'
+            '<script src="app.js" defer></script>\n'
+        )
+        (self.root / "site.css").write_text(".hero {\n  background: url(img/bg.png);\n}\n")
+        (self.root / "app.js").write_text("// boot\nconst WORKER = 'worker.js';\nconst OTHER = 'myapp.js';\n")
+        (self.root / "worker.js").write_text("self.onmessage = () => {};\n")
+        (self.root / "unused.js").write_text("console.log('never referenced');\n")
+        (self.root / "img").mkdir()
+        (self.root / "img" / "bg.png").write_bytes(b"\x89PNG fake")
+        (self.root / "_headers").write_text(SOURCE_HEADERS)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+        shutil.rmtree(self.out.parent)
+
+    def test_fingerprints_and_rewrites_references(self):
+        renamed = build.build(self.root, self.out)
+        self.assertEqual(set(renamed), {"index.html", "site.css", "app.js", "worker.js", "img/bg.png"})
+        self.assertEqual(renamed["index.html"], "index.html")
+        for source, output in renamed.items():
+            if source != "index.html":
+                self.assertRegex(output, r"\.[0-9a-f]{10}\.(css|js|png)$")
+            self.assertTrue((self.out / output).is_file(), output)
+        self.assertFalse(any(self.out.glob("unused*")))
+
+        html = (self.out / "index.html").read_text()
+        self.assertNotIn("mentioned here only", html)
+        self.assertIn(f'href="{renamed["site.css"]}" as="style"', html)
+        self.assertIn(f'href="./{renamed["site.css"]}"', html)
+        self.assertIn(f'src="{renamed["app.js"]}"', html)
+
+        css = (self.out / renamed["site.css"]).read_text()
+        self.assertIn(f"url({renamed['img/bg.png']})", css)
+        app = (self.out / renamed["app.js"]).read_text()
+        self.assertIn(f"'{renamed['worker.js']}'", app)
+        self.assertIn("'myapp.js'", app)
+
+    def test_hash_follows_dependency_content(self):
+        first = build.build(self.root, self.out)
+        (self.root / "worker.js").write_text("self.onmessage = () => { postMessage(1); };\n")
+        second = build.build(self.root, self.out)
+        self.assertNotEqual(first["worker.js"], second["worker.js"])
+        self.assertNotEqual(first["app.js"], second["app.js"])
+        self.assertEqual(first["site.css"], second["site.css"])
+        self.assertFalse((self.out / first["app.js"]).exists(), "Previous output should be replaced")
+
+    def test_writes_gzip_siblings(self):
+        (self.root / "app.js").write_text("const WORKER = 'worker.js';\n" + "console.log('padding');\n" * 50)
+        renamed = build.build(self.root, self.out)
+        app = self.out / renamed["app.js"]
+        gz = app.with_name(app.name + ".gz")
+        self.assertTrue(gz.is_file())
+        self.assertEqual(gzip.decompress(gz.read_bytes()), app.read_bytes())
+        self.assertFalse((self.out / (renamed["img/bg.png"] + ".gz")).exists())
+        # The output must not depend on which optional packages are installed.
+        self.assertEqual(list(self.out.rglob("*.br")), [])
+
+    def test_headers_make_fingerprinted_assets_immutable(self):
+        renamed = build.build(self.root, self.out)
+        text = (self.out / "_headers").read_text()
+        self.assertNotIn("Expires", text)
+        rules = parse_headers_file(text)
+
+        css = dict(headers_for_path(rules, "/" + renamed["site.css"]))
+        self.assertEqual(css["Cache-Control"], build.IMMUTABLE_CACHE)
+        self.assertEqual(css["X-Frame-Options"], "DENY")
+        png = dict(headers_for_path(rules, "/" + renamed["img/bg.png"]))
+        self.assertEqual(png["Cache-Control"], build.IMMUTABLE_CACHE)
+        for path in ("/", "/index.html"):
+            self.assertEqual(dict(headers_for_path(rules, path))["Cache-Control"], "public, max-age=300")
+
+    def test_html_fragments_are_fingerprinted_assets(self):
+        (self.root / "index.html").write_text('<!DOCTYPE html>\n<div data-legal-src="fragments/terms.html"></div>\n')
+        (self.root / "fragments").mkdir()
+        (self.root / "fragments" / "terms.html").write_text("<!DOCTYPE html>\n<p>Terms</p>\n")
+        renamed = build.build(self.root, self.out)
+        self.assertEqual(renamed["index.html"], "index.html")
+        self.assertRegex(renamed["fragments/terms.html"], r"^fragments/terms\.[0-9a-f]{10}\.html$")
+        self.assertIn(f'data-legal-src="{renamed["fragments/terms.html"]}"', (self.out / "index.html").read_text())
+
+        rules = parse_headers_file((self.out / "_headers").read_text())
+        fragment = dict(headers_for_path(rules, "/" + renamed["fragments/terms.html"]))
+        self.assertEqual(fragment["Cache-Control"], build.IMMUTABLE_CACHE)
+        self.assertEqual(dict(headers_for_path(rules, "/index.html"))["Cache-Control"], "public, max-age=300")
+
+    def test_reports_reference_cycles(self):
+        (self.root / "worker.js").write_text("importScripts('app.js');\n")
+        with self.assertRaisesRegex(build.BuildError, "cycle"):
+            build.build(self.root, self.out)
+
+    def test_refuses_to_overwrite_the_source_tree(self):
+        for out in (self.root, self.root.parent):
+            with self.assertRaises(build.BuildError):
+                build.build(self.root, out)
+        self.assertTrue((self.root / "index.html").exists())
+
+
+class SiteBuildTest(unittest.TestCase):
+    """Builds the real site so new references are caught when they are added."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.out = Path(tempfile.mkdtemp()) / "dist"
+        cls.renamed = build.build(REPO_ROOT, cls.out)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.out.parent)
+
+    def test_every_local_reference_resolves(self):
+        html = (self.out / "index.html").read_text()
+        refs = re.findall(r'(?:src|href)="([^"#:]+)"', html)
+        self.assertTrue(refs)
+        for ref in refs:
+            self.assertTrue((self.out / ref.lstrip("./")).is_file(), ref)
+
+    def test_scripts_and_styles_are_fingerprinted(self):
+        for source in ("script.js", "styles.css", "hero-engine.js", "hero-worker.js"):
+            self.assertIn(source, self.renamed)
+            self.assertNotEqual(self.renamed[source], source)
+
+    def test_worker_references_hashed_engine(self):
+        hero = (self.out / self.renamed["hero-canvas.js"]).read_text()
+        worker = (self.out / self.renamed["hero-worker.js"]).read_text()
+        self.assertIn(self.renamed["hero-worker.js"], hero)
+        self.assertIn(f"import('./{self.renamed['hero-engine.js']}')", hero)
+        self.assertIn(self.renamed["hero-engine.js"], worker)
+
+    def test_script_imports_hashed_modules(self):
+        script = (self.out / self.renamed["script.js"]).read_text()
+        for module in ("hero-canvas.js", "marquee.js", "in-practice.js", "contact-form.js", "legal-modals.js",
+                       "back-to-top.js"):
+            self.assertIn(f"import('./{self.renamed[module]}')", script)
+
+    def test_legal_fragments_are_hashed(self):
+        html = (self.out / "index.html").read_text()
+        for name in ("privacy-policy", "terms-conditions", "accessibility"):
+            output = self.renamed[f"fragments/{name}.html"]
+            self.assertNotEqual(output, f"fragments/{name}.html")
+            self.assertIn(f'data-legal-src="{output}"', html)
+
+    def test_output_is_smaller(self):
+        for source in ("index.html", "script.js", "styles.css"):
+            self.assertLess((self.out / self.renamed[source]).stat().st_size, (REPO_ROOT / source).stat().st_size)
+
+
+if __name__ == '__main__':
+    unittest.main()
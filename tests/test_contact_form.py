@@ -0,0 +1,200 @@
+import json
+import unittest
+
+import waits
+from harness import BrowserTestCase, get_session
+
+# contact-form.js timings the tests fast-forward through.
+SUBMIT_TIMEOUT_MS = 10000
+RETRY_BASE_MS = 1000
+OUTBOX_RETRY_BASE_MS = 30000
+FORM_ID = "test-form"
+FIELDS = {"name": "Ada", "email": "ada@example.com", "message": "Hello"}
+
+
+class ContactFormSubmitTest(BrowserTestCase):
+    """Submits through the dev server's Formspree stand-in (tools/devserver.py) instead of formspree.io.
+
+    The page runs on the virtual clock, so the submit timeout and the retry
+    backoff only pass when the test advances it; the stand-in's latency is real.
+    """
+
+    virtual_time = True
+    viewport = {"width": 1280, "height": 800}
+
+    def setUp(self):
+        super().setUp()
+        self.formspree = get_session().server.formspree
+        self.formspree.reset()
+        self.addCleanup(self.formspree.reset)
+        self.navigate()
+        self.assertTrue(waits.wait_for_page_ready(self.page))
+        self.page_url = self.page.url
+        self.point_form_at_stand_in()
+
+    def point_form_at_stand_in(self):
+        self.page.evaluate("""(action) => {
+            document.querySelector('.contact-form').action = action;
+            document.getElementById('formLoadTime').value = String(Date.now() - 60000);
+        }""", f"/__formspree/{FORM_ID}")
+
+    def load_module(self):
+        # Offline emulation blocks the dev server too, so import contact-form.js first.
+        with self.page.expect_response("**/contact-form.js"):
+            self.page.evaluate("document.getElementById('contact-form').scrollIntoView({ behavior: 'instant' })")
+
+    def submit(self):
+        for field, value in FIELDS.items():
+            self.page.fill(f"#{field}", value)
+        self.page.click(".contact-submit-btn")
+        self.assertTrue(waits.wait_for_attribute(self.page, ".contact-form", "data-submit-attempt", "1"))
+
+    def wait_for_state(self, state):
+        return waits.wait_for_attribute(self.page, ".contact-form", "data-submit-state", state)
+
+    def outbox(self):
+        return json.loads(self.page.evaluate("localStorage.getItem('_formOutbox') || '[]'"))
+
+    def assert_sent_once(self):
+        self.assertEqual(len(self.formspree.submissions), 1)
+        form_id, fields = self.formspree.submissions[0]
+        self.assertEqual(form_id, FORM_ID)
+        self.assertEqual({name: fields.get(name) for name in FIELDS}, FIELDS)
+        self.assertEqual(fields.get("_gotcha", ""), "")
+
+    def test_sends_without_navigating(self):
+        self.submit()
+        self.assertTrue(self.wait_for_state("sent"))
+        self.assert_sent_once()
+        self.assertEqual(self.page.url, self.page_url)
+        form = self.page.evaluate("""() => ({
+            message: document.getElementById('message').value,
+            submitting: document.querySelector('.contact-form').classList.contains('is-submitting'),
+            disabled: document.querySelector('.contact-submit-btn').disabled,
+        })""")
+        self.assertEqual(form, {"message": "", "submitting": False, "disabled": False})
+        self.assertEqual(self.outbox(), [])
+
+    def test_server_errors_are_retried_with_backoff(self):
+        self.formspree.inject(status=503, count=2)
+        self.submit()
+        self.assertTrue(waits.wait_for_attribute(self.page, ".contact-form", "data-submit-attempt", "2"))
+        self.assertEqual(self.page.get_attribute(".contact-form", "data-submit-state"), "retrying")
+        self.advance(RETRY_BASE_MS)
+        self.assertTrue(waits.wait_for_attribute(self.page, ".contact-form", "data-submit-attempt", "3"))
+        self.advance(RETRY_BASE_MS * 2)
+        self.assertTrue(self.wait_for_state("sent"))
+        self.assert_sent_once()
+
+    def test_slow_response_times_out_and_is_retried(self):
+        self.formspree.inject(status=504, delay=1.0)
+        self.submit()
+        self.advance(SUBMIT_TIMEOUT_MS)
+        self.assertTrue(waits.wait_for_attribute(self.page, ".contact-form", "data-submit-attempt", "2"))
+        self.advance(RETRY_BASE_MS)
+        self.assertTrue(self.wait_for_state("sent"))
+        self.assert_sent_once()
+
+    def test_exhausted_retries_queue_the_message_until_online(self):
+        self.formspree.inject(status=503, count=3)
+        self.submit()
+        self.assertTrue(waits.wait_for_attribute(self.page, ".contact-form", "data-submit-attempt", "2"))
+        self.advance(RETRY_BASE_MS)
+        self.assertTrue(waits.wait_for_attribute(self.page, ".contact-form", "data-submit-attempt", "3"))
+        self.advance(RETRY_BASE_MS * 2)
+        self.assertTrue(self.wait_for_state("queued"))
+        self.assertEqual([entry["fields"]["message"] for entry in self.outbox()], ["Hello"])
+        self.assertEqual(self.formspree.submissions, [])
+
+        self.page.evaluate("window.dispatchEvent(new Event('online'))")
+        self.assertTrue(self.wait_for_state("sent"))
+        self.assert_sent_once()
+        self.assertEqual(self.outbox(), [])
+
+    def exhaust_retries(self):
+        self.formspree.inject(status=503, count=3)
+        self.submit()
+        self.assertTrue(waits.wait_for_attribute(self.page, ".contact-form", "data-submit-attempt", "2"))
+        self.advance(RETRY_BASE_MS)
+        self.assertTrue(waits.wait_for_attribute(self.page, ".contact-form", "data-submit-attempt", "3"))
+        self.advance(RETRY_BASE_MS * 2)
+        self.assertTrue(self.wait_for_state("queued"))
+
+    def test_queued_message_is_retried_while_online(self):
+        self.exhaust_retries()
+        self.assertNotIn("offline", self.page.text_content(".contact-form .form-success-msg"))
+
+        self.advance(OUTBOX_RETRY_BASE_MS)
+        self.assertTrue(self.wait_for_state("sent"))
+        self.assert_sent_once()
+        self.assertEqual(self.outbox(), [])
+
+    def test_rejected_saved_message_is_restored_with_an_error(self):
+        self.exhaust_retries()
+        self.assertEqual(self.page.input_value("#message"), "")
+        self.formspree.inject(status=422)
+
+        self.page.evaluate("window.dispatchEvent(new Event('online'))")
+        self.assertTrue(self.wait_for_state("failed"))
+        self.assertEqual(self.page.input_value("#message"), "Hello")
+        self.assertEqual(self.page.locator(".contact-form .error-msg-send").count(), 1)
+        self.assertEqual(self.page.locator(".contact-form .form-success-msg").count(), 0)
+        self.assertEqual(self.outbox(), [])
+
+    def test_offline_submit_is_queued_without_a_request(self):
+        self.load_module()
+        self.context.set_offline(True)
+        self.submit()
+        self.assertTrue(self.wait_for_state("queued"))
+        self.assertEqual(len(self.outbox()), 1)
+
+        self.context.set_offline(False)
+        self.assertTrue(self.wait_for_state("sent"))
+        self.assert_sent_once()
+        self.assertEqual(self.outbox(), [])
+
+    def test_rejected_message_stays_in_the_form(self):
+        self.formspree.inject(status=422)
+        self.submit()
+        self.assertTrue(self.wait_for_state("failed"))
+        self.assertEqual(self.page.input_value("#message"), "Hello")
+        self.assertEqual(self.page.locator(".contact-form .error-msg-send").count(), 1)
+        self.assertEqual(self.outbox(), [])
+
+    def test_full_outbox_counts_against_the_rate_limit(self):
+        self.load_module()
+        # Offline, so the saved messages below stay in the outbox.
+        self.context.set_offline(True)
+        self.page.evaluate("""(count) => localStorage.setItem('_formOutbox', JSON.stringify(
+            Array.from({ length: count }, (_, i) => ({ id: `saved-${i}`, fields: { message: 'Saved' }, queuedAt: Date.now() }))
+        ))""", 5)
+        for field, value in FIELDS.items():
+            self.page.fill(f"#{field}", value)
+        self.page.click(".contact-submit-btn")
+        self.assertTrue(waits.wait_for_visible(self.page, ".contact-form .error-msg-rate"))
+        self.assertEqual(len(self.outbox()), 5)
+
+
+class SavedMessageTest(BrowserTestCase):
+    """A message left in the outbox is sent to the form's real action on the next visit."""
+
+    def test_outbox_is_flushed_on_load(self):
+        posted = []
+
+        def formspree(route):
+            posted.append(route.request.post_data)
+            route.fulfill(status=200, content_type="application/json", body='{"ok": true}',
+                          headers={"Access-Control-Allow-Origin": "*"})
+
+        self.context.route("https://formspree.io/**", formspree)
+        self.context.add_init_script("""localStorage.setItem('_formOutbox', JSON.stringify(
+            [{ id: 'saved', fields: { name: 'Ada', email: 'ada@example.com', message: 'Saved' }, queuedAt: 0 }]
+        ))""")
+        with self.page.expect_response("https://formspree.io/f/mnjggoke"):
+            self.navigate()
+        self.assertIn("message=Saved", posted[0])
+        self.page.wait_for_function("localStorage.getItem('_formOutbox') === null")
+
+
+if __name__ == '__main__':
+    unittest.main()
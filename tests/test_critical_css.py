@@ -0,0 +1,144 @@
+import re
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from harness import REPO_ROOT
+from tools import build
+from tools import critical_css as critical
+
+STYLES = (
+    ":root{--teal:#0f766e}"
+    ".hero{animation:fade 1s}"
+    ".hero .btn:hover::after{content:'x{y}'}"
+    ".modal,.legal{display:none}"
+    "@media (max-width:720px){.hero{padding:0}.footer{margin:0}}"
+    "@media print{.hero{color:#000}}"
+    "@keyframes fade{from{opacity:0}to{opacity:1}}"
+    "@keyframes spin{to{transform:rotate(1turn)}}"
+    "@font-face{font-family:Local;src:url(local.woff2)}"
+)
+
+PAGE = (
+    '<!DOCTYPE html><html><head>'
+    '<meta http-equiv="Content-Security-Policy" content="default-src \'none\'; style-src \'self\'; img-src \'self\';">'
+    '<link rel="stylesheet" href="anti-clickjack.1.css"><script src="anti-clickjack.2.js"></script>'
+    '<link rel="stylesheet" href="styles.3.css"></head><body></body></html>'
+)
+
+
+class ParseCssTest(unittest.TestCase):
+    def test_parses_nested_groups_and_strings(self):
+        rules = critical.parse_css(STYLES)
+        self.assertEqual(rules[2].prelude, ".hero .btn:hover::after")
+        self.assertEqual(rules[2].body, "content:'x{y}'")
+        media = rules[4]
+        self.assertEqual(media.at_keyword, "@media")
+        self.assertEqual([child.prelude for child in media.children], [".hero", ".footer"])
+        self.assertEqual("".join(rule.text() for rule in rules), STYLES)
+
+    def test_rejects_unbalanced_braces(self):
+        with self.assertRaises(critical.CriticalCssError):
+            critical.parse_css(".a{color:red")
+
+    def test_splits_selector_lists_at_top_level_only(self):
+        self.assertEqual(
+            critical.split_selector_list(".a, :is(.b, .c) > .d,.e"),
+            [".a", ":is(.b, .c) > .d", ".e"],
+        )
+
+    def test_match_selector_drops_pseudo_elements_and_states(self):
+        self.assertEqual(critical.match_selector(".hero .btn:hover::after"), ".hero .btn")
+        self.assertEqual(critical.match_selector("a:focus-visible > span"), "a > span")
+        self.assertEqual(critical.match_selector(".grid>:nth-child(odd)"), ".grid>:nth-child(odd)")
+        self.assertEqual(critical.match_selector("::selection"), "*")
+        self.assertEqual(critical.match_selector("body[data-theme=\"dark\"]::before"), "body[data-theme=\"dark\"]")
+
+
+class CriticalSelectionTest(unittest.TestCase):
+    def setUp(self):
+        self.rules = critical.parse_css(STYLES)
+
+    def test_print_rules_are_never_collected(self):
+        selectors = critical.collect_selectors(self.rules)
+        self.assertEqual(selectors, {":root", ".hero", ".hero .btn", ".modal", ".legal", ".footer"})
+
+    def test_keeps_matched_rules_and_the_keyframes_they_use(self):
+        css = critical.critical_css(self.rules, {":root", ".hero", ".hero .btn"})
+        self.assertEqual(
+            css,
+            ":root{--teal:#0f766e}.hero{animation:fade 1s}.hero .btn:hover::after{content:'x{y}'}"
+            "@media (max-width:720px){.hero{padding:0}}"
+            "@font-face{font-family:Local;src:url(local.woff2)}"
+            "@keyframes fade{from{opacity:0}to{opacity:1}}",
+        )
+
+    def test_one_matching_selector_keeps_the_whole_rule(self):
+        css = critical.critical_css(self.rules, {".legal"})
+        self.assertIn(".modal,.legal{display:none}", css)
+        self.assertNotIn("@media", css)
+        self.assertNotIn("@keyframes", css)
+
+
+class SplitStylesheetsTest(unittest.TestCase):
+    def test_inlines_and_defers(self):
+        css = "html.anti-clickjack body{display:none!important}.hero{color:red}"
+        html = critical.split_stylesheets(PAGE, ["anti-clickjack.1.css"], "styles.3.css", css)
+
+        self.assertIn(f"<style>{css}</style><script src=\"anti-clickjack.2.js\">", html)
+        self.assertNotIn('href="anti-clickjack.1.css"', html)
+        self.assertIn('<link id="site-styles-link" rel="preload" as="style" href="styles.3.css">', html)
+        self.assertIn('<noscript><link rel="stylesheet" href="styles.3.css"></noscript>', html)
+        self.assertEqual(html.count('rel="stylesheet" href="styles.3.css"'), 1)
+
+    def test_adds_style_hash_to_csp(self):
+        html = critical.split_stylesheets(PAGE, ["anti-clickjack.1.css"], "styles.3.css", ".a{color:red}")
+        policy = re.search(r'content="([^"]*)"', html).group(1)
+        self.assertIn("style-src 'self' 'sha256-", policy)
+        self.assertIn(critical.style_hash(".a{color:red}"), policy)
+        self.assertTrue(policy.endswith("img-src 'self';"))
+
+    def test_style_hash_matches_csp_format(self):
+        # echo -n '.a{color:red}' | openssl dgst -sha256 -binary | base64
+        self.assertEqual(critical.style_hash(".a{color:red}"), "'sha256-AYkV/wUaXEz1i9pndN1veIXFHZVFTj4Ojce2rMK7bSc='")
+
+    def test_requires_style_src(self):
+        page = PAGE.replace("style-src 'self'; ", "")
+        with self.assertRaises(critical.CriticalCssError):
+            critical.split_stylesheets(page, ["anti-clickjack.1.css"], "styles.3.css", ".a{}")
+
+    def test_missing_stylesheet_link_is_an_error(self):
+        with self.assertRaises(critical.CriticalCssError):
+            critical.split_stylesheets(PAGE, ["missing.css"], "styles.3.css", ".a{}")
+
+
+class CriticalCssBuildTest(unittest.TestCase):
+    """Runs the browser extraction and verification against the real site."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.out = Path(tempfile.mkdtemp()) / "dist"
+        cls.renamed = build.build(REPO_ROOT, cls.out, compress=False, critical_css=True)
+        cls.html = (cls.out / "index.html").read_text()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.out.parent)
+
+    def test_styles_are_deferred_and_clickjack_css_inlined(self):
+        styles = self.renamed["styles.css"]
+        self.assertIn(f'<link id="site-styles-link" rel="preload" as="style" href="{styles}">', self.html)
+        self.assertNotIn(self.renamed["anti-clickjack.css"], self.html)
+        self.assertIn("<style>html.anti-clickjack body{display: none !important}", self.html)
+
+    def test_critical_css_is_smaller_than_the_stylesheet(self):
+        css = re.search(r"<style>(.*?)</style>", self.html, re.DOTALL).group(1)
+        self.assertIn(critical.style_hash(css), self.html)
+        self.assertIn(".hero-section", css)
+        self.assertNotIn("@media print", css)
+        self.assertLess(len(css), (self.out / self.renamed["styles.css"]).stat().st_size / 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
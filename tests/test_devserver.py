@@ -0,0 +1,226 @@
+import gzip
+import http.client
+import os
+import shutil
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+
+from harness import REPO_ROOT
+from tools.devserver import headers_for_path, parse_headers_file, start_server
+
+HEADERS = textwrap.dedent("""\
+    /*
+      X-Frame-Options: DENY
+
+    # Assets are cached for a long time
+    /*.css
+      Cache-Control: public, max-age=1814400
+
+    /assets/*
+      Cache-Control: public, max-age=600
+
+    /
+      Cache-Control: public, max-age=300
+""")
+
+
+class HeadersFileTest(unittest.TestCase):
+    def test_parses_rules_in_order(self):
+        rules = parse_headers_file(HEADERS)
+        self.assertEqual([rule.pattern for rule in rules], ["/*", "/*.css", "/assets/*", "/"])
+        self.assertEqual(rules[1].headers, [("Cache-Control", "public, max-age=1814400")])
+
+    def test_root_rule_only_matches_root(self):
+        rules = parse_headers_file(HEADERS)
+        self.assertEqual(
+            headers_for_path(rules, "/"),
+            [("X-Frame-Options", "DENY"), ("Cache-Control", "public, max-age=300")],
+        )
+        self.assertEqual(headers_for_path(rules, "/index.html"), [("X-Frame-Options", "DENY")])
+
+    def test_repeated_headers_are_joined(self):
+        rules = parse_headers_file(HEADERS + "/assets/*.css\n  Link: </a.woff2>; rel=preload\n"
+                                   "/assets/*\n  Link: </b.woff2>; rel=preload\n")
+        self.assertIn(
+            ("Link", "</a.woff2>; rel=preload, </b.woff2>; rel=preload"),
+            headers_for_path(rules, "/assets/site.css"),
+        )
+
+    def test_later_rule_replaces_singleton_headers(self):
+        rules = parse_headers_file(HEADERS + "/assets/*.css\n  Cache-Control: immutable\n")
+        headers = headers_for_path(rules, "/assets/site.css")
+        self.assertEqual([value for name, value in headers if name == "Cache-Control"], ["immutable"])
+
+        repository_rules = parse_headers_file((REPO_ROOT / "_headers").read_text())
+        headers = dict(headers_for_path(repository_rules, "/assets/photo.webp"))
+        self.assertEqual(headers["Cache-Control"], "public, max-age=1814400")
+
+    def test_rejects_header_without_pattern(self):
+        with self.assertRaises(ValueError):
+            parse_headers_file("  X-Frame-Options: DENY\n")
+
+    def test_repository_headers_file_parses(self):
+        rules = parse_headers_file((REPO_ROOT / "_headers").read_text())
+        self.assertIn(("X-Frame-Options", "DENY"), headers_for_path(rules, "/"))
+
+
+class DevServerTest(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        (self.root / "index.html").write_text("<!DOCTYPE html><title>home</title>")
+        (self.root / "site.css").write_text("body { color: red; }")
+        (self.root / "_headers").write_text(HEADERS)
+        (self.root / "assets").mkdir()
+        (self.root / "assets" / "data.txt").write_bytes(b"0123456789")
+        (self.root / ".secret").write_text("nope")
+        self.server = start_server(self.root, host="127.0.0.1")
+        self.conn = http.client.HTTPConnection("127.0.0.1", self.server.port, timeout=5)
+
+    def tearDown(self):
+        self.conn.close()
+        self.server.stop()
+        shutil.rmtree(self.root)
+
+    def request(self, path, method="GET", headers=None):
+        self.conn.request(method, path, headers=headers or {})
+        response = self.conn.getresponse()
+        return response, response.read()
+
+    def test_serves_index_with_headers_rules(self):
+        response, body = self.request("/")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, b"<!DOCTYPE html><title>home</title>")
+        self.assertEqual(response.getheader("Content-Type"), "text/html; charset=utf-8")
+        self.assertEqual(response.getheader("X-Frame-Options"), "DENY")
+        self.assertEqual(response.getheader("Cache-Control"), "public, max-age=300")
+
+    def test_keeps_connection_alive_between_requests(self):
+        self.request("/site.css")
+        first_socket = self.conn.sock
+        response, _body = self.request("/assets/data.txt")
+        self.assertEqual(response.status, 200)
+        self.assertIsNotNone(first_socket)
+        self.assertIs(self.conn.sock, first_socket, "Expected the HTTP/1.1 connection to be reused")
+
+    def test_if_none_match_returns_not_modified(self):
+        response, _body = self.request("/site.css")
+        etag = response.getheader("ETag")
+        self.assertTrue(etag.startswith('"'))
+
+        response, body = self.request("/site.css", headers={"If-None-Match": etag})
+        self.assertEqual(response.status, 304)
+        self.assertEqual(body, b"")
+        self.assertEqual(response.getheader("Cache-Control"), "public, max-age=1814400")
+
+    def test_range_requests(self):
+        response, body = self.request("/assets/data.txt", headers={"Range": "bytes=2-5"})
+        self.assertEqual(response.status, 206)
+        self.assertEqual(body, b"2345")
+        self.assertEqual(response.getheader("Content-Range"), "bytes 2-5/10")
+
+        response, body = self.request("/assets/data.txt", headers={"Range": "bytes=-3"})
+        self.assertEqual((response.status, body), (206, b"789"))
+
+        response, _body = self.request("/assets/data.txt", headers={"Range": "bytes=20-"})
+        self.assertEqual(response.status, 416)
+        self.assertEqual(response.getheader("Content-Range"), "bytes */10")
+
+    def test_stale_if_range_serves_full_body(self):
+        response, body = self.request("/assets/data.txt", headers={"Range": "bytes=0-1", "If-Range": '"stale"'})
+        self.assertEqual((response.status, body), (200, b"0123456789"))
+
+    def test_head_sends_length_without_body(self):
+        response, body = self.request("/site.css", method="HEAD")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, b"")
+        self.assertEqual(response.getheader("Content-Length"), str(len("body { color: red; }")))
+
+    def test_changed_file_is_reloaded(self):
+        response, _body = self.request("/site.css")
+        old_etag = response.getheader("ETag")
+
+        css = self.root / "site.css"
+        css.write_text("body { color: blue; }")
+        stat = css.stat()
+        os.utime(css, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        response, body = self.request("/site.css")
+        self.assertEqual(body, b"body { color: blue; }")
+        self.assertNotEqual(response.getheader("ETag"), old_etag)
+
+    def test_hidden_and_config_files_are_not_served(self):
+        for path in ("/.secret", "/_headers", "/../index.html/../.secret", "/missing.css"):
+            response, _body = self.request(path)
+            self.assertEqual(response.status, 404, path)
+
+    def test_serves_precompressed_sibling_when_accepted(self):
+        css = b"body { color: red; }"
+        (self.root / "site.css.gz").write_bytes(gzip.compress(css, mtime=0))
+
+        response, body = self.request("/site.css", headers={"Accept-Encoding": "br, gzip"})
+        self.assertEqual(response.getheader("Content-Encoding"), "gzip")
+        self.assertEqual(response.getheader("Content-Type"), "text/css; charset=utf-8")
+        self.assertEqual(response.getheader("Vary"), "Accept-Encoding")
+        self.assertEqual(gzip.decompress(body), css)
+
+        response, body = self.request("/site.css", headers={"Accept-Encoding": "gzip;q=0"})
+        self.assertIsNone(response.getheader("Content-Encoding"))
+        self.assertEqual(response.getheader("Vary"), "Accept-Encoding")
+        self.assertEqual(body, css)
+
+        response, body = self.request("/site.css", headers={"Accept-Encoding": "gzip", "Range": "bytes=0-3"})
+        self.assertEqual((response.status, body), (206, b"body"))
+
+    def test_collects_beacons_and_refuses_other_posts(self):
+        self.conn.request("POST", "/__perf", body=b'{"components": {}}', headers={"Content-Type": "application/json"})
+        response = self.conn.getresponse()
+        response.read()
+        self.assertEqual(response.status, 204)
+        self.assertEqual(self.server.beacons, [{"components": {}}])
+
+        self.conn.request("POST", "/__perf", body=b"not json")
+        response = self.conn.getresponse()
+        response.read()
+        self.assertEqual(response.status, 400)
+
+        self.conn.request("POST", "/index.html", body=b"{}")
+        response = self.conn.getresponse()
+        response.read()
+        self.assertEqual(response.status, 405)
+        self.assertEqual(response.getheader("Allow"), "GET, HEAD")
+        self.assertEqual(len(self.server.beacons), 1)
+
+    def test_formspree_stand_in_records_posts_and_replays_faults(self):
+        form = b"name=Ada&email=ada%40example.com&message=Hello"
+        headers = {"Content-Type": "application/x-www-form-urlencoded", "Accept": "application/json"}
+        self.server.formspree.inject(status=503, delay=0.05)
+        self.server.formspree.inject(status=429)
+
+        statuses = []
+        for _attempt in range(3):
+            self.conn.request("POST", "/__formspree/abc123", body=form, headers=headers)
+            response = self.conn.getresponse()
+            response.read()
+            statuses.append(response.status)
+        self.assertEqual(statuses, [503, 429, 200])
+        self.assertEqual(response.getheader("Content-Type"), "application/json")
+        self.assertEqual(self.server.formspree.submissions,
+                         [("abc123", {"name": "Ada", "email": "ada@example.com", "message": "Hello"})])
+
+        self.server.formspree.reset()
+        self.assertEqual(self.server.formspree.submissions, [])
+        self.conn.request("POST", "/__formspree/", body=form, headers=headers)
+        response = self.conn.getresponse()
+        response.read()
+        self.assertEqual(response.status, 405)
+
+    def test_directory_without_slash_redirects(self):
+        response, _body = self.request("/assets")
+        self.assertEqual(response.status, 301)
+        self.assertEqual(response.getheader("Location"), "/assets/")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+import importlib.util
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from harness import REPO_ROOT
+from tools import fonts
+from tools.budgets import third_party_patterns
+
+PAGE = (
+    '<html><head><meta http-equiv="Content-Security-Policy" content="default-src \'none\'; '
+    'style-src \'self\' https://fonts.googleapis.com; font-src \'self\' https://fonts.gstatic.com; img-src \'self\';">'
+    '<style>.x::after{content:"★"}</style></head>'
+    '<body><h1 data-full-text="Hi, I’m Noah">Hi</h1><p>Data • Visualization&nbsp;&mdash; ok</p>'
+    '<img alt="Café"><svg><text>∑</text></svg><script>let s = "»";</script></body></html>'
+)
+
+
+class CollectCodepointsTest(unittest.TestCase):
+    def test_collects_text_attributes_and_script_characters(self):
+        codepoints = fonts.collect_codepoints(PAGE, ['const arrow = "→";'])
+        for ch in "’•—é→ ":
+            self.assertIn(ord(ch), codepoints, ch)
+        self.assertTrue(fonts.BASE_CODEPOINTS <= codepoints)
+
+    def test_ignores_style_script_and_svg_content(self):
+        codepoints = fonts.collect_codepoints(PAGE)
+        for ch in "★∑»":
+            self.assertNotIn(ord(ch), codepoints, ch)
+
+    def test_unicode_range_merges_runs(self):
+        self.assertEqual(fonts.unicode_range({0x41, 0x42, 0x43, 0x2022, 0x20}), "U+20, U+41-43, U+2022")
+
+
+class GeneratedBlocksTest(unittest.TestCase):
+    def test_fallback_metrics_scale_by_size_adjust(self):
+        metrics = fonts.fallback_metrics(1000, 984, -216, 0, 542)
+        size_adjust = (542 / 1000) / fonts.ARIAL_AVG_CHAR_WIDTH
+        self.assertAlmostEqual(metrics["size-adjust"], size_adjust)
+        self.assertAlmostEqual(metrics["ascent-override"], 0.984 / size_adjust)
+        self.assertAlmostEqual(metrics["descent-override"], 0.216 / size_adjust)
+        self.assertEqual(metrics["line-gap-override"], 0)
+
+    def test_font_face_css_declares_every_weight(self):
+        css = fonts.font_face_css({0x41, 0x42}, fonts.fallback_metrics(1000, 900, -200, 0, 500))
+        self.assertTrue(css.startswith(fonts.CSS_MARKERS[0]) and css.endswith(fonts.CSS_MARKERS[1]))
+        for weight in fonts.WEIGHTS:
+            self.assertIn(f"font-weight: {weight};", css)
+            self.assertIn(f"url('assets/fonts/space-grotesk-{weight}.woff2') format('woff2')", css)
+        self.assertEqual(css.count("font-display: swap;"), len(fonts.PRELOADED_WEIGHTS))
+        self.assertIn("unicode-range: U+41-42;", css)
+        self.assertIn(f"font-family: '{fonts.FALLBACK_FAMILY}';", css)
+
+    def test_preloads_are_cors_font_requests(self):
+        block = fonts.preload_html()
+        for weight in fonts.PRELOADED_WEIGHTS:
+            self.assertIn(
+                f'<link rel="preload" as="font" type="font/woff2" href="assets/fonts/space-grotesk-{weight}.woff2" crossorigin>',
+                block,
+            )
+
+    def test_replace_marked_block(self):
+        text = "a\n/* fonts:begin */\nold\n/* fonts:end */\nb"
+        self.assertEqual(fonts.replace_marked_block(text, fonts.CSS_MARKERS, "NEW"), "a\nNEW\nb")
+        with self.assertRaises(fonts.FontPipelineError):
+            fonts.replace_marked_block("no markers", fonts.CSS_MARKERS, "NEW")
+
+    def test_drops_google_origins_from_csp(self):
+        html = fonts.drop_google_fonts_from_csp(PAGE)
+        self.assertIn("style-src 'self'; font-src 'self'; img-src 'self';", html)
+        self.assertNotIn("fonts.g", html)
+
+    def test_removes_marked_script_lines(self):
+        script = "a();\n    // fonts:begin\n    link.rel = 'stylesheet';\n    // fonts:end\n    b();\n"
+        self.assertEqual(fonts.remove_marked_lines(script, fonts.JS_MARKERS), "a();\n    b();\n")
+        self.assertEqual(fonts.remove_marked_lines("a();\n", fonts.JS_MARKERS), "a();\n")
+
+    def test_adds_fallback_family_once(self):
+        css = ":root {\n    --font-main: 'Space Grotesk', Arial, sans-serif;\n}"
+        patched = fonts.add_fallback_family(css)
+        self.assertIn("--font-main: 'Space Grotesk', 'Space Grotesk Fallback', Arial, sans-serif;", patched)
+        self.assertEqual(fonts.add_fallback_family(patched), patched)
+
+    def test_drops_google_origins_from_budgets(self):
+        text = ('{\n  "assets": {},\n  "third_party_origins": [\n    "https://fonts.googleapis.com",\n'
+                '    "https://cdn.example.com",\n    "https://fonts.gstatic.com"\n  ]\n}\n')
+        self.assertEqual(
+            fonts.drop_google_fonts_from_budgets(text),
+            '{\n  "assets": {},\n  "third_party_origins": [\n    "https://cdn.example.com"\n  ]\n}\n',
+        )
+        budgets = json.loads(fonts.drop_google_fonts_from_budgets(fonts.drop_google_fonts_from_budgets(text)))
+        self.assertEqual(budgets["third_party_origins"], ["https://cdn.example.com"])
+        only_google = '{"third_party_origins": ["https://fonts.googleapis.com"]}'
+        self.assertEqual(fonts.drop_google_fonts_from_budgets(only_google), '{"third_party_origins": []}')
+
+
+class SiteFontsTest(unittest.TestCase):
+    def test_page_has_generated_blocks(self):
+        html = (REPO_ROOT / "index.html").read_text()
+        css = (REPO_ROOT / "styles.css").read_text()
+        for marker in fonts.HTML_MARKERS:
+            self.assertEqual(html.count(marker), 1, marker)
+        for marker in fonts.CSS_MARKERS:
+            self.assertEqual(css.count(marker), 1, marker)
+
+    def test_fallback_family_is_only_named_once_defined(self):
+        css = (REPO_ROOT / "styles.css").read_text()
+        defined = f"font-family: '{fonts.FALLBACK_FAMILY}';" in css
+        self.assertEqual(f"'{fonts.FAMILY}', '{fonts.FALLBACK_FAMILY}'," in css, defined)
+
+    def test_google_fonts_are_used_everywhere_or_nowhere(self):
+        """tools/fonts.py retires Google Fonts in one run; a half-done cutover fails here."""
+        html = (REPO_ROOT / "index.html").read_text()
+        script = (REPO_ROOT / "script.js").read_text()
+        origins = set(json.loads((REPO_ROOT / "budgets.json").read_text())["third_party_origins"])
+        self_hosted = (REPO_ROOT / "assets" / "fonts" / fonts.font_file(fonts.WEIGHTS[0])).exists()
+        uses_google = {
+            "csp": all(origin in html.split('Content-Security-Policy" content="')[1].split('"')[0]
+                       for origin in fonts.GOOGLE_FONT_ORIGINS),
+            "stylesheet link": 'id="google-fonts-link"' in html,
+            "script.js activation": fonts.JS_MARKERS[0] in script,
+            "budgets": origins >= set(fonts.GOOGLE_FONT_ORIGINS),
+            "no self-hosted fonts": not self_hosted,
+        }
+        self.assertIn(set(uses_google.values()), ({True}, {False}), uses_google)
+
+    @unittest.skipUnless(fonts.TTFont is not None and fonts.SOURCE_FONT.exists(),
+                         "needs fonttools and the vendored source font")
+    def test_generated_fonts_cover_the_page(self):
+        missing = fonts.missing_codepoints(fonts.covered_codepoints())
+        self.assertEqual(missing, {}, "Run `python -m tools.fonts` to regenerate the subsets")
+
+
+
+def _build_test_font(path):
+    """Write a tiny static TrueType font with an empty glyph for every printable ASCII character."""
+    from fontTools.fontBuilder import FontBuilder
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+    names = [".notdef"] + [f"uni{cp:04X}" for cp in range(0x20, 0x7F)]
+    builder = FontBuilder(1000, isTTF=True)
+    builder.setupGlyphOrder(names)
+    builder.setupCharacterMap({cp: f"uni{cp:04X}" for cp in range(0x20, 0x7F)})
+    builder.setupGlyf({name: TTGlyphPen(None).glyph() for name in names})
+    builder.setupHorizontalMetrics({name: (500, 0) for name in names})
+    builder.setupHorizontalHeader(ascent=900, descent=-200)
+    builder.setupNameTable({"familyName": "Test Grotesk", "styleName": "Regular"})
+    builder.setupOS2(xAvgCharWidth=500)
+    builder.setupPost()
+    builder.save(path)
+
+
+@unittest.skipUnless(fonts.TTFont is not None and importlib.util.find_spec("brotli"),
+                     "needs fonttools and brotli")
+class GenerateTest(unittest.TestCase):
+    """One run of the pipeline, on a copy of the site, leaves no trace of Google Fonts."""
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        for name in (*fonts.TEXT_SOURCES, "styles.css", "budgets.json"):
+            shutil.copy(REPO_ROOT / name, self.root / name)
+        shutil.copytree(REPO_ROOT / fonts.FRAGMENTS_DIR, self.root / fonts.FRAGMENTS_DIR)
+        self.source = self.root / "source.ttf"
+        _build_test_font(self.source)
+
+    def test_generate_retires_google_fonts(self):
+        covered = fonts.generate(self.root, self.source, self.root / "assets" / "fonts")
+        self.assertIn(ord("A"), covered)
+        for weight in fonts.WEIGHTS:
+            self.assertTrue((self.root / "assets" / "fonts" / fonts.font_file(weight)).is_file())
+
+        site = {name: (self.root / name).read_text() for name in ("index.html", "styles.css", "script.js")}
+        for name, text in site.items():
+            self.assertNotIn("fonts.googleapis.com", text, name)
+            self.assertNotIn("google-fonts-link", text, name)
+        self.assertIn(f"'{fonts.FAMILY}', '{fonts.FALLBACK_FAMILY}',", site["styles.css"])
+        self.assertIn(f"font-family: '{fonts.FALLBACK_FAMILY}';", site["styles.css"])
+        self.assertNotIn(fonts.JS_MARKERS[0], site["script.js"])
+        budgets = json.loads((self.root / "budgets.json").read_text())
+        self.assertEqual(budgets["third_party_origins"], [])
+        self.assertEqual(third_party_patterns(self.root / "budgets.json"), ())
+
+        # Re-running (after new copy, say) leaves the cutover as it is.
+        fonts.generate(self.root, self.source, self.root / "assets" / "fonts")
+        self.assertEqual((self.root / "styles.css").read_text(), site["styles.css"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,52 +1,53 @@
 import unittest
-import threading
-import http.server
-import socketserver
-from urllib.parse import urlparse
-from playwright.sync_api import sync_playwright
+
+import waits
+from harness import REPO_ROOT, BrowserTestCase
+from tools.sitemodel import load_site
 
 DEFAULT_VIEWPORT_WIDTH = 1280
 DEFAULT_VIEWPORT_HEIGHT = 800
-BLOCKED_HOSTS = {"fonts.googleapis.com", "fonts.gstatic.com"}
 
 
-class FooterLayoutTest(unittest.TestCase):
+class FooterMarkupTest(unittest.TestCase):
+    """Footer structure as shipped in index.html; the rendered layout is covered below and by test_snapshots."""
+
     @classmethod
     def setUpClass(cls):
-        handler = http.server.SimpleHTTPRequestHandler
-        cls.httpd = socketserver.TCPServer(("", 0), handler)
-        cls.port = cls.httpd.server_address[1]
-        cls.server_thread = threading.Thread(target=cls.httpd.serve_forever)
-        cls.server_thread.daemon = True
-        cls.server_thread.start()
+        cls.document = load_site(REPO_ROOT).document
 
-        cls.playwright = sync_playwright().start()
-        cls.browser = cls.playwright.chromium.launch(headless=True)
-        cls.base_url = f"http://localhost:{cls.port}"
+    def test_footer_has_legal_links(self):
+        legal_headers = self.document.select(".footer-col-heading", text="Legal")
+        self.assertEqual(len(legal_headers), 1, "Expected Legal footer header to exist exactly once")
+
+        for label in ("Privacy Policy", "Terms & Conditions", "Accessibility"):
+            triggers = self.document.select("button.footer-legal-trigger", text=label)
+            self.assertEqual(len(triggers), 1, f"Expected {label} footer legal trigger")
+
+    def test_legal_modal_bodies_are_fragments(self):
+        """The modal bodies are fetched on demand, so only the titles ship in index.html."""
+        bodies = self.document.select(".legal-modal-overlay .legal-modal-body[data-legal-src]")
+        self.assertEqual(len(bodies), 3)
+        for body in bodies:
+            source = body.get("data-legal-src")
+            self.assertTrue(source.startswith("fragments/"), source)
+            self.assertTrue((REPO_ROOT / source).is_file(), source)
+            self.assertEqual(body.text.strip(), "", f"{source} should not be inlined")
+        self.assertEqual(self.document.select(".terms-email-reveal"), [])
 
-    @classmethod
-    def tearDownClass(cls):
-        cls.browser.close()
-        cls.playwright.stop()
-        cls.httpd.shutdown()
-        cls.httpd.server_close()
-
-    def setUp(self):
-        self.context = self.browser.new_context(
-            viewport={"width": DEFAULT_VIEWPORT_WIDTH, "height": DEFAULT_VIEWPORT_HEIGHT}
-        )
-        self.page = self.context.new_page()
-        self.page.route("**/*", self._handle_route)
+    def test_footer_logo_is_slightly_smaller(self):
+        logo = self.document.select_one(".footer-logo")
+        self.assertIsNotNone(logo, "Expected a footer logo")
+        self.assertEqual(logo.get("width"), "44", f"Expected footer logo width attribute to be 44, got {logo.attrs}")
+        self.assertEqual(logo.get("height"), "44", f"Expected footer logo height attribute to be 44, got {logo.attrs}")
 
-    def tearDown(self):
-        self.context.close()
 
-    @staticmethod
-    def _handle_route(route):
-        if urlparse(route.request.url).hostname in BLOCKED_HOSTS:
-            route.abort()
-        else:
-            route.continue_()
+class FooterLayoutTest(BrowserTestCase):
+    viewport = {"width": DEFAULT_VIEWPORT_WIDTH, "height": DEFAULT_VIEWPORT_HEIGHT}
+
+    def open_legal_modal(self, label, modal_id):
+        """Click a footer legal trigger and wait for its modal; the first click also imports legal-modals.js."""
+        self.page.click(f"button.footer-legal-trigger:has-text('{label}')")
+        self.assertTrue(waits.wait_for_attribute(self.page, f"#{modal_id}", "hidden", None))
 
     def test_footer_column_headers_are_left_aligned(self):
         self.page.goto(self.base_url, wait_until="domcontentloaded")
@@ -63,20 +64,6 @@ class FooterLayoutTest(unittest.TestCase):
             f"Expected all footer column headers to be left-aligned, got: {text_alignments}"
         )
 
-    def test_footer_has_legal_links(self):
-        self.page.goto(self.base_url, wait_until="domcontentloaded")
-        self.page.wait_for_selector(".footer-col-heading")
-
-        legal_header_count = self.page.locator(".footer-col-heading", has_text="Legal").count()
-        self.assertEqual(legal_header_count, 1, "Expected Legal footer header to exist exactly once")
-
-        privacy_button_count = self.page.locator("button.footer-legal-trigger", has_text="Privacy Policy").count()
-        terms_button_count = self.page.locator("button.footer-legal-trigger", has_text="Terms & Conditions").count()
-        accessibility_button_count = self.page.locator("button.footer-legal-trigger", has_text="Accessibility").count()
-        self.assertEqual(privacy_button_count, 1, "Expected Privacy Policy footer legal trigger")
-        self.assertEqual(terms_button_count, 1, "Expected Terms & Conditions footer legal trigger")
-        self.assertEqual(accessibility_button_count, 1, "Expected Accessibility footer legal trigger")
-
     def test_footer_legal_links_match_footer_link_font_size(self):
         self.page.goto(self.base_url, wait_until="domcontentloaded")
         self.page.wait_for_selector(".footer-col-heading")
@@ -92,26 +79,6 @@ class FooterLayoutTest(unittest.TestCase):
             f"Expected legal trigger font-size to match footer link font-size, got: {font_sizes}"
         )
 
-    def test_footer_logo_is_slightly_smaller(self):
-        self.page.goto(self.base_url, wait_until="domcontentloaded")
-        self.page.wait_for_selector(".footer-logo")
-
-        footer_logo_size = self.page.evaluate("""() => {
-            const logo = document.querySelector('.footer-logo');
-            const styles = getComputedStyle(logo);
-            return {
-                widthAttr: logo.getAttribute('width'),
-                heightAttr: logo.getAttribute('height'),
-                widthStyle: styles.width,
-                heightStyle: styles.height
-            };
-        }""")
-
-        self.assertEqual(footer_logo_size["widthAttr"], "44", f"Expected footer logo width attribute to be 44, got {footer_logo_size}")
-        self.assertEqual(footer_logo_size["heightAttr"], "44", f"Expected footer logo height attribute to be 44, got {footer_logo_size}")
-        self.assertEqual(footer_logo_size["widthStyle"], "44px", f"Expected footer logo width to be 44px, got {footer_logo_size}")
-        self.assertEqual(footer_logo_size["heightStyle"], "44px", f"Expected footer logo height to be 44px, got {footer_logo_size}")
-
     def test_legal_popups_open_and_close(self):
         self.page.goto(self.base_url, wait_until="domcontentloaded")
         privacy_modal = self.page.locator("#privacy-policy-modal")
@@ -122,24 +89,24 @@ class FooterLayoutTest(unittest.TestCase):
         self.assertEqual(terms_modal.get_attribute("hidden"), "", "Terms modal should be hidden by default")
         self.assertEqual(accessibility_modal.get_attribute("hidden"), "", "Accessibility modal should be hidden by default")
 
-        self.page.click("button.footer-legal-trigger:has-text('Privacy Policy')")
+        self.open_legal_modal("Privacy Policy", "privacy-policy-modal")
         self.assertIsNone(privacy_modal.get_attribute("hidden"), "Privacy modal should open after click")
         self.page.click("#privacy-policy-modal [data-legal-modal-close]")
         self.assertEqual(privacy_modal.get_attribute("hidden"), "", "Privacy modal should close via close button")
 
-        self.page.click("button.footer-legal-trigger:has-text('Terms & Conditions')")
+        self.open_legal_modal("Terms & Conditions", "terms-conditions-modal")
         self.assertIsNone(terms_modal.get_attribute("hidden"), "Terms modal should open after click")
         self.page.keyboard.press("Escape")
         self.assertEqual(terms_modal.get_attribute("hidden"), "", "Terms modal should close on Escape")
 
-        self.page.click("button.footer-legal-trigger:has-text('Accessibility')")
+        self.open_legal_modal("Accessibility", "accessibility-modal")
         self.assertIsNone(accessibility_modal.get_attribute("hidden"), "Accessibility modal should open after click")
         self.page.click("#accessibility-modal [data-legal-modal-close]")
         self.assertEqual(accessibility_modal.get_attribute("hidden"), "", "Accessibility modal should close via close button")
 
     def test_terms_headers_are_left_aligned_and_spaced(self):
         self.page.goto(self.base_url, wait_until="domcontentloaded")
-        self.page.click("button.footer-legal-trigger:has-text('Terms & Conditions')")
+        self.open_legal_modal("Terms & Conditions", "terms-conditions-modal")
 
         heading_styles = self.page.evaluate("""() =>
             Array.from(document.querySelectorAll('#terms-conditions-modal h3')).map((el) => {
@@ -163,7 +130,7 @@ class FooterLayoutTest(unittest.TestCase):
 
     def test_terms_email_is_obfuscated_until_revealed(self):
         self.page.goto(self.base_url, wait_until="domcontentloaded")
-        self.page.click("button.footer-legal-trigger:has-text('Terms & Conditions')")
+        self.open_legal_modal("Terms & Conditions", "terms-conditions-modal")
 
         email_state_before = self.page.evaluate("""() => {
             const modalText = document.querySelector('#terms-conditions-modal .legal-modal').innerText;
@@ -196,7 +163,7 @@ class FooterLayoutTest(unittest.TestCase):
 
     def test_legal_popup_uses_floating_card_style(self):
         self.page.goto(self.base_url, wait_until="domcontentloaded")
-        self.page.click("button.footer-legal-trigger:has-text('Privacy Policy')")
+        self.open_legal_modal("Privacy Policy", "privacy-policy-modal")
 
         modal_styles = self.page.evaluate("""() => {
             const modal = document.querySelector('#privacy-policy-modal .legal-modal');
@@ -0,0 +1,155 @@
+import json
+import unittest
+
+import waits
+from harness import BrowserTestCase
+
+CANVAS = "#hero-neural-canvas"
+
+
+class HeroRendererTest(BrowserTestCase):
+    viewport = {"width": 1280, "height": 800}
+    context_options = {"reduced_motion": "no-preference"}
+
+    def setUp(self):
+        super().setUp()
+        self.page_errors = []
+        self.page.on("pageerror", lambda error: self.page_errors.append(str(error)))
+        self.page.add_init_script("""
+            window.__cspViolations = [];
+            document.addEventListener('securitypolicyviolation', (event) => {
+                window.__cspViolations.push(`${event.violatedDirective} blocked ${event.blockedURI}`);
+            });
+        """)
+
+    def test_main_thread_renderer_is_the_default(self):
+        """Test that the hero animation renders on the main thread unless a worker is requested."""
+        self.navigate()
+        self.assertTrue(waits.wait_for_attribute(self.page, CANVAS, "data-hero-active-renderer", "main"),
+                        "Expected the hero to start on the main-thread renderer")
+        self.assertEqual(self.page_errors, [])
+
+    def test_worker_renderer_opt_in(self):
+        """Test that ?hero=worker transfers the canvas to hero-worker.js without CSP violations."""
+        worker_urls = []
+        self.page.on("worker", lambda worker: worker_urls.append(worker.url))
+
+        self.navigate("?hero=worker")
+        self.assertTrue(waits.wait_for_attribute(self.page, CANVAS, "data-hero-active-renderer", "worker"),
+                        "Expected the hero to start on the worker renderer")
+        self.assertTrue(waits.wait_for_frames(self.page, 4))
+
+        self.assertEqual(len(worker_urls), 1)
+        self.assertTrue(worker_urls[0].endswith("/hero-worker.js"), worker_urls[0])
+        self.assertEqual(self.page.evaluate("window.__cspViolations"), [])
+        self.assertEqual(self.page_errors, [])
+
+        # Pointer and theme events are forwarded to the worker without touching the transferred canvas.
+        self.page.mouse.move(400, 300)
+        self.page.mouse.click(400, 300)
+        self.page.click(".theme-toggle")
+        self.assertTrue(waits.wait_for_frames(self.page, 4))
+        self.assertEqual(self.page_errors, [])
+
+    def test_data_attribute_opt_in(self):
+        """Test that data-hero-renderer="worker" on the canvas also selects the worker renderer."""
+        self.page.add_init_script("""
+            document.addEventListener('DOMContentLoaded', () => {
+                document.getElementById('hero-neural-canvas').dataset.heroRenderer = 'worker';
+            });
+        """)
+        self.navigate()
+        self.assertTrue(waits.wait_for_attribute(self.page, CANVAS, "data-hero-active-renderer", "worker"))
+
+
+class HeroQualityGovernorTest(BrowserTestCase):
+    viewport = {"width": 1280, "height": 800}
+    context_options = {"reduced_motion": "no-preference"}
+
+    def install_probe(self, **settings):
+        """Install the benchmark probe with governor overrides (budget or pinned tier)."""
+        self.page.add_init_script(f"""
+            window.__heroFrameProbe = Object.assign({{ mark() {{}} }}, {json.dumps(settings)});
+        """)
+
+    def test_starts_at_default_tier(self):
+        """Test that the hero starts at quality tier 2, the original fixed configuration."""
+        self.navigate()
+        self.assertTrue(waits.wait_for_attribute(self.page, CANVAS, "data-hero-quality", "2"))
+
+    def test_steps_down_when_over_budget_and_stays_down(self):
+        """Test that frames over budget step the quality down one tier at a time to the lowest tier."""
+        self.install_probe(frameBudgetMs=0.0001)
+        self.page.add_init_script("""
+            window.__heroQualityLog = [];
+            new MutationObserver(() => {
+                window.__heroQualityLog.push(document.getElementById('hero-neural-canvas').dataset.heroQuality);
+            }).observe(document, { attributes: true, subtree: true, attributeFilter: ['data-hero-quality'] });
+        """)
+        self.navigate()
+        self.assertTrue(waits.wait_for_attribute(self.page, CANVAS, "data-hero-quality", "0", timeout=10000),
+                        "Expected the governor to reach tier 0 under an impossible frame budget")
+        self.assertTrue(waits.wait_for_frames(self.page, 90))
+        self.assertEqual(self.page.evaluate("window.__heroQualityLog"), ["2", "1", "0"])
+
+    def test_steps_up_with_headroom(self):
+        """Test that sustained headroom raises the quality tier."""
+        self.install_probe(frameBudgetMs=1000)
+        self.navigate()
+        self.assertTrue(waits.wait_for_attribute(self.page, CANVAS, "data-hero-quality", "3", timeout=10000),
+                        "Expected the governor to reach tier 3 with a generous frame budget")
+
+    def test_steps_down_when_frame_intervals_are_long(self):
+        """Test that long frame intervals drop quality even when the engine's own cost is within budget."""
+        self.install_probe(frameBudgetMs=1000)
+        # Other main-thread work holds every frame for about 40ms.
+        self.page.add_init_script("""
+            const block = () => {
+                const end = performance.now() + 40;
+                while (performance.now() < end) {}
+                requestAnimationFrame(block);
+            };
+            requestAnimationFrame(block);
+        """)
+        self.navigate()
+        self.assertTrue(waits.wait_for_attribute(self.page, CANVAS, "data-hero-quality", "1", timeout=15000),
+                        "Expected the governor to drop a tier when frames arrive late")
+
+    def test_pinned_tier_sets_backing_resolution(self):
+        """Test that a pinned tier disables the governor and tier 0 renders at 0.75x resolution."""
+        self.install_probe(qualityTier=0, frameBudgetMs=1000)
+        self.navigate()
+        self.assertTrue(waits.wait_for_attribute(self.page, CANVAS, "data-hero-quality", "0"))
+        self.assertTrue(waits.wait_for_frames(self.page, 150))
+        size = self.page.evaluate("""() => {
+            const canvas = document.getElementById('hero-neural-canvas');
+            const rect = document.getElementById('hero').getBoundingClientRect();
+            return { quality: canvas.dataset.heroQuality, width: canvas.width, cssWidth: Math.floor(rect.width) };
+        }""")
+        self.assertEqual(size["quality"], "0")
+        self.assertEqual(size["width"], round(size["cssWidth"] * 0.75))
+
+
+class HeroHiDpiQualityTest(BrowserTestCase):
+    viewport = {"width": 1280, "height": 800}
+    context_options = {"reduced_motion": "no-preference", "device_scale_factor": 2}
+
+    def test_raises_resolution_only_after_tier_three(self):
+        """Test that on a HiDPI display tier 3 renders at 1x and only tier 4 raises the resolution."""
+        self.page.add_init_script("window.__heroFrameProbe = { mark() {}, frameBudgetMs: 1000 };")
+        self.navigate()
+
+        def backing_scale():
+            return self.page.evaluate("""() => {
+                const canvas = document.getElementById('hero-neural-canvas');
+                return canvas.width / Math.floor(document.getElementById('hero').getBoundingClientRect().width);
+            }""")
+
+        self.assertTrue(waits.wait_for_attribute(self.page, CANVAS, "data-hero-quality", "3", timeout=10000))
+        self.assertAlmostEqual(backing_scale(), 1, places=1)
+        self.assertTrue(waits.wait_for_attribute(self.page, CANVAS, "data-hero-quality", "4", timeout=10000))
+        self.assertAlmostEqual(backing_scale(), 2, places=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import re
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from harness import REPO_ROOT
+from tools import build, images
+
+SPEC = dict(images.IMAGES["hero-photo"], name="me", size=160, densities=(1, 1.5, 2))
+
+PAGE = """\
+<head>
+    <link rel="preload" as="image" href="logo.png" fetchpriority="high">
+    <link rel="preload" as="image" href="me.webp" type="image/webp" fetchpriority="high">
+</head>
+<body>
+    <a class="brand"><img class="brand-logo" src="logo.png" alt="" width="36" height="36"></a>
+    <picture class="hero-load-item">
+        <source srcset="me.webp" type="image/webp">
+        <img src="me.png" alt="Photo" class="hero-photo" width="160" height="160" fetchpriority="high">
+    </picture>
+</body>
+"""
+
+
+def _variants():
+    hero = dict(images.IMAGES["hero-photo"])
+    logo = dict(images.IMAGES["brand-logo"])
+    return {
+        "hero-photo": (hero, images.variant_widths(hero, 320), "jpeg"),
+        "brand-logo": (logo, images.variant_widths(logo, 144), "png"),
+    }
+
+
+class VariantTest(unittest.TestCase):
+    def test_never_upscales(self):
+        self.assertEqual(images.variant_widths(SPEC, 320), [(1, 160), (1.5, 240), (2, 320)])
+        self.assertEqual(images.variant_widths(SPEC, 250), [(1, 160), (1.5, 240)])
+        with self.assertRaises(images.ImagePipelineError):
+            images.variant_widths(SPEC, 100)
+
+    def test_srcset_uses_density_descriptors(self):
+        self.assertEqual(
+            images.srcset(SPEC, [(1, 160), (1.5, 240)], "avif"),
+            "assets/img/me-160.avif 1x, assets/img/me-240.avif 1.5x",
+        )
+
+    def test_picture_keeps_img_attributes_in_order(self):
+        attributes = images.parse_attributes('<img class="x" src="me.png" alt="A b" width="160" hidden>')
+        markup = images.picture_markup(SPEC, [(1, 160), (2, 320)], "jpeg", attributes)
+        self.assertIn('<source type="image/avif" srcset="assets/img/me-160.avif 1x, assets/img/me-320.avif 2x">', markup)
+        self.assertIn(
+            '<img class="x" src="assets/img/me-160.jpg" srcset="assets/img/me-160.jpg 1x, '
+            'assets/img/me-320.jpg 2x" alt="A b" width="160" hidden>',
+            markup,
+        )
+        self.assertLess(markup.index("image/avif"), markup.index("image/webp"))
+
+
+class RewriteHtmlTest(unittest.TestCase):
+    def test_wraps_images_and_replaces_preloads(self):
+        html = images.rewrite_html(PAGE, _variants())
+        self.assertNotIn('"logo.png"', html)
+        self.assertNotIn("me.webp", html)
+        self.assertEqual(html.count("<picture"), 2)
+        self.assertIn('<picture class="hero-load-item">', html)
+        self.assertIn('class="brand-logo" src="assets/img/nw-logo-36.png"', html)
+
+        preloads = re.findall(r'<link rel="preload"[^>]*>', html)
+        self.assertEqual(len(preloads), 2)
+        for link in preloads:
+            self.assertIn('type="image/avif"', link)
+            self.assertIn("imagesrcset=", link)
+        self.assertIn('imagesrcset="assets/img/me-160.avif 1x, assets/img/me-240.avif 1.5x, assets/img/me-320.avif 2x"',
+                      preloads[0])
+
+    def test_is_idempotent(self):
+        once = images.rewrite_html(PAGE, _variants())
+        self.assertEqual(images.rewrite_html(once, _variants()), once)
+
+    def test_missing_image_is_an_error(self):
+        with self.assertRaises(images.ImagePipelineError):
+            images.rewrite_html(PAGE.replace("hero-photo", "portrait"), _variants())
+
+
+class BudgetTest(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        (self.root / "assets" / "img").mkdir(parents=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def write(self, path, size):
+        (self.root / path).write_bytes(b"\0" * size)
+
+    def test_reports_only_lcp_variants_over_budget(self):
+        budget = images.IMAGES["hero-photo"]["budget"]
+        self.write("assets/img/me-160.avif", budget)
+        self.write("assets/img/me-320.jpg", budget + 1)
+        self.write("assets/img/nw-logo-132.png", 10 * budget)  # footer logo: no budget
+        problems = images.budget_problems(self.root)
+        self.assertEqual(len(problems), 1)
+        self.assertIn("assets/img/me-320.jpg", problems[0])
+
+    def test_build_fails_over_budget(self):
+        self.write("assets/img/me-160.avif", images.IMAGES["hero-photo"]["budget"] + 1)
+        (self.root / "index.html").write_text('<img src="assets/img/me-160.avif">\n')
+        out = Path(tempfile.mkdtemp()) / "dist"
+        self.addCleanup(shutil.rmtree, out.parent)
+        with self.assertRaisesRegex(build.BuildError, "budget"):
+            build.build(self.root, out)
+
+
+class SiteImagesTest(unittest.TestCase):
+    def test_site_variants_exist_and_fit_budgets(self):
+        html = (REPO_ROOT / "index.html").read_text()
+        referenced = set(re.findall(r"assets/img/[\w.-]+", html))
+        self.assertTrue(referenced)
+        for path in referenced:
+            self.assertTrue((REPO_ROOT / path).is_file(), path)
+        self.assertEqual(images.budget_problems(REPO_ROOT), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import subprocess
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+
+import impact
+
+SCRIPT = textwrap.dedent("""\
+    const a = 1;
+    function outer() {
+        const inner = () => 2;
+        return inner();
+    }
+    function other() {}
+""")
+
+INDEX = {
+    "version": impact.INDEX_VERSION,
+    "files": {
+        "script.js": {"hash": "1", "units": [[0, 101, "(top level)"], [13, 80, "outer"], [50, 57, "inner"], [81, 100, "other"]]},
+        "styles.css": {"hash": "2", "units": [[0, 20, ".hero"], [21, 40, ".footer-col a"]]},
+        "assets/img/photo.jpg": {"hash": "3", "units": []},
+    },
+    "tests": {
+        "test_hero.HeroTest.test_outer": {"script.js": [0, 1], "styles.css": [0], "assets/img/photo.jpg": []},
+        "test_hero.HeroTest.test_inner": {"script.js": [0, 1, 2], "styles.css": [0]},
+        "test_footer.FooterTest.test_links": {"script.js": [0, 3], "styles.css": [1]},
+        "test_build.BuildTest.test_build": None,
+    },
+}
+ALL_TESTS = set(INDEX["tests"])
+
+
+class DiffMappingTest(unittest.TestCase):
+    def test_reads_old_side_spans(self):
+        diff = "@@ -3 +3 @@\n-x\n+y\n@@ -7,0 +8,2 @@\n+z\n@@ -10,2 +12,0 @@\n"
+        self.assertEqual(impact.changed_spans(diff), [(3, 1), (7, 0), (10, 2)])
+
+    def test_offsets_are_utf16_units(self):
+        text = "a\n\U0001F600b\nc\n"
+        self.assertEqual(impact.spans_to_offsets(text, [(2, 1), (3, 0), (0, 0)]), [(2, 6), (8, 8), (0, 0)])
+
+    def test_innermost_function_is_hit(self):
+        units = INDEX["files"]["script.js"]["units"]
+        self.assertEqual(impact.units_hit(units, [(52, 53)]), {2})
+        self.assertEqual(impact.units_hit(units, impact.spans_to_offsets(SCRIPT, [(4, 1)])), {1})
+        self.assertEqual(impact.units_hit(units, impact.spans_to_offsets(SCRIPT, [(1, 1)])), {0})
+
+    def test_change_between_rules_hits_nothing(self):
+        self.assertIsNone(impact.units_hit(INDEX["files"]["styles.css"]["units"], [(20, 20)]))
+
+
+class SelectTest(unittest.TestCase):
+    def select(self, changes, tests=ALL_TESTS):
+        return impact.select(INDEX, changes, tests)[0]
+
+    def test_function_change_selects_its_callers(self):
+        self.assertEqual(self.select({"script.js": [(52, 53)]}), {
+            "test_hero.HeroTest.test_inner", "test_build.BuildTest.test_build",
+        })
+
+    def test_rule_change_selects_matching_tests(self):
+        self.assertEqual(self.select({"styles.css": [(25, 30)]}), {
+            "test_footer.FooterTest.test_links", "test_build.BuildTest.test_build",
+        })
+
+    def test_whole_file_change_selects_every_loader(self):
+        self.assertEqual(self.select({"assets/img/photo.jpg": None}), {
+            "test_hero.HeroTest.test_outer", "test_build.BuildTest.test_build",
+        })
+
+    def test_changed_module_and_new_tests_are_selected(self):
+        tests = ALL_TESTS | {"test_footer.FooterTest.test_new"}
+        self.assertEqual(self.select({"tests/test_hero.py": [(0, 1)], "README.md": None}, tests), {
+            "test_hero.HeroTest.test_outer", "test_hero.HeroTest.test_inner",
+            "test_footer.FooterTest.test_new", "test_build.BuildTest.test_build",
+        })
+
+    def test_shared_or_unknown_files_run_everything(self):
+        self.assertEqual(self.select({"tests/harness.py": [(0, 1)]}), ALL_TESTS)
+        self.assertEqual(self.select({"_headers": None}), ALL_TESTS)
+
+    def test_stale_files(self):
+        self.assertEqual(impact.stale_files(INDEX, {"script.js": "1", "styles.css": "9"}),
+                         ["assets/img/photo.jpg", "styles.css"])
+
+
+class GitChangesTest(unittest.TestCase):
+    def git(self, *args):
+        subprocess.run(["git", *args], cwd=self.root, check=True, capture_output=True)
+
+    def test_working_tree_changes_map_to_offsets(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.root = Path(tmp)
+            self.git("init", "-q")
+            (self.root / "script.js").write_text(SCRIPT)
+            (self.root / "README.md").write_text("hi\n")
+            self.git("add", ".")
+            self.git("-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "-qm", "base")
+
+            (self.root / "script.js").write_text(SCRIPT.replace("=> 2", "=> 3"))
+            (self.root / "README.md").unlink()
+            (self.root / "new.css").write_text("a{}\n")
+
+            changes = impact.git_changes(INDEX, "HEAD", cwd=self.root)
+            self.assertEqual(changes, {"script.js": [(32, 59)], "README.md": None, "new.css": None})
+            self.assertEqual(impact.blob_hash(SCRIPT.encode()), impact.base_listing("HEAD", cwd=self.root)["script.js"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,47 +1,15 @@
 import unittest
-import threading
-import http.server
-import socketserver
-from urllib.parse import urlparse
-from playwright.sync_api import sync_playwright
 
+import waits
+from harness import BrowserTestCase
 
-class InPracticeTest(unittest.TestCase):
-    @classmethod
-    def setUpClass(cls):
-        handler = http.server.SimpleHTTPRequestHandler
-        cls.httpd = socketserver.TCPServer(("", 0), handler)
-        cls.port = cls.httpd.server_address[1]
-        cls.server_thread = threading.Thread(target=cls.httpd.serve_forever)
-        cls.server_thread.daemon = True
-        cls.server_thread.start()
 
-        cls.playwright = sync_playwright().start()
-        cls.browser = cls.playwright.chromium.launch(headless=True)
-        cls.base_url = f"http://localhost:{cls.port}"
-
-    @classmethod
-    def tearDownClass(cls):
-        cls.browser.close()
-        cls.playwright.stop()
-        cls.httpd.shutdown()
-        cls.httpd.server_close()
-
-    def setUp(self):
-        self.context = self.browser.new_context(viewport={'width': 1280, 'height': 800})
-        self.page = self.context.new_page()
-        blocked_hosts = {"fonts.googleapis.com", "fonts.gstatic.com"}
-        self.page.route(
-            "**/*",
-            lambda route: route.abort() if urlparse(route.request.url).hostname in blocked_hosts else route.continue_()
-        )
-
-    def tearDown(self):
-        self.context.close()
+class InPracticeTest(BrowserTestCase):
+    viewport = {'width': 1280, 'height': 800}
 
     def test_in_practice_section_is_not_left_hidden_on_desktop(self):
         self.page.goto(self.base_url, wait_until="domcontentloaded")
-        self.page.wait_for_timeout(500)
+        self.assertTrue(waits.wait_for_page_ready(self.page))
 
         section_state = self.page.evaluate("""() => {
             const section = document.querySelector('#in-practice');
@@ -63,8 +31,10 @@ class InPracticeTest(unittest.TestCase):
         self.page.add_init_script("delete window.IntersectionObserver;")
 
         self.page.goto(self.base_url, wait_until="domcontentloaded")
-        self.page.wait_for_timeout(500)
+        self.assertTrue(waits.wait_for_page_ready(self.page))
 
+        # Without an observer to wait for, script.js imports in-practice.js straight away.
+        self.assertTrue(waits.wait_for_class(self.page, '.ip-act', 'ip-visible'), "in-practice.js did not run")
         self.assertEqual(page_errors, [], "Script should not throw when IntersectionObserver is unavailable")
 
         stats = self.page.evaluate("""() => ({
@@ -1,42 +1,13 @@
 import unittest
-import threading
-import http.server
-import socketserver
-import os
-import time
-from playwright.sync_api import sync_playwright
-
-class MarqueeAccessibilityTest(unittest.TestCase):
-    @classmethod
-    def setUpClass(cls):
-        # Start a local server to serve the frontend files
-        handler = http.server.SimpleHTTPRequestHandler
-        cls.httpd = socketserver.TCPServer(("", 0), handler)
-        cls.port = cls.httpd.server_address[1]
-        cls.server_thread = threading.Thread(target=cls.httpd.serve_forever)
-        cls.server_thread.daemon = True
-        cls.server_thread.start()
-
-        cls.playwright = sync_playwright().start()
-        cls.browser = cls.playwright.chromium.launch(headless=True)
-        cls.base_url = f"http://localhost:{cls.port}"
-
-    @classmethod
-    def tearDownClass(cls):
-        cls.browser.close()
-        cls.playwright.stop()
-        cls.httpd.shutdown()
-        cls.httpd.server_close()
 
-    def setUp(self):
-        self.context = self.browser.new_context()
-        self.page = self.context.new_page()
-        # Block external font requests
-        self.page.route("**/*", lambda route: route.abort() if "fonts.googleapis.com" in route.request.url or "fonts.gstatic.com" in route.request.url else route.continue_())
-        self.page.goto(self.base_url, wait_until="domcontentloaded")
+import waits
+from harness import BrowserTestCase
+
 
-    def tearDown(self):
-        self.context.close()
+class MarqueeAccessibilityTest(BrowserTestCase):
+    def setUp(self):
+        super().setUp()
+        self.navigate()
 
     def test_marquee_structure(self):
         """Test that the marquee has the correct accessibility attributes."""
@@ -53,33 +24,138 @@ class MarqueeAccessibilityTest(unittest.TestCase):
         # Check aria-label exists
         self.assertTrue(marquee.get_attribute('aria-label'), "Marquee should have an aria-label")
 
-    def test_marquee_pause_on_hover(self):
-        """Test that the marquee animation pauses on hover."""
-        marquee = self.page.locator('.skills-marquee')
-        track = self.page.locator('.skills-track').first
+    def start_marquee(self):
+        self.page.locator('.skills-marquee').scroll_into_view_if_needed()
+        self.assertTrue(waits.wait_for_marquee(self.page), "Marquee should initialize once scrolled into view")
 
-        # Initial state: animation running
-        # We can check computed style. Note: getComputedStyle might return 'running' even if not hovered
-        # But we can check if the rule exists in the stylesheets or if the computed style reflects it when hovered.
+    def window_play_states(self):
+        return self.page.evaluate("""() => Array.from(document.querySelectorAll('.skills-window'))
+            .map((list) => list.getAnimations().map((animation) => animation.playState).join(','))""")
 
-        # Hover over the marquee
-        marquee.hover()
+    def test_marquee_pause_on_hover(self):
+        """Test that the row animations pause on hover and resume when the pointer leaves."""
+        self.start_marquee()
+        self.page.locator('.skills-marquee').hover()
+        self.assertEqual(self.window_play_states(), ['paused'] * 3, "Animation should be paused on hover")
 
-        # Check if animation-play-state is paused
-        play_state = track.evaluate("el => getComputedStyle(el).animationPlayState")
-        self.assertEqual(play_state, 'paused', "Animation should be paused on hover")
+        self.page.mouse.move(0, 0)
+        self.assertEqual(self.window_play_states(), ['running'] * 3, "Animation should resume after hover")
 
     def test_marquee_pause_on_focus(self):
-        """Test that the marquee animation pauses on focus."""
-        marquee = self.page.locator('.skills-marquee')
-        track = self.page.locator('.skills-track').first
-
-        # Focus the marquee
-        marquee.focus()
-
-        # Check if animation-play-state is paused
-        play_state = track.evaluate("el => getComputedStyle(el).animationPlayState")
-        self.assertEqual(play_state, 'paused', "Animation should be paused on focus")
+        """Test that the row animations pause while the marquee has focus."""
+        self.start_marquee()
+        self.page.locator('.skills-marquee').focus()
+        self.assertEqual(self.window_play_states(), ['paused'] * 3, "Animation should be paused on focus")
+
+        self.page.evaluate("() => document.activeElement.blur()")
+        self.assertEqual(self.window_play_states(), ['running'] * 3, "Animation should resume after blur")
+
+    def test_marquee_pauses_offscreen(self):
+        """Test that the row animations pause while the marquee is out of view."""
+        self.start_marquee()
+        self.page.evaluate("() => window.scrollTo({ top: 0, behavior: 'instant' })")
+        self.assertTrue(waits.wait_for_frames(self.page, 3))
+        self.assertEqual(self.window_play_states(), ['paused'] * 3)
+
+    def test_marquee_windows_are_hidden_from_assistive_tech(self):
+        """Test that the full list is read once and the rendered row windows are aria-hidden."""
+        self.start_marquee()
+
+        lists = self.page.evaluate("""() => Array.from(document.querySelectorAll('.skills-marquee .skills-list')).map((list) => ({
+            hidden: list.getAttribute('aria-hidden'),
+            window: list.classList.contains('skills-window'),
+            items: list.children.length,
+        }))""")
+
+        readable = [entry for entry in lists if entry['hidden'] is None]
+        windows = [entry for entry in lists if entry['window']]
+        self.assertEqual(len(readable), 1, f"Exactly one list should be exposed, got {lists}")
+        self.assertEqual(len(windows), 3, "Expected one window per marquee track")
+        self.assertTrue(all(entry['hidden'] == 'true' for entry in windows), f"Windows should be aria-hidden, got {lists}")
+
+    def test_marquee_renders_only_visible_items(self):
+        """Test that each row keeps only enough items to span the marquee plus a spare."""
+        self.start_marquee()
+
+        rows = self.page.evaluate("""() => {
+            const marquee = document.querySelector('.skills-marquee');
+            const width = marquee.clientWidth;
+            return Array.from(marquee.querySelectorAll('.skills-window')).map((list) => {
+                const items = Array.from(list.children).map((item) => item.getBoundingClientRect());
+                const left = marquee.getBoundingClientRect().left + marquee.clientLeft;
+                return {
+                    count: items.length,
+                    covers: items[0].left - left <= 0 && items[items.length - 1].right - left >= width,
+                    beyond: items.filter((rect) => rect.left - left >= width).length,
+                };
+            });
+        }""")
+        total = self.page.locator('.skills-list--source li').count()
+        for row in rows:
+            self.assertLess(row['count'], total, f"Row renders every item: {row}")
+            self.assertTrue(row['covers'], f"Row leaves a gap: {row}")
+            self.assertLessEqual(row['beyond'], 1, f"Row renders more than one spare item: {row}")
+
+    def test_marquee_animates_transform_only(self):
+        """Test that each window is moved by one running compositor transform animation."""
+        self.start_marquee()
+
+        rows = self.page.evaluate("""() => Array.from(document.querySelectorAll('.skills-window')).map((list) => {
+            const animations = list.getAnimations();
+            return {
+                count: animations.length,
+                properties: animations.flatMap((animation) => animation.effect.getKeyframes())
+                    .flatMap((frame) => Object.keys(frame))
+                    .filter((key) => !['offset', 'computedOffset', 'easing', 'composite'].includes(key)),
+            };
+        })""")
+        self.assertEqual(len(rows), 3)
+        for row in rows:
+            self.assertEqual(row['count'], 1, row)
+            self.assertEqual(set(row['properties']), {'transform'}, row)
+
+    def test_marquee_recycles_nodes_when_a_step_finishes(self):
+        """Test that finishing a step reuses the node that left on the right for the next item."""
+        self.start_marquee()
+
+        result = self.page.evaluate("""() => {
+            const list = document.querySelector('.skills-window');
+            const source = Array.from(document.querySelectorAll('.skills-list--source li'), (item) => item.textContent);
+            const nodes = Array.from(list.children);
+            const first = nodes[0].textContent;
+            const animation = list.getAnimations()[0];
+            animation.finish();
+            return new Promise((resolve) => requestAnimationFrame(() => resolve({
+                expected: source[(source.indexOf(first) - 1 + source.length) % source.length],
+                first: list.firstElementChild.textContent,
+                recycled: list.firstElementChild === nodes[nodes.length - 1],
+                kept: nodes.slice(0, -1).every((node, index) => list.children[index + 1] === node),
+                restarted: list.getAnimations().length === 1 && list.getAnimations()[0] !== animation,
+            })));
+        }""")
+        self.assertEqual(result['first'], result['expected'], result)
+        self.assertTrue(result['recycled'], result)
+        self.assertTrue(result['kept'], result)
+        self.assertTrue(result['restarted'], result)
+
+
+class MarqueeReducedMotionTest(BrowserTestCase):
+    context_options = {"reduced_motion": "reduce"}
+
+    def test_marquee_is_static(self):
+        """Test that reduced motion creates no row animations and leaves the rows still."""
+        self.navigate()
+        self.page.locator('.skills-marquee').scroll_into_view_if_needed()
+        self.assertTrue(waits.wait_for_marquee(self.page))
+
+        state = self.page.evaluate("""() => ({
+            animations: Array.from(document.querySelectorAll('.skills-marquee *'))
+                .reduce((count, element) => count + element.getAnimations().length, 0),
+            transforms: Array.from(document.querySelectorAll('.skills-window')).map((list) => list.style.transform),
+        })""")
+        self.assertEqual(state['animations'], 0)
+        self.assertEqual(len(state['transforms']), 3)
+        self.assertTrue(all(transform.startswith('translate3d(-') for transform in state['transforms']), state)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+
+import waits
+from harness import BrowserTestCase
+
+ON_DEMAND_MODULES = ("in-practice.js", "contact-form.js", "legal-modals.js", "back-to-top.js")
+LEGAL_FRAGMENTS = ("privacy-policy.html", "terms-conditions.html", "accessibility.html")
+UNSAFE_FRAGMENT = """<!DOCTYPE html><html><body>
+<p onclick="window.__owned = true">Kept <strong>text</strong></p>
+<script>window.__owned = true;</script>
+<img src="x" onerror="window.__owned = true">
+<a href="javascript:window.__owned = true">link</a>
+</body></html>"""
+
+
+class OnDemandModulesTest(BrowserTestCase):
+    """script.js imports each below-the-fold module (and legal modal body) the first time it is needed."""
+
+    viewport = {"width": 1280, "height": 800}
+
+    def setUp(self):
+        super().setUp()
+        self.requested = []
+        self.page.on("request", lambda request: self.requested.append(request.url.rsplit("/", 1)[-1]))
+        self.page_errors = []
+        self.page.on("pageerror", lambda error: self.page_errors.append(str(error)))
+        self.navigate()
+        self.assertTrue(waits.wait_for_page_ready(self.page))
+
+    def test_first_view_loads_only_the_bootstrap(self):
+        self.assertIn("script.js", self.requested)
+        for module in ON_DEMAND_MODULES + LEGAL_FRAGMENTS:
+            self.assertNotIn(module, self.requested, f"{module} was loaded before it was needed")
+        self.assertEqual(self.page_errors, [])
+
+    def test_legal_modals_load_on_first_trigger_click(self):
+        self.page.click("button.footer-legal-trigger:has-text('Privacy Policy')")
+        self.assertTrue(waits.wait_for_attribute(self.page, "#privacy-policy-modal", "hidden", None))
+        self.assertEqual(self.requested.count("legal-modals.js"), 1)
+
+        self.page.keyboard.press("Escape")
+        self.page.click("button.footer-legal-trigger:has-text('Accessibility')")
+        self.assertTrue(waits.wait_for_attribute(self.page, "#accessibility-modal", "hidden", None))
+        self.assertEqual(self.requested.count("legal-modals.js"), 1)
+        self.assertEqual(self.page.evaluate("document.getElementById('privacy-policy-modal').hidden"), True)
+
+    def test_hovering_a_legal_trigger_warms_its_fragment(self):
+        with self.page.expect_request("**/fragments/privacy-policy.html"):
+            self.page.hover("button.footer-legal-trigger:has-text('Privacy Policy')")
+        self.assertIn("legal-modals.js", self.requested)
+        self.assertNotIn("terms-conditions.html", self.requested)
+
+        self.page.click("button.footer-legal-trigger:has-text('Privacy Policy')")
+        self.assertTrue(waits.wait_for_attribute(self.page, "#privacy-policy-modal", "hidden", None))
+        self.assertEqual(self.requested.count("privacy-policy.html"), 1)
+        self.assertIn("Formspree", self.page.inner_text("#privacy-policy-modal .legal-modal-body"))
+        self.assertEqual(self.page.evaluate("document.activeElement.matches('#privacy-policy-modal [data-legal-modal-close]')"), True)
+
+    def test_fragment_markup_is_sanitized(self):
+        self.page.route("**/fragments/privacy-policy.html", lambda route: route.fulfill(
+            status=200, content_type="text/html", body=UNSAFE_FRAGMENT))
+        self.page.click("button.footer-legal-trigger:has-text('Privacy Policy')")
+        self.assertTrue(waits.wait_for_attribute(self.page, "#privacy-policy-modal", "hidden", None))
+
+        body = self.page.evaluate("""() => {
+            const body = document.querySelector('#privacy-policy-modal .legal-modal-body');
+            body.querySelector('p').click();
+            return {
+                text: body.innerText,
+                unsafe: body.querySelectorAll('script, img, [onclick], [onerror], a[href]').length,
+                owned: window.__owned === true,
+            };
+        }""")
+        self.assertIn("Kept text", body["text"])
+        self.assertEqual(body["unsafe"], 0)
+        self.assertFalse(body["owned"])
+
+    def test_failed_fragment_shows_a_fallback(self):
+        self.page.route("**/fragments/accessibility.html", lambda route: route.abort())
+        self.page.click("button.footer-legal-trigger:has-text('Accessibility')")
+        self.assertTrue(waits.wait_for_attribute(self.page, "#accessibility-modal", "hidden", None))
+        link = self.page.locator("#accessibility-modal .legal-modal-body a")
+        self.assertEqual(link.get_attribute("href"), "fragments/accessibility.html")
+        self.assertEqual(self.page_errors, [])
+
+    def test_early_submit_waits_for_validation(self):
+        """A submit before contact-form.js has loaded is held until the validation can run."""
+        self.assertNotIn("contact-form.js", self.requested)
+        self.page.evaluate("""() => {
+            const form = document.querySelector('.contact-form');
+            form.noValidate = true;
+            document.getElementById('formLoadTime').value = String(Date.now() - 60000);
+            form.requestSubmit();
+        }""")
+        self.assertTrue(waits.wait_for_attribute(self.page, "#name", "aria-invalid", "true"))
+        self.assertIn("contact-form.js", self.requested)
+        self.assertEqual(self.page.url.rstrip("/"), self.base_url)
+
+    def test_failed_contact_form_import_sends_nothing(self):
+        """Without contact-form.js the message stays in the form instead of being posted unchecked."""
+        posted = []
+        self.context.route("https://formspree.io/**", lambda route: (posted.append(route.request.url), route.abort()))
+        self.page.route("**/contact-form.js", lambda route: route.abort())
+        self.page.fill("#message", "Hello")
+        self.page.evaluate("document.querySelector('.contact-form').requestSubmit()")
+        self.assertTrue(waits.wait_for_attribute(self.page, ".contact-form", "data-submit-state", "failed"))
+        self.assertEqual(self.page.locator(".contact-form .error-msg-send").count(), 1)
+        self.assertEqual(self.page.input_value("#message"), "Hello")
+        self.assertEqual(self.page.url.rstrip("/"), self.base_url)
+        self.assertEqual(posted, [])
+
+    def test_contact_form_loads_as_it_nears_the_viewport(self):
+        with self.page.expect_request("**/contact-form.js"):
+            self.page.evaluate("document.getElementById('contact-form').scrollIntoView({ behavior: 'instant' })")
+        self.assertEqual(self.page_errors, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import multiprocessing
+import tempfile
+import textwrap
+import unittest
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import parallel
+
+SAMPLE_MODULE = textwrap.dedent("""
+    import os
+    import unittest
+
+
+    class FirstTest(unittest.TestCase):
+        def test_passes(self):
+            self.assertTrue(True)
+
+        def test_fails(self):
+            self.assertEqual(1, 2)
+
+        @unittest.skip("not today")
+        def test_skipped(self):
+            pass
+
+
+    class SecondTest(unittest.TestCase):
+        def test_reports_worker_pid(self):
+            self.assertGreater(os.getpid(), 0)
+
+        def test_errors(self):
+            raise RuntimeError("boom")
+""")
+
+
+class ParallelRunnerTest(unittest.TestCase):
+    def setUp(self):
+        if multiprocessing.current_process().daemon:
+            self.skipTest("worker processes cannot start a nested pool")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.tests_dir = Path(self.tmp.name)
+        (self.tests_dir / "test_parallel_sample.py").write_text(SAMPLE_MODULE)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_discover_units_orders_largest_class_first(self):
+        units = parallel.discover_units(["test_parallel_sample"], tests_dir=self.tests_dir)
+        self.assertEqual(units, [
+            ("test_parallel_sample", "FirstTest", 3),
+            ("test_parallel_sample", "SecondTest", 2),
+        ])
+
+    def test_results_from_all_workers_are_merged(self):
+        units = parallel.discover_units(["test_parallel_sample"], tests_dir=self.tests_dir)
+        records = parallel.run_parallel(units, workers=2, tests_dir=self.tests_dir, warm=False)
+
+        outcomes = {test_id.rsplit(".", 1)[-1]: outcome for test_id, outcome, _detail, _duration in records}
+        self.assertEqual(outcomes, {
+            "test_passes": parallel.PASSED,
+            "test_fails": parallel.FAILED,
+            "test_skipped": parallel.SKIPPED,
+            "test_reports_worker_pid": parallel.PASSED,
+            "test_errors": parallel.ERROR,
+        })
+        self.assertEqual(parallel.summarize(records), {
+            parallel.PASSED: 2, parallel.FAILED: 1, parallel.ERROR: 1, parallel.SKIPPED: 1,
+        })
+
+    def test_junit_report_counts_every_outcome(self):
+        units = parallel.discover_units(["test_parallel_sample"], tests_dir=self.tests_dir)
+        records = parallel.run_parallel(units, workers=2, tests_dir=self.tests_dir, warm=False)
+        report_path = self.tests_dir / "report.xml"
+
+        parallel.write_junit_xml(records, 1.0, report_path)
+
+        suite = ET.parse(report_path).getroot()
+        self.assertEqual(suite.get("tests"), "5")
+        self.assertEqual(suite.get("failures"), "1")
+        self.assertEqual(suite.get("errors"), "1")
+        self.assertEqual(suite.get("skipped"), "1")
+        self.assertIn("RuntimeError: boom", suite.find("testcase/error").text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+
+import waits
+from harness import BrowserTestCase, get_session
+
+COMPONENTS = ("hero-intro", "hero-canvas", "marquee", "nav-indicator", "in-practice-layout")
+
+
+class PerfTelemetryDisabledTest(BrowserTestCase):
+    def test_off_by_default(self):
+        self.navigate()
+        self.assertTrue(waits.wait_for_page_ready(self.page))
+        state = self.page.evaluate("""() => ({
+            api: typeof window.__perf,
+            marks: performance.getEntriesByType('mark').filter((mark) => mark.name.startsWith('hire:')).length,
+        })""")
+        self.assertEqual(state, {"api": "undefined", "marks": 0})
+
+
+class PerfTelemetryTest(BrowserTestCase):
+    context_options = {"reduced_motion": "no-preference"}
+
+    def load(self, query="?perf"):
+        self.navigate(query)
+        self.assertTrue(waits.wait_for_page_ready(self.page))
+        # In Practice and the marquee are imported as their sections near the viewport.
+        self.page.locator('.ip-section').scroll_into_view_if_needed()
+        self.assertTrue(waits.wait_for_class(self.page, '.ip-act', 'ip-visible'))
+        self.page.locator('.skills-marquee').scroll_into_view_if_needed()
+        self.assertTrue(waits.wait_for_marquee(self.page))
+        self.assertTrue(waits.wait_for_frames(self.page, 4))
+
+    def test_measures_every_component(self):
+        self.context.add_init_script("""
+            window.__observedMeasures = new Set();
+            new PerformanceObserver((list) => list.getEntries().forEach(
+                (measure) => window.__observedMeasures.add(measure.name))).observe({ type: 'measure' });
+        """)
+        self.load()
+        summary = self.page.evaluate("() => window.__perf.summary()")
+        for name in COMPONENTS:
+            self.assertIn(name, summary["components"], summary)
+            self.assertGreaterEqual(summary["components"][name]["calls"], 1, name)
+
+        measures = self.page.evaluate("() => [...window.__observedMeasures]")
+        for name in COMPONENTS:
+            self.assertIn(f"hire:{name}", measures)
+
+    def test_user_timing_entries_are_cleared(self):
+        self.load()
+        remaining = self.page.evaluate("""() => performance.getEntries()
+            .filter((entry) => entry.name.startsWith('hire:')).length""")
+        self.assertEqual(remaining, 0)
+
+    def test_entries_are_attributed(self):
+        self.load()
+        entries = self.page.evaluate("() => window.__perf.entries()")
+        self.assertTrue(entries)
+        for entry in entries:
+            self.assertIn(entry["type"], ("measure", "longtask", "layout-shift"))
+            if entry["type"] == "measure":
+                self.assertIn(entry["component"], COMPONENTS)
+                self.assertGreaterEqual(entry["duration"], 0)
+
+        self.page.evaluate("() => window.__perf.clear()")
+        self.assertEqual(self.page.evaluate("() => window.__perf.entries().length"), 0)
+
+    def test_beacon_reaches_the_stand_in_endpoint(self):
+        self.load("?perf&perf-beacon=/__perf")
+        server = get_session().server
+        before = len(server.beacons)
+        with self.page.expect_request("**/__perf") as request_info:
+            self.assertTrue(self.page.evaluate("() => window.__perf.send()"))
+        response = request_info.value.response()
+        self.assertEqual(response.status, 204)
+
+        payload = server.beacons[before]
+        self.assertEqual(payload["url"], "/")
+        self.assertIn("marquee", payload["components"])
+
+    def test_beacon_is_same_origin_only(self):
+        self.load("?perf&perf-beacon=//collector.example.com/rum")
+        self.assertFalse(self.page.evaluate("() => window.__perf.send()"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from harness import REPO_ROOT, get_session
+from tools import prune
+
+STYLES = """\
+.hero { color: red; }
+@media (max-width: 720px) {
+    .gone { display: none; }
+}
+@media (min-width: 1101px) {
+    .nav-links a:hover::after { content: "→"; }
+}
+.ghost:focus-visible { outline: 0; }
+"""
+
+
+def rule_range(text, selector):
+    start = text.index(selector)
+    return start, text.index("}", start) + 1
+
+
+class BreakpointTest(unittest.TestCase):
+    def test_widths_straddle_each_breakpoint(self):
+        self.assertEqual(prune.breakpoint_widths(STYLES), [720, 721, 1100, 1101])
+
+    def test_real_stylesheet_covers_every_breakpoint(self):
+        widths = prune.breakpoint_widths((REPO_ROOT / "styles.css").read_text(encoding="utf-8"))
+        for breakpoint in (480, 560, 720, 768, 1100, 1180, 1240):
+            self.assertIn(breakpoint, widths)
+            self.assertIn(breakpoint + 1, widths)
+
+
+class ClassifyTest(unittest.TestCase):
+    def coverage(self, present=()):
+        coverage = prune.Coverage()
+        for used in (False, True):
+            coverage.add_rules("styles.css", [
+                {"startOffset": start, "endOffset": end, "used": used and selector == ".hero"}
+                for selector in (".hero", ".gone", ".nav-links a:hover", ".ghost:focus")
+                for start, end in [rule_range(STYLES, selector)]
+            ])
+        coverage.present.update(present)
+        return coverage
+
+    def test_plain_unused_rules_are_dead(self):
+        dead, unverified = self.coverage(present={".nav-links a"}).classify({"styles.css": STYLES})
+        self.assertEqual([entry[3] for entry in dead], [[".gone"], [".ghost:focus-visible"]])
+        self.assertEqual([entry[3] for entry in unverified], [[".nav-links a:hover::after"]])
+
+    def test_interactive_rule_without_its_element_is_dead(self):
+        dead, unverified = self.coverage().classify({"styles.css": STYLES})
+        self.assertEqual(len(dead), 3)
+        self.assertEqual(unverified, [])
+
+    def test_element_selector_ignores_source_spacing(self):
+        self.assertEqual(prune.element_selector(".a  >  .b:hover::before"), prune.element_selector(".a>.b"))
+
+    def test_unreached_blocks_report_outermost_only(self):
+        script = "function a() {\n  if (x) {\n    y();\n  }\n}\n"
+        branch = (script.index("{", 15), script.index("}") + 1)
+        call = (script.index("y()"), script.index(";") + 1)
+        coverage = prune.Coverage()
+        coverage.add_script("script.js", [
+            {"functionName": "", "ranges": [{"startOffset": 0, "endOffset": len(script), "count": 1}]},
+            {"functionName": "a", "ranges": [
+                {"startOffset": 0, "endOffset": len(script) - 1, "count": 1},
+                {"startOffset": branch[0], "endOffset": branch[1], "count": 0},
+                {"startOffset": call[0], "endOffset": call[1], "count": 0},
+            ]},
+        ])
+        self.assertEqual(coverage.unreached({"script.js": script}), [("script.js", 2, 4, "a")])
+
+
+class PruneCssTest(unittest.TestCase):
+    def test_removes_rules_and_emptied_groups(self):
+        pruned = prune.prune_css(STYLES, [rule_range(STYLES, ".gone"), rule_range(STYLES, ".ghost")])
+        self.assertNotIn(".gone", pruned)
+        self.assertNotIn("max-width", pruned)
+        self.assertIn("min-width: 1101px", pruned)
+        self.assertIn(".hero { color: red; }", pruned)
+
+    def test_offsets_are_utf16_units(self):
+        text = '.a::after { content: "\U0001F600"; }\n.b { color: red; }\n'
+        start = len(text[:text.index(".b")].encode("utf-16-le")) // 2
+        self.assertEqual(prune.prune_css(text, [(start, start + 18)]), '.a::after { content: "\U0001F600"; }\n\n')
+
+    def test_pruned_site_is_a_full_copy(self):
+        out = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, out)
+        styles = (REPO_ROOT / "styles.css").read_text(encoding="utf-8")
+        first = rule_range(styles, styles[styles.index("}") + 1:].lstrip()[:8])
+        pruned = prune.write_pruned_site(REPO_ROOT, out, [("styles.css", *first, [])])
+        self.assertEqual(list(pruned), ["styles.css"])
+        self.assertLess(len((out / "styles.css").read_text(encoding="utf-8")), len(styles))
+        self.assertEqual((out / "index.html").read_bytes(), (REPO_ROOT / "index.html").read_bytes())
+        self.assertFalse((out / "tests").exists())
+
+
+class CoverageRunTest(unittest.TestCase):
+    """One desktop pass over the real page, with JavaScript on and off."""
+
+    @classmethod
+    def setUpClass(cls):
+        session = get_session()
+        cls.coverage = prune.collect_coverage(session.browser, session.base_url + "/", REPO_ROOT, widths=[1280])
+
+    def test_rules_and_script_are_recorded(self):
+        self.assertIn("styles.css", {path for path, _start, _end in self.coverage.rules})
+        self.assertIn("script.js", self.coverage.blocks)
+        self.assertTrue(any(self.coverage.rules.values()))
+
+    def test_exercised_states_are_live(self):
+        texts = {path: (REPO_ROOT / path).read_text(encoding="utf-8")
+                 for path in {path for path, _start, _end in self.coverage.rules}}
+        dead, _unverified = self.coverage.classify(texts)
+        dead_selectors = {selector for entry in dead for selector in entry[3]}
+        for selector in (".site-footer", '.contact-form input[aria-invalid="true"]', ".legal-modal"):
+            self.assertNotIn(selector, dead_selectors)
+
+
+if __name__ == '__main__':
+    unittest.main()
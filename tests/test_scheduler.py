@@ -0,0 +1,61 @@
+import unittest
+
+import waits
+from harness import BrowserTestCase
+
+
+class ScrollSchedulerTest(BrowserTestCase):
+    viewport = {"width": 1280, "height": 800}
+
+    def setUp(self):
+        super().setUp()
+        self.navigate()
+        self.assertTrue(waits.wait_for_page_ready(self.page))
+
+    def test_observers_are_pooled_by_options(self):
+        """Components watching with the same rootMargin/threshold share one IntersectionObserver."""
+        self.page.locator('.skills-marquee').scroll_into_view_if_needed()
+        self.assertTrue(waits.wait_for_marquee(self.page))
+
+        stats = self.page.evaluate("() => scrollScheduler.stats()")
+        # hero/marquee/back-to-top, scroll-fade, active section, in-practice acts and scene triggers
+        self.assertLessEqual(stats["observers"], 5, stats)
+        self.assertGreater(stats["observedElements"], stats["observers"] * 2, stats)
+
+    def test_reads_run_before_writes_in_one_frame(self):
+        order = self.page.evaluate("""() => new Promise((resolve) => {
+            const log = [];
+            scrollScheduler.write(() => log.push('write'));
+            scrollScheduler.read(() => {
+                log.push('read');
+                scrollScheduler.write(() => {
+                    log.push('write queued by read');
+                    scrollScheduler.read(() => {
+                        log.push('read queued by write');
+                        resolve(log);
+                    });
+                });
+            });
+        })""")
+        self.assertEqual(order, ["read", "write", "write queued by read", "read queued by write"])
+
+    def test_resize_bus_debounces_to_one_notification(self):
+        self.page.evaluate("""() => {
+            window.__resizeCalls = 0;
+            window.__resizeSeen = new Promise((resolve) => {
+                scrollScheduler.onResize(() => {
+                    window.__resizeCalls += 1;
+                    resolve();
+                });
+            });
+        }""")
+        self.page.set_viewport_size({"width": 1100, "height": 800})
+        self.page.set_viewport_size({"width": 900, "height": 800})
+        self.page.set_viewport_size({"width": 820, "height": 760})
+        self.page.evaluate("() => window.__resizeSeen")
+        self.assertTrue(waits.wait_for_frames(self.page))
+        self.assertEqual(self.page.evaluate("() => window.__resizeCalls"), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
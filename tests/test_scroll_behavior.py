@@ -1,49 +1,16 @@
 import unittest
-import threading
-import http.server
-import socketserver
-import os
-import time
-from playwright.sync_api import sync_playwright
-
-class ScrollBehaviorTest(unittest.TestCase):
-    @classmethod
-    def setUpClass(cls):
-        # Start a local server to serve the frontend files
-        # Use 0 to bind to a random free port
-        handler = http.server.SimpleHTTPRequestHandler
-        cls.httpd = socketserver.TCPServer(("", 0), handler)
-        cls.port = cls.httpd.server_address[1]
-        cls.server_thread = threading.Thread(target=cls.httpd.serve_forever)
-        cls.server_thread.daemon = True
-        cls.server_thread.start()
-
-        cls.playwright = sync_playwright().start()
-        cls.browser = cls.playwright.chromium.launch(headless=True)
-        cls.base_url = f"http://localhost:{cls.port}"
-
-    @classmethod
-    def tearDownClass(cls):
-        cls.browser.close()
-        cls.playwright.stop()
-        cls.httpd.shutdown()
-        cls.httpd.server_close()
-
-    def setUp(self):
-        self.context = self.browser.new_context(
-            viewport={'width': 1280, 'height': 800}
-        )
-        self.page = self.context.new_page()
-        # Block external font requests
-        self.page.route("**/*", lambda route: route.abort() if "fonts.googleapis.com" in route.request.url or "fonts.gstatic.com" in route.request.url else route.continue_())
 
-    def tearDown(self):
-        self.context.close()
+import waits
+from harness import BrowserTestCase
+
+
+class ScrollBehaviorTest(BrowserTestCase):
+    viewport = {'width': 1280, 'height': 800}
 
     def navigate(self):
-        self.page.goto(self.base_url, wait_until="domcontentloaded")
+        super().navigate()
         # Ensure initial load is settled
-        self.page.wait_for_timeout(500)
+        self.assertTrue(waits.wait_for_page_ready(self.page), "script.js never finished its initial setup")
 
     def test_scroll_down_triggers_visible(self):
         """Test that scrolling down reveals elements (adds 'is-visible')."""
@@ -64,11 +31,12 @@ class ScrollBehaviorTest(unittest.TestCase):
 
         # Scroll down to the section
         self.page.locator(section_selector).scroll_into_view_if_needed()
-        self.page.wait_for_timeout(500) # Wait for observer callback
 
-        # Check if is-visible is added
-        is_visible_class = self.page.evaluate(f"document.querySelector('{section_selector}').classList.contains('is-visible')")
-        self.assertTrue(is_visible_class, "Section should have 'is-visible' class after scrolling down")
+        # Check if is-visible is added once the observer callback runs
+        self.assertTrue(
+            waits.wait_for_visible(self.page, section_selector),
+            "Section should have 'is-visible' class after scrolling down"
+        )
 
     def test_scroll_up_hides_visible_if_below(self):
         """Test that scrolling up past an element (it exits bottom) removes 'is-visible'."""
@@ -78,27 +46,21 @@ class ScrollBehaviorTest(unittest.TestCase):
 
         # Scroll down to reveal it
         self.page.evaluate(f"document.querySelector('{section_selector}').scrollIntoView()")
-        self.page.wait_for_timeout(1000)
 
         # Verify it is visible
-        is_visible_class = self.page.evaluate(f"document.querySelector('{section_selector}').classList.contains('is-visible')")
-        self.assertTrue(is_visible_class)
+        self.assertTrue(waits.wait_for_visible(self.page, section_selector))
 
         # Scroll back up to top so element exits bottom
         # Force instant scroll to avoid smooth scroll delays
         self.page.evaluate("window.scrollTo({ top: 0, behavior: 'instant' })")
-        self.page.wait_for_timeout(1000)
 
         # Check if is-visible is removed
-        # Wait, if we scroll up, it exits to bottom.
         # Logic: if isBelowViewport, remove is-visible
         # We scrolled up so element is now below viewport (its top > viewportHeight).
-
-        # Ensure scroll completes and intersection observer fires
-        self.page.wait_for_timeout(500)
-
-        is_visible_class = self.page.evaluate(f"document.querySelector('{section_selector}').classList.contains('is-visible')")
-        self.assertFalse(is_visible_class, "Section should NOT have 'is-visible' class after scrolling up past it")
+        self.assertTrue(
+            waits.wait_for_class(self.page, section_selector, 'is-visible', present=False),
+            "Section should NOT have 'is-visible' class after scrolling up past it"
+        )
 
     def test_scroll_up_does_not_trigger_visible_entering_from_top(self):
         """Test that entering from top (scrolling up) does NOT trigger visible (per current behavior)."""
@@ -107,7 +69,7 @@ class ScrollBehaviorTest(unittest.TestCase):
 
         # First, scroll past it to the bottom of the page
         self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        self.page.wait_for_timeout(500)
+        self.assertTrue(waits.wait_for_scroll_end(self.page))
 
         # At this point:
         # 1. We loaded at top.
@@ -122,7 +84,10 @@ class ScrollBehaviorTest(unittest.TestCase):
 
         # Start from Selected Work so #work is active
         self.page.locator('.nav-links a[href="#work"]').click()
-        self.page.wait_for_timeout(700)
+        self.assertTrue(waits.wait_for_scroll_end(self.page))
+
+        # Record every aria-current change on the nav links from here on
+        recorder = waits.AttributeRecorder(self.page, '.nav-links a', 'aria-current')
 
         # Click Why Hire Me and verify #why-me immediately becomes/stays active
         why_link = self.page.locator('a[href="#why-me"]')
@@ -136,14 +101,18 @@ class ScrollBehaviorTest(unittest.TestCase):
         )
 
         # During the smooth scroll transition, #work should not become active again
-        self.page.wait_for_timeout(200)
+        self.assertTrue(waits.wait_for_scroll_end(self.page), "Smooth scroll to #why-me never settled")
+        self.assertNotIn(
+            ('#work', 'true'),
+            recorder.changes(),
+            "Selected Work link should not reactivate during nav transition"
+        )
         self.assertIsNone(
             self.page.evaluate("document.querySelector('a[href=\"#work\"]').getAttribute('aria-current')"),
-            "Selected Work link should not reactivate during nav transition"
+            "Selected Work link should not be active after the nav transition"
         )
 
         # Final state after scroll should remain on #why-me
-        self.page.wait_for_timeout(1000)
         self.assertEqual(
             self.page.evaluate("document.querySelector('a[href=\"#why-me\"]').getAttribute('aria-current')"),
             'true',
@@ -151,17 +120,19 @@ class ScrollBehaviorTest(unittest.TestCase):
         )
     def test_reload_at_bottom_scroll_up(self):
         """Test behavior when reloading at bottom and scrolling up."""
+        self.use_virtual_time()
         self.navigate()
         # Scroll to bottom
         self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        self.page.wait_for_timeout(500)
+        self.assertTrue(waits.wait_for_scroll_end(self.page))
 
         # Now reload. Browser might restore scroll position.
-        self.page.reload()
-        # Wait longer than the 1000ms initial check timeout in script.js FIRST
-        self.page.wait_for_timeout(1500)
+        self.page.reload(wait_until="domcontentloaded")
+        self.assertTrue(waits.wait_for_page_ready(self.page))
+        # Let the 1000ms initial check window in script.js elapse on the virtual clock.
+        self.advance(1000)
         self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        self.page.wait_for_timeout(500)
+        self.assertTrue(waits.wait_for_scroll_end(self.page))
 
         # Now we are at bottom.
         # #what-i-do is above viewport.
@@ -187,7 +158,7 @@ class ScrollBehaviorTest(unittest.TestCase):
         target_scroll_y = element_y + height - (height * 0.2)
 
         self.page.evaluate(f"window.scrollTo({{ top: {target_scroll_y}, behavior: 'instant' }})")
-        self.page.wait_for_timeout(1000)
+        self.assertTrue(waits.wait_for_scroll_end(self.page))
 
         # Check if is-visible is added
         # Logic: isEnteringFromBottom (rect.top >= 0) is false because rect.top < 0 (entering from top).
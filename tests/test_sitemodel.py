@@ -0,0 +1,108 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from harness import REPO_ROOT
+from tools import sitemodel
+
+HTML = """\
+<!DOCTYPE html>
+<html><head>
+<meta http-equiv="Content-Security-Policy" content="default-src 'none'; img-src 'self' https://img.example.com; upgrade-insecure-requests">
+<link rel="stylesheet" href="a.css">
+</head><body>
+<nav class="nav"><a href="#one" class="btn btn-hire">Hire <b>me</b></a><a href="#two" data-kind="x y">Two</a></nav>
+<section id="one" class="card">
+  <h2>One</h2>
+  <p>First <br>line</p>
+  <p class="note">Second</p>
+  <svg><path d="M0 0"/></svg>
+</section>
+</body></html>
+"""
+
+CSS = """
+/* header */
+.card, .nav a { color: red; padding: 0 }
+.card { color: blue; background: url("a;b.png") }
+@media (max-width: 768px) {
+    .card { padding: 1rem; }
+}
+@keyframes spin { to { transform: rotate(1turn) } }
+"""
+
+HEADERS = """\
+/*
+  X-Frame-Options: DENY
+/*.css
+  Cache-Control: public, max-age=60
+"""
+
+
+class DocumentTest(unittest.TestCase):
+    document = sitemodel.Document(HTML)
+
+    def tags(self, selector, **options):
+        return [element.tag + "".join(f".{name}" for name in element.classes)
+                for element in self.document.select(selector, **options)]
+
+    def test_compound_and_attribute_selectors(self):
+        self.assertEqual(self.tags("a.btn.btn-hire[href='#one']"), ["a.btn.btn-hire"])
+        self.assertEqual(self.tags("a[data-kind~=y], a[href^='#t']"), ["a"])
+        self.assertEqual(self.tags("[href$=one]"), ["a.btn.btn-hire"])
+        self.assertEqual(self.tags("#one > *"), ["h2", "p", "p.note", "svg"])
+
+    def test_combinators(self):
+        self.assertEqual(self.tags("section p"), ["p", "p.note"])
+        self.assertEqual(self.tags("h2 + p"), ["p"])
+        self.assertEqual(self.tags("h2 ~ p"), ["p", "p.note"])
+        self.assertEqual(self.tags("nav > b"), [])
+        self.assertEqual(self.tags("svg > path"), ["path"])
+
+    def test_text_filter_and_text_content(self):
+        self.assertEqual(self.tags("a", text="Hire me"), ["a.btn.btn-hire"])
+        self.assertEqual(self.document.select_one("#one p").text, "First line")
+        self.assertEqual(self.document.select_one("#one p").line, 9)
+
+    def test_unsupported_selectors_are_rejected(self):
+        for selector in ("a:hover", "> a", "a >", "a::before"):
+            with self.assertRaises(sitemodel.SiteModelError, msg=selector):
+                self.document.select(selector)
+
+
+class StylesheetTest(unittest.TestCase):
+    stylesheet = sitemodel.Stylesheet(CSS)
+
+    def test_indexes_rules_by_selector_and_condition(self):
+        self.assertEqual(len(self.stylesheet.rules_for(".card")), 2)
+        self.assertEqual(self.stylesheet.declared(".card", "color"), "blue")
+        self.assertEqual(self.stylesheet.declared(".nav a", "padding"), "0")
+        self.assertEqual(self.stylesheet.declared(".card", "background"), 'url("a;b.png")')
+        self.assertEqual(self.stylesheet.declared(".card", "padding", ["@media (max-width: 768px)"]), "1rem")
+        self.assertNotIn("to", self.stylesheet.by_selector)
+
+
+class SiteModelTest(unittest.TestCase):
+    def test_loads_markup_css_and_headers(self):
+        root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, root)
+        (root / "index.html").write_text(HTML)
+        (root / "styles.css").write_text(CSS)
+        (root / "_headers").write_text(HEADERS)
+
+        site = sitemodel.SiteModel(root)
+        self.assertEqual(site.csp, {
+            "default-src": ["'none'"],
+            "img-src": ["'self'", "https://img.example.com"],
+            "upgrade-insecure-requests": [],
+        })
+        self.assertEqual(site.headers_for("/a.css"), {"x-frame-options": "DENY", "cache-control": "public, max-age=60"})
+        self.assertEqual(site.headers_for("/"), {"x-frame-options": "DENY"})
+
+    def test_site_is_parsed_once(self):
+        self.assertIs(sitemodel.load_site(REPO_ROOT), sitemodel.load_site(REPO_ROOT))
+
+
+if __name__ == '__main__':
+    unittest.main()
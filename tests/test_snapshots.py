@@ -0,0 +1,122 @@
+import shutil
+import tempfile
+import unittest
+
+from harness import BrowserTestCase
+from tools import snapshots
+
+PROPERTIES = ("color", "font-size", "text-align")
+
+
+def snapshot(*rows):
+    return {"size": [100, 40], "elements": [list(row) for row in rows]}
+
+
+FOOTER = snapshot(
+    ("footer.site-footer", 0, 0, 100, 40, "rgb(226, 232, 240)", "16px", "start"),
+    ("footer.site-footer > h3.footer-col-heading", 10, 5, 80, 12.5, "rgb(148, 163, 184)", "12px", "left"),
+)
+
+
+class DiffTest(unittest.TestCase):
+    def test_drift_within_tolerance_is_ignored(self):
+        moved = snapshot(
+            ("footer.site-footer", 0, 0, 100, 40.6, "rgb(226, 232, 240)", "16px", "start"),
+            ("footer.site-footer > h3.footer-col-heading", 10.8, 5, 80, 12.5, "rgb(148, 163, 184)", "12.4px", "left"),
+        )
+        self.assertEqual(snapshots.diff(FOOTER, moved, PROPERTIES), [])
+
+    def test_reports_box_style_and_element_changes(self):
+        changed = snapshot(
+            ("footer.site-footer", 0, 0, 100, 52, "rgb(226, 232, 240)", "16px", "start"),
+            ("footer.site-footer > p.footer-copy", 10, 5, 80, 12.5, "rgb(71, 85, 105)", "13.6px", "start"),
+        )
+        self.assertEqual(snapshots.diff(FOOTER, changed, PROPERTIES), [
+            ("footer.site-footer", "box", (0, 0, 100, 40), (0, 0, 100, 52)),
+            ("footer.site-footer > h3.footer-col-heading", "element", "present", None),
+            ("footer.site-footer > p.footer-copy", "element", None, "present"),
+        ])
+
+    def test_keywords_must_match_exactly(self):
+        centred = snapshot(FOOTER["elements"][0], FOOTER["elements"][1][:-1] + ["center"])
+        self.assertEqual(snapshots.diff(FOOTER, centred, PROPERTIES), [
+            ("footer.site-footer > h3.footer-col-heading", "text-align", "left", "center"),
+        ])
+
+    def test_report_groups_changes_by_capture(self):
+        results = {
+            "desktop/light": [],
+            "mobile/dark": [("footer.site-footer", "font-size", "16px", "18px")],
+        }
+        self.assertEqual(snapshots.format_report(results), "\n".join([
+            "[mobile/dark] 1 change",
+            "  footer.site-footer: font-size '16px' -> '18px'",
+            "1 of 2 captures match the baseline",
+        ]))
+
+
+class BaselineStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_round_trips_and_compares(self):
+        rows = [["footer.site-footer", 0, 0, 100, 40] + ["x"] * len(snapshots.PROPERTIES)]
+        captures = {"desktop/light": snapshot(*rows), "desktop/print": snapshot(*rows)}
+        path = snapshots.save_baseline("footer", captures, self.directory)
+        self.assertEqual(len(path.read_text(encoding="utf-8").splitlines()), 13)
+
+        baseline = snapshots.load_baseline("footer", self.directory)
+        self.assertEqual(baseline["selector"], ".site-footer")
+        results = snapshots.compare(baseline, {"desktop/light": snapshot(*rows)})
+        self.assertEqual(results, {
+            "desktop/light": [],
+            "desktop/print": [("(capture)", "element", "present", None)],
+        })
+
+    def test_missing_baseline(self):
+        self.assertIsNone(snapshots.load_baseline("footer", self.directory))
+
+
+class FooterSnapshotTest(BrowserTestCase):
+    """Every breakpoint, theme and print render of the footer, one capture each."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.captures = snapshots.capture_section(cls.browser, cls.base_url + "/", snapshots.SECTIONS["footer"])
+
+    def elements(self, label):
+        for key, captured in self.captures.items():
+            matches = [element for path, element in snapshots.unpack(captured).items() if path.endswith(label)]
+            yield key, matches
+
+    def test_covers_every_breakpoint_and_mode(self):
+        self.assertEqual(len(self.captures), len(snapshots.VIEWPORTS) * len(snapshots.MODES))
+
+    def test_column_headers_are_left_aligned(self):
+        for key, headings in self.elements("h3.footer-col-heading"):
+            self.assertEqual(len(headings), 3, key)
+            self.assertEqual({heading["style"]["text-align"] for heading in headings}, {"left"}, key)
+
+    def test_legal_links_match_footer_link_font_size(self):
+        links = dict(self.elements("div.footer-col:1 > ul > li:1 > a"))
+        for key, triggers in self.elements("button.footer-legal-trigger"):
+            self.assertEqual(len(triggers), 3, key)
+            self.assertEqual({trigger["style"]["font-size"] for trigger in triggers},
+                             {links[key][0]["style"]["font-size"]}, key)
+
+    def test_logo_renders_at_44px(self):
+        for key, logos in self.elements("img.footer-logo"):
+            self.assertEqual([logo["box"][2:] for logo in logos], [(44, 44)], key)
+
+    def test_matches_baseline(self):
+        baseline = snapshots.load_baseline("footer")
+        if baseline is None:
+            self.skipTest("No footer baseline; record one with python -m tools.snapshots --update")
+        results = snapshots.compare(baseline, self.captures)
+        self.assertFalse(any(results.values()), "\n" + snapshots.format_report(results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,46 +1,9 @@
 import unittest
-import threading
-import http.server
-import socketserver
-import os
-import time
-from playwright.sync_api import sync_playwright
-
-class ThemePersistenceTest(unittest.TestCase):
-    @classmethod
-    def setUpClass(cls):
-        # Start a local server to serve the frontend files
-        handler = http.server.SimpleHTTPRequestHandler
-        cls.httpd = socketserver.TCPServer(("", 0), handler)
-        cls.port = cls.httpd.server_address[1]
-        cls.server_thread = threading.Thread(target=cls.httpd.serve_forever)
-        cls.server_thread.daemon = True
-        cls.server_thread.start()
-
-        cls.playwright = sync_playwright().start()
-        cls.browser = cls.playwright.chromium.launch(headless=True)
-        cls.base_url = f"http://localhost:{cls.port}"
-
-    @classmethod
-    def tearDownClass(cls):
-        cls.browser.close()
-        cls.playwright.stop()
-        cls.httpd.shutdown()
-        cls.httpd.server_close()
-
-    def setUp(self):
-        self.context = self.browser.new_context()
-        self.page = self.context.new_page()
-        # Block external font requests as per project guidelines to prevent timeouts
-        self.page.route("**/*", lambda route: route.abort() if "fonts.googleapis.com" in route.request.url or "fonts.gstatic.com" in route.request.url else route.continue_())
-
-    def tearDown(self):
-        self.context.close()
-
-    def navigate(self):
-        # Use domcontentloaded to avoid waiting for external assets that might hang
-        self.page.goto(self.base_url, wait_until="domcontentloaded")
 
+from harness import BrowserTestCase
+
+
+class ThemePersistenceTest(BrowserTestCase):
     def test_initialization_default_light(self):
         """Test that the theme defaults to light mode when no preference is set."""
         self.navigate()
@@ -0,0 +1,91 @@
+import unittest
+
+import waits
+from harness import BrowserTestCase
+
+# script.js timings the tests fast-forward through.
+TYPING_MS_PER_CHARACTER = 36
+PENDING_SECTION_MS = 1200
+SCROLL_LOCK_MS = 1400
+
+
+class HeroTypingTimelineTest(BrowserTestCase):
+    virtual_time = True
+    context_options = {"reduced_motion": "no-preference"}
+
+    def heading(self):
+        return self.page.evaluate("""() => {
+            const heading = document.getElementById('hero-heading');
+            return { text: heading.textContent, typing: heading.classList.contains('hero-is-typing') };
+        }""")
+
+    def test_types_one_character_per_tick(self):
+        self.navigate()
+        self.assertTrue(waits.wait_for_page_ready(self.page))
+        full_text = self.page.evaluate("""() => document.getElementById('hero-heading').dataset.fullText
+            .replace(/\\s*\\n\\s*/g, '\\n').trim()""")
+
+        # The first character is typed synchronously on DOMContentLoaded.
+        self.assertEqual(self.heading(), {"text": full_text[:1], "typing": True})
+        self.advance(TYPING_MS_PER_CHARACTER * 4)
+        self.assertEqual(self.heading()["text"], full_text[:5])
+
+        self.advance(TYPING_MS_PER_CHARACTER * len(full_text))
+        self.assertEqual(self.heading(), {"text": full_text, "typing": False})
+
+
+class NavPendingSectionTimelineTest(BrowserTestCase):
+    virtual_time = True
+    viewport = {"width": 1280, "height": 800}
+
+    def active_link(self):
+        return self.page.evaluate("""() => {
+            const link = document.querySelector('.nav-links a[aria-current="true"]');
+            return link ? link.getAttribute('href') : null;
+        }""")
+
+    def jump_to(self, selector):
+        self.page.evaluate(f"() => document.querySelector('{selector}').scrollIntoView({{ behavior: 'instant' }})")
+        self.assertTrue(waits.wait_for_scroll_end(self.page))
+
+    def test_observer_updates_resume_after_pending_window(self):
+        self.navigate()
+        self.assertTrue(waits.wait_for_page_ready(self.page))
+
+        self.page.locator('.nav-links a[href="#why-me"]').click()
+        self.assertEqual(self.active_link(), "#why-me")
+
+        # While the click is pending, observer updates for other sections are ignored.
+        self.jump_to("#skills")
+        self.assertEqual(self.active_link(), "#why-me")
+
+        self.advance(PENDING_SECTION_MS)
+        self.jump_to("#work")
+        self.assertTrue(waits.wait_for_attribute(self.page, '.nav-links a[href="#work"]', "aria-current", "true"))
+
+
+class InPracticeScrollLockTimelineTest(BrowserTestCase):
+    virtual_time = True
+    viewport = {"width": 1280, "height": 800}
+
+    def overflow(self):
+        return self.page.evaluate("() => document.documentElement.style.overflow")
+
+    def test_first_reveal_locks_scroll_for_the_swipe(self):
+        self.navigate()
+        self.assertTrue(waits.wait_for_page_ready(self.page))
+        self.advance(50)  # runs the scheduler's first frame
+
+        self.page.evaluate("""() => document.querySelector('.ip-scroll-scene .ip-scene-trigger')
+            .scrollIntoView({ block: 'center', behavior: 'instant' })""")
+        self.assertTrue(waits.wait_for_class(self.page, '.ip-scroll-scene', 'scene-revealed'))
+        self.assertEqual(self.overflow(), "hidden")
+
+        self.advance(SCROLL_LOCK_MS - 1)
+        self.assertEqual(self.overflow(), "hidden")
+        self.advance(1)
+        self.assertEqual(self.overflow(), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
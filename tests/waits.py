@@ -0,0 +1,199 @@
+"""Event-driven wait primitives for the browser tests.
+
+Each helper resolves from an in-page signal instead of a wall-clock sleep: a
+MutationObserver watching the attribute that script.js toggles, the
+``scrollend`` event, or a couple of animation frames so pending
+IntersectionObserver callbacks are delivered. Waits return ``True`` once the
+condition holds and ``False`` if ``timeout`` (in milliseconds) elapses first,
+so callers can assert on the result with a readable message.
+"""
+
+DEFAULT_TIMEOUT_MS = 5000
+
+# Installed into every context by the harness before any page script runs, so
+# the waits keep working when a test swaps the page timers for a fake clock.
+INIT_SCRIPT = """
+(() => {
+    Object.defineProperty(window, '__hireWaitNatives', {
+        value: Object.freeze({
+            setTimeout: window.setTimeout.bind(window),
+            clearTimeout: window.clearTimeout.bind(window),
+            requestAnimationFrame: window.requestAnimationFrame.bind(window),
+        }),
+    });
+})();
+"""
+
+_MUTATION_WAIT = """
+({ selector, observe, timeout, args }) => new Promise((resolve, reject) => {
+    const natives = window.__hireWaitNatives || window;
+    const root = selector ? document.querySelector(selector) : document.documentElement;
+    if (!root) {
+        reject(new Error(`No element matches ${selector}`));
+        return;
+    }
+    const condition = __CONDITION__;
+    let observer = null;
+    const timer = natives.setTimeout(() => {
+        if (observer) observer.disconnect();
+        resolve(false);
+    }, timeout);
+    const check = () => {
+        if (!condition(root, args)) return false;
+        if (observer) observer.disconnect();
+        natives.clearTimeout(timer);
+        resolve(true);
+        return true;
+    };
+    if (check()) return;
+    observer = new MutationObserver(check);
+    observer.observe(root, observe);
+})
+"""
+
+_FRAMES_WAIT = """
+(count) => new Promise((resolve) => {
+    const natives = window.__hireWaitNatives || window;
+    const step = (remaining) => {
+        if (remaining <= 0) {
+            resolve(true);
+            return;
+        }
+        natives.requestAnimationFrame(() => step(remaining - 1));
+    };
+    step(count);
+})
+"""
+
+# Resolves on `scrollend`, or once scrollY has not moved for a few frames
+# (covers scrolls that finished before the wait started and instant jumps).
+_SCROLL_END_WAIT = """
+({ timeout, stableFrames }) => new Promise((resolve) => {
+    const natives = window.__hireWaitNatives || window;
+    let settled = false;
+    let lastY = window.scrollY;
+    let stable = 0;
+    const finish = (result) => {
+        if (settled) return;
+        settled = true;
+        window.removeEventListener('scrollend', onScrollEnd);
+        natives.clearTimeout(timer);
+        resolve(result);
+    };
+    const onScrollEnd = () => finish(true);
+    const timer = natives.setTimeout(() => finish(false), timeout);
+    const poll = () => {
+        if (settled) return;
+        if (window.scrollY === lastY) {
+            stable += 1;
+            if (stable >= stableFrames) {
+                finish(true);
+                return;
+            }
+        } else {
+            stable = 0;
+            lastY = window.scrollY;
+        }
+        natives.requestAnimationFrame(poll);
+    };
+    window.addEventListener('scrollend', onScrollEnd);
+    natives.requestAnimationFrame(poll);
+})
+"""
+
+_RECORD_ATTRIBUTE = """
+({ selector, name, keyAttribute }) => {
+    const log = [];
+    const observer = new MutationObserver((mutations) => {
+        mutations.forEach((mutation) => {
+            const target = mutation.target;
+            if (!target.matches(selector)) return;
+            log.push({ key: target.getAttribute(keyAttribute), value: target.getAttribute(name) });
+        });
+    });
+    observer.observe(document.documentElement, { attributes: true, subtree: true, attributeFilter: [name] });
+    window.__hireAttributeLog = log;
+}
+"""
+
+
+def _wait_for_mutation(page, condition, selector=None, observe=None, timeout=DEFAULT_TIMEOUT_MS, args=None):
+    source = _MUTATION_WAIT.replace("__CONDITION__", condition)
+    return page.evaluate(source, {
+        "selector": selector,
+        "observe": observe or {"attributes": True},
+        "timeout": timeout,
+        "args": args,
+    })
+
+
+def wait_for_frames(page, count=2):
+    """Wait for ``count`` animation frames so queued observer callbacks run."""
+    return page.evaluate(_FRAMES_WAIT, count)
+
+
+def wait_for_class(page, selector, class_name, present=True, timeout=DEFAULT_TIMEOUT_MS):
+    """Wait until ``class_name`` is added to (or removed from) ``selector``."""
+    return _wait_for_mutation(
+        page,
+        "(el, { className, present }) => el.classList.contains(className) === present",
+        selector=selector,
+        observe={"attributes": True, "attributeFilter": ["class"]},
+        timeout=timeout,
+        args={"className": class_name, "present": present},
+    )
+
+
+def wait_for_visible(page, selector, timeout=DEFAULT_TIMEOUT_MS):
+    """Wait for the scroll-animation IntersectionObserver to reveal ``selector``."""
+    return wait_for_class(page, selector, "is-visible", timeout=timeout)
+
+
+def wait_for_attribute(page, selector, name, value, timeout=DEFAULT_TIMEOUT_MS):
+    """Wait until attribute ``name`` on ``selector`` equals ``value`` (``None`` = removed)."""
+    return _wait_for_mutation(
+        page,
+        "(el, { name, value }) => el.getAttribute(name) === value",
+        selector=selector,
+        observe={"attributes": True, "attributeFilter": [name]},
+        timeout=timeout,
+        args={"name": name, "value": value},
+    )
+
+
+def wait_for_page_ready(page, timeout=DEFAULT_TIMEOUT_MS):
+    """Wait for script.js to finish its DOMContentLoaded setup and first observer pass."""
+    ready = _wait_for_mutation(
+        page,
+        "() => document.querySelector('main > .scroll-fade') !== null",
+        observe={"attributes": True, "subtree": True, "attributeFilter": ["class"]},
+        timeout=timeout,
+    )
+    return ready and wait_for_frames(page)
+
+
+def wait_for_marquee(page, timeout=DEFAULT_TIMEOUT_MS):
+    """Wait for the virtualized marquee renderer to take over every skills track."""
+    return wait_for_attribute(page, ".skills-marquee", "data-marquee", "ready", timeout=timeout)
+
+
+def wait_for_scroll_end(page, timeout=DEFAULT_TIMEOUT_MS, stable_frames=3):
+    """Wait for smooth scrolling to settle, then for the resulting observer callbacks."""
+    settled = page.evaluate(_SCROLL_END_WAIT, {"timeout": timeout, "stableFrames": stable_frames})
+    return settled and wait_for_frames(page)
+
+
+class AttributeRecorder:
+    """Records every change to attribute ``name`` on elements matching ``selector``.
+
+    Useful for asserting that something *never* happened during a transition,
+    e.g. that a nav link was not re-activated mid-scroll.
+    """
+
+    def __init__(self, page, selector, name, key_attribute="href"):
+        self.page = page
+        page.evaluate(_RECORD_ATTRIBUTE, {"selector": selector, "name": name, "keyAttribute": key_attribute})
+
+    def changes(self):
+        """Return the recorded ``(key, value)`` pairs in the order they happened."""
+        return [(entry["key"], entry["value"]) for entry in self.page.evaluate("window.__hireAttributeLog")]
@@ -0,0 +1 @@
+"""Development and build tooling for the site (stdlib-only unless noted)."""
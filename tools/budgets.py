@@ -0,0 +1,352 @@
+"""Byte, request and DOM budgets, checked against budgets.json.
+
+Static checks read the source tree:
+
+* raw, gzip and brotli size of every asset listed in ``budgets.json``
+  (brotli only when the optional ``brotli`` package is installed);
+* render-blocking requests in ``<head>``: stylesheets outside ``<noscript>``
+  that are not ``media="print"``, and classic scripts without ``defer`` or ``async``;
+* element count of index.html as shipped;
+* third-party origins the markup loads from (not plain links).
+
+Dynamic checks load the page in headless Chromium and scroll the skills
+marquee into view so its renderer has built the row windows. They record the
+requests Chromium marks as render-blocking, the element count and composited
+marquee layer area at that point, and every third-party origin the page tried
+to contact. Third-party requests
+are recorded and then aborted, so no network is needed.
+
+Every metric is printed as a row of a table: budget, actual, headroom and, with
+``--baseline``, the change since an earlier report. The exit status is non-zero
+when anything is over budget.
+
+Usage (from the repository root):
+
+    python -m tools.budgets                      # static checks
+    python -m tools.budgets --dynamic            # plus the Playwright checks
+    python -m tools.budgets --output report.json --baseline main-report.json
+"""
+import argparse
+import gzip
+import json
+import sys
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urlsplit
+
+try:
+    import brotli
+except ImportError:  # Optional: brotli sizes are skipped without it.
+    brotli = None
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BUDGETS_FILE = REPO_ROOT / "budgets.json"
+
+# Attributes that make the browser fetch something (plain <a href> does not).
+_FETCHING_ATTRIBUTES = {
+    ("link", "href"), ("script", "src"), ("img", "src"), ("img", "srcset"),
+    ("source", "srcset"), ("link", "imagesrcset"), ("iframe", "src"), ("video", "src"), ("audio", "src"),
+}
+
+
+class BudgetError(Exception):
+    pass
+
+
+def load_budgets(path=BUDGETS_FILE):
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def third_party_patterns(path=BUDGETS_FILE):
+    """Return a Playwright route pattern for every origin in ``third_party_origins``.
+
+    The browser tests and the page-rendering tools abort requests to these, so
+    a missing network only costs the page its web fonts.
+    """
+    return tuple(f"{origin}/**" for origin in load_budgets(path).get("third_party_origins", []))
+
+
+def asset_sizes(data):
+    """Return ``{"raw", "gzip", "brotli"}`` byte counts for ``data`` (brotli is None without the package)."""
+    return {
+        "raw": len(data),
+        "gzip": len(gzip.compress(data, compresslevel=9, mtime=0)),
+        "brotli": len(brotli.compress(data, quality=11)) if brotli is not None else None,
+    }
+
+
+def _origin(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}" if parts.scheme in ("http", "https") and parts.netloc else None
+
+
+class _PageScanner(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.elements = 0
+        self.blocking = []
+        self.origins = set()
+        self._in_head = False
+        self._noscript_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        self.elements += 1
+        attributes = dict(attrs)
+        if tag == "head":
+            self._in_head = True
+        elif tag == "body":
+            self._in_head = False
+        elif tag == "noscript":
+            self._noscript_depth += 1
+
+        for name, value in attrs:
+            if (tag, name) in _FETCHING_ATTRIBUTES and value:
+                for candidate in value.split(",") if name.endswith("srcset") else [value]:
+                    origin = _origin(candidate.strip().split(" ")[0])
+                    if origin:
+                        self.origins.add(origin)
+
+        if not self._in_head or self._noscript_depth:
+            return
+        rel = (attributes.get("rel") or "").lower().split()
+        if tag == "link" and "stylesheet" in rel and attributes.get("media", "all") != "print":
+            self.blocking.append(attributes.get("href"))
+        elif (tag == "script" and attributes.get("src") and "defer" not in attributes
+              and "async" not in attributes and attributes.get("type") != "module"):
+            self.blocking.append(attributes.get("src"))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag == "noscript":
+            self._noscript_depth -= 1
+
+    def handle_endtag(self, tag):
+        if tag == "noscript" and self._noscript_depth:
+            self._noscript_depth -= 1
+        elif tag == "head":
+            self._in_head = False
+
+
+def scan_page(html):
+    """Return ``(element count, render-blocking URLs, third-party origins)`` for ``html``."""
+    scanner = _PageScanner()
+    scanner.feed(html)
+    scanner.close()
+    return scanner.elements, scanner.blocking, scanner.origins
+
+
+def measure_static(root, budgets):
+    """Measure everything ``budgets`` covers that can be read from the tree."""
+    root = Path(root)
+    assets = {}
+    for name in budgets.get("assets", {}):
+        path = root / name
+        if not path.is_file():
+            raise BudgetError(f"Budgeted asset {name} does not exist")
+        assets[name] = asset_sizes(path.read_bytes())
+    elements, blocking, origins = scan_page((root / "index.html").read_text(encoding="utf-8"))
+    return {
+        "assets": assets,
+        "render_blocking_requests": len(blocking),
+        "render_blocking": blocking,
+        "dom_elements": elements,
+        "third_party_origins": sorted(origins),
+    }
+
+
+# Run once the marquee renderer is ready. renderBlockingStatus is Chromium's own
+# verdict on which requests held up the first render. The marquee layer area
+# is the scrollable extent of every element promoted for transform animation
+# inside the marquee, a stand-in for the composited layers' paint area.
+PAGE_METRICS_SCRIPT = """
+() => ({
+    domElements: document.getElementsByTagName('*').length,
+    marqueeLayerArea: Array.from(document.querySelectorAll('.skills-marquee *'))
+        .filter((element) => getComputedStyle(element).willChange.includes('transform'))
+        .reduce((area, element) => area + element.scrollWidth * element.offsetHeight, 0),
+    renderBlocking: performance.getEntriesByType('resource')
+        .filter((entry) => entry.renderBlockingStatus === 'blocking')
+        .map((entry) => entry.name),
+})
+"""
+
+_MARQUEE_READY = """
+(timeout) => new Promise((resolve) => {
+    const marquee = document.querySelector('.skills-marquee');
+    const ready = () => marquee.dataset.marquee === 'ready';
+    if (ready()) { resolve(true); return; }
+    const observer = new MutationObserver(() => {
+        if (ready()) { observer.disconnect(); resolve(true); }
+    });
+    observer.observe(marquee, { attributes: true, attributeFilter: ['data-marquee'] });
+    setTimeout(() => { observer.disconnect(); resolve(ready()); }, timeout);
+})
+"""
+
+
+def dynamic_report(page_metrics, requested_urls, page_origin):
+    """Combine in-page metrics and the page's request URLs into a report section."""
+    origins = {_origin(url) for url in requested_urls}
+    origins.discard(None)
+    origins.discard(page_origin)
+    return {
+        "render_blocking_requests": len(page_metrics["renderBlocking"]),
+        "render_blocking": page_metrics["renderBlocking"],
+        "dom_elements": page_metrics["domElements"],
+        "marquee_layer_area": page_metrics["marqueeLayerArea"],
+        "third_party_origins": sorted(origins),
+    }
+
+
+def record_third_party(context, page_origin, requested):
+    """Record every request in ``context`` and abort those leaving ``page_origin``."""
+    def handle(route):
+        requested.append(route.request.url)
+        if _origin(route.request.url) == page_origin:
+            route.continue_()
+        else:
+            route.abort()
+
+    context.route("**/*", handle)
+
+
+def measure_dynamic(root=REPO_ROOT, viewport=None, timeout=10000):
+    """Load the page in headless Chromium and return its dynamic measurements."""
+    from playwright.sync_api import sync_playwright
+
+    from tools.devserver import start_server
+
+    server = start_server(root, host="127.0.0.1")
+    page_origin = f"http://127.0.0.1:{server.port}"
+    requested = []
+    try:
+        with sync_playwright() as playwright:
+            browser = playwright.chromium.launch(headless=True)
+            try:
+                context = browser.new_context(viewport=viewport or {"width": 1280, "height": 800})
+                record_third_party(context, page_origin, requested)
+                page = context.new_page()
+                page.goto(f"{page_origin}/", wait_until="load")
+                page.locator("#skills").scroll_into_view_if_needed()
+                if not page.evaluate(_MARQUEE_READY, timeout):
+                    raise BudgetError("The skills marquee was not initialised")
+                metrics = page.evaluate(PAGE_METRICS_SCRIPT)
+            finally:
+                browser.close()
+    finally:
+        server.stop()
+    return dynamic_report(metrics, requested, page_origin)
+
+
+# Per-section metrics and their units, in table order.
+_SECTION_METRICS = (
+    ("render_blocking_requests", "count"),
+    ("dom_elements", "count"),
+    ("marquee_layer_area", "px2"),
+)
+
+
+def compare(report, budgets):
+    """Return table rows ``(metric, budget, actual, unit)`` for every budgeted measurement."""
+    rows = []
+    for name, limits in budgets.get("assets", {}).items():
+        for kind in ("raw", "gzip", "brotli"):
+            if kind in limits:
+                rows.append((f"{name} ({kind})", limits[kind], report["static"]["assets"][name][kind], "bytes"))
+    for section in ("static", "dynamic"):
+        measured = report.get(section)
+        limits = budgets.get(section, {})
+        if not measured:
+            continue
+        for key, unit in _SECTION_METRICS:
+            if key in limits and key in measured:
+                rows.append((f"{key.replace('_', ' ')} [{section}]", limits[key], measured[key], unit))
+        allowed = set(budgets.get("third_party_origins", []))
+        unexpected = [origin for origin in measured["third_party_origins"] if origin not in allowed]
+        rows.append((f"unexpected third-party origins [{section}]", 0, len(unexpected), "count"))
+    return rows
+
+
+def violations(rows):
+    return [row for row in rows if row[2] is not None and row[2] > row[1]]
+
+
+def _format_value(value, unit):
+    if value is None:
+        return "n/a"
+    if unit == "bytes":
+        return f"{value / 1024:.1f} KiB" if abs(value) >= 1024 else f"{value} B"
+    if unit == "px2":
+        return f"{value / 1e6:.2f} Mpx" if abs(value) >= 10000 else f"{value} px"
+    return str(value)
+
+
+def _format_delta(value, unit):
+    if value is None:
+        return ""
+    sign = "+" if value > 0 else ""
+    return sign + _format_value(value, unit) if value else "0"
+
+
+def format_table(rows, baseline_rows=None):
+    """Render ``rows`` as a plain-text diff table."""
+    previous = {metric: actual for metric, _budget, actual, _unit in baseline_rows or ()}
+    header = f"{'metric':<48}{'budget':>12}{'actual':>12}{'headroom':>12}"
+    if baseline_rows is not None:
+        header += f"{'vs baseline':>14}"
+    lines = [header + "  status", "-" * (len(header) + 8)]
+    for metric, budget, actual, unit in rows:
+        headroom = None if actual is None else budget - actual
+        status = "n/a" if actual is None else ("OVER" if actual > budget else "ok")
+        line = (f"{metric:<48}{_format_value(budget, unit):>12}{_format_value(actual, unit):>12}"
+                f"{_format_delta(headroom, unit):>12}")
+        if baseline_rows is not None:
+            before = previous.get(metric)
+            delta = None if before is None or actual is None else actual - before
+            line += f"{_format_delta(delta, unit):>14}"
+        lines.append(f"{line}  {status}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the page against budgets.json.")
+    parser.add_argument("--budgets", default=str(BUDGETS_FILE), help="budgets file (default: budgets.json)")
+    parser.add_argument("--root", default=str(REPO_ROOT), help="site directory (default: repository root)")
+    parser.add_argument("--dynamic", action="store_true", help="also measure the page in headless Chromium")
+    parser.add_argument("--output", help="write the measurements and table rows to this JSON file")
+    parser.add_argument("--baseline", help="earlier --output report to diff against")
+    args = parser.parse_args(argv)
+
+    budgets = load_budgets(args.budgets)
+    try:
+        report = {"static": measure_static(args.root, budgets)}
+        if args.dynamic:
+            report["dynamic"] = measure_dynamic(args.root)
+    except BudgetError as exc:
+        print(f"budgets: {exc}", file=sys.stderr)
+        return 2
+
+    rows = compare(report, budgets)
+    baseline_rows = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline_rows = [tuple(row) for row in json.load(handle)["rows"]]
+    print(format_table(rows, baseline_rows))
+    if brotli is None:
+        print("note: install the 'brotli' package to check brotli sizes", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump({**report, "rows": rows}, handle, indent=2)
+            handle.write("\n")
+
+    over = violations(rows)
+    for metric, budget, actual, unit in over:
+        print(f"over budget: {metric} is {_format_value(actual, unit)} (budget {_format_value(budget, unit)})",
+              file=sys.stderr)
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
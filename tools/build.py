@@ -0,0 +1,313 @@
+"""Build a deployable dist/ tree: minified, fingerprinted and precompressed.
+
+Starting from index.html, every local file the site references (stylesheets,
+scripts, images, and files named in string literals inside those scripts, such
+as the hero worker, or in attributes, such as the legal modal fragments) is
+collected. Each one is minified where that applies and
+written under a content-hashed name (``styles.3f9c0a1b2d.css``). Files are
+processed leaves first, so a file's hash covers the hashed names of everything
+it references; references are rewritten in index.html, stylesheets and scripts
+alike, including the preload links.
+
+The generated ``_headers`` keeps the source's security and HTML rules, drops the
+old fixed-date ``Expires`` headers and per-extension cache rules, and gives
+every fingerprinted file a year-long ``immutable`` cache, so repeat visitors
+never revalidate an asset and a deploy can never serve a stale one.
+
+The build fails when an image on the LCP path is over its byte budget (see
+tools/images.py).
+
+Text files get a ``.gz`` sibling, written with the standard library so the
+output is the same wherever the build runs. No ``.br`` siblings are written;
+brotli is left to hosts that compress on the fly.
+
+With ``--critical-css`` the above-the-fold rules of styles.css are inlined into
+index.html and the rest is loaded without blocking render (see
+tools/critical_css.py; needs Playwright and Chromium).
+
+Usage (from the repository root):
+
+    python -m tools.build              # writes dist/
+    python -m tools.build --out /tmp/site
+    python -m tools.build --critical-css
+"""
+import argparse
+import gzip
+import hashlib
+import os
+import re
+import shutil
+import sys
+from pathlib import Path
+
+from tools import images, minify
+from tools.devserver import HEADERS_FILE, SKIPPED_DIRS, parse_headers_file
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_OUT = REPO_ROOT / "dist"
+ENTRY_POINT = "index.html"
+# HTML fragments fetched by scripts (the legal modal bodies) are assets, not
+# pages: they are fingerprinted and cached like any other asset.
+FRAGMENT_DIR = "fragments"
+
+HASH_LENGTH = 10
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+MINIFIERS = {
+    ".css": minify.minify_css,
+    ".js": minify.minify_js,
+    ".html": minify.minify_html,
+}
+# Files whose contents are scanned for references to other site files.
+REFERENCING_SUFFIXES = {".html", ".css", ".js", ".svg"}
+COMPRESSIBLE_SUFFIXES = {".html", ".css", ".js", ".svg", ".json", ".txt", ".xml"}
+
+
+class BuildError(Exception):
+    pass
+
+
+def site_files(root):
+    """Return every file under ``root`` that could be part of the site, as POSIX paths."""
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith(".") and d not in SKIPPED_DIRS)
+        for filename in sorted(filenames):
+            if not filename.startswith("."):
+                files.append(Path(dirpath, filename).relative_to(root).as_posix())
+    return files
+
+
+def _relative(target, source):
+    """Path of ``target`` as written in ``source`` (both site-relative POSIX paths)."""
+    return os.path.relpath(target, os.path.dirname(source) or ".").replace(os.sep, "/")
+
+
+def _reference_pattern(reference):
+    # A reference must stand alone: not part of a longer file name or path.
+    return re.compile(r"(?<![\w./-])(\./)?" + re.escape(reference) + r"(?![\w/-])")
+
+
+def find_references(path, text, candidates):
+    """Return the candidate files referenced from ``text`` (the contents of ``path``)."""
+    found = []
+    for candidate in candidates:
+        if candidate != path and _reference_pattern(_relative(candidate, path)).search(text):
+            found.append(candidate)
+    return found
+
+
+def _is_page(path):
+    """True for HTML documents, which keep their URL; fragments are assets."""
+    return Path(path).suffix.lower() == ".html" and not path.startswith(FRAGMENT_DIR + "/")
+
+
+def fingerprint(path, content):
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    stem, dot, suffix = path.rpartition(".")
+    if not dot or "/" in suffix:
+        return f"{path}.{digest}"
+    return f"{stem}.{digest}.{suffix}"
+
+
+def _read_prepared(root, path):
+    """Return the file's bytes, minified if it is a CSS/JS/HTML file."""
+    content = (root / path).read_bytes()
+    minifier = MINIFIERS.get(Path(path).suffix.lower())
+    if minifier is None:
+        return content
+    try:
+        return minifier(content.decode("utf-8")).encode("utf-8")
+    except ValueError as exc:
+        raise BuildError(f"Could not minify {path}: {exc}") from exc
+
+
+def plan_build(root, entry=ENTRY_POINT):
+    """Collect the files reachable from ``entry`` in dependency order (leaves first).
+
+    Returns ``(order, contents, dependencies)``; ``contents`` holds each file's
+    minified bytes. References are found after minification, so mentions of a
+    file name inside comments never count.
+    """
+    candidates = [path for path in site_files(root) if path != HEADERS_FILE]
+    if entry not in candidates:
+        raise BuildError(f"Entry point {entry} not found in {root}")
+
+    contents = {}
+    dependencies = {}
+    order = []
+    state = {}  # path -> "visiting" | "done"
+
+    def visit(path, chain):
+        if state.get(path) == "done":
+            return
+        if state.get(path) == "visiting":
+            raise BuildError("Reference cycle: " + " -> ".join(chain + [path]))
+        state[path] = "visiting"
+        contents[path] = _read_prepared(root, path)
+        refs = []
+        if Path(path).suffix.lower() in REFERENCING_SUFFIXES:
+            refs = find_references(path, contents[path].decode("utf-8"), candidates)
+        dependencies[path] = refs
+        for ref in refs:
+            visit(ref, chain + [path])
+        state[path] = "done"
+        order.append(path)
+
+    visit(entry, [])
+    return order, contents, dependencies
+
+
+def rewrite_references(path, content, dependencies, renamed):
+    text = content.decode("utf-8")
+    for dependency in dependencies:
+        new_name = renamed.get(dependency)
+        if new_name is None:
+            continue
+        old_ref = _relative(dependency, path)
+        new_ref = _relative(new_name, path)
+        text = _reference_pattern(old_ref).sub(lambda match: (match.group(1) or "") + new_ref, text)
+    return text.encode("utf-8")
+
+
+def build_headers(source_text, hashed_paths, html_paths):
+    """Return the dist ``_headers`` text.
+
+    Rules without caching headers (the security headers) are kept as they are.
+    Per-extension asset caching rules are dropped in favour of one immutable rule
+    per fingerprinted file, ``Expires`` is removed everywhere (``Cache-Control``
+    wins and fixed dates go stale), and HTML keeps the source's short cache.
+    """
+    rules = parse_headers_file(source_text) if source_text else []
+    blocks = []
+    html_cache = None
+    for rule in rules:
+        headers = [(name, value) for name, value in rule.headers if name.lower() != "expires"]
+        caches = [value for name, value in headers if name.lower() == "cache-control"]
+        if caches and rule.pattern == "/":
+            html_cache = caches[-1]
+        if caches and any(rule.matches("/" + path) for path in hashed_paths):
+            continue
+        if headers:
+            blocks.append((rule.pattern, headers))
+
+    covered = {pattern for pattern, _headers in blocks}
+    if html_cache:
+        for path in html_paths:
+            pattern = "/" + path
+            if pattern not in covered:
+                blocks.append((pattern, [("Cache-Control", html_cache)]))
+
+    lines = []
+    for pattern, headers in blocks:
+        lines.append(pattern)
+        lines.extend(f"  {name}: {value}" for name, value in headers)
+        lines.append("")
+    if hashed_paths:
+        lines.append("# Fingerprinted assets: the name changes whenever the content does.")
+        for path in sorted(hashed_paths):
+            lines.append(f"/{path}")
+            lines.append(f"  Cache-Control: {IMMUTABLE_CACHE}")
+            lines.append("")
+    return "\n".join(lines)
+
+
+def write_compressed(path):
+    """Write a ``.gz`` sibling when it is smaller than ``path``; return the paths written."""
+    data = path.read_bytes()
+    gz_data = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(gz_data) >= len(data):
+        return []
+    gz_path = path.with_name(path.name + ".gz")
+    gz_path.write_bytes(gz_data)
+    return [gz_path]
+
+
+def _check_out_dir(root, out):
+    root = root.resolve()
+    out = out.resolve()
+    if out == root or out in root.parents:
+        raise BuildError(f"Refusing to build into {out}: it contains the source tree")
+    return out
+
+
+def build(root=REPO_ROOT, out=DEFAULT_OUT, entry=ENTRY_POINT, compress=True, critical_css=False):
+    """Build the site from ``root`` into ``out`` and return ``{source path: output path}``."""
+    root = Path(root)
+    out = _check_out_dir(root, Path(out))
+    order, contents, dependencies = plan_build(root, entry)
+    over_budget = images.budget_problems(root, order)
+    if over_budget:
+        raise BuildError("LCP image budget exceeded:\n  " + "\n  ".join(over_budget))
+
+    renamed = {}
+    outputs = {}
+    for path in order:
+        content = rewrite_references(path, contents[path], dependencies[path], renamed) \
+            if dependencies[path] else contents[path]
+        # HTML documents are addressed by their URL, so only assets are fingerprinted.
+        output = path if _is_page(path) else fingerprint(path, content)
+        renamed[path] = output
+        outputs[output] = content
+
+    if out.exists():
+        shutil.rmtree(out)
+    for output, content in outputs.items():
+        target = out / output
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+
+    if critical_css:
+        # Imported here so the plain build keeps working without Playwright.
+        from tools.critical_css import CriticalCssError, inline_critical_css
+        try:
+            inline_critical_css(out, renamed)
+        except CriticalCssError as exc:
+            raise BuildError(str(exc)) from exc
+
+    if compress:
+        for output in outputs:
+            if Path(output).suffix.lower() in COMPRESSIBLE_SUFFIXES:
+                write_compressed(out / output)
+
+    headers_source = root / HEADERS_FILE
+    hashed = [output for source, output in renamed.items() if output != source]
+    html = [output for source, output in renamed.items() if output == source and _is_page(source)]
+    headers_text = build_headers(headers_source.read_text(encoding="utf-8") if headers_source.exists() else "",
+                                 hashed, html)
+    (out / HEADERS_FILE).write_text(headers_text, encoding="utf-8")
+    return renamed
+
+
+def _format_size(size):
+    return f"{size / 1024:.1f} KiB" if size >= 1024 else f"{size} B"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the minified, fingerprinted site into dist/.")
+    parser.add_argument("--root", default=str(REPO_ROOT), help="site source directory (default: repository root)")
+    parser.add_argument("--out", default=str(DEFAULT_OUT), help="output directory (default: dist/)")
+    parser.add_argument("--no-compress", action="store_true", help="skip the .gz siblings")
+    parser.add_argument("--critical-css", action="store_true",
+                        help="inline above-the-fold CSS and defer the rest of styles.css (needs Playwright)")
+    args = parser.parse_args(argv)
+
+    try:
+        renamed = build(args.root, args.out, compress=not args.no_compress, critical_css=args.critical_css)
+    except BuildError as exc:
+        print(f"build failed: {exc}", file=sys.stderr)
+        return 1
+
+    out = Path(args.out)
+    for source, output in renamed.items():
+        source_size = (Path(args.root) / source).stat().st_size
+        output_path = out / output
+        gz_path = output_path.with_name(output_path.name + ".gz")
+        gz_size = f" gzip {_format_size(gz_path.stat().st_size)}" if gz_path.exists() else ""
+        print(f"{source:<28} -> {output:<40} {_format_size(source_size):>10} -> "
+              f"{_format_size(output_path.stat().st_size)}{gz_size}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,452 @@
+"""Split the site stylesheet into inlined critical rules and a deferred remainder.
+
+Run as part of the build (``python -m tools.build --critical-css``). The built
+page is rendered in headless Chromium at mobile and desktop viewports, in light
+and dark themes and with JavaScript off, and every ``styles.css`` rule whose
+selector matches an element above the fold is kept. ``@keyframes`` are kept when a
+kept rule uses them, and ``@media print`` is never kept. Those rules and the
+whole of ``anti-clickjack.css`` are inlined in a ``<style>`` block whose hash is
+added to the CSP's ``style-src``. ``styles.css`` itself becomes a
+``rel="preload"`` link that script.js switches to a stylesheet (with a
+``<noscript>`` fallback), so it no longer blocks the first render.
+
+The split page is then checked against the unsplit one. Computed styles must
+be identical once everything has loaded, and with the deferred stylesheet
+blocked, every element above the fold must already render as it does in the
+full page. If either check fails the build fails.
+
+Playwright is an optional dependency of the build. It is only imported when
+this step runs.
+"""
+import base64
+import hashlib
+import re
+from pathlib import Path
+
+from tools import minify
+from tools.budgets import third_party_patterns
+from tools.devserver import start_server
+
+# Stylesheets inlined in full, and the one split into critical and deferred parts.
+INLINED_STYLESHEETS = ("anti-clickjack.css",)
+SPLIT_STYLESHEET = "styles.css"
+DEFERRED_LINK_ID = "site-styles-link"
+
+VIEWPORTS = {
+    "mobile": {"viewport": {"width": 390, "height": 844}, "device_scale_factor": 3, "is_mobile": True, "has_touch": True},
+    "desktop": {"viewport": {"width": 1280, "height": 800}},
+}
+COLOR_SCHEMES = ("light", "dark")
+# Grouping at-rules whose contents are parsed and filtered rule by rule.
+GROUPING_AT_RULES = {"@media", "@supports", "@layer", "@container"}
+# At-rules kept whatever the page contains.
+ALWAYS_KEPT_AT_RULES = {"@import", "@font-face", "@property", "@counter-style", "@namespace"}
+
+# Pseudo-elements and state pseudo-classes are dropped before matching, so
+# ``.btn:hover::after`` is critical whenever ``.btn`` is above the fold.
+_PSEUDO_ELEMENT = re.compile(
+    r"::?(?:before|after|first-line|first-letter)\b|::[-\w]+(?:\([^)]*\))?"
+)
+_STATE_PSEUDO_CLASS = re.compile(
+    r":(?:hover|focus-visible|focus-within|focus|active|visited|link|target|checked|placeholder-shown)\b(?!-)"
+)
+_KEYFRAMES_NAME = re.compile(r"^@(?:-webkit-)?keyframes\s+(\S+)")
+
+
+class CriticalCssError(Exception):
+    pass
+
+
+class CssRule:
+    """One top-level or nested CSS rule: a prelude and either a body or children."""
+
+    __slots__ = ("prelude", "body", "children")
+
+    def __init__(self, prelude, body=None, children=None):
+        self.prelude = prelude
+        self.body = body
+        self.children = children
+
+    @property
+    def at_keyword(self):
+        if not self.prelude.startswith("@"):
+            return None
+        return re.match(r"@[-\w]+", self.prelude).group(0).lower()
+
+    def text(self):
+        if self.children is not None:
+            return f"{self.prelude}{{{''.join(child.text() for child in self.children)}}}"
+        if self.body is None:
+            return f"{self.prelude};"
+        return f"{self.prelude}{{{self.body}}}"
+
+    def __repr__(self):
+        return f"CssRule({self.prelude!r})"
+
+
+def _skip_string(text, i):
+    quote = text[i]
+    i += 1
+    while i < len(text) and text[i] != quote:
+        i += 2 if text[i] == "\\" else 1
+    return i + 1
+
+
+def _block_end(text, start):
+    """Return the index of the ``}`` matching the ``{`` at ``start``."""
+    depth = 0
+    i = start
+    while i < len(text):
+        ch = text[i]
+        if ch in "'\"":
+            i = _skip_string(text, i)
+            continue
+        if ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    raise CriticalCssError(f"Unbalanced braces in stylesheet at offset {start}")
+
+
+def parse_css(text):
+    """Parse a comment-free stylesheet into a list of ``CssRule`` objects."""
+    rules = []
+    i = 0
+    n = len(text)
+    while i < n:
+        if text[i].isspace():
+            i += 1
+            continue
+        start = i
+        parens = 0
+        while i < n:
+            ch = text[i]
+            if ch in "'\"":
+                i = _skip_string(text, i)
+                continue
+            if ch == "(":
+                parens += 1
+            elif ch == ")":
+                parens -= 1
+            elif parens == 0 and ch in "{;":
+                break
+            i += 1
+        prelude = text[start:i].strip()
+        if i >= n:
+            if prelude:
+                raise CriticalCssError(f"Unterminated rule {prelude[:40]!r}")
+            break
+        if text[i] == ";":
+            rules.append(CssRule(prelude))
+            i += 1
+            continue
+        end = _block_end(text, i)
+        body = text[i + 1:end]
+        rule = CssRule(prelude, body)
+        if rule.at_keyword in GROUPING_AT_RULES:
+            rule.body = None
+            rule.children = parse_css(body)
+        rules.append(rule)
+        i = end + 1
+    return rules
+
+
+def split_selector_list(selector_list):
+    """Split a selector list on top-level commas (not those inside ``:is(...)`` etc.)."""
+    parts = []
+    depth = 0
+    current = []
+    for ch in selector_list:
+        if ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth -= 1
+        if ch == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+        else:
+            current.append(ch)
+    parts.append("".join(current).strip())
+    return [part for part in parts if part]
+
+
+def match_selector(selector):
+    """Return the selector used to decide whether ``selector``'s rule is critical."""
+    stripped = _STATE_PSEUDO_CLASS.sub("", _PSEUDO_ELEMENT.sub("", selector)).strip()
+    # A combinator left dangling by the stripping (``a:hover > ``) matches its left side.
+    stripped = re.sub(r"[\s>+~]+$", "", stripped)
+    return stripped or "*"
+
+
+def _is_print_only(rule):
+    media = rule.prelude[len("@media"):].strip().lower()
+    return media == "print" or media.startswith("print and") or media == "only print"
+
+
+def collect_selectors(rules):
+    """Return every match selector the browser needs to evaluate for ``rules``."""
+    selectors = set()
+    for rule in rules:
+        keyword = rule.at_keyword
+        if keyword is None:
+            selectors.update(match_selector(sel) for sel in split_selector_list(rule.prelude))
+        elif rule.children is not None and not (keyword == "@media" and _is_print_only(rule)):
+            selectors.update(collect_selectors(rule.children))
+    return selectors
+
+
+def _select(rules, matched):
+    kept = []
+    for rule in rules:
+        keyword = rule.at_keyword
+        if keyword is None:
+            if any(match_selector(sel) in matched for sel in split_selector_list(rule.prelude)):
+                kept.append(rule.text())
+        elif rule.children is not None:
+            if keyword == "@media" and _is_print_only(rule):
+                continue
+            inner = _select(rule.children, matched)
+            if inner:
+                kept.append(f"{rule.prelude}{{{''.join(inner)}}}")
+        elif keyword in ALWAYS_KEPT_AT_RULES:
+            kept.append(rule.text())
+    return kept
+
+
+def _keyframes(rules):
+    for rule in rules:
+        match = _KEYFRAMES_NAME.match(rule.prelude)
+        if match:
+            yield match.group(1), rule
+        elif rule.children is not None:
+            yield from _keyframes(rule.children)
+
+
+def critical_css(rules, matched):
+    """Return the critical subset of ``rules`` given the set of matched selectors.
+
+    ``@keyframes`` are appended when a kept rule refers to them by name.
+    """
+    kept = _select(rules, matched)
+    text = "".join(kept)
+    for name, rule in _keyframes(rules):
+        if re.search(r"(?<![-\w])" + re.escape(name) + r"(?![-\w])", text):
+            kept.append(rule.text())
+    return "".join(kept)
+
+
+def style_hash(css):
+    digest = hashlib.sha256(css.encode("utf-8")).digest()
+    return f"'sha256-{base64.b64encode(digest).decode('ascii')}'"
+
+
+def add_style_hash(html, css):
+    """Add the CSP hash of an inline ``<style>`` block to the page's ``style-src``."""
+    def patch_policy(match):
+        policy = match.group(2)
+        directive = re.search(r"(^|;)\s*style-src\b([^;]*)", policy)
+        if directive is None:
+            raise CriticalCssError("The page's Content-Security-Policy has no style-src directive")
+        patched = policy[:directive.end()] + f" {style_hash(css)}" + policy[directive.end():]
+        return match.group(1) + patched + match.group(3)
+
+    patched, count = re.subn(
+        r'(<meta http-equiv="Content-Security-Policy" content=")([^"]*)(")', patch_policy, html, flags=re.IGNORECASE,
+    )
+    if count != 1:
+        raise CriticalCssError("Expected exactly one Content-Security-Policy meta tag")
+    return patched
+
+
+def _stylesheet_link(html, href):
+    match = re.search(r'<link\b[^>]*\bhref="' + re.escape(href) + r'"[^>]*>', html)
+    if match is None or 'rel="stylesheet"' not in match.group(0):
+        raise CriticalCssError(f"No stylesheet link for {href} in the page")
+    return match
+
+
+def split_stylesheets(html, inlined_hrefs, deferred_href, css):
+    """Return ``html`` with ``css`` inlined and ``deferred_href`` loaded without blocking render.
+
+    The ``<style>`` block replaces the first of ``inlined_hrefs`` (the others are
+    removed; their contents must already be part of ``css``), and its hash is
+    added to the CSP.
+    """
+    for index, href in enumerate(inlined_hrefs):
+        link = _stylesheet_link(html, href)
+        replacement = f"<style>{css}</style>" if index == 0 else ""
+        html = html[:link.start()] + replacement + html[link.end():]
+    link = _stylesheet_link(html, deferred_href)
+    deferred = (
+        f'<link id="{DEFERRED_LINK_ID}" rel="preload" as="style" href="{deferred_href}">'
+        f'<noscript><link rel="stylesheet" href="{deferred_href}"></noscript>'
+    )
+    html = html[:link.start()] + deferred + html[link.end():]
+    return add_style_hash(html, css)
+
+
+# Returns, for each selector, whether it matches an element above the fold. An
+# element without a box (display: none, hidden) counts when its nearest rendered
+# ancestor inside <body> is above the fold, so the rules that hide things in the
+# header are kept while those for closed modals at the end of <body> are not.
+_MATCH_ABOVE_FOLD = """
+(selectors) => {
+    const fold = window.innerHeight;
+    const rectOf = (el) => {
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 || rect.height > 0 ? rect : null;
+    };
+    const aboveFold = (el) => {
+        if (el === document.documentElement || el === document.body) return true;
+        let node = el;
+        let rect = rectOf(node);
+        while (!rect) {
+            node = node.parentElement;
+            if (!node || node === document.body || node === document.documentElement) return false;
+            rect = rectOf(node);
+        }
+        return rect.top < fold;
+    };
+    return selectors.map((selector) => {
+        try {
+            return Array.prototype.some.call(document.querySelectorAll(selector), aboveFold);
+        } catch (error) {
+            return true;
+        }
+    });
+}
+"""
+
+# Computed styles of every element in document order. The element's box is
+# compared too (as the "(box)" entry), so a critical render that shifts layout
+# fails even when each element's own styles are right.
+_COMPUTED_STYLES = """
+() => Array.from(document.querySelectorAll('body, body *')).map((el) => {
+    const style = getComputedStyle(el);
+    const rect = el.getBoundingClientRect();
+    const values = { '(box)': [rect.left, rect.top, rect.width, rect.height].join(',') };
+    for (let i = 0; i < style.length; i += 1) {
+        const name = style[i];
+        values[name] = style.getPropertyValue(name);
+    }
+    const path = [];
+    for (let node = el; node && node !== document.documentElement; node = node.parentElement) {
+        path.unshift(node.id ? `${node.tagName.toLowerCase()}#${node.id}` : node.tagName.toLowerCase());
+    }
+    return { path: path.join(' > '), top: rect.top, style: values };
+})
+"""
+
+_NEXT_FRAMES = "() => new Promise((resolve) => requestAnimationFrame(() => requestAnimationFrame(resolve)))"
+
+
+def _new_context(browser, viewport, **options):
+    context = browser.new_context(reduced_motion="reduce", **VIEWPORTS[viewport], **options)
+    for pattern in third_party_patterns():
+        context.route(pattern, lambda route: route.abort())
+    return context
+
+
+def _load(context, url, html=None, block=()):
+    page = context.new_page()
+    if html is not None:
+        page.route(url, lambda route: route.fulfill(status=200, content_type="text/html; charset=utf-8", body=html))
+    for blocked in block:
+        page.route(blocked, lambda route: route.abort())
+    page.goto(url, wait_until="load")
+    page.evaluate(_NEXT_FRAMES)
+    return page
+
+
+def matched_selectors(browser, url, selectors):
+    """Return the selectors matching an above-the-fold element in any render of the page."""
+    selectors = sorted(selectors)
+    matched = set()
+    passes = [(viewport, {"color_scheme": scheme}) for viewport in VIEWPORTS for scheme in COLOR_SCHEMES]
+    passes += [(viewport, {"java_script_enabled": False}) for viewport in VIEWPORTS]
+    for viewport, options in passes:
+        context = _new_context(browser, viewport, **options)
+        try:
+            page = _load(context, url)
+            results = page.evaluate(_MATCH_ABOVE_FOLD, selectors)
+        finally:
+            context.close()
+        matched.update(selector for selector, hit in zip(selectors, results) if hit)
+    return matched
+
+
+def _style_differences(expected, actual, limit=10):
+    differences = []
+    if [entry["path"] for entry in expected] != [entry["path"] for entry in actual]:
+        return ["the split page has a different element tree"]
+    for want, got in zip(expected, actual):
+        for name, value in want["style"].items():
+            if got["style"].get(name) != value:
+                differences.append(f"{want['path']}: {name} is {got['style'].get(name)!r}, expected {value!r}")
+                if len(differences) >= limit:
+                    return differences
+    return differences
+
+
+def verify(browser, url, unsplit_html, deferred_url):
+    """Return a list of problems with the split page served at ``url`` (empty when it is equivalent).
+
+    JavaScript is off for the comparison, so nothing but the stylesheets differs
+    between the two renders and the deferred stylesheet loads via ``<noscript>``.
+    """
+    problems = []
+    for viewport in VIEWPORTS:
+        context = _new_context(browser, viewport, java_script_enabled=False)
+        try:
+            fold = VIEWPORTS[viewport]["viewport"]["height"]
+            unsplit = _load(context, url, html=unsplit_html).evaluate(_COMPUTED_STYLES)
+            split = _load(context, url).evaluate(_COMPUTED_STYLES)
+            critical_only = _load(context, url, block=(deferred_url,)).evaluate(_COMPUTED_STYLES)
+        finally:
+            context.close()
+
+        for difference in _style_differences(unsplit, split):
+            problems.append(f"[{viewport}] after load, {difference}")
+        if len(critical_only) != len(unsplit):
+            problems.append(f"[{viewport}] critical CSS only, the page has a different element tree")
+            continue
+        above_fold = [index for index, entry in enumerate(unsplit) if entry["top"] < fold]
+        for difference in _style_differences([unsplit[i] for i in above_fold], [critical_only[i] for i in above_fold]):
+            problems.append(f"[{viewport}] critical CSS only, {difference}")
+    return problems
+
+
+def inline_critical_css(out, renamed):
+    """Inline critical CSS into the built ``index.html`` under ``out``; raise on failed verification."""
+    from playwright.sync_api import sync_playwright
+
+    out = Path(out)
+    index = out / "index.html"
+    unsplit_html = index.read_text(encoding="utf-8")
+    deferred_href = renamed[SPLIT_STYLESHEET]
+    inlined_hrefs = [renamed[name] for name in INLINED_STYLESHEETS]
+    rules = parse_css((out / deferred_href).read_text(encoding="utf-8"))
+    inlined = "".join(minify.minify_css((out / href).read_text(encoding="utf-8")).strip() for href in inlined_hrefs)
+
+    server = start_server(out, host="127.0.0.1")
+    url = f"http://127.0.0.1:{server.port}/"
+    try:
+        with sync_playwright() as playwright:
+            browser = playwright.chromium.launch(headless=True)
+            try:
+                matched = matched_selectors(browser, url, collect_selectors(rules))
+                css = inlined + critical_css(rules, matched)
+                index.write_text(split_stylesheets(unsplit_html, inlined_hrefs, deferred_href, css), encoding="utf-8")
+                problems = verify(browser, url, unsplit_html, url + deferred_href)
+            finally:
+                browser.close()
+    finally:
+        server.stop()
+
+    if problems:
+        index.write_text(unsplit_html, encoding="utf-8")
+        raise CriticalCssError("Critical CSS changes the page:\n  " + "\n  ".join(problems))
+    return css
@@ -0,0 +1,516 @@
+"""Threaded, caching static server for local preview and the browser tests.
+
+The site tree is read into memory once and re-read only when a file's mtime or
+size changes. Responses are served over HTTP/1.1 keep-alive with strong ETags,
+``If-None-Match`` revalidation and single-range ``Range`` requests, and the
+rules in ``_headers`` are applied as real response headers so the preview
+behaves like the production host. When a file has a precompressed ``.br`` or
+``.gz`` sibling (as the build in tools/build.py writes), the sibling is served
+to clients that accept that encoding.
+
+``POST /__perf`` stands in for a real-user-monitoring endpoint: JSON bodies
+sent there (by the ``?perf`` telemetry in script.js) are kept in
+``server.beacons`` for tests to read. ``POST /__formspree/<form id>`` stands
+in for Formspree's JSON API, so the contact form can be pointed at it; see
+``FormspreeStandIn`` for injecting latency and failures. Every other POST is
+refused.
+
+Usage:
+
+    python -m tools.devserver            # http://localhost:8000
+    python -m tools.devserver --port 0   # pick a free port
+"""
+import argparse
+import email.utils
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import threading
+import time
+from collections import deque
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+HEADERS_FILE = "_headers"
+
+CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".js": "text/javascript; charset=utf-8",
+    ".mjs": "text/javascript; charset=utf-8",
+    ".json": "application/json",
+    ".svg": "image/svg+xml",
+    ".png": "image/png",
+    ".webp": "image/webp",
+    ".avif": "image/avif",
+    ".woff2": "font/woff2",
+    ".txt": "text/plain; charset=utf-8",
+}
+
+# Directories that are part of the repository but never part of the site.
+SKIPPED_DIRS = {"tests", "tools", "dist", "__pycache__", "node_modules"}
+
+# Precompressed siblings, in order of preference: (Content-Encoding, file suffix).
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# The local stand-in for the telemetry beacon endpoint, and its body size limit.
+BEACON_PATH = "/__perf"
+MAX_BEACON_BYTES = 64 * 1024
+# The local stand-in for Formspree; the form id follows as the last path segment.
+FORMSPREE_PATH = "/__formspree/"
+
+# Headers that hold a single value: when several ``_headers`` rules set one, the
+# last matching rule wins instead of the values being comma-joined.
+SINGLETON_HEADERS = {"cache-control", "expires", "content-type", "x-frame-options", "location"}
+
+
+class HeaderRule:
+    """One ``_headers`` block: a URL path pattern and the headers it adds."""
+
+    def __init__(self, pattern, headers):
+        self.pattern = pattern
+        self.headers = headers
+        regex = re.escape(pattern).replace(r"\*", ".*")
+        # Placeholders such as /blog/:slug match a single path segment.
+        regex = re.sub(r":[A-Za-z_]\w*", "[^/]+", regex)
+        self._regex = re.compile(f"^{regex}$")
+
+    def matches(self, path):
+        return bool(self._regex.match(path))
+
+    def __repr__(self):
+        return f"HeaderRule({self.pattern!r}, {self.headers!r})"
+
+
+def parse_headers_file(text):
+    """Parse the Netlify/Cloudflare ``_headers`` format into ``HeaderRule`` objects."""
+    rules = []
+    current = None
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if not raw_line[0].isspace():
+            current = HeaderRule(line, [])
+            rules.append(current)
+            continue
+        if current is None:
+            raise ValueError(f"Header line without a path pattern: {raw_line!r}")
+        name, sep, value = line.partition(":")
+        if not sep:
+            raise ValueError(f"Malformed header line: {raw_line!r}")
+        current.headers.append((name.strip(), value.strip()))
+    return rules
+
+
+def headers_for_path(rules, path):
+    """Merge the headers of every rule matching ``path``.
+
+    Rules apply in file order. A later rule replaces a ``SINGLETON_HEADERS``
+    value; any other repeated name is comma-joined.
+    """
+    merged = {}
+    for rule in rules:
+        if not rule.matches(path):
+            continue
+        for name, value in rule.headers:
+            key = name.lower()
+            if key in merged and key not in SINGLETON_HEADERS:
+                merged[key] = (merged[key][0], f"{merged[key][1]}, {value}")
+            else:
+                merged[key] = (name, value)
+    return list(merged.values())
+
+
+class CachedFile:
+    __slots__ = ("path", "mtime_ns", "size", "body", "etag", "last_modified", "content_type")
+
+    def __init__(self, path, stat, body):
+        self.path = path
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+        self.body = body
+        self.etag = f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+        self.last_modified = email.utils.formatdate(stat.st_mtime, usegmt=True)
+        suffix = path.suffix.lower()
+        self.content_type = CONTENT_TYPES.get(suffix) or mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+
+class SiteCache:
+    """In-memory copy of the site tree, invalidated per file by mtime and size."""
+
+    def __init__(self, root):
+        self.root = Path(root).resolve()
+        self._files = {}
+        self._rules = None
+        self._rules_key = None
+        self._lock = threading.Lock()
+
+    def preload(self):
+        """Read every servable file up front so the first page load is warm too."""
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".") and d not in SKIPPED_DIRS]
+            for filename in filenames:
+                if not filename.startswith("."):
+                    self.get(Path(dirpath, filename).relative_to(self.root).as_posix())
+
+    def get(self, relative_path):
+        """Return the ``CachedFile`` for ``relative_path``, or ``None`` if it is not servable."""
+        path = self.root / relative_path
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        if not path.is_file():
+            return None
+
+        with self._lock:
+            cached = self._files.get(relative_path)
+        if cached is not None and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+            return cached
+
+        entry = CachedFile(path, stat, path.read_bytes())
+        with self._lock:
+            self._files[relative_path] = entry
+        return entry
+
+    def header_rules(self):
+        """Return the parsed ``_headers`` rules, re-parsing when the file changes."""
+        entry = self.get(HEADERS_FILE)
+        key = entry.etag if entry else None
+        if key != self._rules_key:
+            self._rules = parse_headers_file(entry.body.decode("utf-8")) if entry else []
+            self._rules_key = key
+        return self._rules
+
+
+class FormspreeStandIn:
+    """Answers form posts the way Formspree's JSON API does, with injectable faults.
+
+    Each fault queued with ``inject()`` answers one request: the handler waits
+    ``delay`` seconds, then replies with ``status`` and records nothing. Once
+    the queue is empty, posts succeed and their fields are appended to
+    ``submissions`` as ``(form id, {name: value})``.
+    """
+
+    def __init__(self):
+        self.submissions = []
+        self._faults = deque()
+        self._lock = threading.Lock()
+
+    def inject(self, status=HTTPStatus.SERVICE_UNAVAILABLE, delay=0.0, count=1):
+        with self._lock:
+            self._faults.extend([(HTTPStatus(status), delay)] * count)
+
+    def reset(self):
+        with self._lock:
+            self.submissions.clear()
+            self._faults.clear()
+
+    def next_fault(self):
+        with self._lock:
+            return self._faults.popleft() if self._faults else None
+
+    def record(self, form_id, fields):
+        with self._lock:
+            self.submissions.append((form_id, fields))
+
+
+class DevRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "hire-devserver"
+    # Close idle keep-alive connections rather than holding a thread forever.
+    timeout = 30
+
+    def do_GET(self):
+        self._serve(include_body=True)
+
+    def do_HEAD(self):
+        self._serve(include_body=False)
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        if path == BEACON_PATH:
+            self._receive_beacon()
+        elif path.startswith(FORMSPREE_PATH) and len(path) > len(FORMSPREE_PATH):
+            self._receive_form(path[len(FORMSPREE_PATH):])
+        else:
+            # The body is never read, so the connection cannot be reused.
+            self.close_connection = True
+            self._send_simple(HTTPStatus.METHOD_NOT_ALLOWED, True, [("Allow", "GET, HEAD")])
+
+    def _read_body(self):
+        """Return the request body, or None after answering a missing or oversized one."""
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self.close_connection = True
+            self._send_simple(HTTPStatus.LENGTH_REQUIRED, True)
+            return None
+        if length < 0 or length > MAX_BEACON_BYTES:
+            self.close_connection = True
+            self._send_simple(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, True)
+            return None
+        return self.rfile.read(length)
+
+    def _receive_beacon(self):
+        body = self._read_body()
+        if body is None:
+            return
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            self._send_simple(HTTPStatus.BAD_REQUEST, True)
+            return
+        self.server.record_beacon(payload)
+        self.send_response(HTTPStatus.NO_CONTENT)
+        self.end_headers()
+
+    def _receive_form(self, form_id):
+        body = self._read_body()
+        if body is None:
+            return
+        stand_in = self.server.formspree
+        fault = stand_in.next_fault()
+        if fault is None:
+            fields = {name: values[-1] for name, values in parse_qs(body.decode("utf-8", "replace")).items()}
+            stand_in.record(form_id, fields)
+            status, reply = HTTPStatus.OK, {"ok": True}
+        else:
+            status, delay = fault
+            time.sleep(delay)
+            reply = {"error": status.phrase}
+        payload = json.dumps(reply).encode("utf-8")
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            # The page gave up on a delayed reply (its submit timeout fired).
+            self.close_connection = True
+
+    def _resolve(self, url_path):
+        path = posixpath.normpath(unquote(url_path))
+        parts = [part for part in path.split("/") if part]
+        if any(part.startswith(".") or part == ".." for part in parts):
+            return None
+        if parts and (parts[0] in SKIPPED_DIRS or parts == [HEADERS_FILE]):
+            return None
+        relative = "/".join(parts)
+        if url_path.endswith("/") or not relative:
+            relative = posixpath.join(relative, "index.html")
+        return relative
+
+    def _serve(self, include_body):
+        cache = self.server.cache
+        url_path = urlsplit(self.path).path or "/"
+        relative = self._resolve(url_path)
+        entry = cache.get(relative) if relative else None
+
+        if entry is None and relative and (cache.root / relative).is_dir():
+            self._send_simple(HTTPStatus.MOVED_PERMANENTLY, include_body, [("Location", f"{url_path}/")])
+            return
+        if entry is None:
+            self._send_simple(HTTPStatus.NOT_FOUND, include_body)
+            return
+
+        extra_headers = headers_for_path(cache.header_rules(), url_path)
+        content_type = entry.content_type
+        encoding, variants = self._negotiate_encoding(cache, relative)
+        if variants:
+            extra_headers.append(("Vary", "Accept-Encoding"))
+        if encoding:
+            entry = variants[encoding]
+
+        if self._etag_matches(self.headers.get("If-None-Match"), entry.etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", entry.etag)
+            self._send_extra_headers(extra_headers)
+            self.end_headers()
+            return
+
+        status = HTTPStatus.OK
+        body = entry.body
+        content_range = None
+        range_header = self.headers.get("Range")
+        if range_header and self._if_range_allows(entry):
+            byte_range = self._parse_range(range_header, entry.size)
+            if byte_range == "unsatisfiable":
+                self._send_simple(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE, include_body,
+                                  [("Content-Range", f"bytes */{entry.size}")])
+                return
+            if byte_range is not None:
+                start, end = byte_range
+                status = HTTPStatus.PARTIAL_CONTENT
+                body = entry.body[start:end + 1]
+                content_range = f"bytes {start}-{end}/{entry.size}"
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", entry.etag)
+        self.send_header("Last-Modified", entry.last_modified)
+        self.send_header("Accept-Ranges", "bytes")
+        if content_range:
+            self.send_header("Content-Range", content_range)
+        self._send_extra_headers(extra_headers)
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+    def _negotiate_encoding(self, cache, relative):
+        """Return ``(encoding or None, {encoding: CachedFile})`` for the file's siblings.
+
+        Range requests always get the identity body so byte offsets refer to the
+        file itself.
+        """
+        variants = {}
+        for encoding, suffix in PRECOMPRESSED:
+            sibling = cache.get(relative + suffix)
+            if sibling is not None:
+                variants[encoding] = sibling
+        if not variants or self.headers.get("Range"):
+            return None, variants
+        accepted = self._accepted_encodings(self.headers.get("Accept-Encoding", ""))
+        for encoding, _suffix in PRECOMPRESSED:
+            if encoding in variants and encoding in accepted:
+                return encoding, variants
+        return None, variants
+
+    @staticmethod
+    def _accepted_encodings(header):
+        accepted = set()
+        for item in header.split(","):
+            name, _sep, params = item.strip().partition(";")
+            quality = params.strip()
+            if quality.startswith("q=") and quality[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+                continue
+            if name.strip():
+                accepted.add(name.strip().lower())
+        return accepted
+
+    @staticmethod
+    def _etag_matches(if_none_match, etag):
+        if not if_none_match:
+            return False
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+    def _if_range_allows(self, entry):
+        if_range = self.headers.get("If-Range")
+        return if_range is None or if_range.strip() in (entry.etag, entry.last_modified)
+
+    @staticmethod
+    def _parse_range(header, size):
+        """Return ``(start, end)``, ``"unsatisfiable"``, or ``None`` to ignore the header.
+
+        Only a single byte range is honoured; multi-range requests get the full body.
+        """
+        match = _RANGE_RE.match(header.strip())
+        if not match:
+            return None
+        first, last = match.groups()
+        if not first and not last:
+            return None
+        if not first:
+            suffix = int(last)
+            if suffix == 0:
+                return "unsatisfiable"
+            return max(0, size - suffix), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+        if start >= size or end < start:
+            return "unsatisfiable"
+        return start, min(end, size - 1)
+
+    def _send_extra_headers(self, headers):
+        for name, value in headers:
+            self.send_header(name, value)
+
+    def _send_simple(self, status, include_body, headers=()):
+        body = f"{status.value} {status.phrase}\n".encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class DevServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, root=REPO_ROOT, quiet=False):
+        self.cache = SiteCache(root)
+        self.quiet = quiet
+        self.beacons = []
+        self._beacon_lock = threading.Lock()
+        self.formspree = FormspreeStandIn()
+        super().__init__(address, DevRequestHandler)
+        self._thread = None
+
+    def record_beacon(self, payload):
+        with self._beacon_lock:
+            self.beacons.append(payload)
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def start(self):
+        """Serve from a daemon thread and return ``self``."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def start_server(root=REPO_ROOT, host="", port=0, quiet=True, preload=True):
+    """Start a ``DevServer`` in a background thread and return it."""
+    server = DevServer((host, port), root=root, quiet=quiet)
+    if preload:
+        server.cache.preload()
+    return server.start()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the site with production-like headers.")
+    parser.add_argument("--host", default="", help="address to bind (default: all interfaces)")
+    parser.add_argument("--port", type=int, default=8000, help="port to listen on (default: 8000)")
+    parser.add_argument("--root", default=str(REPO_ROOT), help="directory to serve (default: repository root)")
+    args = parser.parse_args(argv)
+
+    server = DevServer((args.host, args.port), root=args.root)
+    server.cache.preload()
+    print(f"Serving {server.cache.root} at http://localhost:{server.port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
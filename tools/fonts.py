@@ -0,0 +1,395 @@
+"""Self-hosted, subsetted Space Grotesk.
+
+Vendors the Space Grotesk variable font (SIL Open Font License) and cuts one
+woff2 per weight the site uses. Each cut contains only the glyphs the page can
+render: printable ASCII for text that script.js writes, plus every other
+character in index.html's text and attributes, in the legal modal fragments
+and in script.js and the modules it imports. The tool then
+updates the two generated blocks it owns:
+
+* styles.css, between ``/* fonts:begin */`` and ``/* fonts:end */``. This holds
+  the ``@font-face`` rules and a metric-matched local fallback face, so swapping
+  in the web font does not shift layout.
+* index.html, between ``<!-- fonts:begin -->`` and ``<!-- fonts:end -->``. This
+  holds preload hints for the weights used above the fold.
+
+The first run also retires Google Fonts everywhere else, so the site ends up
+talking to one origin. It adds the fallback face to ``--font-main``, deletes
+the ``// fonts:begin`` ... ``// fonts:end`` lines in script.js that activate
+the Google stylesheet, and removes the Google Fonts origins from the page's
+Content-Security-Policy and from ``third_party_origins`` in budgets.json. The
+browser tests and page tools stop blocking those hosts at that point too (see
+``third_party_patterns`` in tools/budgets.py).
+
+Requires ``fonttools`` (``pip install fonttools brotli``). Re-run it whenever the
+page gains new characters; ``--check`` exits non-zero when the committed fonts
+no longer cover the page.
+
+Usage (from the repository root):
+
+    python -m tools.fonts            # fetch the source font if needed, subset, update the page
+    python -m tools.fonts --source ~/Downloads/SpaceGrotesk[wght].ttf
+    python -m tools.fonts --check
+"""
+import argparse
+import json
+import re
+import shutil
+import sys
+import urllib.request
+from html.parser import HTMLParser
+from pathlib import Path
+
+try:
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+    from fontTools.varLib import instancer
+except ImportError:  # Optional: only needed to generate or check the fonts.
+    TTFont = None
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+FONTS_DIR = REPO_ROOT / "assets" / "fonts"
+SOURCE_DIR = FONTS_DIR / "src"
+SOURCE_FONT = SOURCE_DIR / "SpaceGrotesk[wght].ttf"
+SOURCE_LICENSE = SOURCE_DIR / "OFL.txt"
+SOURCE_BASE_URL = "https://raw.githubusercontent.com/google/fonts/main/ofl/spacegrotesk/"
+
+FAMILY = "Space Grotesk"
+FALLBACK_FAMILY = "Space Grotesk Fallback"
+FILE_STEM = "space-grotesk"
+WEIGHTS = (400, 500, 600, 700)
+# Body copy and the hero heading; the other weights load on demand.
+PRELOADED_WEIGHTS = (400, 700)
+
+# Arial's OS/2 xAvgCharWidth over its unitsPerEm, for the fallback's size-adjust.
+ARIAL_AVG_CHAR_WIDTH = 904 / 2048
+
+TEXT_SOURCES = (
+    "index.html", "script.js", "hero-canvas.js", "marquee.js", "in-practice.js", "contact-form.js",
+    "legal-modals.js", "back-to-top.js",
+)
+# HTML fragments that legal-modals.js inserts into the page.
+FRAGMENTS_DIR = "fragments"
+# Attributes whose values are rendered as text (or typed in by script.js).
+TEXT_ATTRIBUTES = {"alt", "title", "placeholder", "value", "data-full-text"}
+NON_TEXT_ELEMENTS = {"script", "style", "svg"}
+BASE_CODEPOINTS = frozenset(range(0x20, 0x7F)) | {0xA0}
+
+CSS_MARKERS = ("/* fonts:begin */", "/* fonts:end */")
+HTML_MARKERS = ("<!-- fonts:begin -->", "<!-- fonts:end -->")
+# script.js lines that only exist while the fonts come from Google; removed outright.
+JS_MARKERS = ("// fonts:begin", "// fonts:end")
+FONT_STACK_PROPERTY = "--font-main"
+GOOGLE_FONT_ORIGINS = ("https://fonts.googleapis.com", "https://fonts.gstatic.com")
+
+
+class FontPipelineError(Exception):
+    pass
+
+
+class _TextCollector(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.chars = set()
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in NON_TEXT_ELEMENTS:
+            self._skip_depth += 1
+        for name, value in attrs:
+            if name in TEXT_ATTRIBUTES and value:
+                self.chars.update(value)
+
+    def handle_endtag(self, tag):
+        if tag in NON_TEXT_ELEMENTS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.chars.update(data)
+
+
+def collect_codepoints(html, scripts=()):
+    """Return the code points the page can render in the web font."""
+    collector = _TextCollector()
+    collector.feed(html)
+    collector.close()
+    chars = set(collector.chars)
+    for script in scripts:
+        chars.update(ch for ch in script if ord(ch) > 0x7E)
+    codepoints = {ord(ch) for ch in chars if ch.isprintable() or ch == "\xa0"}
+    return frozenset(codepoints | BASE_CODEPOINTS)
+
+
+def unicode_range(codepoints):
+    """Format code points as a compact CSS ``unicode-range`` value."""
+    ranges = []
+    for cp in sorted(codepoints):
+        if ranges and cp == ranges[-1][1] + 1:
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp])
+    return ", ".join(f"U+{start:X}" if start == end else f"U+{start:X}-{end:X}" for start, end in ranges)
+
+
+def fallback_metrics(units_per_em, ascender, descender, line_gap, avg_char_width):
+    """Return the ``@font-face`` overrides that make Arial occupy the web font's space.
+
+    The overrides apply to the size-adjusted face, so they are divided by it.
+    """
+    size_adjust = (avg_char_width / units_per_em) / ARIAL_AVG_CHAR_WIDTH
+    return {
+        "size-adjust": size_adjust,
+        "ascent-override": ascender / units_per_em / size_adjust,
+        "descent-override": abs(descender) / units_per_em / size_adjust,
+        "line-gap-override": line_gap / units_per_em / size_adjust,
+    }
+
+
+def font_file(weight):
+    return f"{FILE_STEM}-{weight}.woff2"
+
+
+def font_face_css(codepoints, metrics):
+    """Return the generated styles.css block (markers included)."""
+    lines = [f"{CSS_MARKERS[0]}",
+             "/* Generated by `python -m tools.fonts`; edit that tool, not this block. */"]
+    ranges = unicode_range(codepoints)
+    for weight in WEIGHTS:
+        # Preloaded weights arrive with the first render, so swap is safe; the
+        # rest only swap in if they load quickly, avoiding a late reflow.
+        display = "swap" if weight in PRELOADED_WEIGHTS else "fallback"
+        lines += [
+            "@font-face {",
+            f"    font-family: '{FAMILY}';",
+            "    font-style: normal;",
+            f"    font-weight: {weight};",
+            f"    font-display: {display};",
+            f"    src: url('assets/fonts/{font_file(weight)}') format('woff2');",
+            f"    unicode-range: {ranges};",
+            "}",
+        ]
+    lines += [
+        "@font-face {",
+        f"    font-family: '{FALLBACK_FAMILY}';",
+        "    src: local('Arial'), local('Helvetica'), local('Liberation Sans');",
+    ]
+    lines += [f"    {name}: {value * 100:.2f}%;" for name, value in metrics.items()]
+    lines += ["}", CSS_MARKERS[1]]
+    return "\n".join(lines)
+
+
+def preload_html(indent="    "):
+    """Return the generated index.html block (markers included)."""
+    lines = [HTML_MARKERS[0]]
+    lines += [
+        f'<link rel="preload" as="font" type="font/woff2" href="assets/fonts/{font_file(weight)}" crossorigin>'
+        for weight in PRELOADED_WEIGHTS
+    ]
+    lines.append(HTML_MARKERS[1])
+    return f"\n{indent}".join(lines)
+
+
+def replace_marked_block(text, markers, block):
+    """Replace everything from the begin marker through the end marker with ``block``."""
+    begin, end = markers
+    start = text.find(begin)
+    stop = text.find(end, start + len(begin)) if start != -1 else -1
+    if start == -1 or stop == -1:
+        raise FontPipelineError(f"Markers {begin} ... {end} not found")
+    return text[:start] + block + text[stop + len(end):]
+
+
+def remove_marked_lines(text, markers):
+    """Delete the lines from the begin marker through the end marker; a no-op once they are gone."""
+    begin, end = markers
+    start = text.find(begin)
+    stop = text.find(end, start + len(begin)) if start != -1 else -1
+    if start == -1 or stop == -1:
+        return text
+    line_start = text.rfind("\n", 0, start) + 1
+    line_end = text.find("\n", stop)
+    return text[:line_start] + (text[line_end + 1:] if line_end != -1 else "")
+
+
+def add_fallback_family(css):
+    """Put the metric-matched fallback face right after Space Grotesk in ``--font-main``."""
+    def patch_stack(match):
+        stack = match.group(2)
+        if f"'{FALLBACK_FAMILY}'" not in stack:
+            stack = stack.replace(f"'{FAMILY}',", f"'{FAMILY}', '{FALLBACK_FAMILY}',", 1)
+        return match.group(1) + stack
+
+    return re.sub(rf"({re.escape(FONT_STACK_PROPERTY)}:\s*)([^;]*)", patch_stack, css, count=1)
+
+
+def drop_google_fonts_from_budgets(text):
+    """Remove the Google Fonts origins from ``third_party_origins``, keeping budgets.json's layout."""
+    origins = [origin for origin in json.loads(text).get("third_party_origins", [])
+               if origin not in GOOGLE_FONT_ORIGINS]
+    listing = "[" + "".join(f"\n    {json.dumps(origin)}," for origin in origins).rstrip(",")
+    listing += "\n  ]" if origins else "]"
+    return re.sub(r'("third_party_origins":\s*)\[[^\]]*\]', lambda match: match.group(1) + listing, text)
+
+
+def drop_google_fonts_from_csp(html):
+    """Remove the Google Fonts origins from the page's Content-Security-Policy."""
+    def patch_policy(match):
+        policy = match.group(2)
+        for origin in GOOGLE_FONT_ORIGINS:
+            policy = policy.replace(f" {origin}", "")
+        return match.group(1) + policy + match.group(3)
+
+    return re.sub(r'(<meta http-equiv="Content-Security-Policy" content=")([^"]*)(")', patch_policy, html)
+
+
+def _require_fonttools():
+    if TTFont is None:
+        raise FontPipelineError("fonttools is required: pip install fonttools brotli")
+
+
+def fetch_source():
+    """Download the variable font and its license into assets/fonts/src/."""
+    SOURCE_DIR.mkdir(parents=True, exist_ok=True)
+    for target, name in ((SOURCE_FONT, "SpaceGrotesk%5Bwght%5D.ttf"), (SOURCE_LICENSE, "OFL.txt")):
+        try:
+            with urllib.request.urlopen(SOURCE_BASE_URL + name, timeout=60) as response:
+                data = response.read()
+        except OSError as exc:
+            raise FontPipelineError(f"could not download {SOURCE_BASE_URL + name} ({exc}); "
+                                    "pass --source with a local copy of the font instead") from exc
+        target.write_bytes(data)
+
+
+def instance(source, weight):
+    """Return a static ``TTFont`` of ``source`` at ``weight`` (the font itself if not variable)."""
+    font = TTFont(source)
+    if "fvar" in font:
+        font = instancer.instantiateVariableFont(font, {"wght": weight})
+    return font
+
+
+def subset_font(font, codepoints, out_path):
+    options = subset.Options()
+    options.flavor = "woff2"
+    options.hinting = False
+    options.desubroutinize = True
+    options.name_IDs = [0, 1, 2, 3, 4, 5, 6]  # keep copyright and family names for the OFL
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    font.flavor = "woff2"
+    font.save(out_path)
+
+
+def page_codepoints(root=REPO_ROOT):
+    html = (root / TEXT_SOURCES[0]).read_text(encoding="utf-8")
+    scripts = [(root / name).read_text(encoding="utf-8") for name in TEXT_SOURCES[1:]]
+    fragments = [path.read_text(encoding="utf-8") for path in sorted((root / FRAGMENTS_DIR).glob("*.html"))]
+    return collect_codepoints("".join([html, *fragments]), scripts)
+
+
+def missing_codepoints(codepoints, fonts_dir=FONTS_DIR):
+    """Return ``{weight: missing code points}`` for generated fonts that lack part of the page."""
+    _require_fonttools()
+    missing = {}
+    for weight in WEIGHTS:
+        path = fonts_dir / font_file(weight)
+        if not path.exists():
+            missing[weight] = set(codepoints)
+            continue
+        cmap = TTFont(path).getBestCmap()
+        lacking = {cp for cp in codepoints if cp not in cmap and cp != 0xA0}
+        if lacking:
+            missing[weight] = lacking
+    return missing
+
+
+def covered_codepoints(root=REPO_ROOT, source=SOURCE_FONT):
+    """Return the page's code points that the source font has glyphs for.
+
+    Characters the font lacks (emoji, arrows) keep falling back to system fonts.
+    """
+    return frozenset(page_codepoints(root) & set(TTFont(source).getBestCmap()))
+
+
+def generate(root=REPO_ROOT, source=SOURCE_FONT, fonts_dir=FONTS_DIR):
+    """Subset every weight, rewrite the generated blocks and retire Google Fonts."""
+    _require_fonttools()
+    if not Path(source).exists():
+        if Path(source) != SOURCE_FONT:
+            raise FontPipelineError(f"{source} does not exist")
+        fetch_source()
+    covered = covered_codepoints(root, source)
+
+    Path(fonts_dir).mkdir(parents=True, exist_ok=True)
+    for weight in WEIGHTS:
+        subset_font(instance(source, weight), covered, Path(fonts_dir) / font_file(weight))
+
+    regular = instance(source, 400)
+    hhea = regular["hhea"]
+    metrics = fallback_metrics(regular["head"].unitsPerEm, hhea.ascent, hhea.descent, hhea.lineGap,
+                               regular["OS/2"].xAvgCharWidth)
+
+    styles = root / "styles.css"
+    css = replace_marked_block(styles.read_text(encoding="utf-8"), CSS_MARKERS, font_face_css(covered, metrics))
+    styles.write_text(add_fallback_family(css), encoding="utf-8")
+    index = root / "index.html"
+    html = replace_marked_block(index.read_text(encoding="utf-8"), HTML_MARKERS, preload_html())
+    index.write_text(drop_google_fonts_from_csp(html), encoding="utf-8")
+    script = root / "script.js"
+    script.write_text(remove_marked_lines(script.read_text(encoding="utf-8"), JS_MARKERS), encoding="utf-8")
+    budgets = root / "budgets.json"
+    budgets.write_text(drop_google_fonts_from_budgets(budgets.read_text(encoding="utf-8")), encoding="utf-8")
+    return covered
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vendor and subset Space Grotesk for the site.")
+    parser.add_argument("--check", action="store_true",
+                        help="only verify that the generated fonts cover the page's text")
+    parser.add_argument("--fetch", action="store_true", help="re-download the source font first")
+    parser.add_argument("--source", type=Path,
+                        help="vendor this copy of SpaceGrotesk[wght].ttf (and the OFL.txt beside it) "
+                             "instead of downloading it")
+    args = parser.parse_args(argv)
+
+    try:
+        _require_fonttools()
+        if args.check:
+            if not SOURCE_FONT.exists():
+                raise FontPipelineError(f"{SOURCE_FONT.relative_to(REPO_ROOT)} is missing; run `python -m tools.fonts`")
+            missing = missing_codepoints(covered_codepoints())
+            for weight, lacking in sorted(missing.items()):
+                chars = "".join(sorted(chr(cp) for cp in lacking))[:60]
+                print(f"{font_file(weight)} is missing {len(lacking)} characters: {chars!r}", file=sys.stderr)
+            if missing:
+                print("Run `python -m tools.fonts` to regenerate the fonts.", file=sys.stderr)
+                return 1
+            print("Fonts cover every character on the page.")
+            return 0
+        if args.source:
+            if not args.source.is_file():
+                raise FontPipelineError(f"{args.source} does not exist")
+            SOURCE_DIR.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(args.source, SOURCE_FONT)
+            # The OFL has to travel with the font.
+            license_file = args.source.with_name(SOURCE_LICENSE.name)
+            if license_file.is_file():
+                shutil.copyfile(license_file, SOURCE_LICENSE)
+        elif args.fetch:
+            fetch_source()
+        covered = generate()
+    except FontPipelineError as exc:
+        print(f"fonts: {exc}", file=sys.stderr)
+        return 1
+
+    for weight in WEIGHTS:
+        path = FONTS_DIR / font_file(weight)
+        print(f"{path.relative_to(REPO_ROOT)}  {path.stat().st_size / 1024:.1f} KiB")
+    print(f"{len(covered)} code points; preloading {', '.join(map(str, PRELOADED_WEIGHTS))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
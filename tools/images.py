@@ -0,0 +1,255 @@
+"""Responsive AVIF/WebP variants for the page's raster images.
+
+Each image in ``IMAGES`` is rendered at a fixed CSS size, so variants are cut
+for several device pixel ratios. They are written to assets/img/ as AVIF, WebP
+and a fallback format: PNG where the source has transparency, JPEG otherwise.
+The matching ``<img>`` in index.html is then rewritten into a ``<picture>``
+with density ``srcset`` candidates. The image preload links are regenerated
+with ``imagesrcset``, so a phone preloads the 2x AVIF rather than the
+full-size PNG.
+
+Images on the LCP path have per-variant byte budgets. ``--check``, and every
+``python -m tools.build``, fail when a variant the page references exceeds its
+budget.
+
+Generating variants requires Pillow (``pip install Pillow``; 11.3 or newer for
+AVIF). The budget check only reads file sizes and needs nothing extra.
+
+Usage (from the repository root):
+
+    python -m tools.images            # regenerate variants and rewrite index.html
+    python -m tools.images --check    # budgets only
+"""
+import argparse
+import re
+import sys
+from pathlib import Path
+
+try:
+    from PIL import Image
+except ImportError:  # Optional: only needed to generate the variants.
+    Image = None
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+OUTPUT_DIR = "assets/img"
+
+# Keyed by the class of the <img> each entry renders. ``size`` is the CSS box in
+# pixels; ``budget`` (bytes) applies to every variant of an LCP-path image.
+IMAGES = {
+    "hero-photo": {
+        "source": "assets/icons/me.png",
+        "name": "me",
+        "size": 160,
+        "densities": (1, 1.5, 2),
+        "budget": 16 * 1024,
+        "preload": True,
+    },
+    "brand-logo": {
+        "source": "nw-logo.png",
+        "name": "nw-logo",
+        "size": 36,
+        "densities": (1, 2, 3),
+        "budget": 12 * 1024,
+        "preload": True,
+    },
+    "footer-logo": {
+        "source": "nw-logo.png",
+        "name": "nw-logo",
+        "size": 44,
+        "densities": (1, 2, 3),
+        "budget": None,
+        "preload": False,
+    },
+}
+
+# (extension, MIME type, Pillow format, save options), best first.
+MODERN_FORMATS = (
+    ("avif", "image/avif", "AVIF", {"quality": 55}),
+    ("webp", "image/webp", "WEBP", {"quality": 80, "method": 6}),
+)
+FALLBACK_FORMATS = {
+    "png": ("png", "image/png", "PNG", {"optimize": True}),
+    "jpeg": ("jpg", "image/jpeg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+_ATTRIBUTE = re.compile(r'([^\s=/>]+)(?:="([^"]*)")?')
+_IMAGE_PRELOAD = re.compile(r'[ \t]*<link\b(?=[^>]*\brel="preload")(?=[^>]*\bas="image")[^>]*>\n?')
+
+
+class ImagePipelineError(Exception):
+    pass
+
+
+def _density_label(density):
+    return f"{density:g}x"
+
+
+def variant_widths(spec, source_width):
+    """Return ``[(density, width)]`` for the densities the source is large enough for."""
+    widths = []
+    for density in spec["densities"]:
+        width = round(spec["size"] * density)
+        if width <= source_width:
+            widths.append((density, width))
+    if not widths:
+        raise ImagePipelineError(f"{spec['source']} is smaller than its {spec['size']}px CSS size")
+    return widths
+
+
+def variant_path(spec, width, extension):
+    return f"{OUTPUT_DIR}/{spec['name']}-{width}.{extension}"
+
+
+def formats_for(fallback):
+    return MODERN_FORMATS + (FALLBACK_FORMATS[fallback],)
+
+
+def srcset(spec, widths, extension):
+    return ", ".join(f"{variant_path(spec, width, extension)} {_density_label(density)}" for density, width in widths)
+
+
+def parse_attributes(tag):
+    """Return the attributes of a start tag as an ordered list of ``(name, value)``."""
+    inner = re.match(r"<\w+\s*(.*?)\s*/?>$", tag, re.DOTALL).group(1)
+    return [match.groups() for match in _ATTRIBUTE.finditer(inner)]
+
+
+def _format_attributes(attributes):
+    return "".join(f' {name}="{value}"' if value is not None else f" {name}" for name, value in attributes)
+
+
+def picture_markup(spec, widths, fallback, img_attributes, picture_attributes=(), indent=""):
+    """Return the ``<picture>`` element for ``spec`` (``img_attributes`` keep their order)."""
+    fallback_extension = FALLBACK_FORMATS[fallback][0]
+    img = []
+    for name, value in img_attributes:
+        if name == "srcset":
+            continue
+        if name == "src":
+            img.append(("src", variant_path(spec, widths[0][1], fallback_extension)))
+            img.append(("srcset", srcset(spec, widths, fallback_extension)))
+        else:
+            img.append((name, value))
+    lines = [f"<picture{_format_attributes(picture_attributes)}>"]
+    for extension, mime, _format, _options in MODERN_FORMATS:
+        lines.append(f'    <source type="{mime}" srcset="{srcset(spec, widths, extension)}">')
+    lines.append(f"    <img{_format_attributes(img)}>")
+    lines.append("</picture>")
+    return f"\n{indent}".join(lines)
+
+
+def preload_markup(spec, widths):
+    extension, mime = MODERN_FORMATS[0][:2]
+    return (
+        f'<link rel="preload" as="image" type="{mime}" href="{variant_path(spec, widths[0][1], extension)}" '
+        f'imagesrcset="{srcset(spec, widths, extension)}" fetchpriority="high">'
+    )
+
+
+def _element_pattern(img_class):
+    img = r'<img\b(?=[^>]*\bclass="(?:[^"]*\s)?' + re.escape(img_class) + r'(?:\s[^"]*)?")[^>]*>'
+    return re.compile(
+        r"(?P<picture><picture\b[^>]*>)\s*(?:<source\b[^>]*>\s*)*(?P<inner>" + img + r")\s*</picture>"
+        r"|(?P<img>" + img + r")"
+    )
+
+
+def rewrite_html(html, variants):
+    """Rewrite every image in ``variants`` (``{img class: (spec, widths, fallback)}``) and the preloads."""
+    for img_class, (spec, widths, fallback) in variants.items():
+        pattern = _element_pattern(img_class)
+        match = pattern.search(html)
+        if match is None:
+            raise ImagePipelineError(f'No <img class="{img_class}"> in index.html')
+        line_start = html.rfind("\n", 0, match.start()) + 1
+        indent = re.match(r"[ \t]*", html[line_start:]).group(0)
+        if match.group("picture"):
+            picture_attributes = parse_attributes(match.group("picture"))
+            img_tag = match.group("inner")
+        else:
+            picture_attributes = []
+            img_tag = match.group("img")
+        markup = picture_markup(spec, widths, fallback, parse_attributes(img_tag), picture_attributes, indent)
+        html = html[:match.start()] + markup + html[match.end():]
+
+    preloads = [preload_markup(spec, widths) for spec, widths, _fallback in variants.values() if spec["preload"]]
+    first = _IMAGE_PRELOAD.search(html)
+    if first is None:
+        raise ImagePipelineError("index.html has no image preload links to replace")
+    indent = re.match(r"[ \t]*", first.group(0)).group(0)
+    block = "".join(f"{indent}{link}\n" for link in preloads)
+    html = html[:first.start()] + block + _IMAGE_PRELOAD.sub("", html[first.end():])
+    return html
+
+
+def budget_problems(root, paths=None):
+    """Return budget violations for the LCP-path variants among ``paths`` (default: all on disk)."""
+    root = Path(root)
+    problems = []
+    for img_class, spec in IMAGES.items():
+        if not spec["budget"]:
+            continue
+        pattern = re.compile(re.escape(f"{OUTPUT_DIR}/{spec['name']}-") + r"(\d+)\.\w+$")
+        candidates = paths if paths is not None else [
+            path.relative_to(root).as_posix() for path in (root / OUTPUT_DIR).glob(f"{spec['name']}-*")
+        ]
+        allowed = {round(spec["size"] * density) for density in spec["densities"]}
+        for path in sorted(candidates):
+            match = pattern.match(path)
+            if not match or int(match.group(1)) not in allowed:
+                continue
+            size = (root / path).stat().st_size
+            if size > spec["budget"]:
+                problems.append(f"{path} is {size} bytes, over the {spec['budget']}-byte budget for .{img_class}")
+    return problems
+
+
+def generate(root=REPO_ROOT):
+    """Write every variant and rewrite index.html; return the written paths."""
+    if Image is None:
+        raise ImagePipelineError("Pillow is required: pip install Pillow")
+    root = Path(root)
+    (root / OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
+    written = []
+    variants = {}
+    for img_class, spec in IMAGES.items():
+        with Image.open(root / spec["source"]) as source:
+            source.load()
+            has_alpha = source.mode in ("RGBA", "LA") or "transparency" in source.info
+            image = source.convert("RGBA" if has_alpha else "RGB")
+        fallback = "png" if has_alpha else "jpeg"
+        widths = variant_widths(spec, min(image.size))
+        for _density, width in widths:
+            resized = image.resize((width, round(width * image.height / image.width)), Image.LANCZOS)
+            for extension, _mime, pil_format, options in formats_for(fallback):
+                path = variant_path(spec, width, extension)
+                resized.save(root / path, pil_format, **options)
+                written.append(path)
+        variants[img_class] = (spec, widths, fallback)
+
+    index = root / "index.html"
+    index.write_text(rewrite_html(index.read_text(encoding="utf-8"), variants), encoding="utf-8")
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate responsive image variants and check LCP budgets.")
+    parser.add_argument("--check", action="store_true", help="only check the LCP byte budgets")
+    args = parser.parse_args(argv)
+
+    try:
+        if not args.check:
+            for path in generate():
+                print(f"{path:<32} {(REPO_ROOT / path).stat().st_size:>8} B")
+    except ImagePipelineError as exc:
+        print(f"images: {exc}", file=sys.stderr)
+        return 1
+
+    problems = budget_problems(REPO_ROOT)
+    for problem in problems:
+        print(f"over budget: {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""Conservative, dependency-free minifiers for the site's CSS, JavaScript and HTML.
+
+They only remove what can never change behaviour: comments, indentation and
+redundant whitespace. String, template and regular-expression literals are
+copied verbatim, and JavaScript line breaks are kept so automatic semicolon
+insertion works exactly as it does on the source.
+"""
+import re
+
+_JS_WORD = re.compile(r"[A-Za-z0-9_$\u0080-\U0010ffff]")
+# After these tokens a "/" starts a regular expression rather than a division,
+# except after a postfix ``++``/``--`` or the ``}`` of an object literal.
+_REGEX_PREFIX_CHARS = set("(,=:[!&|?{;+-*%<>~^")
+_REGEX_PREFIX_WORDS = {
+    "return", "typeof", "instanceof", "in", "of", "new", "delete", "void",
+    "throw", "case", "do", "else", "yield", "await",
+}
+# A "{" after these opens an object literal (an expression) rather than a block.
+_OBJECT_PREFIX_CHARS = set("(,=:[!&|?+-*%<>~^")
+_OBJECT_PREFIX_WORDS = _REGEX_PREFIX_WORDS - {"do", "else"}
+
+
+def _is_word_char(ch):
+    return bool(ch) and bool(_JS_WORD.match(ch))
+
+
+def _copy_quoted(source, start, quote):
+    """Return the index just past the string literal starting at ``start``."""
+    i = start + 1
+    n = len(source)
+    while i < n:
+        ch = source[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == quote:
+            return i + 1
+        if ch == "\n" and quote != "`":
+            raise ValueError(f"Unterminated string literal at offset {start}")
+        i += 1
+    raise ValueError(f"Unterminated string literal at offset {start}")
+
+
+def _copy_regex(source, start):
+    """Return the index just past the regex literal (including flags) at ``start``."""
+    i = start + 1
+    n = len(source)
+    in_class = False
+    while i < n:
+        ch = source[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == "\n":
+            raise ValueError(f"Unterminated regular expression at offset {start}")
+        if in_class:
+            if ch == "]":
+                in_class = False
+        elif ch == "[":
+            in_class = True
+        elif ch == "/":
+            i += 1
+            while i < n and _is_word_char(source[i]):
+                i += 1
+            return i
+        i += 1
+    raise ValueError(f"Unterminated regular expression at offset {start}")
+
+
+def _ends_postfix_update(out):
+    """Return whether the emitted output ends with a ``++`` or ``--`` token.
+
+    A prefix ``++``/``--`` cannot be followed by a regex literal, so a "/" after
+    either is always a division (``i++ / 2``).
+    """
+    return len(out) >= 2 and out[-1] in ("+", "-") and out[-2] == out[-1]
+
+
+def minify_js(source):
+    """Strip comments, indentation and insignificant spaces from JavaScript."""
+    out = []
+    i = 0
+    n = len(source)
+    last_char = ""       # last significant character emitted
+    last_word = ""       # last identifier/keyword emitted, if it was the last token
+    pending_space = False
+    pending_newline = False
+    # Brace depth at which each open template ``${`` expression started.
+    template_stack = []
+    depth = 0
+    # For each open "{": whether it started an object literal. A "/" after the
+    # "}" closing one is a division; after a block's "}" it starts a regex.
+    brace_kinds = []
+    closed_object = False
+
+    def emit(text, word=""):
+        nonlocal last_char, last_word, pending_space, pending_newline
+        if pending_newline and out:
+            out.append("\n")
+        elif pending_space and out:
+            prev = out[-1][-1]
+            nxt = text[0]
+            if (_is_word_char(prev) and _is_word_char(nxt)) or (prev in "+-" and nxt == prev):
+                out.append(" ")
+        pending_space = pending_newline = False
+        out.append(text)
+        last_char = text[-1]
+        last_word = word
+
+    def copy_template(start):
+        """Copy template text from ``start`` up to the closing backtick or a ``${``."""
+        j = start
+        while j < n:
+            ch = source[j]
+            if ch == "\\":
+                j += 2
+                continue
+            if ch == "`":
+                return j + 1, False
+            if ch == "$" and j + 1 < n and source[j + 1] == "{":
+                return j + 2, True
+            j += 1
+        raise ValueError(f"Unterminated template literal at offset {start}")
+
+    while i < n:
+        ch = source[i]
+        nxt = source[i + 1] if i + 1 < n else ""
+
+        if ch in " \t\r\f\v\ufeff":
+            pending_space = True
+            i += 1
+        elif ch == "\n":
+            pending_newline = True
+            i += 1
+        elif ch == "/" and nxt == "/":
+            end = source.find("\n", i)
+            i = n if end == -1 else end
+        elif ch == "/" and nxt == "*":
+            end = source.find("*/", i + 2)
+            if end == -1:
+                raise ValueError(f"Unterminated comment at offset {i}")
+            if "\n" in source[i:end]:
+                pending_newline = True
+            else:
+                pending_space = True
+            i = end + 2
+        elif ch in "'\"":
+            end = _copy_quoted(source, i, ch)
+            emit(source[i:end])
+            i = end
+        elif ch == "`":
+            end, opened = copy_template(i + 1)
+            emit(source[i:end])
+            i = end
+            if opened:
+                template_stack.append(depth)
+                depth += 1
+        elif ch == "}" and template_stack and depth - 1 == template_stack[-1]:
+            template_stack.pop()
+            depth -= 1
+            end, opened = copy_template(i + 1)
+            emit(source[i:end])
+            i = end
+            if opened:
+                template_stack.append(depth)
+                depth += 1
+        elif ch == "/" and (not last_char or last_word in _REGEX_PREFIX_WORDS
+                            or (last_char == "}" and not closed_object)
+                            or (last_char in _REGEX_PREFIX_CHARS and not _ends_postfix_update(out))):
+            end = _copy_regex(source, i)
+            emit(source[i:end])
+            i = end
+        elif _is_word_char(ch):
+            j = i + 1
+            while j < n and _is_word_char(source[j]):
+                j += 1
+            word = source[i:j]
+            emit(word, word)
+            i = j
+        else:
+            if ch == "{":
+                depth += 1
+                brace_kinds.append(last_char in _OBJECT_PREFIX_CHARS or last_word in _OBJECT_PREFIX_WORDS)
+            elif ch == "}":
+                depth -= 1
+                closed_object = brace_kinds.pop() if brace_kinds else False
+            emit(ch)
+            i += 1
+
+    return "".join(out) + "\n"
+
+
+def _strip_css_comments(source):
+    """Remove ``/* */`` comments, leaving strings untouched."""
+    out = []
+    i = 0
+    n = len(source)
+    while i < n:
+        ch = source[i]
+        if ch in "'\"":
+            end = _copy_quoted(source, i, ch)
+            out.append(source[i:end])
+            i = end
+        elif ch == "/" and source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            if end == -1:
+                raise ValueError(f"Unterminated comment at offset {i}")
+            out.append(" ")
+            i = end + 2
+        else:
+            out.append(ch)
+            i += 1
+    return "".join(out)
+
+
+_CSS_STRING = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""")
+_CSS_PUNCTUATION_SPACE = re.compile(r"\s*([{};,>])\s*")
+
+
+def minify_css(source):
+    """Drop comments and whitespace around ``{ } ; , >``; values are otherwise untouched."""
+    parts = _CSS_STRING.split(_strip_css_comments(source))
+    for index in range(0, len(parts), 2):
+        chunk = re.sub(r"\s+", " ", parts[index])
+        chunk = _CSS_PUNCTUATION_SPACE.sub(r"\1", chunk)
+        parts[index] = chunk.replace(";}", "}")
+    return "".join(parts).strip() + "\n"
+
+
+# Blocks whose content is kept byte for byte (comments are dropped).
+_HTML_PRESERVE = re.compile(
+    r"(<!--.*?-->|<pre\b.*?</pre>|<textarea\b.*?</textarea>|<script\b.*?</script>|<style\b.*?</style>)",
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+def minify_html(source):
+    """Drop comments and collapse whitespace runs to one space (or one line break).
+
+    Collapsing never changes rendering because HTML already treats any run of
+    whitespace in normal flow as a single space; ``pre``/``textarea``/``script``/
+    ``style`` contents are left alone.
+    """
+    out = []
+    for index, part in enumerate(_HTML_PRESERVE.split(source)):
+        if index % 2:
+            if part.startswith("<!--") and not part.startswith("<!--["):
+                continue
+            out.append(part)
+            continue
+        part = re.sub(r"[ \t\r\f\v]*\n\s*", "\n", part)
+        out.append(re.sub(r"[ \t\r\f\v]+", " ", part))
+    text = "".join(out)
+    return re.sub(r"\n{2,}", "\n", text).strip() + "\n"
@@ -0,0 +1,424 @@
+"""Find dead CSS rules and unreached script branches by exercising the page.
+
+The page is loaded in headless Chromium once per breakpoint. Widths are read
+from the ``@media`` width queries in styles.css, one on each side of every
+breakpoint. Each load runs through these states in turn, and CSS rule usage
+and V8 block coverage are collected across all of them:
+
+* a scroll through the whole page, in the light theme and then the dark one;
+* each legal modal opened and closed;
+* the contact form submitted empty (the validation errors), then filled in
+  (the submitting state; the Formspree request is blocked);
+* ``prefers-reduced-motion: reduce``;
+* print media.
+
+Two more loads, at the desktop and mobile widths, run with JavaScript
+disabled so the ``<noscript>`` stylesheet is exercised.
+
+A rule that never matched is reported as dead. Rules whose selectors depend
+on interaction (``:hover``, ``:focus-visible``, pseudo-elements) are kept
+apart. They are dead only when the element they style never existed in any
+state; otherwise they are listed as unverified. Script blocks that never ran
+are listed by line, with their enclosing function. Coverage is what Chromium
+saw, so a rule for another engine (an ``@supports`` fallback, say) shows up
+as dead and needs a human decision.
+
+With ``--out`` a copy of the site is written with the dead rules removed. The
+copy is accepted only when layout snapshots of the whole page
+(tools/snapshots.py) match the original at every breakpoint, theme and print
+render. The copy can then be built with ``python -m tools.build --root``.
+
+Usage (from the repository root):
+
+    python -m tools.prune                        # report
+    python -m tools.prune --json prune-report.json
+    python -m tools.prune --out /tmp/pruned      # plus a verified, pruned copy of the site
+
+Playwright is imported only when the page is exercised.
+"""
+import argparse
+import json
+import re
+import shutil
+import sys
+from pathlib import Path
+
+from tools import minify, snapshots
+from tools.budgets import third_party_patterns
+from tools.build import site_files
+from tools.critical_css import match_selector, parse_css, split_selector_list
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DESKTOP = {"width": 1280, "height": 800}
+MOBILE = {"width": 390, "height": 844}
+VIEWPORT_HEIGHT = 900
+# Blocked on top of the third-party origins: the rendering passes must not
+# submit the contact form to the live endpoint.
+FORM_ENDPOINT_PATTERN = "https://formspree.io/**"
+
+_WIDTH_QUERY = re.compile(r"\((min|max)-width:\s*(\d+)px\)")
+_EMPTY_GROUP = re.compile(r"@(?:media|supports|layer|container)[^{};]*\{\s*\}")
+_COMBINATOR_SPACE = re.compile(r"\s*([>+~,])\s*")
+
+_NEXT_FRAMES = "() => new Promise((resolve) => requestAnimationFrame(() => requestAnimationFrame(resolve)))"
+
+# Scrolls through the page one viewport at a time, letting observers and the
+# scroll scheduler run at each stop, then returns to the top.
+_SCROLL_THROUGH = """
+async () => {
+    const frames = () => new Promise((resolve) => requestAnimationFrame(() => requestAnimationFrame(resolve)));
+    for (let y = 0; y < document.documentElement.scrollHeight; y += Math.round(window.innerHeight * 0.6)) {
+        window.scrollTo({ top: y, behavior: 'instant' });
+        await frames();
+    }
+    window.scrollTo({ top: 0, behavior: 'instant' });
+    await frames();
+}
+"""
+
+# Submits the contact form through contact-form.js's validation: once empty,
+# once filled in. Native validation is switched off and the bot timer backdated
+# so the handler runs. A listener added after the page's own cancels the real
+# submission, including the one script.js repeats once contact-form.js loads.
+_SUBMIT_FORM = """
+(filled) => {
+    const form = document.querySelector('.contact-form');
+    if (!form) return false;
+    form.noValidate = true;
+    const loadTime = document.getElementById('formLoadTime');
+    if (loadTime) loadTime.value = String(Date.now() - 60000);
+    for (const [id, value] of [['name', 'Ada'], ['email', 'ada@example.com'], ['message', 'Hello']]) {
+        const input = document.getElementById(id);
+        if (input) input.value = filled ? value : '';
+    }
+    if (!window.__pruneCancelsSubmit) {
+        form.addEventListener('submit', (event) => event.preventDefault());
+        window.__pruneCancelsSubmit = true;
+    }
+    form.requestSubmit();
+    return true;
+}
+"""
+
+# Which of the given selectors match at least one element right now.
+_SELECTORS_PRESENT = """
+(selectors) => selectors.map((selector) => {
+    try {
+        return document.querySelector(selector) !== null;
+    } catch (error) {
+        return false;
+    }
+})
+"""
+
+
+class PruneError(Exception):
+    pass
+
+
+def breakpoint_widths(css):
+    """Return viewport widths on both sides of every ``min-width``/``max-width`` media query."""
+    widths = set()
+    for kind, value in _WIDTH_QUERY.findall(css):
+        value = int(value)
+        widths.update((value, value + 1) if kind == "max" else (value - 1, value))
+    return sorted(widths) or [MOBILE["width"], DESKTOP["width"]]
+
+
+def _utf16_slice(text, start, end):
+    return text.encode("utf-16-le")[start * 2:end * 2].decode("utf-16-le", errors="replace")
+
+
+def _line_of(text, offset):
+    return _utf16_slice(text, 0, offset).count("\n") + 1
+
+
+def rule_selectors(text, start, end):
+    """Return the selector list of the rule at UTF-16 offsets ``start``..``end`` of ``text``."""
+    return split_selector_list(" ".join(_utf16_slice(text, start, end).split("{", 1)[0].split()))
+
+
+def is_conditional(selector):
+    """True for selectors that need interaction (state pseudo-classes) or style pseudo-elements."""
+    return match_selector(selector) != selector
+
+
+def element_selector(selector):
+    """The selector for the elements ``selector`` styles, spelled the same however the source spaced it."""
+    return _COMBINATOR_SPACE.sub(r"\1", " ".join(match_selector(selector).split()))
+
+
+class Coverage:
+    """CSS rule usage and JS block coverage merged over every exercised state."""
+
+    def __init__(self):
+        self.rules = {}  # (path, start, end) -> used
+        self.blocks = {}  # path -> {(start, end): [count, function name]}
+        self.present = set()  # stripped selectors that matched an element at some point
+
+    def add_rules(self, path, rule_usage):
+        for rule in rule_usage:
+            key = (path, rule["startOffset"], rule["endOffset"])
+            self.rules[key] = self.rules.get(key, False) or rule["used"]
+
+    def add_script(self, path, functions):
+        blocks = self.blocks.setdefault(path, {})
+        for function in functions:
+            name = function["functionName"] or "(top level)"
+            for block in function["ranges"]:
+                key = (block["startOffset"], block["endOffset"])
+                entry = blocks.setdefault(key, [0, name])
+                entry[0] += block["count"]
+
+    def classify(self, texts):
+        """Return ``(dead, unverified)`` lists of ``(path, start, end, selectors)`` for unused rules."""
+        dead, unverified = [], []
+        for (path, start, end), used in sorted(self.rules.items()):
+            if used:
+                continue
+            selectors = rule_selectors(texts[path], start, end)
+            conditional = [element_selector(selector) for selector in selectors if is_conditional(selector)]
+            entry = (path, start, end, selectors)
+            if any(selector in self.present for selector in conditional):
+                unverified.append(entry)
+            else:
+                dead.append(entry)
+        return dead, unverified
+
+    def unreached(self, texts):
+        """Return ``(path, first line, last line, function)`` for outermost blocks that never ran."""
+        found = []
+        for path, blocks in sorted(self.blocks.items()):
+            never = sorted((start, end, name) for (start, end), (count, name) in blocks.items() if count == 0)
+            outermost = []
+            for start, end, name in never:
+                if outermost and start >= outermost[-1][0] and end <= outermost[-1][1]:
+                    continue
+                outermost.append((start, end, name))
+            found.extend((path, _line_of(texts[path], start), _line_of(texts[path], max(start, end - 1)), name)
+                         for start, end, name in outermost)
+        return found
+
+
+def prune_css(text, ranges):
+    """Remove the rules at UTF-16 ``ranges`` from ``text``, then any grouping at-rule left empty."""
+    data = text.encode("utf-16-le")
+    for start, end in sorted(ranges, reverse=True):
+        data = data[:start * 2] + data[end * 2:]
+    pruned = data.decode("utf-16-le")
+    while True:
+        emptied = _EMPTY_GROUP.sub("", pruned)
+        if emptied == pruned:
+            return pruned
+        pruned = emptied
+
+
+def _path(url, base_url):
+    if not url.startswith(base_url + "/"):
+        return None
+    return url[len(base_url) + 1:].split("?", 1)[0].split("#", 1)[0] or "index.html"
+
+
+def _new_context(browser, viewport, **options):
+    context = browser.new_context(viewport=viewport, reduced_motion="no-preference", **options)
+    for pattern in (*third_party_patterns(), FORM_ENDPOINT_PATTERN):
+        context.route(pattern, lambda route: route.abort())
+    return context
+
+
+def _exercise(page, note_present):
+    """Walk the page through every state, calling ``note_present()`` whenever the DOM may have changed."""
+    page.evaluate(_SCROLL_THROUGH)
+    note_present()
+    theme_toggle = page.locator(".theme-toggle")
+    if theme_toggle.count():
+        theme_toggle.first.click()
+        page.evaluate(_SCROLL_THROUGH)
+        note_present()
+    for trigger in page.locator("[data-legal-modal-target]").all():
+        trigger.click()
+        # The first click also imports legal-modals.js, so the modal opens asynchronously.
+        page.locator("#" + trigger.get_attribute("data-legal-modal-target")).wait_for(state="visible")
+        page.evaluate(_NEXT_FRAMES)
+        note_present()
+        page.keyboard.press("Escape")
+    for filled, outcome in ((False, ".contact-form .error-msg"), (True, ".contact-form.is-submitting")):
+        if page.evaluate(_SUBMIT_FORM, filled):
+            page.wait_for_selector(outcome, state="attached")
+        page.evaluate(_NEXT_FRAMES)
+        note_present()
+    page.emulate_media(reduced_motion="reduce")
+    page.evaluate(_NEXT_FRAMES)
+    page.emulate_media(media="print")
+    page.evaluate(_NEXT_FRAMES)
+
+
+def _record_pass(browser, url, viewport, coverage, conditional, java_script_enabled=True):
+    base_url = url.rstrip("/")
+    context = _new_context(browser, viewport, java_script_enabled=java_script_enabled)
+    try:
+        page = context.new_page()
+        cdp = context.new_cdp_session(page)
+        sheets = {}
+        cdp.on("CSS.styleSheetAdded", lambda event: sheets.update({
+            event["header"]["styleSheetId"]: event["header"]["sourceURL"]}))
+        cdp.send("Profiler.enable")
+        cdp.send("Profiler.startPreciseCoverage", {"callCount": True, "detailed": True})
+        cdp.send("DOM.enable")
+        cdp.send("CSS.enable")
+        cdp.send("CSS.startRuleUsageTracking")
+        page.goto(url, wait_until="load")
+        page.evaluate(_NEXT_FRAMES)
+
+        def note_present():
+            found = page.evaluate(_SELECTORS_PRESENT, conditional)
+            coverage.present.update(selector for selector, present in zip(conditional, found) if present)
+
+        note_present()
+        if java_script_enabled:
+            _exercise(page, note_present)
+        else:
+            page.evaluate(_SCROLL_THROUGH)
+            note_present()
+
+        usage = cdp.send("CSS.stopRuleUsageTracking")["ruleUsage"]
+        for sheet_id in {rule["styleSheetId"] for rule in usage}:
+            path = _path(sheets.get(sheet_id, ""), base_url)
+            if path is not None:
+                coverage.add_rules(path, [rule for rule in usage if rule["styleSheetId"] == sheet_id])
+        for script in cdp.send("Profiler.takePreciseCoverage")["result"]:
+            path = _path(script["url"], base_url)
+            if path is not None:
+                coverage.add_script(path, script["functions"])
+    finally:
+        context.close()
+
+
+def _style_rules(rules):
+    for rule in rules:
+        if rule.children is not None:
+            if not rule.at_keyword.endswith("keyframes"):
+                yield from _style_rules(rule.children)
+        elif rule.at_keyword is None:
+            yield rule
+
+
+def conditional_selectors(root):
+    """The ``element_selector()`` of every interaction-dependent selector in the site's stylesheets."""
+    selectors = set()
+    for path in Path(root).glob("*.css"):
+        for rule in _style_rules(parse_css(minify.minify_css(path.read_text(encoding="utf-8")))):
+            selectors.update(element_selector(selector) for selector in split_selector_list(rule.prelude)
+                             if is_conditional(selector))
+    return sorted(selectors)
+
+
+def collect_coverage(browser, url, root=REPO_ROOT, widths=None):
+    """Exercise the page at ``widths`` (default: every breakpoint) and return the merged ``Coverage``."""
+    coverage = Coverage()
+    conditional = conditional_selectors(root)
+    if widths is None:
+        widths = breakpoint_widths((Path(root) / "styles.css").read_text(encoding="utf-8"))
+    for width in widths:
+        _record_pass(browser, url, {"width": width, "height": VIEWPORT_HEIGHT}, coverage, conditional)
+    for viewport in (DESKTOP, MOBILE):
+        _record_pass(browser, url, viewport, coverage, conditional, java_script_enabled=False)
+    return coverage
+
+
+def write_pruned_site(root, out, dead):
+    """Copy the site under ``root`` to ``out`` with the ``dead`` rules removed; return the pruned files."""
+    root, out = Path(root), Path(out)
+    if out.exists():
+        shutil.rmtree(out)
+    for relative in site_files(root):
+        target = out / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(root / relative, target)
+    pruned = {}
+    for path in sorted({entry[0] for entry in dead}):
+        text = (root / path).read_text(encoding="utf-8")
+        ranges = [(start, end) for rule_path, start, end, _selectors in dead if rule_path == path]
+        pruned[path] = prune_css(text, ranges)
+        (out / path).write_text(pruned[path], encoding="utf-8")
+    return pruned
+
+
+def verify_pruned(browser, original_url, pruned_url, tolerance=snapshots.DEFAULT_TOLERANCE):
+    """Return ``{capture: changes}`` between whole-page snapshots of the original and the pruned site."""
+    before = snapshots.capture_section(browser, original_url, "body")
+    after = snapshots.capture_section(browser, pruned_url, "body")
+    return {key: snapshots.diff(before[key], after[key], tolerance=tolerance) for key in sorted(before)}
+
+
+def format_report(dead, unverified, unreached, texts):
+    lines = [f"Dead rules ({len(dead)}):"]
+    lines += [f"  {path}:{_line_of(texts[path], start)}  {', '.join(selectors)}" for path, start, _end, selectors in dead]
+    lines.append(f"Unverified interactive rules ({len(unverified)}):")
+    lines += [f"  {path}:{_line_of(texts[path], start)}  {', '.join(selectors)}"
+              for path, start, _end, selectors in unverified]
+    lines.append(f"Unreached script blocks ({len(unreached)}):")
+    lines += [f"  {path}:{first}" + (f"-{last}" if last != first else "") + f"  in {name}"
+              for path, first, last, name in unreached]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report dead CSS rules and unreached script blocks.")
+    parser.add_argument("--root", default=str(REPO_ROOT), help="site directory (default: repository root)")
+    parser.add_argument("--json", help="also write the findings to this JSON file")
+    parser.add_argument("--out", help="write a copy of the site without the dead rules, verified by snapshots")
+    args = parser.parse_args(argv)
+
+    from playwright.sync_api import sync_playwright
+
+    from tools.devserver import start_server
+
+    root = Path(args.root)
+    server = start_server(root, host="127.0.0.1")
+    url = f"http://127.0.0.1:{server.port}/"
+    try:
+        with sync_playwright() as playwright:
+            browser = playwright.chromium.launch(headless=True)
+            try:
+                coverage = collect_coverage(browser, url, root)
+                paths = {key[0] for key in coverage.rules} | set(coverage.blocks)
+                texts = {path: (root / path).read_text(encoding="utf-8") for path in paths}
+                dead, unverified = coverage.classify(texts)
+                unreached = coverage.unreached(texts)
+                print(format_report(dead, unverified, unreached, texts))
+
+                if args.json:
+                    with open(args.json, "w", encoding="utf-8") as handle:
+                        json.dump({
+                            "dead_rules": [[p, _line_of(texts[p], s), sel] for p, s, _e, sel in dead],
+                            "unverified_rules": [[p, _line_of(texts[p], s), sel] for p, s, _e, sel in unverified],
+                            "unreached_blocks": unreached,
+                        }, handle, indent=2)
+                        handle.write("\n")
+
+                if args.out:
+                    pruned = write_pruned_site(root, args.out, dead)
+                    pruned_server = start_server(args.out, host="127.0.0.1")
+                    try:
+                        results = verify_pruned(browser, url, f"http://127.0.0.1:{pruned_server.port}/")
+                    finally:
+                        pruned_server.stop()
+                    if any(results.values()):
+                        for path in pruned:
+                            shutil.copy2(root / path, Path(args.out) / path)
+                        print(snapshots.format_report(results), file=sys.stderr)
+                        print("prune: removing the dead rules changes the layout; "
+                              f"{args.out} keeps the original stylesheets", file=sys.stderr)
+                        return 1
+                    saved = sum(len(texts[path].encode()) - len(text.encode()) for path, text in pruned.items())
+                    print(f"prune: wrote {args.out} ({saved} bytes of CSS removed, layout unchanged)")
+            finally:
+                browser.close()
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
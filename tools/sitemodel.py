@@ -0,0 +1,346 @@
+"""A parsed, indexed model of the site source for checks that need no browser.
+
+``load_site()`` reads ``index.html``, ``styles.css`` and ``_headers`` once per
+process and returns a ``SiteModel``:
+
+* ``document``: the markup as an element tree, indexed by id, tag and class.
+  ``select()`` takes a CSS selector (type, ``#id``, ``.class``, attribute
+  tests and the four combinators), and every element keeps its attributes,
+  text and source line;
+* ``csp``: the ``Content-Security-Policy`` meta tag as ``{directive: [sources]}``;
+* ``stylesheet``: every style rule with its selectors, declarations and the
+  at-rules it is nested in, indexed by selector;
+* ``headers_for(path)``: the ``_headers`` rules that apply to a URL path,
+  merged the way tools/devserver.py serves them.
+
+This is the markup as shipped, before script.js runs. Anything script.js
+adds or changes still needs the browser tests.
+"""
+import functools
+import re
+from html.parser import HTMLParser
+from pathlib import Path
+
+from tools import minify
+from tools.critical_css import parse_css, split_selector_list
+from tools.devserver import HEADERS_FILE, headers_for_path, parse_headers_file
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr",
+}
+
+_COMPOUND_PART = re.compile(
+    r"(?P<tag>\*|[a-zA-Z][\w-]*)"
+    r"|#(?P<id>[\w-]+)"
+    r"|\.(?P<cls>[\w-]+)"
+    r"|\[\s*(?P<attr>[\w:-]+)\s*(?:(?P<op>[~|^$*]?=)\s*(?:\"(?P<dq>[^\"]*)\"|'(?P<sq>[^']*)'|(?P<bare>[^\]\s]+))\s*)?\]"
+)
+
+
+class SiteModelError(Exception):
+    pass
+
+
+class Element:
+    """One element of the parsed markup."""
+
+    __slots__ = ("tag", "attrs", "parent", "children", "line", "_text")
+
+    def __init__(self, tag, attrs, parent, line):
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children = []
+        self.line = line
+        self._text = []
+
+    def get(self, name, default=None):
+        return self.attrs.get(name, default)
+
+    @property
+    def classes(self):
+        return self.attrs.get("class", "").split()
+
+    @property
+    def text(self):
+        """The element's text content with whitespace collapsed, as ``innerText`` roughly reads it."""
+        return " ".join("".join(self._iter_text()).split())
+
+    def _iter_text(self):
+        for piece in self._text:
+            yield piece if isinstance(piece, str) else "".join(piece._iter_text())
+
+    def ancestors(self):
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def __repr__(self):
+        ident = f"#{self.attrs['id']}" if "id" in self.attrs else "".join(f".{name}" for name in self.classes[:2])
+        return f"<{self.tag}{ident} line {self.line}>"
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Element("#document", {}, None, 0)
+        self.elements = []
+        self._stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        parent = self._stack[-1]
+        element = Element(tag, {name: value or "" for name, value in attrs}, parent, self.getpos()[0])
+        parent.children.append(element)
+        parent._text.append(element)
+        self.elements.append(element)
+        if tag not in VOID_ELEMENTS:
+            self._stack.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self._stack.pop()
+
+    def handle_endtag(self, tag):
+        for depth in range(len(self._stack) - 1, 0, -1):
+            if self._stack[depth].tag == tag:
+                del self._stack[depth:]
+                return
+
+    def handle_data(self, data):
+        self._stack[-1]._text.append(data)
+
+
+def _parse_compound(text):
+    """Return ``(tag, tests)`` for a compound selector such as ``a.btn[target="_blank"]``."""
+    tag, tests, position = None, [], 0
+    for match in _COMPOUND_PART.finditer(text):
+        if match.start() != position or (match.group("tag") and position):
+            break
+        position = match.end()
+        if match.group("tag"):
+            tag = None if match.group("tag") == "*" else match.group("tag").lower()
+        elif match.group("id"):
+            tests.append(("id", "=", match.group("id")))
+        elif match.group("cls"):
+            tests.append(("class", "~=", match.group("cls")))
+        else:
+            value = next((v for v in match.group("dq", "sq", "bare") if v is not None), None)
+            tests.append((match.group("attr").lower(), match.group("op"), value))
+    if position != len(text) or not text:
+        raise SiteModelError(f"Unsupported selector {text!r}")
+    return tag, tests
+
+
+def _attribute_matches(actual, op, expected):
+    if actual is None:
+        return False
+    if op is None:
+        return True
+    if op == "=":
+        return actual == expected
+    if op == "~=":
+        return expected in actual.split()
+    if op == "|=":
+        return actual == expected or actual.startswith(expected + "-")
+    if op == "^=":
+        return bool(expected) and actual.startswith(expected)
+    if op == "$=":
+        return bool(expected) and actual.endswith(expected)
+    return bool(expected) and expected in actual
+
+
+def _compile(selector):
+    """Compile one complex selector into ``[(combinator, tag, tests), ...]``, leftmost first."""
+    steps = []
+    combinator = None
+    current = []
+    quote = None
+    depth = 0
+    for ch in selector.strip() + " ":
+        if quote:
+            quote = None if ch == quote else quote
+        elif ch in "'\"":
+            quote = ch
+        elif ch in "[]":
+            depth += 1 if ch == "[" else -1
+        elif depth == 0 and (ch.isspace() or ch in ">+~"):
+            if current:
+                steps.append((combinator, *_parse_compound("".join(current))))
+                current = []
+                combinator = " "
+            if ch in ">+~":
+                if not steps or combinator not in (" ", None):
+                    raise SiteModelError(f"Unsupported selector {selector!r}")
+                combinator = ch
+            continue
+        current.append(ch)
+    if not steps or combinator not in (" ",):
+        raise SiteModelError(f"Unsupported selector {selector!r}")
+    return steps
+
+
+def _previous_siblings(element):
+    siblings = element.parent.children
+    return reversed(siblings[:siblings.index(element)])
+
+
+class Document:
+    """The element tree of one HTML file, with id, tag and class indexes."""
+
+    def __init__(self, html):
+        builder = _TreeBuilder()
+        builder.feed(html)
+        builder.close()
+        self.root = builder.root
+        self.elements = builder.elements
+        self.by_id = {}
+        self.by_tag = {}
+        self.by_class = {}
+        for element in self.elements:
+            if "id" in element.attrs:
+                self.by_id.setdefault(element.attrs["id"], element)
+            self.by_tag.setdefault(element.tag, []).append(element)
+            for name in element.classes:
+                self.by_class.setdefault(name, []).append(element)
+
+    def _candidates(self, tag, tests):
+        for name, op, value in tests:
+            if name == "id" and op == "=":
+                element = self.by_id.get(value)
+                return [element] if element is not None else []
+        for name, op, value in tests:
+            if name == "class":
+                return self.by_class.get(value, [])
+        return self.by_tag.get(tag, []) if tag else self.elements
+
+    @staticmethod
+    def _matches_compound(element, tag, tests):
+        return (tag is None or element.tag == tag) and all(
+            _attribute_matches(element.attrs.get(name), op, value) for name, op, value in tests)
+
+    def _matches_left(self, element, steps):
+        combinator, tag, tests = steps[-1]
+        if not self._matches_compound(element, tag, tests):
+            return False
+        if combinator is None:
+            return True
+        if combinator == ">":
+            candidates = [element.parent] if element.parent is not self.root else []
+        elif combinator == " ":
+            candidates = [node for node in element.ancestors() if node is not self.root]
+        elif combinator == "+":
+            candidates = list(_previous_siblings(element))[:1]
+        else:
+            candidates = _previous_siblings(element)
+        return any(self._matches_left(candidate, steps[:-1]) for candidate in candidates)
+
+    def select(self, selector, text=None):
+        """Return the elements matching ``selector`` in document order.
+
+        ``text`` keeps only elements whose text content contains it, like
+        Playwright's ``:has-text()``.
+        """
+        matched = set()
+        for part in split_selector_list(selector):
+            steps = _compile(part)
+            _combinator, tag, tests = steps[-1]
+            for element in self._candidates(tag, tests):
+                if element not in matched and self._matches_left(element, steps):
+                    matched.add(element)
+        found = [element for element in self.elements if element in matched]
+        if text is not None:
+            found = [element for element in found if text in element.text]
+        return found
+
+    def select_one(self, selector, text=None):
+        found = self.select(selector, text)
+        return found[0] if found else None
+
+
+def parse_csp(policy):
+    """Parse a CSP string into ``{directive: [source, ...]}``, keeping the first of repeated directives."""
+    directives = {}
+    for directive in policy.split(";"):
+        tokens = directive.split()
+        if tokens:
+            directives.setdefault(tokens[0].lower(), tokens[1:])
+    return directives
+
+
+def parse_declarations(body):
+    """Parse a declaration block into ``{property: value}``; later declarations win."""
+    declarations = {}
+    for declaration in re.split(r";(?![^(]*\))", body or ""):
+        name, sep, value = declaration.partition(":")
+        if sep and name.strip():
+            declarations[name.strip().lower()] = value.strip()
+    return declarations
+
+
+class StyleRule:
+    """One style rule, with the at-rule preludes it is nested in (outermost first)."""
+
+    __slots__ = ("selectors", "declarations", "conditions")
+
+    def __init__(self, selectors, declarations, conditions):
+        self.selectors = selectors
+        self.declarations = declarations
+        self.conditions = conditions
+
+    def __repr__(self):
+        inside = f" in {' / '.join(self.conditions)}" if self.conditions else ""
+        return f"StyleRule({', '.join(self.selectors)!r}{inside})"
+
+
+class Stylesheet:
+    """Every style rule of a stylesheet, in source order and indexed by selector."""
+
+    def __init__(self, css):
+        self.rules = []
+        self.by_selector = {}
+        self._collect(parse_css(minify.minify_css(css)), ())
+
+    def _collect(self, rules, conditions):
+        for rule in rules:
+            if rule.children is not None:
+                self._collect(rule.children, conditions + (rule.prelude,))
+            elif rule.at_keyword is None and rule.body is not None:
+                style = StyleRule(split_selector_list(rule.prelude), parse_declarations(rule.body), conditions)
+                self.rules.append(style)
+                for selector in style.selectors:
+                    self.by_selector.setdefault(selector, []).append(style)
+
+    def rules_for(self, selector, conditions=()):
+        """Return the rules listing ``selector`` exactly, nested in exactly ``conditions``."""
+        return [rule for rule in self.by_selector.get(selector, []) if rule.conditions == tuple(conditions)]
+
+    def declared(self, selector, name, conditions=()):
+        """Return the last value ``selector``'s own rules declare for ``name``, or ``None``."""
+        values = [rule.declarations[name] for rule in self.rules_for(selector, conditions) if name in rule.declarations]
+        return values[-1] if values else None
+
+
+class SiteModel:
+    def __init__(self, root=REPO_ROOT):
+        root = Path(root)
+        self.root = root
+        self.document = Document((root / "index.html").read_text(encoding="utf-8"))
+        self.stylesheet = Stylesheet((root / "styles.css").read_text(encoding="utf-8"))
+        headers_file = root / HEADERS_FILE
+        self.header_rules = parse_headers_file(headers_file.read_text(encoding="utf-8")) if headers_file.exists() else []
+        meta = self.document.select_one('meta[http-equiv="Content-Security-Policy"]')
+        self.csp = parse_csp(meta.get("content", "")) if meta is not None else None
+
+    def headers_for(self, path):
+        """Return ``{lower-case name: value}`` for the headers ``_headers`` adds to ``path``."""
+        return {name.lower(): value for name, value in headers_for_path(self.header_rules, path)}
+
+
+@functools.lru_cache(maxsize=None)
+def load_site(root=REPO_ROOT):
+    """Return the ``SiteModel`` for ``root``, parsed on first use and shared afterwards."""
+    return SiteModel(root)
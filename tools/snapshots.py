@@ -0,0 +1,300 @@
+"""Layout snapshots: element boxes and key computed styles, diffed against baselines.
+
+A snapshot of a section (``SECTIONS``, e.g. the footer) records, for the
+section and every element inside it, the element's box relative to the
+section and the computed values of ``PROPERTIES``. The whole section is read in
+a single ``page.evaluate`` call. Snapshots are taken at the desktop, tablet
+and mobile breakpoints, in the light and dark themes and with print media
+emulated, so one run covers every render the stylesheet distinguishes.
+
+Baselines live in ``tests/snapshots/<section>.json``, one row per element.
+A diff matches elements by their path in the section. Boxes and any numbers
+inside a style value (lengths, colour channels) may differ by up to the
+tolerance, 1px by default. Everything else must match exactly. The report
+groups changes by capture, so a breakpoint regression reads as one block.
+
+Usage (from the repository root):
+
+    python -m tools.snapshots                    # diff every section against its baseline
+    python -m tools.snapshots --section footer --tolerance 0.5
+    python -m tools.snapshots --update           # record new baselines
+
+Playwright is only imported when a browser is needed.
+"""
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+from tools.budgets import third_party_patterns
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_DIR = REPO_ROOT / "tests" / "snapshots"
+FORMAT_VERSION = 1
+
+SECTIONS = {
+    "footer": ".site-footer",
+}
+# The 768px and 1100px stylesheet breakpoints put tablet and desktop on either side.
+VIEWPORTS = {
+    "desktop": {"width": 1280, "height": 800},
+    "tablet": {"width": 768, "height": 1024},
+    "mobile": {"width": 390, "height": 844},
+}
+MODES = ("light", "dark", "print")
+PROPERTIES = (
+    "display", "position", "visibility", "opacity",
+    "color", "background-color", "border-top-width", "border-top-color", "border-top-left-radius", "box-shadow",
+    "font-family", "font-size", "font-weight", "font-style", "line-height", "letter-spacing",
+    "text-align", "text-transform", "text-decoration-line",
+    "margin-top", "margin-right", "margin-bottom", "margin-left",
+    "padding-top", "padding-right", "padding-bottom", "padding-left",
+    "flex-direction", "flex-wrap", "justify-content", "align-items", "row-gap", "column-gap",
+)
+DEFAULT_TOLERANCE = 1.0
+
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?(?:e-?\d+)?")
+
+
+class SnapshotError(Exception):
+    pass
+
+
+# Returns { size: [w, h], elements: [[path, x, y, w, h, ...values], ...] } for
+# the first element matching the selector. Boxes are relative to the section,
+# so scroll position and content above it do not show up in the diff. A path
+# step is the tag and first class, with a :n suffix when siblings share both.
+CAPTURE_SCRIPT = """
+([selector, properties]) => {
+    const section = document.querySelector(selector);
+    if (!section) return null;
+    const origin = section.getBoundingClientRect();
+    const round = (value) => Math.round(value * 100) / 100;
+    const label = (el) => {
+        const name = el.tagName.toLowerCase() + (el.classList.length ? `.${el.classList[0]}` : '');
+        if (el === section || !el.parentElement) return name;
+        const twins = Array.prototype.filter.call(el.parentElement.children,
+            (sibling) => sibling.tagName === el.tagName && sibling.classList[0] === el.classList[0]);
+        return twins.length > 1 ? `${name}:${twins.indexOf(el) + 1}` : name;
+    };
+    const paths = new Map([[section, label(section)]]);
+    const elements = [section, ...section.querySelectorAll('*')].map((el) => {
+        if (el !== section) paths.set(el, `${paths.get(el.parentElement)} > ${label(el)}`);
+        const rect = el.getBoundingClientRect();
+        const style = getComputedStyle(el);
+        return [
+            paths.get(el),
+            round(rect.left - origin.left), round(rect.top - origin.top), round(rect.width), round(rect.height),
+            ...properties.map((name) => style.getPropertyValue(name)),
+        ];
+    });
+    return { size: [round(origin.width), round(origin.height)], elements };
+}
+"""
+
+_NEXT_FRAMES = "() => new Promise((resolve) => requestAnimationFrame(() => requestAnimationFrame(resolve)))"
+
+
+def capture(page, selector, properties=PROPERTIES):
+    """Snapshot the section matching ``selector`` on ``page`` in one round-trip."""
+    snapshot = page.evaluate(CAPTURE_SCRIPT, [selector, list(properties)])
+    if snapshot is None:
+        raise SnapshotError(f"No element matches {selector!r}")
+    return snapshot
+
+
+def capture_section(browser, url, selector, viewports=VIEWPORTS, modes=MODES):
+    """Return ``{"<viewport>/<mode>": snapshot}`` for every breakpoint and mode.
+
+    Each theme gets its own context (script.js picks the theme once, from
+    ``prefers-color-scheme``). Print is captured from the light page with print
+    media emulated, so it costs no extra page load.
+    """
+    captures = {}
+    for viewport_name, viewport in viewports.items():
+        for scheme in ("light", "dark"):
+            wanted = [mode for mode in modes if mode == scheme or (mode == "print" and scheme == "light")]
+            if not wanted:
+                continue
+            context = browser.new_context(viewport=viewport, color_scheme=scheme, reduced_motion="reduce")
+            for pattern in third_party_patterns():
+                context.route(pattern, lambda route: route.abort())
+            try:
+                page = context.new_page()
+                page.goto(url, wait_until="load")
+                page.locator(selector).scroll_into_view_if_needed()
+                page.evaluate(_NEXT_FRAMES)
+                for mode in wanted:
+                    if mode == "print":
+                        page.emulate_media(media="print")
+                        page.evaluate(_NEXT_FRAMES)
+                    captures[f"{viewport_name}/{mode}"] = capture(page, selector)
+            finally:
+                context.close()
+    return captures
+
+
+def unpack(snapshot, properties=PROPERTIES):
+    """Return ``{path: {"box": (x, y, w, h), "style": {property: value}}}`` for a snapshot."""
+    return {
+        row[0]: {"box": tuple(row[1:5]), "style": dict(zip(properties, row[5:]))}
+        for row in snapshot["elements"]
+    }
+
+
+def _close(expected, actual, tolerance):
+    if expected == actual:
+        return True
+    if expected is None or actual is None:
+        return False
+    if not isinstance(expected, str) or not isinstance(actual, str):
+        return abs(expected - actual) <= tolerance
+    if _NUMBER.sub("#", expected) != _NUMBER.sub("#", actual):
+        return False
+    pairs = zip(_NUMBER.findall(expected), _NUMBER.findall(actual))
+    return all(abs(float(want) - float(got)) <= tolerance for want, got in pairs)
+
+
+def diff(expected, actual, properties=PROPERTIES, tolerance=DEFAULT_TOLERANCE):
+    """Return ``(path, field, expected, actual)`` for every change between two snapshots.
+
+    ``field`` is ``"box"``, a property name, or ``"element"`` for an element
+    that exists in only one of them (the missing side is ``None``).
+    """
+    want, got = unpack(expected, properties), unpack(actual, properties)
+    changes = []
+    for path, before in want.items():
+        after = got.get(path)
+        if after is None:
+            changes.append((path, "element", "present", None))
+            continue
+        if not all(_close(a, b, tolerance) for a, b in zip(before["box"], after["box"])):
+            changes.append((path, "box", before["box"], after["box"]))
+        for name, value in before["style"].items():
+            if not _close(value, after["style"].get(name), tolerance):
+                changes.append((path, name, value, after["style"].get(name)))
+    changes.extend((path, "element", None, "present") for path in got if path not in want)
+    return changes
+
+
+def baseline_path(section, directory=BASELINE_DIR):
+    return Path(directory) / f"{section}.json"
+
+
+def load_baseline(section, directory=BASELINE_DIR):
+    """Return the stored baseline for ``section``, or ``None`` when none has been recorded."""
+    path = baseline_path(section, directory)
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    if baseline.get("version") != FORMAT_VERSION:
+        raise SnapshotError(f"{path} is in an old format; record it again with --update")
+    return baseline
+
+
+def save_baseline(section, captures, directory=BASELINE_DIR):
+    """Write ``captures`` as the baseline for ``section``: one element per line, so reviews diff cleanly."""
+    path = baseline_path(section, directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = [
+        "{",
+        f'  "version": {FORMAT_VERSION},',
+        f'  "selector": {json.dumps(SECTIONS.get(section, section))},',
+        f'  "properties": {json.dumps(list(PROPERTIES))},',
+        '  "captures": {',
+    ]
+    for index, (key, snapshot) in enumerate(sorted(captures.items())):
+        rows = ",\n".join(f"      {json.dumps(row, separators=(',', ':'))}" for row in snapshot["elements"])
+        lines.append(f'    {json.dumps(key)}: {{"size": {json.dumps(snapshot["size"])}, "elements": [\n{rows}\n    ]}}'
+                     + ("," if index < len(captures) - 1 else ""))
+    lines += ["  }", "}", ""]
+    path.write_text("\n".join(lines), encoding="utf-8")
+    return path
+
+
+def compare(baseline, captures, tolerance=DEFAULT_TOLERANCE):
+    """Return ``{capture: changes}`` for every capture in the baseline or in ``captures``."""
+    if list(baseline["properties"]) != list(PROPERTIES):
+        raise SnapshotError("The baseline records different properties; record it again with --update")
+    results = {}
+    for key in sorted(set(baseline["captures"]) | set(captures)):
+        expected, actual = baseline["captures"].get(key), captures.get(key)
+        if expected is None or actual is None:
+            results[key] = [("(capture)", "element", expected and "present", actual and "present")]
+            continue
+        results[key] = diff(expected, actual, PROPERTIES, tolerance)
+    return results
+
+
+def _format_value(value):
+    if isinstance(value, tuple):
+        return "({})".format(", ".join(f"{number:g}" for number in value))
+    return repr(value)
+
+
+def format_report(results, limit=20):
+    """Render ``compare`` results as text: a block per changed capture, at most ``limit`` lines each."""
+    lines = []
+    for key, changes in results.items():
+        if not changes:
+            continue
+        lines.append(f"[{key}] {len(changes)} change{'s' if len(changes) != 1 else ''}")
+        for path, field, expected, actual in changes[:limit]:
+            if field == "element":
+                lines.append(f"  {path}: {'added' if expected is None else 'removed'}")
+            else:
+                lines.append(f"  {path}: {field} {_format_value(expected)} -> {_format_value(actual)}")
+        if len(changes) > limit:
+            lines.append(f"  ... and {len(changes) - limit} more")
+    unchanged = sum(1 for changes in results.values() if not changes)
+    lines.append(f"{unchanged} of {len(results)} captures match the baseline")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diff section layout snapshots against their baselines.")
+    parser.add_argument("--section", action="append", choices=sorted(SECTIONS),
+                        help="section to check (repeatable; default: all)")
+    parser.add_argument("--root", default=str(REPO_ROOT), help="site directory (default: repository root)")
+    parser.add_argument("--baseline-dir", default=str(BASELINE_DIR), help="where baselines are stored")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed px/number drift")
+    parser.add_argument("--update", action="store_true", help="record the captures as the new baselines")
+    args = parser.parse_args(argv)
+
+    from playwright.sync_api import sync_playwright
+
+    from tools.devserver import start_server
+
+    server = start_server(args.root, host="127.0.0.1")
+    url = f"http://127.0.0.1:{server.port}/"
+    failed = False
+    try:
+        with sync_playwright() as playwright:
+            browser = playwright.chromium.launch(headless=True)
+            try:
+                for section in args.section or sorted(SECTIONS):
+                    captures = capture_section(browser, url, SECTIONS[section])
+                    if args.update:
+                        print(f"{section}: wrote {save_baseline(section, captures, args.baseline_dir)}")
+                        continue
+                    try:
+                        baseline = load_baseline(section, args.baseline_dir)
+                        if baseline is None:
+                            raise SnapshotError(f"No baseline for {section}; record one with --update")
+                        results = compare(baseline, captures, args.tolerance)
+                    except SnapshotError as exc:
+                        print(f"snapshots: {exc}", file=sys.stderr)
+                        return 2
+                    print(f"== {section} ==\n{format_report(results)}")
+                    failed = failed or any(results.values())
+            finally:
+                browser.close()
+    finally:
+        server.stop()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())